@@ -5,16 +5,42 @@ Servicio para la lógica de cálculo de personal (Staffing).
 CORREGIDO: Cálculo ponderado de KPIs y redondeo de decimales.
 CONSERVADO: Lógica original de Erlang VBA y estructura de datos.
 """
+import os
 import math
 import io
 import json
 import datetime
 import traceback
+import importlib.util
 import numpy as np
 import pandas as pd
 from ..models import StaffingResult
 from .. import db
 
+# Núcleo de Erlang compartido con SIPO (solo depende de math y NumPy).
+# Se carga desde el árbol de sipo desplegado junto a este proyecto, o desde SIPO_ERLANG_KERNEL_PATH.
+_ERLANG_KERNEL_PATH = os.environ.get('SIPO_ERLANG_KERNEL_PATH') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', '..',
+    'sipo', 'services', 'calculator', 'strategies', 'erlang_kernel.py'
+)
+
+
+def _load_erlang_kernel():
+    path = os.path.abspath(_ERLANG_KERNEL_PATH)
+    if not os.path.isfile(path):
+        raise ImportError(
+            f"No se encuentra el núcleo de Erlang de SIPO en '{path}'. proyecto-legacy necesita el árbol "
+            "'sipo' desplegado en el mismo directorio padre (sipo/services/calculator/strategies/erlang_kernel.py) "
+            "o la variable SIPO_ERLANG_KERNEL_PATH apuntando a erlang_kernel.py."
+        )
+    spec = importlib.util.spec_from_file_location('sipo_erlang_kernel', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+erlang_kernel = _load_erlang_kernel()
+
 # ==============================================================================
 # 1. FUNCIONES PRINCIPALES (PROCESAMIENTO)
 # ==============================================================================
@@ -311,48 +337,29 @@ def save_staffing_results(segment_id, config, all_sheets, df_dimensionados, df_e
 # ==============================================================================
 
 def vba_erlang_b(servers, intensity):
-    if servers < 0 or intensity < 0: return 0
-    max_iterate = int(servers); last = 1.0; b = 1.0
-    for count in range(1, max_iterate + 1):
-        b = (intensity * last) / (count + (intensity * last)); last = b
-    return max(0, min(b, 1))
+    return erlang_kernel.erlang_b(servers, intensity)
 
 def vba_erlang_c(servers, intensity):
-    if servers <= intensity: return 1.0
-    b = vba_erlang_b(servers, intensity); denominator = (1 - (intensity / servers) * (1 - b))
-    if denominator == 0: return 1.0
-    return max(0, min(b / denominator, 1))
+    return erlang_kernel.erlang_c(servers, intensity)
 
 def vba_sla(agents, service_time, calls_per_hour, aht):
-    if agents <= 0 or aht <= 0 or calls_per_hour < 0: return 1.0 if calls_per_hour == 0 else 0.0
-    traffic_rate = (calls_per_hour * aht) / 3600.0
-    if traffic_rate >= agents: return 0.0
-    c = vba_erlang_c(agents, traffic_rate); exponent = (traffic_rate - agents) * (service_time / aht)
-    try: sl_queued = 1 - c * math.exp(exponent)
-    except OverflowError: sl_queued = 0
-    return max(0, min(sl_queued, 1))
+    return erlang_kernel.sla(agents, service_time, calls_per_hour, aht)
 
 def vba_agents_required(target_sla, service_time, calls_per_hour, aht):
     if calls_per_hour <= 0 or aht <= 0: return 0
-    traffic_rate = (calls_per_hour * aht) / 3600.0; num_agents = math.ceil(traffic_rate)
-    if num_agents == 0 and traffic_rate > 0: num_agents = 1
-    utilisation = traffic_rate / num_agents if num_agents > 0 else 0
-    while utilisation >= 1.0:
-        num_agents += 1; utilisation = traffic_rate / num_agents
-    while True:
-        current_sla = vba_sla(num_agents, service_time, calls_per_hour, aht)
-        if current_sla >= target_sla: break
-        num_agents += 1
-        if num_agents > calls_per_hour + 100: break
-    return num_agents
+    # Recorrido lineal desde el menor entero mayor que el tráfico; se corta al superar calls_per_hour + 100
+    traffic_rate = (calls_per_hour * aht) / 3600.0; num_agents = math.floor(traffic_rate) + 1
+    if target_sla <= 0: return num_agents
+    upper = max(math.floor(calls_per_hour) + 101, num_agents + 1)
+    return int(erlang_kernel.agents_required_batch(target_sla, service_time, calls_per_hour, aht, upper_bound=upper))
 
 def _calculate_sl_capacity(num_agents, aht, sl_target, sl_time, interval_seconds=1800):
     if num_agents == 0 or aht == 0: return 0
-    for traffic in np.arange(num_agents - 0.01, 0, -0.01):
-        calls_per_hour_equivalent = (traffic * 3600) / aht
-        sl = vba_sla(num_agents, sl_time, calls_per_hour_equivalent, aht)
-        if sl >= sl_target: return math.floor((traffic * interval_seconds) / aht)
-    return 0
+    # Evalúa toda la rejilla de tráfico (pasos de 0.01) en una sola llamada y toma el mayor que cumple
+    traffic = np.arange(num_agents - 0.01, 0, -0.01)
+    met = erlang_kernel.sla_batch(num_agents, sl_time, (traffic * 3600) / aht, aht) >= sl_target
+    if not met.any(): return 0
+    return math.floor((traffic[np.argmax(met)] * interval_seconds) / aht)
 
 def _normalize_sheets(all_sheets):
     master_time_labels = [(datetime.datetime.strptime("00:00", "%H:%M") + datetime.timedelta(minutes=30 * i)).strftime('%H:%M') for i in range(48)]
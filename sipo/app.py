@@ -58,9 +58,13 @@ def create_app(config_name='default'):
          supports_credentials=True,
          allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-         expose_headers=['Content-Type', 'Authorization'],
+         expose_headers=['Content-Type', 'Authorization', 'ETag', 'X-Next-Before-Id'],
          vary_header=False)
 
+    # Serialización JSON de jsonify y request.get_json (orjson si está instalado)
+    from utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     # Inicializar extensiones
     db.init_app(app)
     migrate.init_app(app, db)
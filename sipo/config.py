@@ -32,6 +32,51 @@ class Config:
     # Configuración CORS para desarrollo
     CORS_ORIGINS = ['http://localhost:4200', 'http://127.0.0.1:4200']
 
+    # Caché de cálculos Erlang (agentes requeridos y SLA), compartida por todo el proceso
+    ERLANG_CACHE_ENABLED = os.getenv('ERLANG_CACHE_ENABLED', 'True').lower() == 'true'
+    ERLANG_CACHE_SIZE = int(os.getenv('ERLANG_CACHE_SIZE', '65536'))
+    ERLANG_CACHE_POLICY = os.getenv('ERLANG_CACHE_POLICY', 'lru')  # 'lru' o 'fifo'
+    # Decimales para cuantizar volumen y AHT en la clave (vacío = valores exactos)
+    ERLANG_CACHE_CALLS_DECIMALS = os.getenv('ERLANG_CACHE_CALLS_DECIMALS', '')
+    ERLANG_CACHE_AHT_DECIMALS = os.getenv('ERLANG_CACHE_AHT_DECIMALS', '')
+
+    # Tablas precalculadas de agentes requeridos (scripts/build_staffing_tables.py)
+    # Vacío = instance/staffing_tables en la raíz del proyecto
+    STAFFING_TABLES_DIR = os.getenv('STAFFING_TABLES_DIR', '')
+    STAFFING_TABLES_ENABLED = os.getenv('STAFFING_TABLES_ENABLED', 'True').lower() == 'true'
+
+    # Cálculo de requerimientos sobre matrices (días × intervalos) en lugar de fila a fila
+    DIMENSIONING_VECTORIZED = os.getenv('DIMENSIONING_VECTORIZED', 'True').lower() == 'true'
+    # Ejecutor del cálculo: 'serial' o 'process' (bloques de fechas en un ProcessPoolExecutor)
+    DIMENSIONING_EXECUTOR = os.getenv('DIMENSIONING_EXECUTOR', 'serial')
+    DIMENSIONING_WORKERS = int(os.getenv('DIMENSIONING_WORKERS', '0'))  # 0 = núcleos disponibles
+    DIMENSIONING_CHUNK_DAYS = int(os.getenv('DIMENSIONING_CHUNK_DAYS', '31'))
+
+    # Caché en disco de archivos subidos ya parseados (clave = hash del contenido)
+    # Vacío = instance/upload_cache en la raíz del proyecto
+    UPLOAD_CACHE_ENABLED = os.getenv('UPLOAD_CACHE_ENABLED', 'True').lower() == 'true'
+    UPLOAD_CACHE_DIR = os.getenv('UPLOAD_CACHE_DIR', '')
+    UPLOAD_CACHE_MAX_MB = int(os.getenv('UPLOAD_CACHE_MAX_MB', '512'))
+
+    # Registro de históricos de forecasting normalizados (fecha, intervalo, volumen)
+    # Vacío = instance/historical_datasets en la raíz del proyecto
+    HISTORICAL_DATASETS_DIR = os.getenv('HISTORICAL_DATASETS_DIR', '')
+
+    # Cubos de datos reales (fecha × intervalo) por segmento, mantenidos a partir de ActualsData
+    # Vacío = instance/actuals_cubes en la raíz del proyecto
+    ACTUALS_CUBES_DIR = os.getenv('ACTUALS_CUBES_DIR', '')
+
+    # Formato de las tablas de resultados de los escenarios: 'blob' (float32 comprimido) o 'json'
+    # Las tablas guardadas en JSON se siguen leyendo con cualquiera de los dos
+    SCENARIO_STORAGE_FORMAT = os.getenv('SCENARIO_STORAGE_FORMAT', 'blob')
+
+    # Caché en memoria de las respuestas ya formateadas de /api/calculator/history/<id>
+    SCENARIO_RESPONSE_CACHE_ENABLED = os.getenv('SCENARIO_RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+    SCENARIO_RESPONSE_CACHE_SIZE = int(os.getenv('SCENARIO_RESPONSE_CACHE_SIZE', '128'))
+
+    # Motor JSON de la API y de los datos guardados: 'auto' (orjson si está instalado), 'orjson' o 'stdlib'
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+
 
 class DevelopmentConfig(Config):
     """Configuración para desarrollo"""
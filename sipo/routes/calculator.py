@@ -4,16 +4,24 @@ Este módulo solo contiene los endpoints HTTP, delegando la lógica de negocio
 a los servicios correspondientes.
 """
 
-from flask import Blueprint, request, jsonify
-import pandas as pd
+from flask import Blueprint, request, jsonify, current_app
 import json
+from sqlalchemy import func
 from models import Segment
 from services.calculator.calculator_service import CalculatorService
 from services.calculator.storage_service import StorageService
+from services.calculator.batch_executor import DimensioningBatchExecutor
+from services.calculator.data_processor import DimensioningDataProcessor
+from utils.erlang_cache import get_erlang_cache
+from utils.upload_cache import get_upload_cache
+from utils.response_cache import get_scenario_response_cache
 
 calculator_bp = Blueprint('calculator', __name__, url_prefix='/api/calculator')
 service = CalculatorService()
 
+# Máximo de escenarios por página del historial
+HISTORY_MAX_LIMIT = 200
+
 
 @calculator_bp.route('/', methods=['GET'])
 def calculator_page():
@@ -50,6 +58,7 @@ def calculate():
         - intervalo: Intervalo en minutos
         - id_legal: ID legal del usuario (opcional)
         - username: Nombre de usuario (opcional)
+        - executor: 'serial' o 'process' (opcional, por defecto DIMENSIONING_EXECUTOR)
         - file_llamadas: Archivo Excel con volumen de llamadas
         - file_reductores: Archivo Excel con reductores
     """
@@ -92,11 +101,13 @@ def calculate():
             "intervalo": int(intervalo_seg_raw or 1800) // 60,
             "segment": segment
         }
+        # El ejecutor es un detalle de ejecución: no forma parte de los parámetros guardados del escenario
+        executor = request.form.get('executor')
         
         print(f"Calculator config: SLA={config['sla_objetivo']}, NDA={config['nda_objetivo']}, Time={config['sla_tiempo']}s", flush=True)
         
-        # Leer todas las hojas del archivo Excel
-        all_sheets = pd.read_excel(plantilla_excel, sheet_name=None)
+        # Leer solo las hojas que usa el cálculo (volumen, AHT y reductores)
+        all_sheets = DimensioningDataProcessor.read_template(plantilla_excel)
         
         # Verificar y normalizar nombres de hojas
         # Permitir tanto 'Volumen_a_gestionar' como 'Llamadas_esperadas'/'Llamadas_Esperadas' para compatibilidad
@@ -128,15 +139,21 @@ def calculate():
         
         # Procesar plantilla y calcular
         try:
-            results = service.procesar_plantilla_unica(config, all_sheets)
-            df_dimensionados, df_presentes, df_logados, df_efectivos, kpi_data, df_calls, df_aht = results
+            debug_info = {}
+            results = service.procesar_plantilla_unica(config, all_sheets, debug_info=debug_info, executor=executor)
+            cube, kpi_data, df_calls, df_aht = results
             print(f"[DEBUG CALCULATOR] CALCULATION COMPLETE. Rows processed: {len(df_calls)}", flush=True)
+            print(f"[DEBUG CALCULATOR] ERLANG CACHE: {get_erlang_cache().stats()}", flush=True)
+            print(f"[DEBUG CALCULATOR] EXECUTION: {debug_info}", flush=True)
         except ValueError as ve:
             return jsonify({"error": str(ve)}), 400
         
-        if df_dimensionados is None or df_dimensionados.empty:
+        if cube.empty:
             return jsonify({"error": "No se pudieron procesar los datos para el cálculo."}), 400
         
+        # Los DataFrames de resultados solo se construyen aquí, para guardar y responder
+        df_dimensionados, df_presentes, df_logados, df_efectivos = cube.result_frames()
+        
         # Crear escenario
         id_legal = request.form.get('id_legal')
         username = request.form.get('username')
@@ -162,7 +179,8 @@ def calculate():
             "presentes": service.format_and_calculate_simple(df_presentes).to_dict(orient='split'),
             "logados": service.format_and_calculate_simple(df_logados).to_dict(orient='split'),
             "kpis": kpi_data,
-            "warning": fallback_msg if 'fallback_msg' in locals() else None
+            "warning": fallback_msg if 'fallback_msg' in locals() else None,
+            "debug": debug_info
         }
         
         # Limpieza de index
@@ -180,14 +198,200 @@ def calculate():
         return jsonify({"error": f"Error en el cálculo: {str(e)}"}), 500
 
 
+@calculator_bp.route('/batch', methods=['POST'])
+def calculate_batch():
+    """
+    POST /api/calculator/batch
+    Calcula y guarda el dimensionamiento de varios segmentos a partir de una sola carga.
+    Los segmentos se calculan en paralelo y los escenarios se guardan en una única transacción:
+    si algún segmento falla no se guarda ninguno.
+    
+    Form Data:
+        - plantilla_excel: Libro Excel (columna de segmento u hojas '<segmento>__<hoja>') o zip de libros
+        - sla_objetivo, sla_tiempo, nda_objetivo: Objetivos comunes a todos los segmentos
+        - start_date, end_date: Rango de fechas
+        - intervalo_seg: Intervalo en segundos (opcional, 1800 por defecto)
+        - id_legal, username: Usuario que guarda los escenarios (opcional)
+    
+    Cada segmento se identifica por su ID o por su nombre.
+    """
+    try:
+        plantilla_excel = request.files.get('plantilla_excel')
+        if not plantilla_excel:
+            return jsonify({"error": "Falta el archivo de plantilla Excel"}), 400
+        
+        sla_objetivo_raw = request.form.get('sla_objetivo')
+        sla_tiempo_raw = request.form.get('sla_tiempo')
+        nda_objetivo_raw = request.form.get('nda_objetivo')
+        if not all([sla_objetivo_raw, sla_tiempo_raw, nda_objetivo_raw]):
+            return jsonify({"error": "Faltan parámetros requeridos: sla_objetivo, sla_tiempo, nda_objetivo"}), 400
+        
+        config = {
+            "start_date": request.form.get('start_date'),
+            "end_date": request.form.get('end_date'),
+            "sla_objetivo": float(sla_objetivo_raw),
+            "sla_tiempo": int(sla_tiempo_raw),
+            "nda_objetivo": float(nda_objetivo_raw),
+            "intervalo": int(request.form.get('intervalo_seg') or 1800) // 60
+        }
+        
+        try:
+            jobs = DimensioningBatchExecutor.read_upload(plantilla_excel)
+            segments = {key: _resolve_segment(key) for key in jobs}
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+        
+        outcomes, debug_info = DimensioningBatchExecutor().run(jobs, config)
+        report = [
+            {
+                "segment_key": key,
+                "segment_id": segments[key].id,
+                "segment_name": segments[key].name,
+                "seconds": outcome['seconds'],
+                "timings": outcome['debug'].get('timings'),
+                "error": outcome['error']
+            }
+            for key, outcome in outcomes.items()
+        ]
+        print(f"[DEBUG CALCULATOR] BATCH: {debug_info}", flush=True)
+        
+        if any(outcome['error'] for outcome in outcomes.values()):
+            return jsonify({"error": "No se guardó ningún escenario: fallaron uno o más segmentos", "segments": report, "debug": debug_info}), 400
+        
+        entries = [
+            (segments[key].id, dict(config, segment=segments[key]), outcome['results'])
+            for key, outcome in outcomes.items()
+        ]
+        scenarios = StorageService.save_batch_results(entries, request.form.get('id_legal'), request.form.get('username'))
+        
+        for item, scenario, outcome in zip(report, scenarios, outcomes.values()):
+            item["scenario_id"] = scenario.id
+            item["kpis"] = outcome['results'][1]
+        
+        return jsonify({"segments": report, "debug": debug_info})
+        
+    except Exception as e:
+        from app import db
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Error en el cálculo por lotes: {str(e)}"}), 500
+
+
+def _resolve_segment(key):
+    """
+    Busca un segmento por ID (clave numérica) o por nombre (sin distinguir mayúsculas).
+    
+    Raises:
+        ValueError: Si no existe o el nombre es ambiguo
+    """
+    if str(key).isdigit():
+        segment = Segment.query.get(int(key))
+        if segment:
+            return segment
+    matches = Segment.query.filter(func.lower(Segment.name) == str(key).lower()).all()
+    if not matches:
+        raise ValueError(f"Segmento no encontrado: {key}")
+    if len(matches) > 1:
+        raise ValueError(f"El nombre de segmento '{key}' es ambiguo ({len(matches)} campañas); use su ID")
+    return matches[0]
+
+
+@calculator_bp.route('/sweep', methods=['POST'])
+def calculate_sweep():
+    """
+    POST /api/calculator/sweep
+    Calcula los requerimientos de una plantilla para varios objetivos de servicio en una sola pasada.
+    No guarda escenarios: es una comparación para planificación de capacidad.
+    
+    Form Data:
+        - plantilla_excel: Archivo Excel con volumen, AHT y reductores
+        - targets: JSON con pares [nivel, tiempo], p. ej. [[0.7, 20], [0.8, 20], [0.9, 30]]
+        - start_date, end_date: Rango de fechas (opcional)
+        - intervalo_seg: Intervalo en segundos (opcional, 1800 por defecto)
+    """
+    try:
+        plantilla_excel = request.files.get('plantilla_excel')
+        if not plantilla_excel:
+            return jsonify({"error": "Falta el archivo de plantilla Excel"}), 400
+        
+        try:
+            targets = json.loads(request.form.get('targets') or '[]')
+        except json.JSONDecodeError:
+            return jsonify({"error": "El parámetro 'targets' debe ser una lista JSON de pares [nivel, tiempo]"}), 400
+        
+        config = {
+            "start_date": request.form.get('start_date'),
+            "end_date": request.form.get('end_date'),
+            "intervalo": int(request.form.get('intervalo_seg') or 1800) // 60
+        }
+        all_sheets = DimensioningDataProcessor.read_template(plantilla_excel)
+        
+        try:
+            debug_info = {}
+            results = service.procesar_barrido_objetivos(config, all_sheets, targets, debug_info=debug_info)
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+        
+        results["debug"] = debug_info
+        return jsonify(results)
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Error en el barrido de objetivos: {str(e)}"}), 500
+
+
+@calculator_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """
+    GET /api/calculator/cache-stats
+    Devuelve los contadores de aciertos/fallos de la caché compartida de cálculos Erlang.
+    """
+    return jsonify(get_erlang_cache().stats())
+
+
+@calculator_bp.route('/cache-stats', methods=['DELETE'])
+def reset_cache_stats():
+    """
+    DELETE /api/calculator/cache-stats
+    Vacía la caché de cálculos Erlang y reinicia sus contadores.
+    """
+    get_erlang_cache().clear()
+    return jsonify({"message": "Caché de cálculos reiniciada"}), 200
+
+
+@calculator_bp.route('/upload-cache-stats', methods=['GET'])
+def get_upload_cache_stats():
+    """
+    GET /api/calculator/upload-cache-stats
+    Devuelve los contadores y la ocupación de la caché de archivos subidos ya parseados.
+    """
+    return jsonify(get_upload_cache().stats())
+
+
+@calculator_bp.route('/upload-cache-stats', methods=['DELETE'])
+def reset_upload_cache():
+    """
+    DELETE /api/calculator/upload-cache-stats
+    Vacía la caché de archivos subidos y reinicia sus contadores.
+    """
+    get_upload_cache().clear()
+    return jsonify({"message": "Caché de cargas reiniciada"}), 200
+
+
 @calculator_bp.route('/history', methods=['GET'])
 def get_history():
     """
-    GET /api/calculator/history?id_legal=<id>
-    Obtiene el historial de cálculos de un usuario.
+    GET /api/calculator/history?id_legal=<id>&limit=<n>&before_id=<id>
+    Obtiene el historial de cálculos de un usuario, del más reciente al más antiguo.
     
     Query Parameters:
         - id_legal: ID legal del usuario (requerido)
+        - limit: Escenarios por página (opcional, 20 por defecto, máximo HISTORY_MAX_LIMIT)
+        - before_id: Cursor de paginación; solo escenarios con id menor (opcional)
+    
+    Si hay más escenarios, la cabecera X-Next-Before-Id trae el before_id de la página siguiente.
     """
     try:
         id_legal = request.args.get('id_legal')
@@ -195,8 +399,21 @@ def get_history():
         if not id_legal:
             return jsonify({"error": "El parámetro 'id_legal' es requerido"}), 400
         
-        history_data = StorageService.get_scenario_history(id_legal)
-        return jsonify(history_data)
+        try:
+            limit = int(request.args.get('limit') or 20)
+            before_id = request.args.get('before_id')
+            before_id = int(before_id) if before_id else None
+        except ValueError:
+            return jsonify({"error": "Los parámetros 'limit' y 'before_id' deben ser enteros"}), 400
+        if limit <= 0 or (before_id is not None and before_id <= 0):
+            return jsonify({"error": "Los parámetros 'limit' y 'before_id' deben ser mayores que 0"}), 400
+        limit = min(limit, HISTORY_MAX_LIMIT)
+        
+        history_data, next_before_id = StorageService.get_scenario_history_page(id_legal, limit, before_id)
+        response = jsonify(history_data)
+        if next_before_id is not None:
+            response.headers['X-Next-Before-Id'] = str(next_before_id)
+        return response
         
     except Exception as e:
         return jsonify({"error": f"Error al obtener el historial: {e}"}), 500
@@ -208,12 +425,30 @@ def get_scenario_details(scenario_id):
     GET /api/calculator/history/<scenario_id>
     Obtiene los detalles completos de un escenario específico.
     
+    Un escenario guardado no cambia, así que la respuesta formateada se guarda en caché con
+    su ETag: con If-None-Match coincidente se responde 304 sin cuerpo.
+    
     Path Parameters:
         - scenario_id: ID del escenario
     """
     try:
-        results_dict = StorageService.get_scenario_details(scenario_id)
-        return jsonify(results_dict)
+        cache = get_scenario_response_cache()
+        # Comprobación barata por clave primaria: un escenario borrado en otro proceso no se sirve de caché,
+        # y uno que reutiliza el id de otro borrado (SQLite) tiene otra fecha de creación
+        created_at = StorageService.get_scenario_created_at(scenario_id)
+        if created_at is None:
+            cache.invalidate(scenario_id)
+            raise ValueError(f"Escenario {scenario_id} no encontrado")
+        
+        body, etag = cache.get_or_render(
+            scenario_id,
+            lambda: current_app.json.dumps(StorageService.get_scenario_details(scenario_id)).encode('utf-8'),
+            version=created_at
+        )
+        response = current_app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response.make_conditional(request)
         
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
@@ -223,6 +458,117 @@ def get_scenario_details(scenario_id):
         return jsonify({"error": f"Error al obtener detalles del escenario: {e}"}), 500
 
 
+@calculator_bp.route('/history/<int:scenario_id>/reducers', methods=['POST'])
+def recalculate_reducers(scenario_id):
+    """
+    POST /api/calculator/history/<scenario_id>/reducers
+    Recalcula un escenario cambiando solo los reductores (absentismo, auxiliares, desconexiones)
+    y lo guarda como un escenario nuevo. Reutiliza los agentes efectivos almacenados, sin
+    volver a leer volumen/AHT ni repetir el cálculo de Erlang.
+    
+    Body (multipart/form-data):
+        - plantilla_excel: Excel con las hojas de reductores a sustituir
+        - id_legal, username: Usuario que guarda el nuevo escenario
+    
+    Body (JSON):
+        - reducers: {"absenteeism" | "auxiliaries" | "shrinkage": valor, lista de 48 intervalos o matriz días × 48}
+        - id_legal, username: Usuario que guarda el nuevo escenario
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        reducer_sheets = None
+        if 'plantilla_excel' in request.files and request.files['plantilla_excel'].filename:
+            reducer_sheets = DimensioningDataProcessor.read_template(
+                request.files['plantilla_excel'], keys=DimensioningDataProcessor.REDUCER_KEYS
+            )
+        reducer_arrays = payload.get('reducers')
+        
+        if not reducer_sheets and not reducer_arrays:
+            return jsonify({"error": "Falta el archivo de reductores o el campo 'reducers'"}), 400
+        
+        source, stored_frames = StorageService.get_scenario_frames(scenario_id)
+        parameters = json.loads(source.parameters) if source.parameters else {}
+        stored_kpis = json.loads(source.kpis_data) if source.kpis_data else {}
+        
+        try:
+            df_dimensionados, df_presentes, df_logados, df_efectivos, kpi_data, recalculated = service.recalculate_reducers(
+                stored_frames, stored_kpis, parameters,
+                reducer_sheets=reducer_sheets, reducer_arrays=reducer_arrays
+            )
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+        
+        config = dict(parameters, recalculated_from=scenario_id, reducers=recalculated)
+        scenario = StorageService.save_recalculated_scenario(
+            source, config,
+            df_dimensionados, df_presentes, df_logados, df_efectivos, kpi_data,
+            id_legal=payload.get('id_legal') or request.form.get('id_legal'),
+            username=payload.get('username') or request.form.get('username')
+        )
+        
+        results_to_send = {
+            "scenario_id": scenario.id,
+            "source_scenario_id": scenario_id,
+            "reducers": recalculated,
+            "dimensionados": service.format_and_calculate_simple(df_dimensionados).to_dict(orient='split'),
+            "efectivos": service.format_and_calculate_simple(df_efectivos).to_dict(orient='split'),
+            "presentes": service.format_and_calculate_simple(df_presentes).to_dict(orient='split'),
+            "logados": service.format_and_calculate_simple(df_logados).to_dict(orient='split'),
+            "kpis": kpi_data
+        }
+        
+        # Limpieza de index
+        for key in results_to_send:
+            if isinstance(results_to_send[key], dict) and 'index' in results_to_send[key]:
+                del results_to_send[key]['index']
+        
+        return jsonify(results_to_send)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        from app import db
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Error en el recálculo: {str(e)}"}), 500
+
+
+@calculator_bp.route('/history/<int:scenario_id>/sensitivity', methods=['POST'])
+def scenario_sensitivity(scenario_id):
+    """
+    POST /api/calculator/history/<scenario_id>/sensitivity
+    Calcula horas y FTE de un escenario almacenado ante choques de volumen y AHT.
+    
+    Body (JSON, opcional):
+        - volume_shocks: Variaciones del volumen en %, p. ej. [-10, -5, 0, 5, 10]
+        - aht_shocks: Variaciones del AHT en %
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        scenario, stored_frames = StorageService.get_scenario_frames(scenario_id)
+        parameters = json.loads(scenario.parameters) if scenario.parameters else {}
+        
+        try:
+            results = service.sensitivity_grid(
+                stored_frames, parameters,
+                volume_shocks=payload.get('volume_shocks'),
+                aht_shocks=payload.get('aht_shocks')
+            )
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+        
+        results["scenario_id"] = scenario_id
+        return jsonify(results)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Error en el análisis de sensibilidad: {str(e)}"}), 500
+
+
 @calculator_bp.route('/history/<int:scenario_id>', methods=['DELETE'])
 def delete_scenario(scenario_id):
     """
@@ -234,6 +580,7 @@ def delete_scenario(scenario_id):
     """
     try:
         StorageService.delete_scenario(scenario_id)
+        get_scenario_response_cache().invalidate(scenario_id)
         return jsonify({"message": "Escenario eliminado exitosamente"}), 200
         
     except ValueError as e:
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify, send_file, current_app, g
 from services.forecasting import ForecastingService
+from services.forecasting.dataset_registry import DatasetNotFoundError
+from services.forecasting.intraday_analyzer import IntradayAnalyzer
 from utils.auth import token_required
 import json
 import pandas as pd
@@ -9,18 +11,145 @@ from datetime import datetime
 forecasting_bp = Blueprint('forecasting', __name__)
 service = ForecastingService()
 
+
+def _historical_source(file_field):
+    """
+    Obtiene el histórico de la petición: el dataset registrado (campo dataset_id), el cubo de reales
+    del segmento (campo actuals_segment_id) o el archivo subido.
+    """
+    dataset_id = request.form.get('dataset_id')
+    if dataset_id:
+        return service.open_historical_dataset(dataset_id)
+    actuals_segment_id = request.form.get('actuals_segment_id')
+    if actuals_segment_id:
+        return service.open_actuals_cube(int(actuals_segment_id))
+    return request.files.get(file_field)
+
+
+@forecasting_bp.route('/api/forecasting/datasets', methods=['POST'])
+@token_required
+def register_dataset():
+    """
+    POST /api/forecasting/datasets
+    Registra un histórico (archivo + segment_id) y devuelve su dataset_id.
+    """
+    try:
+        if 'file' not in request.files:
+            return jsonify({"error": "No file uploaded"}), 400
+        segment_id = request.form.get('segment_id')
+        if not segment_id:
+            return jsonify({"error": "Falta el ID del segmento"}), 400
+
+        user_info = getattr(g, 'user', {})
+        meta = service.register_historical_dataset(
+            request.files['file'], int(segment_id), user_info, request.form.get('name')
+        )
+        return jsonify(meta)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in register_dataset: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@forecasting_bp.route('/api/forecasting/datasets/<int:segment_id>', methods=['GET', 'OPTIONS'])
+@token_required
+def get_datasets(segment_id):
+    """
+    GET /api/forecasting/datasets/<segment_id>
+    Lista los históricos registrados de un segmento.
+    """
+    try:
+        return jsonify(service.get_historical_datasets_by_segment(segment_id))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@forecasting_bp.route('/api/forecasting/datasets/<dataset_id>', methods=['DELETE', 'OPTIONS'])
+@token_required
+def delete_dataset(dataset_id):
+    """
+    DELETE /api/forecasting/datasets/<dataset_id>
+    Elimina un histórico registrado.
+    """
+    try:
+        service.delete_historical_dataset(dataset_id)
+        return jsonify({"message": "Histórico eliminado exitosamente"}), 200
+    except DatasetNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@forecasting_bp.route('/api/forecasting/actuals', methods=['POST'])
+@token_required
+def record_actuals():
+    """
+    POST /api/forecasting/actuals
+    Guarda los datos reales por intervalo de uno o varios días y actualiza el cubo del segmento.
+    Body: {"segment_id": 1, "days": {"2025-01-31": {"08:00": {"entrantes": 120, "aht": 310}, ...}}}
+    """
+    try:
+        data = request.json or {}
+        segment_id = data.get('segment_id')
+        days = data.get('days')
+        if not segment_id:
+            return jsonify({"error": "Falta el ID del segmento"}), 400
+        if not isinstance(days, dict) or not days:
+            return jsonify({"error": "Faltan los datos reales por día"}), 400
+
+        meta = service.record_actuals(int(segment_id), days)
+        return jsonify(meta)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in record_actuals: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@forecasting_bp.route('/api/forecasting/actuals/<int:segment_id>', methods=['GET', 'OPTIONS'])
+@token_required
+def get_actuals_cube(segment_id):
+    """
+    GET /api/forecasting/actuals/<segment_id>
+    Devuelve los metadatos del cubo de reales del segmento (días, rango de fechas e intervalos).
+    """
+    try:
+        return jsonify(service.get_actuals_cube_info(segment_id))
+    except DatasetNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@forecasting_bp.route('/api/forecasting/actuals/<int:segment_id>/rebuild', methods=['POST'])
+@token_required
+def rebuild_actuals_cube(segment_id):
+    """
+    POST /api/forecasting/actuals/<segment_id>/rebuild
+    Regenera el cubo de reales del segmento a partir de ActualsData.
+    """
+    try:
+        meta = service.rebuild_actuals_cube(segment_id)
+        if meta is None:
+            return jsonify({"error": f"No hay datos reales registrados para el segmento {segment_id}"}), 404
+        return jsonify(meta)
+    except Exception as e:
+        current_app.logger.error(f"Error in rebuild_actuals_cube: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @forecasting_bp.route('/api/forecasting/analyze-intraday', methods=['POST'])
 @token_required
 def analyze_intraday():
     try:
-        if 'file' not in request.files:
+        file = _historical_source('file')
+        if file is None:
             return jsonify({"error": "No file uploaded"}), 400
         
-        file = request.files['file']
         weeks = int(request.form.get('weeks', 4))
+        layout = request.form.get('layout', 'rows')
+        if layout not in IntradayAnalyzer.LAYOUTS:
+            return jsonify({"error": f"Formato no válido. Formatos disponibles: {', '.join(IntradayAnalyzer.LAYOUTS)}"}), 400
         
-        result = service.analyze_intraday_distribution(file, weeks)
+        result = service.analyze_intraday_distribution(file, weeks, layout)
         return jsonify(result)
+    except DatasetNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         current_app.logger.error(f"Error in analyze_intraday: {e}")
         return jsonify({"error": str(e)}), 500
@@ -29,14 +158,16 @@ def analyze_intraday():
 @token_required
 def analyze_holidays():
     try:
-        if 'historical_file' not in request.files or 'holidays_file' not in request.files:
+        historical_file = _historical_source('historical_file')
+        if historical_file is None or 'holidays_file' not in request.files:
             return jsonify({"error": "Se requieren ambos archivos: histórico y festivos."}), 400
         
-        historical_file = request.files['historical_file']
         holidays_file = request.files['holidays_file']
         
         result = service.analyze_holiday_distribution(historical_file, holidays_file)
         return jsonify(result)
+    except DatasetNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         current_app.logger.error(f"Error in analyze_holidays: {e}")
         return jsonify({"error": str(e)}), 500
@@ -61,14 +192,16 @@ def build_curve():
 @token_required
 def analyze_date():
     try:
-        if 'file' not in request.files:
+        file = _historical_source('file')
+        if file is None:
             return jsonify({"error": "No file uploaded"}), 400
         
-        file = request.files['file']
         target_date = request.form.get('target_date')
         
         result = service.analyze_specific_date_historically(file, target_date)
         return jsonify(result)
+    except DatasetNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         current_app.logger.error(f"Error in analyze_date: {e}")
         return jsonify({"error": str(e)}), 500
@@ -77,14 +210,16 @@ def analyze_date():
 @token_required
 def analyze_date_curve():
     try:
-        if 'file' not in request.files:
+        file = _historical_source('file')
+        if file is None:
             return jsonify({"error": "No file uploaded"}), 400
         
-        file = request.files['file']
         specific_date = request.form.get('specific_date')
         
         result = service.analyze_specific_date_curve(file, specific_date)
         return jsonify(result)
+    except DatasetNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         current_app.logger.error(f"Error in analyze_date_curve: {e}")
         return jsonify({"error": str(e)}), 500
@@ -93,10 +228,10 @@ def analyze_date_curve():
 @token_required
 def monthly_forecast():
     try:
-        if 'historical_file' not in request.files:
+        historical_file = _historical_source('historical_file')
+        if historical_file is None:
             return jsonify({"error": "Historical file is required"}), 400
         
-        historical_file = request.files['historical_file']
         holidays_file = request.files.get('holidays_file')
         
         recency_weight = float(request.form.get('recency_weight', 0.5))
@@ -107,6 +242,8 @@ def monthly_forecast():
             historical_file, holidays_file, recency_weight, manual_overrides, year_weights
         )
         return jsonify(result)
+    except DatasetNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         current_app.logger.error(f"Error in monthly_forecast: {e}")
         return jsonify({"error": str(e)}), 500
@@ -115,10 +252,10 @@ def monthly_forecast():
 @token_required
 def distribute_intramonth():
     try:
-        if 'historical_file' not in request.files:
+        historical_file = _historical_source('historical_file')
+        if historical_file is None:
             return jsonify({"error": "Historical file is required"}), 400
             
-        historical_file = request.files['historical_file']
         holidays_file = request.files.get('holidays_file')
         
         monthly_volume_str = request.form.get('monthly_volume')
@@ -136,6 +273,8 @@ def distribute_intramonth():
             as_attachment=True, 
             download_name='distribucion_intrames.xlsx'
         )
+    except DatasetNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         current_app.logger.error(f"Error in distribute_intramonth: {e}")
         return jsonify({"error": str(e)}), 500
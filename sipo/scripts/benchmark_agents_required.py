@@ -0,0 +1,142 @@
+"""
+Benchmark de la búsqueda de agentes requeridos: horquilla original vs estimación de square-root staffing.
+Mide sondeos de SLA por intervalo y tiempo total sobre una muestra aleatoria de intervalos,
+y verifica que ambos métodos devuelven el mismo número de agentes.
+
+Ejecutar con: python sipo/scripts/benchmark_agents_required.py --cells 5000
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Agregar el directorio raíz del proyecto al path para importar módulos
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from services.calculator.strategies.sla_strategy import SLAStrategy
+from services.calculator.strategies.agents_required_strategy import AgentsRequiredStrategy
+from services.scheduler.metrics_calculator import DimensioningCalculator
+
+
+class ProbeCounter:
+    """
+    Envuelve una función de SLA y cuenta cuántas veces se evalúa.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+        return self.func(*args)
+
+
+def strategy_binary_original(sla, target_sla, service_time, calls_per_hour, aht):
+    """
+    Búsqueda binaria original de AgentsRequiredStrategy sobre [0, max(100, 2·A + 10)].
+    """
+    min_agents = 0
+    max_agents = max(100, int(calls_per_hour * aht / 3600) * 2 + 10)
+    if sla(max_agents, service_time, calls_per_hour, aht) < target_sla:
+        return max_agents
+    while min_agents < max_agents:
+        mid_agents = (min_agents + max_agents) // 2
+        if sla(mid_agents, service_time, calls_per_hour, aht) >= target_sla:
+            max_agents = mid_agents
+        else:
+            min_agents = mid_agents + 1
+    return max_agents
+
+
+def scheduler_binary_original(sla, calls, aht, sl_target, sl_time):
+    """
+    Búsqueda binaria original de DimensioningCalculator sobre [A, max(3·A, A + 50)].
+    """
+    calls_per_hour = calls * 2
+    traffic = (calls_per_hour * aht) / 3600.0
+    low = max(1, int(traffic))
+    high = max(int(traffic * 3), int(traffic) + 50)
+    best_agents = high
+    for _ in range(20):
+        if low > high:
+            break
+        mid = (low + high) // 2
+        if sla(mid, sl_time, calls_per_hour, aht) >= sl_target:
+            best_agents = mid
+            high = mid - 1
+        else:
+            low = mid + 1
+    return float(best_agents)
+
+
+def run(label, cells, solve_before, solve_after, counter_before, counter_after):
+    """
+    Ejecuta ambos métodos sobre las celdas e imprime sondeos, tiempos y discrepancias.
+    """
+    start = time.perf_counter()
+    before = [solve_before(*cell) for cell in cells]
+    time_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = [solve_after(*cell) for cell in cells]
+    time_after = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(before, after) if a != b)
+    print(f"\n[{label}] {len(cells)} intervalos")
+    print(f"  Antes:   {counter_before.count / len(cells):5.2f} sondeos/intervalo  {time_before:7.3f}s")
+    print(f"  Después: {counter_after.count / len(cells):5.2f} sondeos/intervalo  {time_after:7.3f}s")
+    print(f"  Discrepancias: {mismatches}")
+
+
+def main():
+    """
+    Genera intervalos aleatorios y compara ambos métodos para la estrategia y el scheduler.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de la búsqueda de agentes requeridos.")
+    parser.add_argument('--cells', type=int, default=5000, help="Número de intervalos a evaluar")
+    parser.add_argument('--max-calls', type=float, default=3000, help="Volumen máximo por intervalo de 30 min")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    calls = rng.uniform(1, args.max_calls, args.cells)
+    aht = rng.uniform(60, 900, args.cells)
+    targets = rng.choice([0.7, 0.8, 0.9, 0.95], args.cells)
+    service_times = rng.choice([10.0, 20.0, 30.0], args.cells)
+
+    # Estrategia del calculador (volumen por hora)
+    sla_strategy = SLAStrategy()
+    counter_before = ProbeCounter(sla_strategy.calculate)
+    counter_after = ProbeCounter(sla_strategy.calculate)
+    strategy = AgentsRequiredStrategy(solver='binary', use_tables=False)
+    original_calculate = SLAStrategy.calculate
+    strategy_cells = [(float(t), float(s), float(c * 2), float(h))
+                      for t, s, c, h in zip(targets, service_times, calls, aht)]
+
+    SLAStrategy.calculate = lambda self, *params: counter_after(*params)
+    try:
+        run('AgentsRequiredStrategy', strategy_cells,
+            lambda *cell: strategy_binary_original(counter_before, *cell),
+            strategy.calculate, counter_before, counter_after)
+    finally:
+        SLAStrategy.calculate = original_calculate
+
+    # Calculador del scheduler (volumen por intervalo de 30 min)
+    calculator = DimensioningCalculator()
+    counter_before = ProbeCounter(calculator._vba_sla)
+    counter_after = ProbeCounter(calculator._vba_sla)
+    scheduler_cells = [(float(c), float(h), float(t), float(s))
+                       for c, h, t, s in zip(calls, aht, targets, service_times)]
+
+    calculator._vba_sla = counter_after
+    run('DimensioningCalculator', scheduler_cells,
+        lambda *cell: scheduler_binary_original(counter_before, *cell),
+        calculator._calculate_required_agents, counter_before, counter_after)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark de consistencia del núcleo de Erlang compartido.
+Evalúa Erlang B, Erlang C y SLA por cada implementación que delega en el núcleo
+(estrategias del calculador, estrategias previas de services/strategies y calculador del scheduler)
+frente a la recursión original en Python puro, informando discrepancias y llamadas por segundo.
+
+El servicio legacy (proyecto-legacy) carga el mismo archivo erlang_kernel.py, por lo que
+sus resultados coinciden con la fila "Núcleo escalar".
+
+Ejecutar con: python sipo/scripts/benchmark_erlang_kernel.py --cells 20000
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+import numpy as np
+
+# Agregar el directorio raíz del proyecto al path para importar módulos
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from services.calculator.strategies import erlang_kernel
+from services.calculator.strategies.erlang_b_strategy import ErlangBStrategy
+from services.calculator.strategies.erlang_c_strategy import ErlangCStrategy
+from services.calculator.strategies.sla_strategy import SLAStrategy
+from services.strategies.erlang_b_strategy import ErlangBStrategy as PreviousErlangBStrategy
+from services.strategies.erlang_c_strategy import ErlangCStrategy as PreviousErlangCStrategy
+from services.strategies.sla_strategy import SLAStrategy as PreviousSLAStrategy
+from services.scheduler.metrics_calculator import DimensioningCalculator
+
+
+def reference_erlang_b(servers, intensity):
+    """
+    Recursión original (port de VBA) de Erlang B.
+    """
+    if servers < 0 or intensity < 0:
+        return 0.0
+    last = 1.0
+    b = 1.0
+    for count in range(1, int(servers) + 1):
+        b = (intensity * last) / (count + (intensity * last))
+        last = b
+    return max(0.0, min(b, 1.0))
+
+
+def reference_erlang_c(servers, intensity):
+    """
+    Erlang C original a partir de la recursión de Erlang B.
+    """
+    if servers <= intensity:
+        return 1.0
+    b = reference_erlang_b(servers, intensity)
+    denominator = (1 - (intensity / servers) * (1 - b))
+    if denominator == 0:
+        return 1.0
+    return max(0.0, min(b / denominator, 1.0))
+
+
+def reference_sla(agents, service_time, calls_per_hour, aht):
+    """
+    SLA original con math.exp.
+    """
+    if calls_per_hour == 0:
+        return 1.0
+    if agents <= 0 or aht <= 0 or calls_per_hour < 0:
+        return 0.0
+    traffic_rate = (calls_per_hour * aht) / 3600.0
+    if traffic_rate >= agents:
+        return 0.0
+    c = reference_erlang_c(agents, traffic_rate)
+    try:
+        sl_queued = 1 - c * math.exp((traffic_rate - agents) * (service_time / aht))
+    except OverflowError:
+        sl_queued = 0
+    return max(0.0, min(sl_queued, 1.0))
+
+
+def time_scalar(func, cells):
+    """
+    Evalúa func celda a celda y devuelve (resultados, segundos).
+    """
+    start = time.perf_counter()
+    results = np.array([func(*cell) for cell in cells], dtype=float)
+    return results, time.perf_counter() - start
+
+
+def time_batch(func, columns):
+    """
+    Evalúa func sobre las columnas completas y devuelve (resultados, segundos).
+    """
+    start = time.perf_counter()
+    results = np.asarray(func(*columns), dtype=float)
+    return results, time.perf_counter() - start
+
+
+def report(label, implementations, reference):
+    """
+    Imprime discrepancias, error máximo y throughput de cada implementación frente a la referencia.
+    """
+    print(f"\n[{label}] {reference.size} celdas")
+    print(f"  {'Implementación':<28}{'Discrepancias':>14}{'Error máx.':>14}{'Llamadas/s':>14}")
+    for name, (results, elapsed) in implementations.items():
+        mismatches = int(np.count_nonzero(results != reference))
+        max_error = float(np.max(np.abs(results - reference))) if reference.size else 0.0
+        throughput = reference.size / elapsed if elapsed > 0 else float('inf')
+        print(f"  {name:<28}{mismatches:>14}{max_error:>14.2e}{throughput:>14,.0f}")
+
+
+def main():
+    """
+    Genera celdas aleatorias y compara todas las implementaciones para B, C y SLA.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de consistencia del núcleo de Erlang.")
+    parser.add_argument('--cells', type=int, default=20000, help="Número de celdas a evaluar")
+    parser.add_argument('--max-agents', type=int, default=300, help="Número máximo de agentes")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    agents = rng.integers(1, args.max_agents, args.cells).astype(float)
+    intensity = agents * rng.uniform(0.3, 1.1, args.cells)
+    aht = rng.uniform(60, 900, args.cells)
+    calls = intensity * 3600.0 / aht
+    calls[::10] = 0
+    service_time = rng.choice([10.0, 20.0, 30.0], args.cells)
+
+    pairs = list(zip(agents.tolist(), intensity.tolist()))
+    sla_cells = list(zip(agents.tolist(), service_time.tolist(), calls.tolist(), aht.tolist()))
+    calculator = DimensioningCalculator()
+
+    reference, _ = time_scalar(reference_erlang_b, pairs)
+    report('Erlang B', {
+        'Original (Python puro)': time_scalar(reference_erlang_b, pairs),
+        'Núcleo escalar': time_scalar(erlang_kernel.erlang_b, pairs),
+        'Núcleo por lotes': time_batch(erlang_kernel.erlang_b_batch, (agents, intensity)),
+        'ErlangBStrategy': time_scalar(ErlangBStrategy().calculate, pairs),
+        'services.strategies': time_scalar(PreviousErlangBStrategy().calculate, pairs),
+        'DimensioningCalculator': time_scalar(calculator.vba_erlang_b, pairs),
+    }, reference)
+
+    reference, _ = time_scalar(reference_erlang_c, pairs)
+    report('Erlang C', {
+        'Original (Python puro)': time_scalar(reference_erlang_c, pairs),
+        'Núcleo escalar': time_scalar(erlang_kernel.erlang_c, pairs),
+        'Núcleo por lotes': time_batch(erlang_kernel.erlang_c_batch, (agents, intensity)),
+        'ErlangCStrategy': time_scalar(ErlangCStrategy().calculate, pairs),
+        'services.strategies': time_scalar(PreviousErlangCStrategy().calculate, pairs),
+        'DimensioningCalculator': time_scalar(calculator.vba_erlang_c, pairs),
+    }, reference)
+
+    reference, _ = time_scalar(reference_sla, sla_cells)
+    report('SLA', {
+        'Original (Python puro)': time_scalar(reference_sla, sla_cells),
+        'Núcleo escalar': time_scalar(erlang_kernel.sla, sla_cells),
+        'Núcleo por lotes': time_batch(erlang_kernel.sla_batch, (agents, service_time, calls, aht)),
+        'SLAStrategy': time_scalar(SLAStrategy().calculate, sla_cells),
+        'services.strategies': time_scalar(PreviousSLAStrategy().calculate, sla_cells),
+        'DimensioningCalculator': time_scalar(calculator._vba_sla, sla_cells),
+    }, reference)
+
+
+if __name__ == '__main__':
+    main()
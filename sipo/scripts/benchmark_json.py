@@ -0,0 +1,143 @@
+"""
+Benchmark de serialización JSON de un plan de horarios realista.
+Genera un plan de 200 agentes × 31 días (turnos con descanso y PVDs), calcula sus métricas
+con DimensioningCalculator.calculate_metrics (288 slots de 5 minutos por día) y mide
+dumps/loads del payload completo con cada motor de utils.json_codec.
+
+Ejecutar con: python sipo/scripts/benchmark_json.py --agents 200 --days 31
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import datetime
+import numpy as np
+
+# Agregar el directorio raíz del proyecto al path para importar módulos
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from services.scheduler.metrics_calculator import DimensioningCalculator
+from utils.json_codec import JSONCodec, orjson
+
+
+def build_activities(start_min, end_min):
+    """
+    Genera un descanso de 30 minutos y PVDs de 5 minutos cada hora, como ActivityAllocator.
+    """
+    activities = []
+    break_start = start_min + 180
+    activities.append({
+        "type": "BREAK", "start": break_start, "end": break_start + 30, "duration": 30,
+        "startStr": f"{break_start // 60:02d}:{break_start % 60:02d}",
+        "endStr": f"{(break_start + 30) // 60:02d}:{(break_start + 30) % 60:02d}"
+    })
+    for pvd_start in range(start_min + 60, end_min - 5, 60):
+        if break_start <= pvd_start < break_start + 30:
+            continue
+        activities.append({
+            "type": "PVD", "start": pvd_start, "end": pvd_start + 5, "duration": 5,
+            "startStr": f"{pvd_start // 60:02d}:{pvd_start % 60:02d}",
+            "endStr": f"{(pvd_start + 5) // 60:02d}:{(pvd_start + 5) % 60:02d}"
+        })
+    return activities
+
+
+def build_plan(agents, days, seed):
+    """
+    Construye (horario, previsión) con la estructura de GreedyScheduler.
+    """
+    rng = random.Random(seed)
+    start_date = datetime.date(2025, 1, 1)
+    dates = [(start_date + datetime.timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days)]
+
+    schedule = []
+    for agent_id in range(agents):
+        shifts = {}
+        for d_idx, d_str in enumerate(dates):
+            if (d_idx + agent_id) % 7 in (5, 6):
+                shifts[d_str] = {"type": "OFF", "label": "LIBRE", "duration_minutes": 0}
+                continue
+            start_min = rng.choice(range(420, 840, 30))
+            end_min = start_min + 480
+            shifts[d_str] = {
+                "type": "WORK",
+                "label": f"{start_min // 60:02d}:{start_min % 60:02d}-{end_min // 60:02d}:{end_min % 60:02d}",
+                "start_min": start_min,
+                "end_min": end_min,
+                "duration_minutes": 480,
+                "activities": build_activities(start_min, end_min),
+            }
+        schedule.append({
+            "agent": {"id": agent_id, "name": f"Agente {agent_id:03d}", "contract_hours": 40, "country": "ES"},
+            "shifts": shifts,
+        })
+
+    forecast = {}
+    for d_str in dates:
+        day = {}
+        for slot in range(48):
+            calls = max(0.0, 120 * np.sin(np.pi * (slot - 14) / 30)) if 14 <= slot < 44 else 0.0
+            day[slot] = {"calls": round(calls, 2), "aht": 300, "required": round(calls * 300 / 1800 * 1.15, 2)}
+        forecast[d_str] = day
+    return schedule, forecast
+
+
+def measure(label, codec, payload, repeat):
+    """
+    Mide e imprime el mejor tiempo de dumps y loads de un codec y el tamaño del documento.
+    """
+    best_dumps = best_loads = float('inf')
+    text = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = codec.dumps(payload)
+        best_dumps = min(best_dumps, time.perf_counter() - start)
+        start = time.perf_counter()
+        codec.loads(text)
+        best_loads = min(best_loads, time.perf_counter() - start)
+    size_mb = len(text.encode('utf-8')) / 1e6
+    print(f"  {label:<12}{best_dumps * 1000:>12.1f}{best_loads * 1000:>12.1f}{size_mb:>12.2f}")
+
+
+def main():
+    """
+    Genera el plan, calcula las métricas y compara los motores JSON disponibles.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de serialización JSON de un plan de horarios.")
+    parser.add_argument('--agents', type=int, default=200, help="Número de agentes")
+    parser.add_argument('--days', type=int, default=31, help="Número de días")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por medida")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    schedule, forecast = build_plan(args.agents, args.days, args.seed)
+    start = time.perf_counter()
+    metrics = DimensioningCalculator().calculate_metrics(
+        schedule, forecast, service_level_target=0.8, service_time_target=20, interval_minutes=5
+    )
+    print(f"Métricas calculadas en {time.perf_counter() - start:.1f}s "
+          f"({len(metrics['daily_metrics'])} días × {1440 // metrics['interval_minutes']} slots)")
+
+    # KPIs con escalares y arrays de NumPy, como los que devuelven los servicios de cálculo
+    coverage = np.array([metrics['coverage'][d] for d in sorted(metrics['coverage'])], dtype=np.float32)
+    kpis = {
+        "total_hours": np.float64(metrics['total_hours']),
+        "agents": np.int64(args.agents),
+        "coverage_mean": coverage.mean(axis=0),
+        "generated_at": datetime.datetime.now(),
+    }
+    payload = {"schedule": schedule, "metrics": metrics, "kpis": kpis}
+
+    print(f"\n{'Motor':<14}{'dumps (ms)':>12}{'loads (ms)':>12}{'Tamaño (MB)':>12}")
+    measure('stdlib', JSONCodec('stdlib'), payload, args.repeat)
+    if orjson is not None:
+        measure('orjson', JSONCodec('orjson'), payload, args.repeat)
+    else:
+        print("\norjson no está instalado: solo se mide el motor estándar")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Script para precalcular las tablas de agentes requeridos usadas por AgentsRequiredStrategy.
+Genera un fichero .npy por cada (objetivo, tiempo de servicio) y un manifest.json en el
+directorio de tablas (por defecto instance/staffing_tables en la raíz del proyecto).
+
+Ejecutar con: python sipo/scripts/build_staffing_tables.py --targets 0.8 --service-times 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+# Agregar el directorio raíz del proyecto al path para importar módulos
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from services.calculator.strategies.staffing_tables import (
+    MANIFEST_NAME, build_capacity_table, default_tables_dir, table_filename
+)
+
+
+def parse_args():
+    """
+    Define y parsea los argumentos de línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Construye las tablas precalculadas de agentes requeridos.")
+    parser.add_argument('--targets', type=float, nargs='+', default=[0.8],
+                        help="SLA objetivo (entre 0 y 1, sin incluir). Ej: 0.8 0.9")
+    parser.add_argument('--service-times', type=float, nargs='+', default=[20],
+                        help="Tiempos de servicio en segundos. Ej: 20 30")
+    parser.add_argument('--aht-min', type=float, default=30, help="AHT mínimo cubierto (segundos)")
+    parser.add_argument('--aht-max', type=float, default=1200, help="AHT máximo cubierto (segundos)")
+    parser.add_argument('--aht-step', type=float, default=5, help="Ancho de cada tramo de AHT (segundos)")
+    parser.add_argument('--max-agents', type=int, default=600, help="Número máximo de agentes por tabla")
+    parser.add_argument('--output', default=None, help="Directorio de salida (por defecto el de la configuración)")
+    return parser.parse_args()
+
+
+def main():
+    """
+    Construye todas las tablas solicitadas y escribe el manifiesto.
+    """
+    args = parse_args()
+    output_dir = os.path.abspath(args.output) if args.output else default_tables_dir()
+    os.makedirs(output_dir, exist_ok=True)
+
+    aht_buckets = np.arange(args.aht_min, args.aht_max + args.aht_step / 2, args.aht_step)
+    entries = []
+
+    for target in args.targets:
+        if not 0 < target < 1:
+            raise ValueError(f"El SLA objetivo debe estar entre 0 y 1 (sin incluir): {target}")
+        for service_time in args.service_times:
+            start = time.time()
+            capacities = build_capacity_table(target, service_time, aht_buckets, args.max_agents)
+            filename = table_filename(target, service_time)
+            np.save(os.path.join(output_dir, filename), capacities)
+            entries.append({
+                'target_sla': float(target),
+                'service_time': float(service_time),
+                'aht_buckets': [float(a) for a in aht_buckets],
+                'max_agents': int(args.max_agents),
+                'file': filename
+            })
+            print(f"[INFO] Tabla {filename} generada en {time.time() - start:.1f}s")
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'tables': entries}, f, indent=2)
+
+    print(f"[INFO] {len(entries)} tablas escritas en {output_dir}")
+
+
+if __name__ == '__main__':
+    main()
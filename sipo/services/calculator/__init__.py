@@ -1,5 +1,13 @@
 from .calculator_facade import CalculatorServiceFacade
 from .calculator_service import CalculatorService
-from .storage_service import StorageService
 
 __all__ = ['CalculatorServiceFacade', 'CalculatorService', 'StorageService']
+
+
+def __getattr__(name):
+    # StorageService depende de la app Flask (db); se importa bajo demanda para que el
+    # núcleo de cálculo (p. ej. desde el subproceso del scheduler) no arrastre la app.
+    if name == 'StorageService':
+        from .storage_service import StorageService
+        return StorageService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,177 @@
+"""
+Dimensionamiento de varios segmentos en una sola carga.
+Separa un libro (o un zip de libros) en un grupo de hojas por segmento y resuelve
+process_full_dimensioning de cada segmento en el pool de procesos compartido.
+"""
+
+import io
+import os
+import time
+import zipfile
+import pandas as pd
+from .chunk_executor import CALCULATION_KEYS, default_workers, map_in_pool
+from .data_processor import DimensioningDataProcessor
+
+# Columnas que identifican el segmento de cada fila dentro de una hoja
+SEGMENT_COLUMNS = ('Segmento', 'segmento', 'Segment', 'segment', 'segment_id')
+
+# Separador de los grupos de hojas por segmento: '<segmento>__<hoja>'
+SHEET_GROUP_SEPARATOR = '__'
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+
+def _segment_key(value):
+    """
+    Normaliza el valor de la columna de segmento a su clave de texto, o None si la celda está vacía.
+    Los enteros que pandas lee como float (la columna tiene celdas vacías) vuelven a su forma entera: 12.0 -> '12'.
+    """
+    if pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip() or None
+
+
+def _dimension_segment(config, sheets):
+    """
+    Resuelve el dimensionamiento completo de un segmento en el proceso de trabajo.
+
+    Returns:
+        tuple: (resultados de process_full_dimensioning, debug_info, segundos, error)
+    """
+    from .calculator_service import CalculatorService
+
+    start = time.perf_counter()
+    debug_info = {}
+    try:
+        results = CalculatorService.procesar_plantilla_unica(config, sheets, debug_info=debug_info, executor='serial')
+        return results, debug_info, time.perf_counter() - start, None
+    except ValueError as e:
+        return None, debug_info, time.perf_counter() - start, str(e)
+
+
+class DimensioningBatchExecutor:
+    """
+    Reparte el dimensionamiento de varios segmentos entre procesos de trabajo.
+    """
+
+    def __init__(self, max_workers=None):
+        """
+        Args:
+            max_workers (int): Procesos de trabajo (por defecto Config.DIMENSIONING_WORKERS; 0 = núcleos disponibles)
+        """
+        self.max_workers = max_workers or default_workers()
+
+    @staticmethod
+    def read_upload(file_storage):
+        """
+        Lee la carga del lote: un libro Excel o un zip de libros.
+
+        En un zip, cada libro es un segmento (clave = nombre del archivo sin extensión), salvo
+        que el propio libro use columna de segmento o grupos de hojas.
+
+        Returns:
+            dict: Hojas por clave de segmento (clave -> {nombre de hoja: DataFrame})
+        """
+        filename = (file_storage.filename or '').lower()
+        if not filename.endswith('.zip'):
+            return DimensioningBatchExecutor.split_workbook(DimensioningBatchExecutor.read_workbook(file_storage))
+
+        jobs = {}
+        with zipfile.ZipFile(io.BytesIO(file_storage.read())) as archive:
+            for name in sorted(archive.namelist()):
+                base = os.path.basename(name)
+                if not base.lower().endswith(EXCEL_EXTENSIONS) or base.startswith(('~$', '.')):
+                    continue
+                all_sheets = DimensioningBatchExecutor.read_workbook(io.BytesIO(archive.read(name)))
+                groups = DimensioningBatchExecutor.split_workbook(all_sheets, default_key=os.path.splitext(base)[0])
+                for key, sheets in groups.items():
+                    if key in jobs:
+                        raise ValueError(f"El segmento '{key}' aparece en más de un libro del zip")
+                    jobs[key] = sheets
+        if not jobs:
+            raise ValueError("El zip no contiene libros Excel")
+        return jobs
+
+    @staticmethod
+    def read_workbook(source):
+        """
+        Lee de un libro solo las hojas del dimensionamiento, incluidas las de los grupos
+        '<segmento>__<hoja>', con el lector selectivo y la caché de cargas de la plantilla.
+
+        Returns:
+            dict: Nombre de hoja -> DataFrame
+        """
+        return DimensioningDataProcessor.read_template(source, group_separator=SHEET_GROUP_SEPARATOR)
+
+    @staticmethod
+    def split_workbook(all_sheets, default_key=None):
+        """
+        Separa un libro en un grupo de hojas por segmento.
+
+        Admite dos formatos, combinables:
+        - Grupos de hojas con prefijo '<segmento>__<hoja>' (p. ej. 'Ventas__Volumen_a_gestionar').
+        - Hojas con una columna de segmento (SEGMENT_COLUMNS), que se reparten por su valor.
+        Las hojas sin prefijo ni columna de segmento se comparten entre todos los segmentos.
+        Las filas con la celda de segmento vacía no pertenecen a ningún segmento y se descartan.
+
+        Returns:
+            dict: Hojas por clave de segmento
+        """
+        groups, shared = {}, {}
+        for sheet_name, df in all_sheets.items():
+            key, separator, name = str(sheet_name).partition(SHEET_GROUP_SEPARATOR)
+            if separator and key and name:
+                groups.setdefault(key.strip(), {})[name] = df
+                continue
+
+            column = next((col for col in SEGMENT_COLUMNS if col in df.columns), None)
+            if column is None:
+                shared[sheet_name] = df
+                continue
+            keys = df[column].map(_segment_key)
+            for value, df_segment in df.groupby(keys, sort=False):
+                groups.setdefault(value, {})[sheet_name] = df_segment.drop(columns=[column]).reset_index(drop=True)
+
+        if not groups:
+            if default_key is None:
+                raise ValueError(
+                    f"No se encontraron segmentos en el libro. Use una columna de segmento "
+                    f"({', '.join(SEGMENT_COLUMNS)}) o hojas con prefijo '<segmento>{SHEET_GROUP_SEPARATOR}<hoja>'"
+                )
+            return {default_key: dict(shared)}
+        return {key: dict(shared, **sheets) for key, sheets in groups.items()}
+
+    def run(self, jobs, config):
+        """
+        Calcula el dimensionamiento de cada segmento.
+
+        Args:
+            jobs (dict): Hojas por clave de segmento
+            config (dict): Configuración común del cálculo
+
+        Returns:
+            tuple: (dict clave -> {'results', 'debug', 'seconds', 'error'}, debug_info del lote)
+        """
+        # Cada segmento se calcula en serie dentro de su proceso: el paralelismo es entre segmentos
+        segment_config = {key: config[key] for key in CALCULATION_KEYS + ('start_date', 'end_date') if key in config}
+
+        start = time.perf_counter()
+        workers = min(self.max_workers, len(jobs))
+        if workers <= 1:
+            outcomes = [_dimension_segment(segment_config, sheets) for sheets in jobs.values()]
+        else:
+            outcomes = map_in_pool(
+                self.max_workers, _dimension_segment, [segment_config] * len(jobs), list(jobs.values())
+            )
+
+        results = {
+            key: {'results': results, 'debug': debug, 'seconds': round(seconds, 4), 'error': error}
+            for key, (results, debug, seconds, error) in zip(jobs, outcomes)
+        }
+        return results, {
+            'executor': 'process' if workers > 1 else 'serial',
+            'workers': workers,
+            'seconds': round(time.perf_counter() - start, 4),
+        }
@@ -3,10 +3,14 @@ Fachada principal para el servicio de Dimensionamiento (Calculadora).
 Orquesta el flujo de procesamiento, cálculo y generación de KPIs.
 """
 
+import time
 import logging
+import numpy as np
 from .data_processor import DimensioningDataProcessor
 from .core_calculator import DimensioningCoreCalculator
 from .kpi_service import DimensioningKPIService
+from .chunk_executor import DimensioningChunkExecutor
+from utils.date_parsing import parse_dates
 
 logger = logging.getLogger(__name__)
 
@@ -15,42 +19,289 @@ class CalculatorServiceFacade:
     Punto de entrada unificado para la lógica de dimensionamiento.
     """
 
+    # Choques por defecto (en %) de la rejilla de sensibilidad de volumen y AHT
+    DEFAULT_SHOCKS = (-15, -10, -5, 0, 5, 10, 15)
+
+    # Nombre del KPI de porcentaje asociado a cada reductor
+    REDUCER_KPIS = {'absenteeism': 'absentismo', 'auxiliaries': 'auxiliares', 'shrinkage': 'desconexiones'}
+
     def __init__(self, erlang_strategy_service):
         self.processor = DimensioningDataProcessor()
         self.calculator = DimensioningCoreCalculator(erlang_strategy_service)
         self.kpi_service = DimensioningKPIService()
+        self.chunk_executor = DimensioningChunkExecutor(self.calculator)
         self.strategy_service = erlang_strategy_service
 
-    def process_full_dimensioning(self, config, all_sheets):
+    def process_full_dimensioning(self, config, all_sheets, debug_info=None, executor=None):
         """
         Ejecuta el flujo completo de cálculo:
         1. Normalización de hojas.
-        2. Fusión de datos (Merge).
-        3. Cálculo de requerimientos Erlang.
+        2. Fusión de datos en el cubo de entradas.
+        3. Cálculo de requerimientos Erlang (en serie o por bloques de fechas, según executor;
+           por defecto Config.DIMENSIONING_EXECUTOR).
         4. Cálculo de KPIs.
+
+        Si se pasa debug_info (dict), se completa con el desglose de tiempos por fase y por bloque.
+
+        Returns:
+            tuple: (cubo con las capas de resultados, kpis, hoja de volumen, hoja de AHT)
         """
         try:
+            timings = {}
+            start = time.perf_counter()
+
             # 1. Generar etiquetas de tiempo estándar (00:00, 00:30, ...)
             time_labels = [f"{i*30//60:02d}:{i*30%60:02d}" for i in range(48)]
 
             # 2. Preparar hojas
             sheets = self.processor.prepare_sheets(all_sheets)
+            timings['prepare'] = time.perf_counter() - start
             
             # 3. Mezclar datos
-            df_master = self.processor.merge_data(sheets, config, time_labels)
+            start = time.perf_counter()
+            cube = self.processor.build_cube(sheets, config, time_labels)
+            timings['merge'] = time.perf_counter() - start
             
-            # 4. Calcular requerimientos
-            df_dim, df_pre, df_log, df_efe = self.calculator.calculate_requirements(df_master, config, time_labels)
+            # 4. Calcular requerimientos (capas de resultados del cubo)
+            start = time.perf_counter()
+            cube, execution = self.chunk_executor.run(
+                cube, config, time_labels, executor=executor
+            )
+            timings['requirements'] = time.perf_counter() - start
             
             # 5. Calcular KPIs
-            kpis = self.kpi_service.calculate_global_kpis(df_master, time_labels, sheets, df_dim)
+            start = time.perf_counter()
+            kpis = self.kpi_service.calculate_global_kpis(cube, time_labels, sheets)
+            timings['kpis'] = time.perf_counter() - start
+
+            if debug_info is not None:
+                debug_info.update(execution)
+                debug_info['timings'] = {phase: round(seconds, 4) for phase, seconds in timings.items()}
+                debug_info['cube_bytes'] = cube.nbytes
             
-            return df_dim, df_pre, df_log, df_efe, kpis, sheets['calls'], sheets['aht']
+            return cube, kpis, sheets['calls'], sheets['aht']
             
         except Exception as e:
             logger.error(f"Error en process_full_dimensioning: {e}", exc_info=True)
             raise ValueError(str(e))
 
+    def process_target_sweep(self, config, all_sheets, targets, debug_info=None):
+        """
+        Calcula los requerimientos de una misma previsión para varios objetivos de servicio.
+
+        La plantilla se normaliza y fusiona una sola vez y todos los objetivos se evalúan
+        sobre el mismo conjunto de pares (volumen, AHT) únicos.
+
+        Args:
+            config (dict): Configuración del cálculo (fechas, intervalo)
+            all_sheets (dict): Hojas de la plantilla Excel
+            targets (list): Pares (nivel objetivo, tiempo de servicio); el nivel admite fracción (0.8) o porcentaje (80)
+            debug_info (dict): Si se pasa, se completa con el desglose de tiempos por fase
+
+        Returns:
+            dict: Etiquetas de intervalo, KPIs por objetivo y matrices objetivos × intervalos con el
+                promedio diario de agentes dimensionados y efectivos
+        """
+        targets = self._parse_targets(targets)
+        time_labels = [f"{i*30//60:02d}:{i*30%60:02d}" for i in range(48)]
+        timings = {}
+
+        start = time.perf_counter()
+        sheets = self.processor.prepare_sheets(all_sheets)
+        df_master = self.processor.build_cube(sheets, config, time_labels)
+        timings['merge'] = time.perf_counter() - start
+        if df_master.empty:
+            raise ValueError("No se pudieron procesar los datos para el cálculo.")
+
+        start = time.perf_counter()
+        results = self.calculator.calculate_requirements_sweep(df_master, config, time_labels, targets)
+        timings['requirements'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        kpis = self.kpi_service.calculate_global_kpis(df_master, time_labels, sheets)
+        summary, requirements, efectivos = [], [], []
+        for (target_level, service_time), (dimensionados, _, _, efe) in zip(targets, results):
+            summary.append(dict(
+                self.kpi_service.staffing_kpis(dimensionados, time_labels),
+                objetivo=target_level,
+                sla_tiempo=service_time,
+                pico_agentes=round(float(dimensionados.max()), 2)
+            ))
+            requirements.append(np.round(dimensionados.mean(axis=0, dtype=float), 2).tolist())
+            efectivos.append(np.round(efe.mean(axis=0, dtype=float), 2).tolist())
+        timings['kpis'] = time.perf_counter() - start
+
+        if debug_info is not None:
+            debug_info['timings'] = {phase: round(seconds, 4) for phase, seconds in timings.items()}
+
+        return {
+            'time_labels': time_labels,
+            'dias': len(df_master),
+            'kpis': kpis,
+            'targets': summary,
+            'dimensionados': requirements,
+            'efectivos': efectivos,
+        }
+
+    @staticmethod
+    def _parse_targets(targets):
+        """
+        Valida la lista de objetivos y la normaliza a pares (fracción, segundos).
+        """
+        if not targets:
+            raise ValueError("Se requiere al menos un objetivo (nivel, tiempo de servicio)")
+        parsed = []
+        for target in targets:
+            try:
+                level, service_time = target
+                level, service_time = float(level), int(service_time)
+            except (TypeError, ValueError):
+                raise ValueError(f"Objetivo no válido: {target}. Formato esperado: [nivel, tiempo de servicio]")
+            if level > 1:
+                level /= 100.0
+            if not 0 < level < 1 or service_time < 0:
+                raise ValueError(f"Objetivo fuera de rango: {target}")
+            parsed.append((level, service_time))
+        return parsed
+
+    def recalculate_reducers(self, stored_frames, stored_kpis, parameters=None, reducer_sheets=None, reducer_arrays=None):
+        """
+        Recalcula un escenario existente cambiando solo los reductores.
+
+        Reutiliza los agentes efectivos almacenados (que solo dependen de volumen, AHT y SLA)
+        y rehace la cascada logados → presentes → dimensionados, sin leer la plantilla ni
+        repetir búsquedas de Erlang.
+
+        Args:
+            stored_frames (dict): DataFrames almacenados ('dimensionados', 'presentes', 'logados', 'efectivos')
+            stored_kpis (dict): KPIs almacenados del escenario original
+            parameters (dict): Parámetros del escenario original (rango de fechas para alinear hojas)
+            reducer_sheets (dict): Hojas de Excel con reductores (nombre -> DataFrame)
+            reducer_arrays (dict): Reductores por clave ('absenteeism', 'auxiliaries', 'shrinkage');
+                cada valor puede ser un escalar, una lista por intervalo o una matriz días × intervalos
+
+        Returns:
+            tuple: (df_dim, df_pre, df_log, df_efe, kpis, claves de reductores recalculados)
+        """
+        time_labels = [f"{i*30//60:02d}:{i*30%60:02d}" for i in range(48)]
+        df_efe = stored_frames.get('efectivos')
+        if df_efe is None or df_efe.empty:
+            raise ValueError("El escenario no tiene agentes efectivos almacenados")
+
+        efectivos = self.calculator.load_matrix(df_efe, time_labels)
+        stored = [self.calculator.load_matrix(stored_frames[key], time_labels) for key in ('logados', 'presentes', 'dimensionados')]
+        if any(matrix.shape != efectivos.shape for matrix in stored):
+            raise ValueError("Los resultados almacenados del escenario no son consistentes")
+
+        reducers = {}
+        reducer_pct = {}
+        if reducer_sheets:
+            sheets = self.processor.prepare_reducer_sheets(reducer_sheets)
+            if sheets:
+                date_range = {k: v for k, v in (parameters or {}).items() if k in ('start_date', 'end_date')}
+                cube = self.processor.build_cube(sheets, date_range, time_labels, base=df_efe)
+                if len(cube) != len(df_efe):
+                    raise ValueError("Las fechas de las hojas de reductores no coinciden con el escenario")
+                for key in sheets:
+                    reducers[key] = cube.metric(key)
+                    reducer_pct[key] = cube.reducer_pct.get(key, 0.0)
+
+        for key, values in (reducer_arrays or {}).items():
+            if key not in self.REDUCER_KPIS:
+                raise ValueError(f"Reductor no válido: {key}. Reductores disponibles: {', '.join(self.REDUCER_KPIS)}")
+            reducer_pct.pop(key, None)
+            try:
+                reducers[key] = np.broadcast_to(np.asarray(values, dtype=float), efectivos.shape)
+            except ValueError:
+                raise ValueError(f"El reductor '{key}' debe ser un valor, una lista de {len(time_labels)} intervalos o una matriz de {efectivos.shape[0]} días × {len(time_labels)} intervalos")
+
+        if not reducers:
+            raise ValueError("No se recibieron reductores para recalcular")
+
+        dimensionados, presentes, logados = self.calculator.recalculate_cascade(efectivos, *stored, reducers)
+        df_dim, df_pre, df_log, df_efe = self.calculator.build_frames(
+            df_efe, time_labels, dimensionados, presentes, logados, efectivos
+        )
+
+        kpis = dict(stored_kpis or {})
+        for key, values in reducers.items():
+            pct = reducer_pct.get(key)
+            kpis[f'{self.REDUCER_KPIS[key]}_pct'] = pct if pct is not None else self.kpi_service.reducer_pct(values)
+        kpis.update(self.kpi_service.staffing_kpis(df_dim, time_labels))
+
+        return df_dim, df_pre, df_log, df_efe, kpis, sorted(reducers)
+
+    def sensitivity_grid(self, stored_frames, parameters, volume_shocks=None, aht_shocks=None):
+        """
+        Calcula horas y FTE de un escenario almacenado ante choques de volumen y AHT.
+
+        Se parte del volumen y AHT guardados con el escenario (sin volver a leer la plantilla)
+        y de su factor de reductores almacenado (dimensionados / efectivos por celda).
+
+        Args:
+            stored_frames (dict): DataFrames almacenados (resultados, 'calls' y 'aht')
+            parameters (dict): Parámetros del escenario (objetivos, intervalo, rango de fechas)
+            volume_shocks (list): Variaciones del volumen en % (por defecto DEFAULT_SHOCKS)
+            aht_shocks (list): Variaciones del AHT en % (por defecto DEFAULT_SHOCKS)
+
+        Returns:
+            dict: Choques aplicados, matrices volumen × AHT de horas y FTE y el detalle por celda
+        """
+        volume_shocks = self._parse_shocks(self.DEFAULT_SHOCKS if volume_shocks is None else volume_shocks)
+        aht_shocks = self._parse_shocks(self.DEFAULT_SHOCKS if aht_shocks is None else aht_shocks)
+        time_labels = [f"{i*30//60:02d}:{i*30%60:02d}" for i in range(48)]
+
+        df_calls, df_aht = stored_frames.get('calls'), stored_frames.get('aht')
+        if df_calls is None or df_calls.empty or df_aht is None or df_aht.empty:
+            raise ValueError("El escenario no tiene volumen y AHT almacenados")
+
+        date_range = {k: v for k, v in parameters.items() if k in ('start_date', 'end_date') and v}
+        df_master = self.processor.build_cube({'calls': df_calls.copy(), 'aht': df_aht.copy()}, date_range, time_labels)
+
+        efectivos = self.calculator.load_matrix(stored_frames['efectivos'], time_labels)
+        dimensionados = self.calculator.load_matrix(stored_frames['dimensionados'], time_labels)
+        if efectivos.shape != (len(df_master), len(time_labels)) or dimensionados.shape != efectivos.shape:
+            raise ValueError("Los resultados almacenados del escenario no son consistentes")
+        reducer_factor = np.divide(dimensionados, efectivos, out=np.ones(efectivos.shape), where=efectivos > 0)
+
+        grid = self.calculator.calculate_sensitivity_grid(
+            df_master, parameters, time_labels,
+            [1 + shock / 100.0 for shock in volume_shocks],
+            [1 + shock / 100.0 for shock in aht_shocks],
+            reducer_factor=reducer_factor
+        )
+
+        cells, hours, fte = [], [], []
+        for i, volume_shock in enumerate(volume_shocks):
+            hours.append([])
+            fte.append([])
+            for j, aht_shock in enumerate(aht_shocks):
+                kpis = self.kpi_service.staffing_kpis(grid[i, j], time_labels)
+                hours[i].append(kpis.get('total_horas_planificadas', 0.0))
+                fte[i].append(kpis.get('fte_promedio', 0.0))
+                cells.append(dict(kpis, volumen_pct=volume_shock, aht_pct=aht_shock))
+
+        return {
+            'volume_shocks': volume_shocks,
+            'aht_shocks': aht_shocks,
+            'total_horas_planificadas': hours,
+            'fte_promedio': fte,
+            'grid': cells,
+        }
+
+    @staticmethod
+    def _parse_shocks(shocks):
+        """
+        Valida una lista de choques porcentuales (mayores que -100).
+        """
+        try:
+            parsed = [float(shock) for shock in shocks]
+        except (TypeError, ValueError):
+            raise ValueError(f"Choques no válidos: {shocks}. Formato esperado: lista de porcentajes")
+        if not parsed or any(shock <= -100 for shock in parsed):
+            raise ValueError("Los choques deben ser una lista no vacía de porcentajes mayores que -100")
+        return parsed
+
     def format_dataframe(self, df):
         """Formatea para visualización."""
         return self.calculator.format_results(df)
@@ -94,20 +345,10 @@ class CalculatorServiceFacade:
             rows = []
             metadata_cols = set()
             
-            for date_key, row_data in data_map.items():
-                # Normalizar la fecha del key de forma robusta
-                def smart_parse_key(val):
-                    s = str(val).strip()
-                    try:
-                        # ISO?
-                        if '-' in s and s.index('-') == 4:
-                            return pd.to_datetime(s, dayfirst=False)
-                        # ES?
-                        return pd.to_datetime(s, dayfirst=True)
-                    except:
-                        return pd.to_datetime(s, errors='coerce')
-
-                dt = smart_parse_key(date_key)
+            # Normalizar las fechas de todas las claves de una vez
+            parsed_keys = parse_dates(list(data_map.keys())).tolist()
+
+            for (date_key, row_data), dt in zip(data_map.items(), parsed_keys):
                 if pd.isna(dt):
                     print(f"[DEBUG FALLBACK] No se pudo parsear fecha key: {date_key}", flush=True)
                     continue
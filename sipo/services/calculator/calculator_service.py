@@ -18,6 +18,8 @@ class CalculatorService:
     basados en la metodología Erlang y procesar plantillas de datos.
     """
 
+    _shared_instance = None
+
     def __init__(self):
         """
         Inicializa el servicio con el contexto de estrategias y la fachada.
@@ -50,21 +52,83 @@ class CalculatorService:
         """
         return self.strategy_context.calculate('agents_required', target_sla, service_time, calls_per_hour, aht)
 
+    def vba_erlang_b_batch(self, servers, intensity):
+        """
+        Calcula Erlang B para arrays completos de servidores e intensidades.
+        """
+        return self.strategy_context.calculate_batch('erlang_b', servers, intensity)
+
+    def vba_erlang_c_batch(self, servers, intensity):
+        """
+        Calcula Erlang C para arrays completos de servidores e intensidades.
+        """
+        return self.strategy_context.calculate_batch('erlang_c', servers, intensity)
+
+    def vba_sla_batch(self, agents, service_time, calls_per_hour, aht):
+        """
+        Calcula el SLA para arrays completos de agentes, volúmenes y AHT.
+        """
+        return self.strategy_context.calculate_batch('sla', agents, service_time, calls_per_hour, aht)
+
+    def vba_agents_required_batch(self, target_sla, service_time, calls_per_hour, aht):
+        """
+        Calcula los agentes requeridos para arrays completos de volúmenes y AHT.
+        """
+        return self.strategy_context.calculate_batch('agents_required', target_sla, service_time, calls_per_hour, aht)
+
     @staticmethod
-    def procesar_plantilla_unica(config, all_sheets):
+    def procesar_plantilla_unica(config, all_sheets, debug_info=None, executor=None):
         """
         Punto de entrada legacy que delega a la fachada.
+        executor ('serial' o 'process') fuerza el modo de cálculo de esta llamada.
+
+        Returns:
+            tuple: (DimensioningCube con las capas de resultados, kpis, hoja de volumen, hoja de AHT)
         """
         instance = CalculatorService()
-        return instance._facade.process_full_dimensioning(config, all_sheets)
+        return instance._facade.process_full_dimensioning(config, all_sheets, debug_info=debug_info, executor=executor)
 
     @staticmethod
-    def format_and_calculate_simple(df):
+    def procesar_barrido_objetivos(config, all_sheets, targets, debug_info=None):
         """
-        Delega el formato a la fachada.
+        Delega a la fachada el cálculo de la misma plantilla para varios objetivos de servicio.
         """
         instance = CalculatorService()
-        return instance._facade.format_dataframe(df)
+        return instance._facade.process_target_sweep(config, all_sheets, targets, debug_info=debug_info)
+
+    @staticmethod
+    def sensitivity_grid(stored_frames, parameters, volume_shocks=None, aht_shocks=None):
+        """
+        Delega a la fachada la rejilla de sensibilidad de volumen y AHT de un escenario almacenado.
+        """
+        instance = CalculatorService()
+        return instance._facade.sensitivity_grid(stored_frames, parameters, volume_shocks, aht_shocks)
+
+    @staticmethod
+    def recalculate_reducers(stored_frames, stored_kpis, parameters=None, reducer_sheets=None, reducer_arrays=None):
+        """
+        Delega a la fachada el recálculo de un escenario cambiando solo los reductores.
+        """
+        instance = CalculatorService()
+        return instance._facade.recalculate_reducers(
+            stored_frames, stored_kpis, parameters, reducer_sheets=reducer_sheets, reducer_arrays=reducer_arrays
+        )
+
+    @staticmethod
+    def format_and_calculate_simple(df):
+        """
+        Delega el formato a la fachada (el formato no depende de estado, se usa una instancia compartida).
+        """
+        return CalculatorService._shared()._facade.format_dataframe(df)
+
+    @classmethod
+    def _shared(cls):
+        """
+        Obtiene una instancia del servicio reutilizable entre llamadas sin estado.
+        """
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
 
     @staticmethod
     def get_fallback_volume(segment_id, start_date, end_date, id_legal=None):
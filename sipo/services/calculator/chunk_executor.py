@@ -0,0 +1,182 @@
+"""
+Ejecución por bloques de fechas del cálculo de requerimientos.
+Divide el cubo de entradas en bloques de días consecutivos y los resuelve en un
+ProcessPoolExecutor; cada celda solo depende de sus propias entradas, así que el
+resultado reensamblado es idéntico al del cálculo en serie. Los procesos de trabajo
+solo devuelven el array de resultados de su bloque, que se copia en su tramo del cubo.
+
+El pool de procesos se crea una vez por proceso (get_process_pool) y se reutiliza entre
+peticiones, de modo que cada cálculo no paga el arranque de los procesos ni sus imports.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
+
+EXECUTORS = ('serial', 'process')
+
+# Claves de configuración que usa el cálculo (config puede traer objetos no serializables, p. ej. el segmento)
+CALCULATION_KEYS = ('intervalo', 'sla_objetivo', 'sla_tiempo', 'nda_objetivo')
+
+
+def default_workers():
+    """
+    Número de procesos de trabajo de Config.DIMENSIONING_WORKERS (0 = núcleos disponibles).
+    """
+    return Config.DIMENSIONING_WORKERS or os.cpu_count() or 1
+
+
+_instances = {}
+_instance_lock = threading.Lock()
+
+
+def get_process_pool(max_workers=None):
+    """
+    Obtiene el pool de procesos compartido del proceso, creándolo la primera vez.
+    Con la configuración por defecto hay un único pool de default_workers() procesos; un
+    tamaño distinto (p. ej., en pruebas) tiene su propio pool, también reutilizado.
+
+    Args:
+        max_workers (int): Procesos del pool (por defecto default_workers())
+
+    Returns:
+        ProcessPoolExecutor: Pool compartido
+    """
+    workers = max_workers or default_workers()
+    pool = _instances.get(workers)
+    if pool is None:
+        with _instance_lock:
+            pool = _instances.get(workers)
+            if pool is None:
+                pool = _instances[workers] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+def discard_process_pool(pool):
+    """
+    Descarta un pool roto (p. ej., si murió un proceso de trabajo) para que la siguiente petición cree otro.
+    """
+    with _instance_lock:
+        for workers, current in list(_instances.items()):
+            if current is pool:
+                del _instances[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def map_in_pool(max_workers, function, *iterables):
+    """
+    Ejecuta function sobre los argumentos en el pool compartido y devuelve los resultados en orden.
+
+    Raises:
+        BrokenProcessPool: Si un proceso de trabajo terminó de forma anómala (el pool se descarta)
+    """
+    pool = get_process_pool(max_workers)
+    try:
+        futures = [pool.submit(function, *args) for args in zip(*iterables)]
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        discard_process_pool(pool)
+        raise
+
+
+def _solve_chunk(chunk, config):
+    """
+    Resuelve un bloque del cubo en el proceso de trabajo y mide su duración.
+
+    Returns:
+        tuple: (array de resultados del bloque, segundos)
+    """
+    from .calculator_service import CalculatorService
+    from .core_calculator import DimensioningCoreCalculator
+
+    start = time.perf_counter()
+    DimensioningCoreCalculator(CalculatorService()).solve(chunk, config)
+    return chunk.results, time.perf_counter() - start
+
+
+class DimensioningChunkExecutor:
+    """
+    Resuelve calculate_requirements en serie o repartiendo bloques de fechas entre procesos.
+    """
+
+    def __init__(self, calculator, executor=None, max_workers=None, chunk_days=None):
+        """
+        Args:
+            calculator (DimensioningCoreCalculator): Calculador usado en modo serie
+            executor (str): 'serial' o 'process' (por defecto Config.DIMENSIONING_EXECUTOR)
+            max_workers (int): Procesos de trabajo (por defecto Config.DIMENSIONING_WORKERS; 0 = núcleos disponibles)
+            chunk_days (int): Días por bloque (por defecto Config.DIMENSIONING_CHUNK_DAYS)
+        """
+        self.calculator = calculator
+        self.executor = executor or Config.DIMENSIONING_EXECUTOR
+        if self.executor not in EXECUTORS:
+            raise ValueError(f"Ejecutor no válido. Ejecutores disponibles: {', '.join(EXECUTORS)}")
+        self.max_workers = max_workers or default_workers()
+        self.chunk_days = max(1, chunk_days or Config.DIMENSIONING_CHUNK_DAYS)
+
+    def split(self, cube):
+        """
+        Divide el cubo de entradas en bloques de días consecutivos, en orden.
+
+        Returns:
+            list: Pares (día inicial, cubo del bloque como vista del original)
+        """
+        return [(i, cube.slice(i, i + self.chunk_days)) for i in range(0, len(cube), self.chunk_days)]
+
+    def run(self, df_master, config, time_labels, executor=None):
+        """
+        Calcula los requerimientos y los guarda en las capas de resultados del cubo.
+
+        Args:
+            df_master (DimensioningCube | pd.DataFrame): Cubo de entradas o DataFrame maestro (una fila por fecha)
+            config (dict): Configuración del cálculo
+            time_labels (list): Etiquetas de intervalo
+            executor (str): Fuerza 'serial' o 'process' para esta llamada
+
+        Returns:
+            tuple: (cubo con resultados, debug_info)
+        """
+        executor = executor or self.executor
+        if executor not in EXECUTORS:
+            raise ValueError(f"Ejecutor no válido. Ejecutores disponibles: {', '.join(EXECUTORS)}")
+
+        cube = self.calculator.as_cube(df_master, time_labels)
+        chunks = self.split(cube)
+        if executor == 'serial' or len(chunks) <= 1 or self.max_workers <= 1:
+            start = time.perf_counter()
+            self.calculator.solve(cube, config)
+            elapsed = time.perf_counter() - start
+            return cube, {
+                'executor': 'serial',
+                'chunks': [self._chunk_info(cube, elapsed)],
+            }
+
+        chunk_config = {key: config[key] for key in CALCULATION_KEYS if key in config}
+        workers = min(self.max_workers, len(chunks))
+        results = map_in_pool(
+            self.max_workers, _solve_chunk, [chunk for _, chunk in chunks], [chunk_config] * len(chunks)
+        )
+
+        # Reensamblar en el array de resultados del cubo, sin concatenar DataFrames
+        layers = cube.allocate_results()
+        for (first_day, chunk), (chunk_results, _) in zip(chunks, results):
+            layers[:, first_day:first_day + len(chunk)] = chunk_results
+        return cube, {
+            'executor': 'process',
+            'workers': workers,
+            'chunks': [self._chunk_info(chunk, seconds) for (_, chunk), (_, seconds) in zip(chunks, results)],
+        }
+
+    @staticmethod
+    def _chunk_info(chunk, seconds):
+        """
+        Describe un bloque (rango de fechas, filas y duración) para la información de depuración.
+        """
+        info = {'rows': len(chunk), 'seconds': round(seconds, 4)}
+        if 'Fecha' in chunk.index.columns and len(chunk):
+            info['start'] = str(chunk.index['Fecha'].iloc[0])
+            info['end'] = str(chunk.index['Fecha'].iloc[-1])
+        return info
@@ -5,24 +5,297 @@ Implementa el bucle de cálculo Erlang y la asignación de categorías de agente
 
 import pandas as pd
 import numpy as np
+from config import Config
+from utils.erlang_cache import get_erlang_cache
+from .dimensioning_cube import DimensioningCube, INDEX_COLS
 
 class DimensioningCoreCalculator:
     """
     Realiza los cálculos matemáticos pesados basados en Erlang.
     """
 
-    def __init__(self, calculation_strategy):
+    def __init__(self, calculation_strategy, vectorized=None):
         """
         Args:
             calculation_strategy (CalculatorService): El servicio que contiene las estrategias Erlang.
+            vectorized (bool): Si se calcula sobre matrices (días × intervalos); por defecto
+                Config.DIMENSIONING_VECTORIZED.
         """
         self.calc = calculation_strategy
+        self.cache = get_erlang_cache()
+        self.vectorized = Config.DIMENSIONING_VECTORIZED if vectorized is None else vectorized
+
+    def _agents_required(self, target_level, service_time, calls_per_hour, aht):
+        """
+        Calcula los agentes requeridos pasando por la caché compartida de Erlang.
+        """
+        return self.cache.memoize(
+            'agents_required',
+            lambda calls, aht_value, target, time: self.calc.vba_agents_required(target, time, calls, aht_value),
+            calls_per_hour, aht, target_level, service_time
+        )
+
+    def _agents_required_batch(self, target_level, service_time, calls_per_hour, aht):
+        """
+        Calcula los agentes requeridos de arrays de celdas pasando por la caché compartida de Erlang.
+        """
+        return self.cache.memoize_batch(
+            'agents_required',
+            lambda calls, aht_values, target, time: self.calc.vba_agents_required_batch(target, time, calls, aht_values),
+            calls_per_hour, aht, target_level, service_time
+        )
 
     def calculate_requirements(self, df_master, config, time_labels):
         """
-        Recorre el DataFrame maestro y calcula agentes para cada intervalo.
+        Calcula agentes dimensionados, presentes, logados y efectivos para cada intervalo.
+
+        Args:
+            df_master (DimensioningCube | pd.DataFrame): Cubo de entradas o DataFrame maestro ancho
+
+        Returns:
+            tuple: (df_dimensionados, df_presentes, df_logados, df_efectivos)
+        """
+        if not self.vectorized and not isinstance(df_master, DimensioningCube):
+            return self._calculate_requirements_rows(df_master, config, time_labels)
+        if len(df_master) == 0:
+            empty = pd.DataFrame()
+            return empty, empty.copy(), empty.copy(), empty.copy()
+        return self.solve(self.as_cube(df_master, time_labels), config).result_frames()
+
+    def solve(self, cube, config):
         """
-        index_cols = ['Fecha', 'Dia', 'Semana', 'Tipo']
+        Calcula los requerimientos del cubo y los guarda en sus capas de resultados.
+
+        En modo vectorizado Erlang solo se resuelve para los pares (volumen, AHT) únicos con
+        volumen no nulo y la cascada de reductores se aplica como división de matrices; los
+        resultados coinciden con el recorrido fila a fila.
+
+        Args:
+            cube (DimensioningCube): Cubo de entradas
+            config (dict): Configuración del cálculo (intervalo y objetivos)
+
+        Returns:
+            DimensioningCube: El mismo cubo, con las capas de resultados calculadas
+        """
+        if not self.vectorized:
+            frames = self._calculate_requirements_rows(cube.to_frame(), config, cube.time_labels)
+            cube.set_results(*(self.load_matrix(frame, cube.time_labels) for frame in frames))
+            return cube
+
+        calls_factor = 60.0 / config.get("intervalo", 30)
+        target_level = config.get("nda_objetivo") or config.get("sla_objetivo", 0.8)
+        service_time = config.get("sla_tiempo", 20)
+
+        workload = self._unique_workload(cube, calls_factor)
+        efectivos = self._solve_efectivos(workload, target_level, service_time)
+        dimensionados, presentes, logados = self._cascade(efectivos, *self._reducer_matrices(cube))
+        cube.set_results(dimensionados, presentes, logados, efectivos)
+        return cube
+
+    @staticmethod
+    def as_cube(df_master, time_labels):
+        """
+        Devuelve el cubo de entradas, construyéndolo si se recibe un DataFrame maestro ancho.
+        """
+        if isinstance(df_master, DimensioningCube):
+            return df_master
+        return DimensioningCube.from_frame(df_master, time_labels)
+
+    @staticmethod
+    def load_matrix(df_master, time_labels, suffix=''):
+        """
+        Extrae las columnas de tiempo (con sufijo) como matriz float (días × intervalos); las ausentes valen 0.
+        """
+        columns = [f'{col}{suffix}' for col in time_labels]
+        return df_master.reindex(columns=columns, fill_value=0).to_numpy(dtype=float)
+
+    @staticmethod
+    def _divide_reducer(agents, pct):
+        """
+        Aplica un paso de la cascada de reductores: agents / (1 - pct), o agents si el divisor no es positivo.
+        """
+        remaining = 1 - pct
+        return np.divide(agents, remaining, out=agents.copy(), where=remaining > 0)
+
+    def calculate_requirements_sweep(self, df_master, config, time_labels, targets):
+        """
+        Calcula los requerimientos para varios objetivos (nivel, tiempo de servicio) sobre el mismo DataFrame maestro.
+
+        Los pares (volumen, AHT) únicos y los reductores se extraen una sola vez; por cada
+        objetivo solo se resuelve Erlang sobre ese conjunto único.
+
+        Args:
+            df_master (DimensioningCube | pd.DataFrame): Cubo de entradas o DataFrame maestro ancho
+            config (dict): Configuración del cálculo (intervalo)
+            time_labels (list): Etiquetas de intervalo
+            targets (list): Pares (nivel objetivo, tiempo de servicio en segundos)
+
+        Returns:
+            list: Una tupla de matrices float32 (dimensionados, presentes, logados, efectivos) por objetivo
+        """
+        calls_factor = 60.0 / config.get("intervalo", 30)
+        cube = self.as_cube(df_master, time_labels)
+        workload = self._unique_workload(cube, calls_factor)
+        reducers = self._reducer_matrices(cube)
+
+        results = []
+        for target_level, service_time in targets:
+            efectivos = self._solve_efectivos(workload, target_level, service_time)
+            dimensionados, presentes, logados = self._cascade(efectivos, *reducers)
+            results.append(tuple(
+                matrix.astype(DimensioningCube.DTYPE)
+                for matrix in (dimensionados, presentes, logados, efectivos)
+            ))
+        return results
+
+    def calculate_sensitivity_grid(self, df_master, config, time_labels, volume_factors, aht_factors, reducer_factor=None):
+        """
+        Calcula los agentes dimensionados aplicando choques multiplicativos al volumen y al AHT.
+
+        Todas las celdas de la rejilla (volumen × AHT) escalan el mismo conjunto de pares
+        únicos y se resuelven en una sola llamada por lotes a Erlang.
+
+        Args:
+            df_master (DimensioningCube | pd.DataFrame): Cubo de entradas o DataFrame maestro ancho
+            config (dict): Configuración del cálculo (intervalo y objetivos)
+            time_labels (list): Etiquetas de intervalo
+            volume_factors (list): Multiplicadores del volumen (p. ej. 0.9, 1.0, 1.1)
+            aht_factors (list): Multiplicadores del AHT
+            reducer_factor (np.ndarray): Factor dimensionados / efectivos por celda; por defecto
+                se obtiene de los reductores del DataFrame maestro
+
+        Returns:
+            np.ndarray: Agentes dimensionados con forma (volumen, AHT, días, intervalos)
+        """
+        calls_factor = 60.0 / config.get("intervalo", 30)
+        target_level = config.get("nda_objetivo") or config.get("sla_objetivo", 0.8)
+        service_time = config.get("sla_tiempo", 20)
+
+        cube = self.as_cube(df_master, time_labels)
+        shape, active, unique_pairs, inverse = self._unique_workload(cube, calls_factor)
+        if reducer_factor is None:
+            reducer_factor = self._cascade(np.ones(shape), *self._reducer_matrices(cube))[0]
+
+        grid = np.zeros((len(volume_factors), len(aht_factors)) + shape)
+        if not len(unique_pairs):
+            return grid
+
+        factors = np.array([(v, a) for v in volume_factors for a in aht_factors], dtype=float)
+        scaled = (unique_pairs[None, :, :] * factors[:, None, :]).reshape(-1, 2)
+        agents = self._agents_required_batch(target_level, service_time, scaled[:, 0], scaled[:, 1])
+        agents = agents.reshape(len(volume_factors), len(aht_factors), len(unique_pairs))
+
+        efectivos = np.zeros(shape)
+        for i in range(len(volume_factors)):
+            for j in range(len(aht_factors)):
+                efectivos[active] = agents[i, j][inverse]
+                grid[i, j] = efectivos * reducer_factor
+        return grid
+
+    def _unique_workload(self, cube, calls_factor):
+        """
+        Extrae los pares (llamadas por hora, AHT) únicos de las celdas con volumen no nulo.
+
+        Returns:
+            tuple: (forma de la matriz, máscara de celdas activas, pares únicos, índice inverso)
+        """
+        calls = cube.metric('calls').astype(float)
+        aht = cube.metric('aht').astype(float)
+
+        active = calls != 0
+        zero_aht = active & (aht <= 0)
+        if zero_aht.any():
+            fechas = cube.index['Fecha'].to_numpy() if 'Fecha' in cube.index.columns else [None] * len(cube)
+            for day, slot in np.argwhere(zero_aht):
+                print(f"[WARNING] AHT de 0 detectado para {fechas[day]} {cube.time_labels[slot]}. Usando fallback de 1s para evitar error.", flush=True)
+
+        if not active.any():
+            return calls.shape, active, np.empty((0, 2)), np.empty(0, dtype=int)
+
+        # Si hay llamadas pero el AHT es 0 se usa el fallback de 1s
+        pairs = np.stack([calls[active] * calls_factor, np.where(aht[active] <= 0, 1.0, aht[active])], axis=1)
+        unique_pairs, inverse = np.unique(pairs, axis=0, return_inverse=True)
+        return calls.shape, active, unique_pairs, inverse.ravel()
+
+    def _solve_efectivos(self, workload, target_level, service_time):
+        """
+        Resuelve los agentes efectivos de los pares únicos y los reparte en la matriz días × intervalos.
+        """
+        shape, active, unique_pairs, inverse = workload
+        efectivos = np.zeros(shape)
+        if len(unique_pairs):
+            agents = self._agents_required_batch(target_level, service_time, unique_pairs[:, 0], unique_pairs[:, 1])
+            efectivos[active] = agents[inverse]
+        return efectivos
+
+    @staticmethod
+    def _reducer_matrices(cube):
+        """
+        Extrae los reductores (auxiliares, absentismo, desconexiones) como fracciones entre 0 y 1.
+        El cálculo se hace en float64 aunque el cubo guarde float32.
+        """
+        return tuple(
+            np.clip(cube.metric(key).astype(float), 0.0, 1.0)
+            for key in ('auxiliaries', 'absenteeism', 'shrinkage')
+        )
+
+    def _cascade(self, efectivos, aux_pct, abs_pct, shr_pct):
+        """
+        Aplica la cascada de reductores efectivos → logados → presentes → dimensionados.
+
+        Returns:
+            tuple: (dimensionados, presentes, logados)
+        """
+        logados = self._divide_reducer(efectivos, aux_pct)
+        presentes = self._divide_reducer(logados, abs_pct)
+        dimensionados = self._divide_reducer(presentes, shr_pct)
+        return dimensionados, presentes, logados
+
+    @staticmethod
+    def build_frames(df_index, time_labels, *matrices):
+        """
+        Construye un DataFrame por matriz (días × intervalos) con las columnas índice de df_index.
+        Los valores se pasan a float64 para que el redondeo de format_results sea exacto.
+        """
+        base = df_index[[col for col in INDEX_COLS if col in df_index.columns]].reset_index(drop=True)
+        return tuple(
+            pd.concat([base, pd.DataFrame(np.asarray(values, dtype=np.float64), columns=time_labels)], axis=1)
+            for values in matrices
+        )
+
+    def recalculate_cascade(self, efectivos, logados, presentes, dimensionados, reducers):
+        """
+        Recalcula logados → presentes → dimensionados a partir de efectivos ya resueltos.
+
+        Los reductores recibidos (fracciones, días × intervalos) sustituyen a los del cálculo
+        original; para los no recibidos se conserva el factor almacenado entre etapas
+        (p. ej. dimensionados / presentes), de modo que solo cambia lo que se ha modificado.
+
+        Args:
+            efectivos, logados, presentes, dimensionados (np.ndarray): Matrices almacenadas
+            reducers (dict): Matrices por clave ('auxiliaries', 'absenteeism', 'shrinkage')
+
+        Returns:
+            tuple: (dimensionados, presentes, logados) recalculados
+        """
+        def stage(previous_new, previous_old, current_old, key):
+            if key in reducers:
+                return self._divide_reducer(previous_new, np.clip(reducers[key], 0.0, 1.0))
+            if previous_new is previous_old:
+                return current_old
+            ratio = np.divide(current_old, previous_old, out=np.ones(current_old.shape), where=previous_old > 0)
+            return previous_new * ratio
+
+        new_logados = stage(efectivos, efectivos, logados, 'auxiliaries')
+        new_presentes = stage(new_logados, logados, presentes, 'absenteeism')
+        new_dimensionados = stage(new_presentes, presentes, dimensionados, 'shrinkage')
+        return new_dimensionados, new_presentes, new_logados
+
+    def _calculate_requirements_rows(self, df_master, config, time_labels):
+        """
+        Recorre el DataFrame maestro fila a fila y calcula agentes para cada intervalo.
+        """
+        index_cols = INDEX_COLS
         dim_data, pre_data, log_data, efe_data = [], [], [], []
         
         # Intervalo y factor de llamadas (ajustado a config)
@@ -49,10 +322,10 @@ class DimensioningCoreCalculator:
                     # Si hay llamadas pero el AHT es 0, no se puede calcular Erlang. 
                     # Usamos un valor mínimo o registramos advertencia.
                     print(f"[WARNING] AHT de 0 detectado para {row.get('Fecha')} {col}. Usando fallback de 1s para evitar error.", flush=True)
-                    efectivos = float(self.calc.vba_agents_required(target_level, service_time, calls * calls_factor, 1))
+                    efectivos = float(self._agents_required(target_level, service_time, calls * calls_factor, 1))
                 else:
                     # Cálculo Erlang
-                    efectivos = float(self.calc.vba_agents_required(target_level, service_time, calls * calls_factor, aht))
+                    efectivos = float(self._agents_required(target_level, service_time, calls * calls_factor, aht))
                 
                 # Cascada de reductores
                 logados = efectivos / (1 - aux_pct) if (1 - aux_pct) > 0 else efectivos
@@ -3,17 +3,59 @@ Módulo para el procesamiento y normalización de datos de dimensionamiento.
 Maneja la carga de Excel, detección de cabeceras y mezcla de hojas.
 """
 
+import zipfile
+import numpy as np
 import pandas as pd
 import datetime
 import logging
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from utils.upload_cache import get_upload_cache
+from utils.date_parsing import parse_dates, fix_day_month_swap
+from .dimensioning_cube import DimensioningCube, INDEX_COLS
 
 logger = logging.getLogger(__name__)
 
+
+def normalize_time_header(col):
+    """
+    Normaliza una cabecera de intervalo a 'HH:MM' (ultra-robusta: time, datetime, texto o número).
+    """
+    # Si ya es datetime o time, formatear directamente
+    if isinstance(col, (datetime.time, datetime.datetime)):
+        return col.strftime('%H:%M')
+    
+    # Si es string o número, intentar parsear con pandas
+    col_str = str(col).strip()
+    if col_str == "" or col_str.lower() in ['fecha', 'dia', 'semana', 'tipo']:
+        return col_str
+        
+    try:
+        # pandas to_datetime maneja casi cualquier formato de fecha/hora de Excel
+        dt = pd.to_datetime(col_str, errors='coerce')
+        if pd.notnull(dt):
+            return dt.strftime('%H:%M')
+    except:
+        pass
+    return col_str
+
+
 class DimensioningDataProcessor:
     """
     Se encarga de limpiar, normalizar y fusionar los datos provenientes de Excel.
     """
 
+    # Nombres de hoja aceptados para cada dato (búsqueda insensible a mayúsculas/espacios)
+    SHEET_NAME_RULES = {
+        'calls': ['Distribucion_Intraday', 'Volumen_a_gestionar', 'distribucion_intradia', 'Llamadas_esperadas', 'Llamadas_Esperadas'],
+        'aht': ['AHT_esperado', 'aht', 'AHT esperado'],
+        'absenteeism': ['Absentismo_esperado', 'absentismo', 'Absentismo esperado'],
+        'auxiliaries': ['Auxiliares_esperados', 'auxiliares', 'Auxiliares esperados'],
+        'shrinkage': ['Desconexiones_esperadas', 'desconexiones', 'desconexión', 'desconecion', 'Desconexiones esperadas']
+    }
+
+    REDUCER_KEYS = ('absenteeism', 'auxiliaries', 'shrinkage')
+
     @staticmethod
     def _robust_date_parsing(df, config):
         """
@@ -22,27 +64,7 @@ class DimensioningDataProcessor:
         if 'Fecha' not in df.columns or df.empty:
             return df
             
-        def smart_parse(val):
-            if pd.isna(val): return val
-            if isinstance(val, (datetime.datetime, pd.Timestamp)):
-                return val.replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            s = str(val).strip()
-            try:
-                # Si parece ISO (YYYY-MM-DD), no usar dayfirst
-                if '-' in s and s.index('-') == 4:
-                    dt = pd.to_datetime(s, dayfirst=False)
-                else:
-                    # Si parece ES (DD/MM/YYYY), usar dayfirst
-                    dt = pd.to_datetime(s, dayfirst=True)
-                return dt.normalize()
-            except:
-                try: 
-                    return pd.to_datetime(s, errors='coerce').normalize()
-                except:
-                    return pd.NaT
-
-        df['Fecha'] = df['Fecha'].apply(smart_parse)
+        df['Fecha'] = parse_dates(df['Fecha'])
         df.dropna(subset=['Fecha'], inplace=True)
         
         if df.empty or 'start_date' not in config or 'end_date' not in config:
@@ -53,18 +75,7 @@ class DimensioningDataProcessor:
         end = pd.to_datetime(config['end_date'], dayfirst=True)
         
         # Detectar si las fechas están masivamente fuera de rango y corregir swap si es necesario
-        mask_in_range = (df['Fecha'] >= start) & (df['Fecha'] <= end)
-        if mask_in_range.sum() < len(df) * 0.3: 
-            def try_swap_month_day(dt):
-                if pd.isna(dt): return dt
-                try:
-                    if dt.day <= 12:
-                        new_dt = datetime.datetime(dt.year, dt.day, dt.month, dt.hour, dt.minute)
-                        if start <= new_dt <= end:
-                            return new_dt
-                except: pass
-                return dt
-            df['Fecha'] = df['Fecha'].apply(try_swap_month_day)
+        df['Fecha'] = fix_day_month_swap(df['Fecha'], start, end)
             
         return df
 
@@ -111,33 +122,147 @@ class DimensioningDataProcessor:
             
         return df
 
+    @staticmethod
+    def _find_sheet(all_sheets, possible_names):
+        """
+        Busca la primera hoja cuyo nombre coincida (sin distinguir mayúsculas ni espacios).
+        """
+        normalized_sheets = {str(k).strip().lower(): all_sheets[k] for k in all_sheets}
+        for name in possible_names:
+            if name.strip().lower() in normalized_sheets:
+                return normalized_sheets[name.strip().lower()]
+        return None
+
+    @classmethod
+    def resolve_sheet_names(cls, sheet_names, keys=None):
+        """
+        Resuelve qué hojas del libro corresponden a cada dato según SHEET_NAME_RULES.
+
+        Args:
+            sheet_names (list): Nombres de hoja del libro
+            keys (iterable): Claves a resolver (por defecto todas las de SHEET_NAME_RULES)
+
+        Returns:
+            dict: Clave -> nombre real de la hoja (solo las encontradas)
+        """
+        normalized = {str(name).strip().lower(): name for name in sheet_names}
+        resolved = {}
+        for key in keys or cls.SHEET_NAME_RULES:
+            for name in cls.SHEET_NAME_RULES[key]:
+                if name.strip().lower() in normalized:
+                    resolved[key] = normalized[name.strip().lower()]
+                    break
+        return resolved
+
+    @classmethod
+    def select_sheet_names(cls, sheet_names, keys=None, group_separator=None):
+        """
+        Obtiene los nombres de hoja que hay que leer del libro.
+
+        Con group_separator, las hojas '<grupo><separador><hoja>' se resuelven por grupo con el
+        nombre tras el separador (p. ej. 'Ventas__Volumen_a_gestionar' en una carga por lotes),
+        además de las hojas sin prefijo.
+
+        Returns:
+            list: Nombres reales de las hojas resueltas
+        """
+        if not group_separator:
+            return list(cls.resolve_sheet_names(sheet_names, keys).values())
+
+        groups = {}
+        for name in sheet_names:
+            group, separator, sheet = str(name).partition(group_separator)
+            if separator and group and sheet:
+                groups.setdefault(group, {})[sheet] = name
+            else:
+                groups.setdefault(None, {})[name] = name
+        selected = []
+        for sheets in groups.values():
+            selected.extend(sheets[sheet] for sheet in cls.resolve_sheet_names(list(sheets), keys).values())
+        return [name for name in sheet_names if name in selected]
+
+    @classmethod
+    def read_template(cls, source, keys=None, group_separator=None):
+        """
+        Lee de la plantilla solo las hojas que usa el dimensionamiento.
+
+        El libro se abre una vez en modo solo lectura y solo valores (openpyxl read_only),
+        se resuelven los nombres de hoja con SHEET_NAME_RULES antes de cargar nada y solo
+        se materializan esas hojas. Los formatos que openpyxl no abre (p. ej. .xls) se leen
+        con pd.read_excel limitado a las mismas hojas. El resultado pasa por la caché de cargas,
+        así que una plantilla con los mismos bytes solo se parsea una vez.
+
+        Args:
+            source: Ruta o archivo (p. ej. FileStorage de Flask)
+            keys (iterable): Claves de SHEET_NAME_RULES a leer (por defecto todas)
+            group_separator (str): Separador de los grupos de hojas por prefijo (ver select_sheet_names)
+
+        Returns:
+            dict: Nombre de hoja -> DataFrame, con el mismo formato que pd.read_excel(sheet_name=None)
+        """
+        keys = tuple(keys) if keys else None
+        return get_upload_cache().get_or_parse(
+            source, 'dimensioning_template', cls._parse_template, keys, group_separator
+        )
+
+    @classmethod
+    def _parse_template(cls, source, keys=None, group_separator=None):
+        """
+        Parsea las hojas requeridas de la plantilla (ver read_template).
+        """
+        stream = getattr(source, 'stream', source)
+        try:
+            workbook = load_workbook(stream, read_only=True, data_only=True)
+        except (InvalidFileException, zipfile.BadZipFile):
+            if hasattr(stream, 'seek'):
+                stream.seek(0)
+            excel = pd.ExcelFile(stream)
+            names = cls.select_sheet_names(excel.sheet_names, keys, group_separator)
+            return excel.parse(sheet_name=names) if names else {}
+
+        try:
+            names = cls.select_sheet_names(workbook.sheetnames, keys, group_separator)
+            return {name: cls._rows_to_frame(workbook[name].iter_rows(values_only=True)) for name in names}
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _rows_to_frame(rows):
+        """
+        Convierte las filas de una hoja (tuplas de valores) en DataFrame con la primera fila como
+        cabecera, igual que pd.read_excel: se descartan filas y columnas vacías al final y las
+        cabeceras vacías o repetidas se nombran 'Unnamed: i' / 'col.1'.
+        """
+        rows = list(rows)
+        while rows and all(value is None for value in rows[-1]):
+            rows.pop()
+        if not rows:
+            return pd.DataFrame()
+
+        width = max((i + 1 for row in rows for i, value in enumerate(row) if value is not None), default=0)
+        rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+
+        columns, seen = [], {}
+        for i, value in enumerate(rows[0]):
+            name = f"Unnamed: {i}" if value is None else value
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            columns.append(name)
+
+        return pd.DataFrame(rows[1:], columns=columns).infer_objects()
+
     def prepare_sheets(self, all_sheets):
         """
         Mapea y normaliza todas las hojas necesarias de forma flexible.
         """
-        # Normalizar llaves para búsqueda insensible a mayúsculas/espacios
-        # Mantenemos las hojas originales en un diccionario con llaves limpias
-        normalized_sheets = {str(k).strip().lower(): all_sheets[k] for k in all_sheets}
         print(f"[DEBUG PROCESSOR] Hojas detectadas: {list(all_sheets.keys())}", flush=True)
 
-        def get_sheet_by_name(possible_names):
-            for name in possible_names:
-                if name.strip().lower() in normalized_sheets:
-                    return normalized_sheets[name.strip().lower()]
-            return None
-
-        # Mapeo de búsqueda
-        mapping_rules = {
-            'calls': ['Distribucion_Intraday', 'Volumen_a_gestionar', 'distribucion_intradia', 'Llamadas_esperadas', 'Llamadas_Esperadas'],
-            'aht': ['AHT_esperado', 'aht', 'AHT esperado'],
-            'absenteeism': ['Absentismo_esperado', 'absentismo', 'Absentismo esperado'],
-            'auxiliaries': ['Auxiliares_esperados', 'auxiliares', 'Auxiliares esperados'],
-            'shrinkage': ['Desconexiones_esperadas', 'desconexiones', 'desconexión', 'desconecion', 'Desconexiones esperadas']
-        }
-
         processed = {}
-        for key, possible_names in mapping_rules.items():
-            df_sheet = get_sheet_by_name(possible_names)
+        for key, possible_names in self.SHEET_NAME_RULES.items():
+            df_sheet = self._find_sheet(all_sheets, possible_names)
             if df_sheet is None:
                 # Si es 'calls', puede ser None si se usará el fallback de forecasting
                 # Pero el processor debe fallar si no tiene datos para procesar después
@@ -147,11 +272,44 @@ class DimensioningDataProcessor:
             
         return processed
 
+    def prepare_reducer_sheets(self, all_sheets):
+        """
+        Mapea y normaliza solo las hojas de reductores presentes (absentismo, auxiliares, desconexiones).
+
+        Returns:
+            dict: Hojas normalizadas por clave ('absenteeism', 'auxiliaries', 'shrinkage')
+        """
+        processed = {}
+        for key in self.REDUCER_KEYS:
+            df_sheet = self._find_sheet(all_sheets, self.SHEET_NAME_RULES[key])
+            if df_sheet is not None:
+                processed[key] = self.normalize_df(df_sheet)
+        return processed
+
     def merge_data(self, processed_sheets, config, time_labels):
         """
-        Filtra por fechas y mezcla todas las hojas en un solo DataFrame maestro.
+        Filtra por fechas y mezcla todas las hojas en un solo DataFrame maestro ancho
+        ('08:00', '08:00_aht', ...). Se mantiene para los consumidores que esperan ese formato;
+        el cálculo usa build_cube.
+        """
+        return self.build_cube(processed_sheets, config, time_labels).to_frame()
+
+    def build_cube(self, processed_sheets, config, time_labels, base=None):
+        """
+        Filtra por fechas y alinea todas las hojas en un cubo (métrica × día × intervalo).
+
+        Cada hoja secundaria se alinea con las fechas de la hoja de volumen mediante reindex
+        (sin merges sucesivos) y sus cabeceras de tiempo se normalizan una vez por etiqueta distinta.
+
+        Args:
+            base (pd.DataFrame): Tabla con columna Fecha que define el índice de fechas en lugar de la
+                hoja de volumen (p. ej. los efectivos de un escenario). Su contenido no se carga como
+                métrica: la métrica de volumen queda a 0 salvo que processed_sheets incluya 'calls'.
+
+        Returns:
+            DimensioningCube: Cubo de entradas con el índice de fechas de la hoja de volumen (o de base)
         """
-        df_calls = processed_sheets['calls']
+        df_calls = processed_sheets['calls'] if base is None else base.copy()
         
         # Convertir Fecha con lógica robusta para todas las hojas
         df_calls = self._robust_date_parsing(df_calls, config)
@@ -168,58 +326,56 @@ class DimensioningDataProcessor:
             if df_calls.empty:
                 raise ValueError(f"No hay datos de volumen para el rango seleccionado ({config['start_date']} a {config['end_date']}). Verifique el formato de fecha.")
 
-        # Función de normalización ultra-robusta (HH:MM)
-        def normalize_time_header(col):
-            # Si ya es datetime o time, formatear directamente
-            if isinstance(col, (datetime.time, datetime.datetime)):
-                return col.strftime('%H:%M')
-            
-            # Si es string o número, intentar parsear con pandas
-            col_str = str(col).strip()
-            if col_str == "" or col_str.lower() in ['fecha', 'dia', 'semana', 'tipo']:
-                return col_str
-                
-            try:
-                # pandas to_datetime maneja casi cualquier formato de fecha/hora de Excel
-                dt = pd.to_datetime(col_str, errors='coerce')
-                if pd.notnull(dt):
-                    return dt.strftime('%H:%M')
-            except:
-                pass
-            return col_str
-
-        # Normalizar columnas de calls
-        index_cols = ['Fecha', 'Dia', 'Semana', 'Tipo']
-        df_calls.columns = [normalize_time_header(c) if str(c) not in index_cols else c for c in df_calls.columns]
-        
-        # Merge con el resto de hojas
-        df_master = df_calls.copy()
-        time_cols = [c for c in df_master.columns if c not in index_cols]
-        total_calls = df_master[time_cols].sum().sum()
-        print(f"[DEBUG MERGE] LÓGICA DE VOLUMEN: Filas={len(df_master)}, VOLUMEN TOTAL={total_calls:.2f}", flush=True)
-        print(f"[DEBUG MERGE] Iniciando merge masivo. Filas base (Llamadas): {len(df_master)}", flush=True)
-        
-        suffixes = {'aht': '_aht', 'absenteeism': '_abs', 'auxiliaries': '_aux', 'shrinkage': '_shr'}
-        
-        for key, suffix in suffixes.items():
-            if key in processed_sheets:
-                df = processed_sheets[key]
-                if df is not None and not df.empty:
-                    print(f"[DEBUG MERGE] Procesando hoja '{key}'. Filas: {len(df)}", flush=True)
-                    # Aplicar la misma lógica robusta de fechas
-                    df = self._robust_date_parsing(df, config)
-                    
-                    # Normalizar columnas en la hoja secundaria
-                    df.columns = [normalize_time_header(c) if str(c) not in index_cols else c for c in df.columns]
-                    
-                    # Sincronizar solo columnas que existan en el maestro (tiempo real)
-                    cols_to_keep = ['Fecha'] + [t for t in time_labels if t in df.columns]
-                    df_temp = df[cols_to_keep].rename(columns={t: f"{t}{suffix}" for t in time_labels if t in df.columns})
-                    # Asegurar duplicados de fecha (tomar el último)
-                    df_temp = df_temp.drop_duplicates(subset=['Fecha'], keep='last')
-                    
-                    df_master = pd.merge(df_master, df_temp, on='Fecha', how='left')
-                    print(f"[DEBUG MERGE] Hoja '{key}' fusionada exitosamente. Filas maestro: {len(df_master)}", flush=True)
-
-        print(f"[DEBUG MERGE] Merge completado. Filas finales: {len(df_master)}", flush=True)
-        return df_master.fillna(0)
+        header_cache = {}
+        df_calls = df_calls.reset_index(drop=True)
+        dates = df_calls['Fecha']
+        values = DimensioningCube.empty_values(len(df_calls), len(time_labels))
+        if base is None:
+            self._time_matrix(df_calls, time_labels, header_cache, out=values[0])
+        print(f"[DEBUG MERGE] LÓGICA DE VOLUMEN: Filas={len(df_calls)}, VOLUMEN TOTAL={values[0].sum():.2f}", flush=True)
+
+        reducer_pct = {}
+        start = 1 if base is None else 0
+        for position, key in enumerate(DimensioningCube.METRICS[start:], start=start):
+            df = processed_sheets.get(key)
+            if df is None or df.empty:
+                continue
+            print(f"[DEBUG MERGE] Procesando hoja '{key}'. Filas: {len(df)}", flush=True)
+            # Aplicar la misma lógica robusta de fechas
+            df = self._robust_date_parsing(df, config)
+            # Fechas duplicadas: se toma la última, alineada con las fechas de volumen
+            df = df.drop_duplicates(subset=['Fecha'], keep='last').set_index('Fecha').reindex(dates)
+            if key in DimensioningCube.REDUCERS:
+                # Los KPI de reductores se calculan sobre la matriz float64, antes de pasarla a float32
+                matrix = self._time_matrix(df, time_labels, header_cache)
+                values[position] = matrix
+                reducer_pct[key] = DimensioningCube.nonzero_mean_pct(matrix)
+            else:
+                self._time_matrix(df, time_labels, header_cache, out=values[position])
+
+        index = df_calls[[col for col in INDEX_COLS if col in df_calls.columns]]
+        print(f"[DEBUG MERGE] Cubo completado. Forma: {values.shape}", flush=True)
+        return DimensioningCube(index, values, time_labels, reducer_pct=reducer_pct)
+
+    @staticmethod
+    def _time_matrix(df, time_labels, header_cache, out=None):
+        """
+        Extrae las columnas de tiempo de una hoja como matriz float (filas × intervalos).
+
+        Las cabeceras se normalizan a 'HH:MM' una sola vez por etiqueta distinta (header_cache);
+        los intervalos ausentes y los valores no numéricos valen 0. Si se pasa out, la matriz
+        se escribe directamente en ese array (p. ej. la vista de una métrica del cubo).
+        """
+        positions = {}
+        for position, col in enumerate(df.columns):
+            key = (type(col), col)
+            if key not in header_cache:
+                header_cache[key] = col if str(col) in INDEX_COLS else normalize_time_header(col)
+            positions.setdefault(header_cache[key], position)
+
+        matrix = np.zeros((len(df), len(time_labels))) if out is None else out
+        for j, label in enumerate(time_labels):
+            if label in positions:
+                column = pd.to_numeric(df.iloc[:, positions[label]], errors='coerce')
+                matrix[:, j] = column.fillna(0).to_numpy(dtype=float)
+        return matrix
@@ -0,0 +1,172 @@
+"""
+Cubo de datos del dimensionamiento.
+Agrupa volumen, AHT y reductores en un único array float32 (métrica × día × intervalo) alineado
+sobre un índice de fechas común, junto con las capas de resultados (dimensionados, presentes,
+logados, efectivos). Las etapas del cálculo intercambian el cubo; los DataFrames solo se
+construyen en el límite de la API.
+"""
+
+import numpy as np
+import pandas as pd
+
+INDEX_COLS = ['Fecha', 'Dia', 'Semana', 'Tipo']
+
+
+class DimensioningCube:
+    """
+    Entradas y resultados del dimensionamiento como arrays (capa × día × intervalo) más sus columnas índice.
+    """
+
+    __slots__ = ('index', 'values', 'time_labels', 'results', 'reducer_pct')
+
+    # Tipo de los arrays de entradas y resultados
+    DTYPE = np.float32
+
+    # Orden de las métricas en el primer eje del cubo
+    METRICS = ('calls', 'aht', 'absenteeism', 'auxiliaries', 'shrinkage')
+
+    # Métricas de reductores (porcentajes por intervalo)
+    REDUCERS = ('absenteeism', 'auxiliaries', 'shrinkage')
+
+    # Sufijo de columna de cada métrica en el DataFrame maestro ancho
+    SUFFIXES = {'calls': '', 'aht': '_aht', 'absenteeism': '_abs', 'auxiliaries': '_aux', 'shrinkage': '_shr'}
+
+    # Orden de las capas de resultados (el mismo que devuelve calculate_requirements)
+    RESULTS = ('dimensionados', 'presentes', 'logados', 'efectivos')
+
+    def __init__(self, index, values, time_labels, results=None, reducer_pct=None):
+        """
+        Args:
+            index (pd.DataFrame): Columnas índice (INDEX_COLS presentes), una fila por día
+            values (np.ndarray): Array (len(METRICS), días, intervalos); se convierte a float32 sin copiar si ya lo es
+            time_labels (list): Etiquetas de intervalo
+            results (np.ndarray): Array (len(RESULTS), días, intervalos) ya calculado (opcional)
+            reducer_pct (dict): Porcentaje medio de cada reductor ({métrica: %}) calculado sobre los
+                valores float64 de origen, antes de pasarlos a float32 (opcional)
+        """
+        values = np.asarray(values, dtype=self.DTYPE)
+        if values.shape != (len(self.METRICS), len(index), len(time_labels)):
+            raise ValueError(f"Forma del cubo no válida: {values.shape}")
+        self.index = index
+        self.values = values
+        self.time_labels = list(time_labels)
+        self.results = None
+        self.reducer_pct = dict(reducer_pct or {})
+        if results is not None:
+            self.set_results(*results)
+
+    @classmethod
+    def empty_values(cls, days, intervals):
+        """
+        Reserva el array de entradas (a cero) de un cubo de days × intervals.
+        """
+        return np.zeros((len(cls.METRICS), days, intervals), dtype=cls.DTYPE)
+
+    @classmethod
+    def from_frame(cls, df_master, time_labels):
+        """
+        Construye el cubo a partir de un DataFrame maestro ancho ('08:00', '08:00_aht', ...).
+        Las columnas ausentes valen 0.
+        """
+        values = cls.empty_values(len(df_master), len(time_labels))
+        reducer_pct = {}
+        for position, metric in enumerate(cls.METRICS):
+            columns = [f'{label}{cls.SUFFIXES[metric]}' for label in time_labels]
+            matrix = df_master.reindex(columns=columns, fill_value=0).to_numpy(dtype=float)
+            values[position] = matrix
+            if metric in cls.REDUCERS:
+                reducer_pct[metric] = cls.nonzero_mean_pct(matrix)
+        index = df_master[[col for col in INDEX_COLS if col in df_master.columns]].reset_index(drop=True)
+        return cls(index, values, time_labels, reducer_pct=reducer_pct)
+
+    @staticmethod
+    def nonzero_mean_pct(values):
+        """
+        Porcentaje medio de una matriz de reductor sobre los intervalos con valor no nulo (0 si no hay ninguno).
+        """
+        values = np.asarray(values).flatten()
+        non_zero = values[values != 0]
+        return float(np.mean(non_zero, dtype=float) * 100) if non_zero.size > 0 else 0.0
+
+    def metric(self, name):
+        """
+        Devuelve la matriz (días × intervalos) de una métrica, como vista del cubo.
+        """
+        return self.values[self.METRICS.index(name)]
+
+    def set_results(self, *matrices):
+        """
+        Guarda las capas de resultados (en el orden de RESULTS) en un único array float32.
+        """
+        if len(matrices) != len(self.RESULTS):
+            raise ValueError(f"Se esperaban {len(self.RESULTS)} capas de resultados")
+        results = self.allocate_results()
+        for position, matrix in enumerate(matrices):
+            results[position] = matrix
+
+    def allocate_results(self):
+        """
+        Reserva (si aún no existe) el array de resultados (len(RESULTS), días, intervalos) y lo devuelve.
+        """
+        if self.results is None:
+            self.results = np.zeros((len(self.RESULTS),) + self.values.shape[1:], dtype=self.DTYPE)
+        return self.results
+
+    @property
+    def solved(self):
+        return self.results is not None
+
+    def layer(self, name):
+        """
+        Devuelve la matriz (días × intervalos) de una capa de resultados, como vista del cubo.
+        """
+        if self.results is None:
+            raise ValueError("El cubo no tiene resultados calculados")
+        return self.results[self.RESULTS.index(name)]
+
+    def slice(self, start, stop):
+        """
+        Devuelve el cubo de los días [start, stop), como vista del cubo original.
+        """
+        part = DimensioningCube(self.index.iloc[start:stop].reset_index(drop=True), self.values[:, start:stop], self.time_labels)
+        if self.results is not None:
+            part.results = self.results[:, start:stop]
+        return part
+
+    def layer_frame(self, name):
+        """
+        Construye el DataFrame (columnas índice + intervalos) de una capa de resultados.
+        Los valores se pasan a float64: el float32 solo se usa dentro del cubo, y redondear
+        en float32 en la respuesta de la API dejaría restos como 12.300000190734863.
+        """
+        return pd.concat([self.index, pd.DataFrame(self.layer(name).astype(np.float64), columns=self.time_labels)], axis=1)
+
+    def result_frames(self):
+        """
+        Construye los DataFrames de las cuatro capas de resultados, en el orden de RESULTS.
+        """
+        return tuple(self.layer_frame(name) for name in self.RESULTS)
+
+    def to_frame(self):
+        """
+        Expande las entradas del cubo al DataFrame maestro ancho con columnas sufijadas.
+        """
+        blocks = [self.index]
+        for metric, matrix in zip(self.METRICS, self.values):
+            suffix = self.SUFFIXES[metric]
+            blocks.append(pd.DataFrame(matrix, columns=[f'{label}{suffix}' for label in self.time_labels]))
+        return pd.concat(blocks, axis=1)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def nbytes(self):
+        """
+        Bytes ocupados por los arrays de entradas y resultados.
+        """
+        return self.values.nbytes + (self.results.nbytes if self.results is not None else 0)
+
+    def __len__(self):
+        return len(self.index)
@@ -3,7 +3,7 @@ Módulo para el cálculo de KPIs globales de dimensionamiento.
 """
 
 import numpy as np
-import pandas as pd
+from .dimensioning_cube import DimensioningCube
 
 class DimensioningKPIService:
     """
@@ -13,56 +13,62 @@ class DimensioningKPIService:
     def calculate_global_kpis(self, df_master, time_labels, processed_sheets, df_dim=None):
         """
         Calcula los KPIs finales basados en los datos mezclados y resultados de dimensionamiento.
+
+        Args:
+            df_master (DimensioningCube | pd.DataFrame): Cubo de entradas o DataFrame maestro ancho
+            df_dim (pd.DataFrame | np.ndarray): Agentes dimensionados; por defecto la capa
+                'dimensionados' del cubo si ya está calculada
         """
+        cube = df_master if isinstance(df_master, DimensioningCube) else DimensioningCube.from_frame(df_master, time_labels)
+        if df_dim is None and cube.solved:
+            df_dim = cube.layer('dimensionados')
         kpis = {}
         
-        # 1. Promedios de reductores
-        for key, suffix in [('absentismo', 'abs'), ('auxiliares', 'aux'), ('desconexiones', 'shr')]:
-            # Filtrar solo columnas que existan
-            cols = [f'{c}_{suffix}' for c in time_labels if f'{c}_{suffix}' in df_master.columns]
-            if not cols:
-                kpis[f'{key}_pct'] = 0.0
-                continue
-                
-            values = df_master[cols].values.flatten()
-            non_zero = values[values != 0]
-            kpis[f'{key}_pct'] = float(np.mean(non_zero) * 100) if non_zero.size > 0 else 0.0
+        # 1. Promedios de reductores (sobre los valores float64 de las hojas si el cubo los trae)
+        for key, metric in [('absentismo', 'absenteeism'), ('auxiliares', 'auxiliaries'), ('desconexiones', 'shrinkage')]:
+            pct = cube.reducer_pct.get(metric)
+            kpis[f'{key}_pct'] = pct if pct is not None else self.reducer_pct(cube.metric(metric))
 
-        # 2. Volumen y AHT
-        total_weighted_aht = 0
-        total_calls = 0
-        
-        for col in time_labels:
-            if col in df_master.columns:
-                calls_col = pd.to_numeric(df_master[col], errors='coerce').fillna(0)
-                total_calls += calls_col.sum()
-                
-                aht_col_name = f'{col}_aht'
-                if aht_col_name in df_master.columns:
-                    aht_col = pd.to_numeric(df_master[aht_col_name], errors='coerce').fillna(0)
-                    total_weighted_aht += (calls_col * aht_col).sum()
-            else:
-                # Si el intervalo no existe, se asume volumen 0
-                pass
+        # 2. Volumen y AHT (acumulados en float64 sobre las matrices float32 del cubo)
+        calls = cube.metric('calls')
+        total_calls = calls.sum(dtype=float)
+        total_weighted_aht = np.multiply(calls, cube.metric('aht'), dtype=float).sum()
         
         kpis['total_volumen'] = int(total_calls)
-        kpis['aht_promedio'] = round(total_weighted_aht / total_calls, 1) if total_calls > 0 else 0.0
+        kpis['aht_promedio'] = round(float(total_weighted_aht / total_calls), 1) if total_calls > 0 else 0.0
 
         # 3. Horas y FTE (Basado en Dimensionados)
-        if df_dim is not None and not df_dim.empty:
+        kpis.update(self.staffing_kpis(df_dim, time_labels))
+        
+        return kpis
+
+    @staticmethod
+    def reducer_pct(values):
+        """
+        Porcentaje medio de un reductor sobre los intervalos con valor no nulo.
+        """
+        return DimensioningCube.nonzero_mean_pct(values)
+
+    @staticmethod
+    def staffing_kpis(df_dim, time_labels):
+        """
+        Calcula horas planificadas y FTE promedio a partir de los agentes dimensionados.
+
+        Args:
+            df_dim (pd.DataFrame | np.ndarray): DataFrame con las columnas de tiempo o matriz días × intervalos
+        """
+        kpis = {}
+        if df_dim is not None and len(df_dim) > 0:
             # Seleccionar solo las columnas de tiempo para el cálculo de horas
-            time_data = df_dim[time_labels]
+            time_data = df_dim[time_labels].to_numpy(dtype=float) if hasattr(df_dim, 'columns') else np.asarray(df_dim, dtype=float)
             # Cada intervalo es de 30 min (0.5 horas). La suma de agentes en los intervalos / 2 = horas totales.
-            total_man_hours = (time_data.sum().sum() * 0.5)
+            total_man_hours = float(time_data.sum() * 0.5)
             kpis['total_horas_planificadas'] = round(total_man_hours, 2)
             
             # FTE Promedio: Horas totales / (8 horas * número de días)
-            num_days = len(df_dim)
+            num_days = len(time_data)
             if num_days > 0:
                 kpis['fte_promedio'] = round(total_man_hours / (8 * num_days), 2)
             else:
                 kpis['fte_promedio'] = 0.0
-        
         return kpis
-
-
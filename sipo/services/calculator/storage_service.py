@@ -4,11 +4,52 @@ Maneja toda la lógica de persistencia en la base de datos.
 """
 
 import pandas as pd
-import json
 import datetime
-import io
+from collections.abc import Mapping
+from sqlalchemy.orm import load_only
 from app import db
-from models import DimensioningScenario
+from config import Config
+from models import DimensioningScenario, Segment, Campaign
+from utils import json_codec
+from utils.matrix_blob import encode_frame, read_table
+
+# Formatos de almacenamiento de las tablas de resultados
+STORAGE_FORMATS = ('blob', 'json')
+
+# Columna del escenario que guarda cada tabla
+TABLE_COLUMNS = {
+    'dimensionados': 'agents_total',
+    'presentes': 'agents_present',
+    'logados': 'agents_logged',
+    'efectivos': 'agents_online',
+    'calls': 'calls_forecast',
+    'aht': 'aht_forecast',
+}
+
+
+def _format_fecha(value):
+    return value.strftime('%Y-%m-%d') if isinstance(value, (datetime.date, datetime.datetime)) else str(value)
+
+
+class ScenarioFrames(Mapping):
+    """
+    Tablas de un escenario que se cargan y decodifican solo al pedirlas (y una sola vez).
+    """
+
+    def __init__(self, scenario):
+        self._scenario = scenario
+        self._frames = {}
+
+    def __getitem__(self, key):
+        if key not in self._frames:
+            self._frames[key] = read_table(getattr(self._scenario, TABLE_COLUMNS[key]))
+        return self._frames[key]
+
+    def __iter__(self):
+        return iter(TABLE_COLUMNS)
+
+    def __len__(self):
+        return len(TABLE_COLUMNS)
 
 
 class StorageService:
@@ -30,7 +71,7 @@ class StorageService:
         """
         new_scenario = DimensioningScenario(
             segment_id=segment_id,
-            parameters=json.dumps(config, default=str),
+            parameters=json_codec.dumps(config, default=str),
             id_legal=id_legal,
             username=username
         )
@@ -47,36 +88,157 @@ class StorageService:
         df_efectivos: pd.DataFrame,
         kpi_data: dict,
         df_calls: pd.DataFrame = None,
-        df_aht: pd.DataFrame = None
+        df_aht: pd.DataFrame = None,
+        commit: bool = True
     ) -> None:
         """
         Guarda los resultados del cálculo en el escenario existente.
+        Con commit=False solo se actualiza la sesión (para guardar varios escenarios en una transacción).
         """
         scenario = DimensioningScenario.query.get(scenario_id)
         if not scenario:
             raise ValueError(f"Escenario {scenario_id} no encontrado")
             
-        def df_to_json(df):
-            if df is None or df.empty:
-                return "[]"
-            df_copy = df.copy()
-            if 'Fecha' in df_copy.columns:
-                df_copy['Fecha'] = df_copy['Fecha'].apply(lambda x: x.strftime('%Y-%m-%d') if isinstance(x, (datetime.date, datetime.datetime)) else str(x))
-            return df_copy.to_json(orient='records')
-
-        scenario.agents_total = df_to_json(df_dimensionados)
-        scenario.agents_present = df_to_json(df_presentes)
-        scenario.agents_logged = df_to_json(df_logados)
-        scenario.agents_online = df_to_json(df_efectivos)
+        scenario.agents_total = StorageService.encode_table(df_dimensionados)
+        scenario.agents_present = StorageService.encode_table(df_presentes)
+        scenario.agents_logged = StorageService.encode_table(df_logados)
+        scenario.agents_online = StorageService.encode_table(df_efectivos)
         
         if df_calls is not None:
-            scenario.calls_forecast = df_to_json(df_calls)
+            scenario.calls_forecast = StorageService.encode_table(df_calls)
         if df_aht is not None:
-            scenario.aht_forecast = df_to_json(df_aht)
+            scenario.aht_forecast = StorageService.encode_table(df_aht)
             
-        scenario.kpis_data = json.dumps(kpi_data)
+        scenario.kpis_data = json_codec.dumps(kpi_data)
         
-        db.session.commit()
+        if commit:
+            db.session.commit()
+    
+    @staticmethod
+    def save_batch_results(entries: list, id_legal: str = None, username: str = None) -> list:
+        """
+        Crea y guarda varios escenarios en una sola transacción.
+        
+        Args:
+            entries: Lista de tuplas (segment_id, config, resultados de process_full_dimensioning:
+                cubo con resultados, kpis, hoja de volumen y hoja de AHT)
+            id_legal: ID legal del usuario
+            username: Nombre de usuario
+            
+        Returns:
+            Lista de objetos DimensioningScenario creados, en el mismo orden
+        """
+        scenarios = []
+        try:
+            for segment_id, config, results in entries:
+                cube, kpi_data, df_calls, df_aht = results
+                df_dimensionados, df_presentes, df_logados, df_efectivos = cube.result_frames()
+                scenario = StorageService.create_scenario(segment_id, config, id_legal, username)
+                StorageService.save_calculation_results(
+                    scenario_id=scenario.id,
+                    df_dimensionados=df_dimensionados,
+                    df_presentes=df_presentes,
+                    df_logados=df_logados,
+                    df_efectivos=df_efectivos,
+                    kpi_data=kpi_data,
+                    df_calls=df_calls,
+                    df_aht=df_aht,
+                    commit=False
+                )
+                scenarios.append(scenario)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return scenarios
+    
+    @staticmethod
+    def encode_table(df: pd.DataFrame, storage_format: str = None) -> str:
+        """
+        Serializa una tabla de resultados o de entrada para guardarla en el escenario.
+        
+        Args:
+            df: Tabla (una fila por día)
+            storage_format: 'blob' (float32 comprimido) o 'json' (orient='records');
+                por defecto Config.SCENARIO_STORAGE_FORMAT
+            
+        Returns:
+            Texto a guardar en la columna del escenario
+        """
+        if df is None or df.empty:
+            return "[]"
+        storage_format = storage_format or Config.SCENARIO_STORAGE_FORMAT
+        if storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Formato de almacenamiento no válido. Formatos disponibles: {', '.join(STORAGE_FORMATS)}")
+        if storage_format == 'blob':
+            return encode_frame(df, formatters={'Fecha': _format_fecha})
+        
+        df_copy = df.copy()
+        if 'Fecha' in df_copy.columns:
+            df_copy['Fecha'] = df_copy['Fecha'].apply(_format_fecha)
+        return df_copy.to_json(orient='records')
+    
+    @staticmethod
+    def get_scenario_frames(scenario_id: int) -> tuple:
+        """
+        Carga un escenario con acceso a sus tablas de resultados y de entrada (volumen y AHT).
+        
+        Las columnas de tablas no se leen con el escenario: cada tabla se carga y decodifica
+        la primera vez que se pide, de modo que solo se pagan las que usa el llamador.
+        
+        Args:
+            scenario_id: ID del escenario
+            
+        Returns:
+            Tupla (escenario, ScenarioFrames con 'dimensionados', 'presentes', 'logados', 'efectivos', 'calls' y 'aht')
+            
+        Raises:
+            ValueError: Si no se encuentra el escenario
+        """
+        scenario = DimensioningScenario.query.options(
+            load_only(
+                DimensioningScenario.segment_id,
+                DimensioningScenario.parameters,
+                DimensioningScenario.kpis_data,
+                DimensioningScenario.id_legal,
+                DimensioningScenario.username
+            )
+        ).filter_by(id=scenario_id).first()
+        if not scenario:
+            raise ValueError(f"Escenario {scenario_id} no encontrado")
+        
+        return scenario, ScenarioFrames(scenario)
+    
+    @staticmethod
+    def save_recalculated_scenario(
+        source: DimensioningScenario,
+        config: dict,
+        df_dimensionados: pd.DataFrame,
+        df_presentes: pd.DataFrame,
+        df_logados: pd.DataFrame,
+        df_efectivos: pd.DataFrame,
+        kpi_data: dict,
+        id_legal: str = None,
+        username: str = None
+    ) -> DimensioningScenario:
+        """
+        Guarda un nuevo escenario derivado de otro, conservando su volumen y AHT originales.
+        
+        Returns:
+            Objeto DimensioningScenario creado
+        """
+        scenario = StorageService.create_scenario(source.segment_id, config, id_legal, username)
+        scenario.calls_forecast = source.calls_forecast
+        scenario.aht_forecast = source.aht_forecast
+        StorageService.save_calculation_results(
+            scenario_id=scenario.id,
+            df_dimensionados=df_dimensionados,
+            df_presentes=df_presentes,
+            df_logados=df_logados,
+            df_efectivos=df_efectivos,
+            kpi_data=kpi_data
+        )
+        return scenario
     
     @staticmethod
     def get_scenario_history(id_legal: str, limit: int = 20) -> list:
@@ -90,19 +252,47 @@ class StorageService:
         Returns:
             Lista de diccionarios con información de los escenarios
         """
-        scenarios = DimensioningScenario.query.filter_by(id_legal=id_legal)\
-            .order_by(DimensioningScenario.created_at.desc())\
-            .limit(limit)\
-            .all()
+        return StorageService.get_scenario_history_page(id_legal, limit)[0]
+    
+    @staticmethod
+    def get_scenario_history_page(id_legal: str, limit: int = 20, before_id: int = None) -> tuple:
+        """
+        Obtiene una página del historial de escenarios de un usuario, del más reciente al más antiguo.
+        
+        Solo se leen las columnas del listado (sin las tablas de resultados) y el segmento y la
+        campaña se obtienen en la misma consulta. La paginación es por clave (id < before_id),
+        de modo que el coste de cada página no crece con el número de escenarios.
+        
+        Args:
+            id_legal: ID legal del usuario
+            limit: Número máximo de resultados
+            before_id: Devolver solo escenarios con id menor que este (cursor de la página anterior)
+            
+        Returns:
+            Tupla (lista de diccionarios con información de los escenarios, before_id de la página siguiente o None)
+        """
+        query = db.session.query(
+            DimensioningScenario.id,
+            DimensioningScenario.created_at,
+            DimensioningScenario.parameters,
+            Segment.name.label('segment_name'),
+            Campaign.name.label('campaign_name')
+        ).join(Segment, DimensioningScenario.segment_id == Segment.id)\
+            .join(Campaign, Segment.campaign_id == Campaign.id)\
+            .filter(DimensioningScenario.id_legal == id_legal)
+        if before_id is not None:
+            query = query.filter(DimensioningScenario.id < before_id)
+        # Se pide una fila de más para saber si hay página siguiente
+        rows = query.order_by(DimensioningScenario.id.desc()).limit(limit + 1).all()
         
         history_data = []
-        for scenario in scenarios:
-            params = json.loads(scenario.parameters)
+        for row in rows[:limit]:
+            params = json_codec.loads(row.parameters) if row.parameters else {}
             history_data.append({
-                'id': scenario.id,
-                'created_at': scenario.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'segment_name': scenario.segment.name,
-                'campaign_name': scenario.segment.campaign.name,
+                'id': row.id,
+                'created_at': row.created_at.strftime('%Y-%m-%d %H:%M:%S') if row.created_at else None,
+                'segment_name': row.segment_name,
+                'campaign_name': row.campaign_name,
                 'start_date': params.get('start_date'),
                 'end_date': params.get('end_date'),
                 'sla_objetivo': params.get('sla_objetivo'),
@@ -110,7 +300,8 @@ class StorageService:
                 'nda': params.get('nda_objetivo') or params.get('nda') or params.get('sla_objetivo')  # NDA objetivo
             })
         
-        return history_data
+        next_before_id = history_data[-1]['id'] if len(rows) > limit else None
+        return history_data, next_before_id
     
     @staticmethod
     def get_scenario_details(scenario_id: int) -> dict:
@@ -128,35 +319,24 @@ class StorageService:
         """
         from .calculator_service import CalculatorService
         
-        scenario = DimensioningScenario.query.get(scenario_id)
-        if not scenario:
-            raise ValueError(f"Escenario {scenario_id} no encontrado")
-        
-        # Helper para cargar JSON a DataFrame
-        def json_to_df(json_str):
-            if not json_str or json_str == "[]":
-                return pd.DataFrame()
-            return pd.read_json(io.StringIO(json_str), orient='records')
-
-        import io
-        
-        df_dim = json_to_df(scenario.agents_total)
-        df_efe = json_to_df(scenario.agents_online)
-        df_pre = json_to_df(scenario.agents_present)
-        df_log = json_to_df(scenario.agents_logged)
+        scenario, frames = StorageService.get_scenario_frames(scenario_id)
         
-        kpi_data = json.loads(scenario.kpis_data) if scenario.kpis_data else {}
+        df_dim = frames['dimensionados']
+        df_efe = frames['efectivos']
+        df_pre = frames['presentes']
+        df_log = frames['logados']
         
-        from .calculator_service import CalculatorService
-        service = CalculatorService()
+        kpi_data = json_codec.loads(scenario.kpis_data) if scenario.kpis_data else {}
+        # format_and_calculate_simple es estático y usa la instancia compartida del servicio
+        format_table = CalculatorService.format_and_calculate_simple
         
         # Formatear resultados
         results_dict = {
             "scenario_id": scenario.id,
-            "dimensionados": service.format_and_calculate_simple(df_dim).to_dict(orient='split') if not df_dim.empty else {},
-            "efectivos": service.format_and_calculate_simple(df_efe).to_dict(orient='split') if not df_efe.empty else {},
-            "presentes": service.format_and_calculate_simple(df_pre).to_dict(orient='split') if not df_pre.empty else {},
-            "logados": service.format_and_calculate_simple(df_log).to_dict(orient='split') if not df_log.empty else {},
+            "dimensionados": format_table(df_dim).to_dict(orient='split') if not df_dim.empty else {},
+            "efectivos": format_table(df_efe).to_dict(orient='split') if not df_efe.empty else {},
+            "presentes": format_table(df_pre).to_dict(orient='split') if not df_pre.empty else {},
+            "logados": format_table(df_log).to_dict(orient='split') if not df_log.empty else {},
             "kpis": kpi_data
         }
         
@@ -167,6 +347,15 @@ class StorageService:
         
         return results_dict
     
+    @staticmethod
+    def get_scenario_created_at(scenario_id: int) -> datetime.datetime:
+        """
+        Obtiene la fecha de creación de un escenario (None si no existe) sin cargar sus tablas.
+        Junto con el id identifica la versión del escenario aunque la base de datos reutilice ids.
+        """
+        row = db.session.query(DimensioningScenario.created_at).filter_by(id=scenario_id).first()
+        return row[0] if row is not None else None
+    
     @staticmethod
     def delete_scenario(scenario_id: int) -> None:
         """
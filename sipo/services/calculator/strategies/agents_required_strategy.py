@@ -4,8 +4,13 @@ Calcula el número de agentes requeridos para alcanzar un SLA objetivo.
 """
 
 import math
+import numpy as np
 from .base_strategy import CalculationStrategy
 from .sla_strategy import SLAStrategy
+from .erlang_kernel import (
+    agents_required_batch, agents_required_upper_bound, search_min_agents, sqrt_staffing_estimate
+)
+from .staffing_tables import get_staffing_tables
 
 
 class AgentsRequiredStrategy(CalculationStrategy):
@@ -13,18 +18,42 @@ class AgentsRequiredStrategy(CalculationStrategy):
     Estrategia de cálculo para el número de agentes requeridos.
     Calcula el número mínimo de agentes necesarios para alcanzar un SLA objetivo
     basado en el volumen de llamadas, AHT y tiempo de servicio objetivo.
+
+    Soporta dos modos de resolución con resultados idénticos:
+        - 'incremental' (por defecto): recorre N hacia arriba desde el tráfico
+          arrastrando la recursión de Erlang B, O(N) por celda.
+        - 'binary': búsqueda acotada desde la estimación de square-root staffing,
+          recalculando el SLA en cada sondeo (2-3 sondeos típicos).
+
+    Si existen tablas precalculadas (scripts/build_staffing_tables.py) se consultan
+    primero; el modo de resolución solo se usa para las entradas fuera de tabla.
     """
+
+    SOLVERS = ('incremental', 'binary')
+
+    def __init__(self, solver='incremental', use_tables=True):
+        """
+        Inicializa la estrategia con el modo de resolución indicado.
+
+        Args:
+            solver (str): Modo de resolución ('incremental' o 'binary')
+            use_tables (bool): Si se consultan las tablas precalculadas antes de resolver
+        """
+        if solver not in self.SOLVERS:
+            raise ValueError(f"Modo de resolución no válido. Modos disponibles: {', '.join(self.SOLVERS)}")
+        self.solver = solver
+        self.use_tables = use_tables
     
     def calculate(self, target_sla, service_time, calls_per_hour, aht, **kwargs):
         """
-        Calcula el número de agentes requeridos usando búsqueda binaria.
+        Calcula el número de agentes requeridos con el modo de resolución configurado.
         
         Args:
             target_sla (float): SLA objetivo (valor entre 0 y 1)
             service_time (float): Tiempo objetivo de servicio en segundos
             calls_per_hour (float): Volumen de llamadas por hora
             aht (float): Tiempo promedio de manejo de llamada (AHT) en segundos
-            **kwargs: Argumentos adicionales no utilizados en esta estrategia
+            **kwargs: Puede incluir 'solver' para forzar un modo en esta llamada
         
         Returns:
             int: Número mínimo de agentes requeridos
@@ -39,31 +68,87 @@ class AgentsRequiredStrategy(CalculationStrategy):
         # Si el SLA objetivo es 0 o negativo, no se necesitan agentes
         if target_sla <= 0:
             return 0
+
+        tables = get_staffing_tables() if self.use_tables else None
+        if tables is not None:
+            agents = tables.lookup(target_sla, service_time, calls_per_hour, aht)
+            if agents is not None:
+                return agents
+
+        if kwargs.get('solver', self.solver) == 'incremental':
+            return int(agents_required_batch(target_sla, service_time, calls_per_hour, aht))
+
+        return self._calculate_binary(target_sla, service_time, calls_per_hour, aht)
+
+    def calculate_batch(self, target_sla, service_time, calls_per_hour, aht, **kwargs):
+        """
+        Calcula el número de agentes requeridos para arrays completos de parámetros.
+        
+        Args:
+            target_sla (array-like): SLA objetivo (valores entre 0 y 1)
+            service_time (array-like): Tiempo objetivo de servicio en segundos
+            calls_per_hour (array-like): Volumen de llamadas por hora
+            aht (array-like): Tiempo promedio de manejo de llamada (AHT) en segundos
+            **kwargs: Argumentos adicionales no utilizados en esta estrategia
+        
+        Returns:
+            np.ndarray: Número mínimo de agentes requeridos por celda
+        """
+        target_sla, service_time, calls_per_hour, aht = np.broadcast_arrays(
+            np.asarray(target_sla, dtype=float),
+            np.asarray(service_time, dtype=float),
+            np.asarray(calls_per_hour, dtype=float),
+            np.asarray(aht, dtype=float),
+        )
+        if np.any((target_sla < 0) | (target_sla > 1)):
+            raise ValueError("El SLA objetivo debe estar entre 0 y 1")
+        if np.any(aht < 0):
+            raise ValueError("El AHT no puede ser negativo")
+        if np.any((aht == 0) & (calls_per_hour > 0)):
+            raise ValueError("El AHT debe ser mayor que cero si hay llamadas")
+        if np.any(calls_per_hour < 0):
+            raise ValueError("El volumen de llamadas por hora no puede ser negativo")
+        if np.any(service_time <= 0):
+            raise ValueError("El tiempo de servicio debe ser mayor que cero")
+
+        tables = get_staffing_tables() if self.use_tables else None
+        if tables is None:
+            return agents_required_batch(target_sla, service_time, calls_per_hour, aht)
+
+        result = tables.lookup_batch(target_sla, service_time, calls_per_hour, aht)
+        result[(calls_per_hour <= 0) | (target_sla <= 0)] = 0.0
+        missing = np.isnan(result)
+        if missing.any():
+            result[missing] = agents_required_batch(
+                target_sla[missing], service_time[missing], calls_per_hour[missing], aht[missing]
+            )
+        return result
+
+    def _calculate_binary(self, target_sla, service_time, calls_per_hour, aht):
+        """
+        Búsqueda acotada partiendo de la estimación de square-root staffing (Halfin-Whitt).
+
+        La horquilla inicial se obtiene galopando desde la estimación analítica y se
+        ensancha solo cuando hace falta, dentro de [floor(A) + 1, límite superior]
+        (con N <= A el SLA es 0). El resultado es el mismo que el de la búsqueda
+        binaria sobre [0, límite superior], con 2-3 sondeos en lugar de 8-10.
         
-        # Búsqueda binaria para encontrar el número mínimo de agentes
-        # que alcanza el SLA objetivo
-        min_agents = 0
-        max_agents = max(100, int(calls_per_hour * aht / 3600) * 2 + 10)  # Límite superior razonable
+        Returns:
+            int: Número mínimo de agentes requeridos
+        """
+        traffic_rate = calls_per_hour * aht / 3600
+        max_agents = int(agents_required_upper_bound(traffic_rate))  # Límite superior razonable
         
         sla_strategy = SLAStrategy()
-        
-        # Primero verificamos si el máximo alcanza el SLA
-        current_sla = sla_strategy.calculate(max_agents, service_time, calls_per_hour, aht)
-        if current_sla < target_sla:
-            # Si ni siquiera con el máximo alcanzamos el SLA, devolvemos el máximo
-            return max_agents
-        
-        # Búsqueda binaria para encontrar el mínimo
-        while min_agents < max_agents:
-            mid_agents = (min_agents + max_agents) // 2
-            current_sla = sla_strategy.calculate(mid_agents, service_time, calls_per_hour, aht)
-            
-            if current_sla >= target_sla:
-                max_agents = mid_agents
-            else:
-                min_agents = mid_agents + 1
-        
-        return max_agents
+
+        def meets(agents):
+            return sla_strategy.calculate(agents, service_time, calls_per_hour, aht) >= target_sla
+
+        estimate = sqrt_staffing_estimate(traffic_rate, target_sla, service_time, aht)
+        agents = search_min_agents(meets, estimate, int(math.floor(traffic_rate)) + 1, max_agents)
+
+        # Si ni siquiera con el máximo alcanzamos el SLA, devolvemos el máximo
+        return max_agents if agents is None else agents
     
     def get_name(self):
         """
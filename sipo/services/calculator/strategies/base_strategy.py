@@ -26,6 +26,23 @@ class CalculationStrategy(ABC):
         """
         pass
     
+    def calculate_batch(self, *args, **kwargs):
+        """
+        Realiza el cálculo sobre arrays completos de parámetros en una sola llamada.
+        Las estrategias que soportan evaluación vectorizada sobrescriben este método.
+        
+        Args:
+            *args: Arrays (o escalares difundibles) con los parámetros del cálculo
+            **kwargs: Argumentos de palabra clave opcionales para el cálculo
+            
+        Returns:
+            np.ndarray: Resultados del cálculo con la forma de los parámetros de entrada
+            
+        Raises:
+            NotImplementedError: Si la estrategia no soporta cálculo por lotes
+        """
+        raise NotImplementedError(f"La estrategia '{self.get_name()}' no soporta cálculo por lotes")
+    
     @abstractmethod
     def get_name(self):
         """
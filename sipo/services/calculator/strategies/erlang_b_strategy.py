@@ -3,8 +3,9 @@ Implementación de la estrategia de cálculo Erlang B para el patrón Strategy.
 Calcula la probabilidad de bloqueo en sistemas de telecomunicaciones.
 """
 
-import math
+import numpy as np
 from .base_strategy import CalculationStrategy
+from .erlang_kernel import erlang_b, erlang_b_batch
 
 
 class ErlangBStrategy(CalculationStrategy):
@@ -33,15 +34,30 @@ class ErlangBStrategy(CalculationStrategy):
         if servers == 0:
             return 1.0
         
-        max_iterate = int(servers)
-        last = 1.0
-        b = 1.0
+        return erlang_b(servers, intensity)
+    
+    def calculate_batch(self, servers, intensity, **kwargs):
+        """
+        Calcula la probabilidad de bloqueo para arrays de servidores e intensidades.
+        
+        Args:
+            servers (array-like): Número de servidores/canales por celda
+            intensity (array-like): Intensidad del tráfico por celda
+            **kwargs: Argumentos adicionales no utilizados en esta estrategia
+            
+        Returns:
+            np.ndarray: Probabilidades de bloqueo (valores entre 0 y 1)
+        """
+        servers = np.asarray(servers, dtype=float)
+        intensity = np.asarray(intensity, dtype=float)
+        
+        if np.any(servers < 0):
+            raise ValueError("El número de servidores no puede ser negativo")
         
-        for count in range(1, max_iterate + 1):
-            b = (intensity * last) / (count + (intensity * last))
-            last = b
+        if np.any(intensity < 0):
+            raise ValueError("La intensidad del tráfico no puede ser negativa")
         
-        return max(0.0, min(b, 1.0))
+        return erlang_b_batch(servers, intensity)
     
     def get_name(self):
         """
@@ -3,8 +3,9 @@ Implementación de la estrategia de cálculo Erlang C para el patrón Strategy.
 Calcula la probabilidad de espera en sistemas de colas de llamadas.
 """
 
-import math
+import numpy as np
 from .base_strategy import CalculationStrategy
+from .erlang_kernel import erlang_b, erlang_c, erlang_c_batch
 
 
 class ErlangCStrategy(CalculationStrategy):
@@ -30,17 +31,30 @@ class ErlangCStrategy(CalculationStrategy):
         if not is_valid:
             raise ValueError(error_msg)
         
-        if servers <= intensity:
-            return 1.0
+        return erlang_c(servers, intensity)
+    
+    def calculate_batch(self, servers, intensity, **kwargs):
+        """
+        Calcula la probabilidad de espera para arrays de servidores e intensidades.
         
-        b = ErlangCStrategy._calculate_erlang_b(servers, intensity)
-        denominator = (1 - (intensity / servers) * (1 - b))
+        Args:
+            servers (array-like): Número de servidores/agentes por celda
+            intensity (array-like): Intensidad del tráfico por celda
+            **kwargs: Argumentos adicionales no utilizados en esta estrategia
+            
+        Returns:
+            np.ndarray: Probabilidades de espera (valores entre 0 y 1)
+        """
+        servers = np.asarray(servers, dtype=float)
+        intensity = np.asarray(intensity, dtype=float)
+        
+        if np.any(servers <= 0):
+            raise ValueError("El número de servidores debe ser mayor que cero")
         
-        if denominator == 0:
-            return 1.0
+        if np.any(intensity < 0):
+            raise ValueError("La intensidad del tráfico no puede ser negativa")
         
-        c = b / denominator
-        return max(0.0, min(c, 1.0))
+        return erlang_c_batch(servers, intensity)
     
     def get_name(self):
         """
@@ -86,15 +100,4 @@ class ErlangCStrategy(CalculationStrategy):
         Returns:
             float: Valor de Erlang B
         """
-        if servers < 0 or intensity < 0:
-            return 0.0
-        
-        max_iterate = int(servers)
-        last = 1.0
-        b = 1.0
-        
-        for count in range(1, max_iterate + 1):
-            b = (intensity * last) / (count + (intensity * last))
-            last = b
-        
-        return max(0.0, min(b, 1.0))
\ No newline at end of file
+        return erlang_b(servers, intensity)
\ No newline at end of file
@@ -0,0 +1,553 @@
+"""
+Núcleo único de los cálculos de Erlang (B, C, SLA y agentes requeridos).
+Evalúa arrays completos de parámetros con NumPy en una sola llamada y ofrece funciones
+escalares con la misma aritmética. Todas las implementaciones del proyecto (estrategias,
+calculador del scheduler y servicio legacy) delegan aquí para garantizar resultados idénticos.
+
+Este módulo solo depende de math y NumPy para poder cargarse desde cualquier proceso.
+"""
+
+import math
+import numpy as np
+
+
+def _erlang_b_scalar(servers, intensity):
+    """
+    Recursión de Erlang B para un único par (servidores, intensidad).
+
+    Se usa como camino rápido cuando el lote tiene un solo elemento, evitando
+    la sobrecarga de NumPy por iteración sin alterar la aritmética.
+    """
+    last = 1.0
+    b = 1.0
+    for count in range(1, int(servers) + 1):
+        b = (intensity * last) / (count + (intensity * last))
+        last = b
+    return b
+
+
+def erlang_b(servers, intensity):
+    """
+    Calcula la probabilidad de bloqueo (Erlang B) para un único par de parámetros.
+
+    Args:
+        servers (float): Número de servidores/canales (se trunca a entero)
+        intensity (float): Intensidad del tráfico en Erlangs
+
+    Returns:
+        float: Probabilidad de bloqueo (valor entre 0 y 1)
+    """
+    if servers < 0 or intensity < 0:
+        return 0.0
+    return min(max(_erlang_b_scalar(servers, float(intensity)), 0.0), 1.0)
+
+
+def erlang_c(servers, intensity):
+    """
+    Calcula la probabilidad de espera (Erlang C) para un único par de parámetros.
+
+    Args:
+        servers (float): Número de servidores/agentes
+        intensity (float): Intensidad del tráfico en Erlangs
+
+    Returns:
+        float: Probabilidad de espera (valor entre 0 y 1)
+    """
+    if servers <= intensity:
+        return 1.0
+    servers = float(servers)
+    intensity = float(intensity)
+    b = erlang_b(servers, intensity)
+    # servers == 0 solo llega aquí con intensidad negativa; se replica el -inf de NumPy
+    ratio = intensity / servers if servers else -math.inf
+    denominator = (1 - ratio * (1 - b))
+    if denominator == 0:
+        return 1.0
+    return min(max(b / denominator, 0.0), 1.0)
+
+
+def sla(agents, service_time, calls_per_hour, aht):
+    """
+    Calcula el Nivel de Servicio (SLA) para una única celda, con las mismas reglas que sla_batch.
+
+    Args:
+        agents (float): Número de agentes disponibles
+        service_time (float): Tiempo objetivo de servicio en segundos
+        calls_per_hour (float): Volumen de llamadas por hora
+        aht (float): Tiempo promedio de manejo (AHT) en segundos
+
+    Returns:
+        float: Porcentaje de llamadas atendidas en tiempo (valor entre 0 y 1)
+    """
+    if calls_per_hour == 0:
+        return 1.0
+    agents = float(agents)
+    aht = float(aht)
+    traffic_rate = (float(calls_per_hour) * aht) / 3600.0
+    if not (calls_per_hour > 0 and agents > 0 and aht > 0 and traffic_rate < agents):
+        return 0.0
+    c = erlang_c(agents, traffic_rate)
+    with np.errstate(over='ignore', invalid='ignore'):
+        sl_queued = 1 - c * float(np.exp((traffic_rate - agents) * (float(service_time) / aht)))
+    if not math.isfinite(sl_queued):
+        return 0.0
+    return min(max(sl_queued, 0.0), 1.0)
+
+
+def erlang_b_batch(servers, intensity):
+    """
+    Calcula la probabilidad de bloqueo (Erlang B) para arrays de parámetros.
+
+    La recursión B(n) = A·B(n-1) / (n + A·B(n-1)) se avanza para todas las celdas
+    a la vez. Las celdas se ordenan por número de servidores para que en cada paso
+    solo se opere sobre el prefijo que aún no ha terminado.
+
+    Args:
+        servers (array-like): Número de servidores/canales (se trunca a entero)
+        intensity (array-like): Intensidad del tráfico en Erlangs
+
+    Returns:
+        np.ndarray: Probabilidades de bloqueo (valores entre 0 y 1) con la forma de la entrada
+    """
+    servers, intensity = np.broadcast_arrays(
+        np.asarray(servers, dtype=float), np.asarray(intensity, dtype=float)
+    )
+    shape = servers.shape
+    flat_servers = servers.ravel()
+    flat_intensity = intensity.ravel()
+    result = np.ones(flat_servers.size)
+
+    if flat_servers.size == 0:
+        return result.reshape(shape)
+
+    invalid = (flat_servers < 0) | (flat_intensity < 0)
+    iterations = np.where(invalid, 0.0, np.trunc(flat_servers))
+
+    if flat_servers.size == 1:
+        result[0] = _erlang_b_scalar(iterations[0], flat_intensity[0])
+    else:
+        order = np.argsort(-iterations, kind='stable')
+        sorted_iterations = iterations[order]
+        sorted_intensity = flat_intensity[order]
+        sorted_b = np.ones(flat_servers.size)
+
+        max_iterate = int(sorted_iterations[0])
+        # Número de celdas activas (servers >= count) para cada paso de la recursión
+        active_counts = np.searchsorted(
+            -sorted_iterations, -np.arange(1, max_iterate + 1), side='right'
+        )
+        for count, active in enumerate(active_counts, start=1):
+            weighted = sorted_intensity[:active] * sorted_b[:active]
+            sorted_b[:active] = weighted / (count + weighted)
+
+        result[order] = sorted_b
+
+    result = np.clip(result, 0.0, 1.0)
+    result[invalid] = 0.0
+    return result.reshape(shape)
+
+
+def erlang_c_batch(servers, intensity):
+    """
+    Calcula la probabilidad de espera (Erlang C) para arrays de parámetros.
+
+    Args:
+        servers (array-like): Número de servidores/agentes
+        intensity (array-like): Intensidad del tráfico en Erlangs
+
+    Returns:
+        np.ndarray: Probabilidades de espera (valores entre 0 y 1)
+    """
+    servers, intensity = np.broadcast_arrays(
+        np.asarray(servers, dtype=float), np.asarray(intensity, dtype=float)
+    )
+    result = np.ones(servers.shape)
+
+    # Con servers <= intensity la cola es inestable y la espera es segura
+    stable = servers > intensity
+    if not stable.any():
+        return result
+
+    s = servers[stable]
+    a = intensity[stable]
+    result[stable] = _erlang_c_from_b(s, a, erlang_b_batch(s, a))
+    return result
+
+
+def _erlang_c_from_b(servers, intensity, blocking):
+    """
+    Obtiene Erlang C a partir de una probabilidad de bloqueo ya calculada.
+
+    Solo es válido para celdas estables (servers > intensity).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denominator = (1 - (intensity / servers) * (1 - blocking))
+        c = np.where(denominator == 0, 1.0, blocking / denominator)
+
+    return np.clip(c, 0.0, 1.0)
+
+
+def _sla_from_c(agents, traffic_rate, wait_probability, service_time, aht):
+    """
+    Obtiene el SLA a partir de la probabilidad de espera de Erlang C.
+
+    Solo es válido para celdas activas (llamadas, agentes y AHT positivos y tráfico < agentes).
+    """
+    exponent = (traffic_rate - agents) * (service_time / aht)
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        sl_queued = 1 - wait_probability * np.exp(exponent)
+    sl_queued = np.where(np.isfinite(sl_queued), sl_queued, 0.0)
+
+    return np.clip(sl_queued, 0.0, 1.0)
+
+
+def sla_batch(agents, service_time, calls_per_hour, aht):
+    """
+    Calcula el Nivel de Servicio (SLA) para arrays de parámetros usando Erlang C.
+
+    Reglas por celda (idénticas a la estrategia escalar):
+        - Sin llamadas el SLA es 1.
+        - Sin agentes, con AHT no positivo o con tráfico >= agentes el SLA es 0.
+
+    Args:
+        agents (array-like): Número de agentes disponibles
+        service_time (array-like): Tiempo objetivo de servicio en segundos
+        calls_per_hour (array-like): Volumen de llamadas por hora
+        aht (array-like): Tiempo promedio de manejo (AHT) en segundos
+
+    Returns:
+        np.ndarray: Porcentaje de llamadas atendidas en tiempo (valores entre 0 y 1)
+    """
+    agents, service_time, calls_per_hour, aht = np.broadcast_arrays(
+        np.asarray(agents, dtype=float),
+        np.asarray(service_time, dtype=float),
+        np.asarray(calls_per_hour, dtype=float),
+        np.asarray(aht, dtype=float),
+    )
+    result = np.zeros(agents.shape)
+    result[calls_per_hour == 0] = 1.0
+
+    traffic_rate = (calls_per_hour * aht) / 3600.0
+    active = (calls_per_hour > 0) & (agents > 0) & (aht > 0) & (traffic_rate < agents)
+    if not active.any():
+        return result
+
+    n = agents[active]
+    a = traffic_rate[active]
+    c = erlang_c_batch(n, a)
+    result[active] = _sla_from_c(n, a, c, service_time[active], aht[active])
+    return result
+
+
+def _agents_required_scalar(target, service_time, aht, traffic_rate, upper):
+    """
+    Recorrido incremental para una única celda con aritmética de Python.
+
+    Reproduce operación a operación el camino vectorizado (misma exponencial de NumPy)
+    para que ambos devuelvan exactamente el mismo número de agentes.
+    """
+    n = math.floor(traffic_rate) + 1.0
+    b = _erlang_b_scalar(n, traffic_rate)
+    ratio = service_time / aht
+    while True:
+        denominator = (1 - (traffic_rate / n) * (1 - b))
+        c = 1.0 if denominator == 0 else min(max(b / denominator, 0.0), 1.0)
+        with np.errstate(over='ignore'):
+            sl_queued = 1 - c * float(np.exp((traffic_rate - n) * ratio))
+        if not math.isfinite(sl_queued):
+            sl_queued = 0.0
+        if min(max(sl_queued, 0.0), 1.0) >= target:
+            return n
+        if n >= upper:
+            return upper
+        n += 1
+        weighted = traffic_rate * b
+        b = weighted / (n + weighted)
+
+
+def agents_required_upper_bound(traffic_rate):
+    """
+    Límite superior de agentes considerado en la búsqueda de agentes requeridos.
+
+    Args:
+        traffic_rate (array-like): Tráfico en Erlangs
+
+    Returns:
+        np.ndarray: Número máximo de agentes a considerar por celda
+    """
+    traffic_rate = np.asarray(traffic_rate, dtype=float)
+    return np.maximum(100.0, np.trunc(traffic_rate) * 2 + 10)
+
+
+def agents_required_batch(target_sla, service_time, calls_per_hour, aht, upper_bound=None):
+    """
+    Calcula el número mínimo de agentes que alcanza el SLA objetivo para arrays de parámetros.
+
+    Recorre N hacia arriba desde el límite inferior del tráfico (el menor entero mayor que A,
+    ya que con N <= A el SLA es 0) y arrastra la recursión B(N) -> B(N+1), deteniéndose en
+    el primer N que cumple el objetivo. Si ni el límite superior alcanza el objetivo se
+    devuelve dicho límite, igual que la búsqueda binaria. Las combinaciones de entrada
+    repetidas (p. ej. intervalos nocturnos idénticos) se resuelven una sola vez.
+
+    Args:
+        target_sla (array-like): SLA objetivo (valores entre 0 y 1)
+        service_time (array-like): Tiempo objetivo de servicio en segundos
+        calls_per_hour (array-like): Volumen de llamadas por hora
+        aht (array-like): Tiempo promedio de manejo (AHT) en segundos
+        upper_bound (array-like): Límite superior de agentes por celda
+            (por defecto agents_required_upper_bound del tráfico)
+
+    Returns:
+        np.ndarray: Número de agentes requeridos (enteros en formato float) con la forma de la entrada
+    """
+    target_sla, service_time, calls_per_hour, aht = np.broadcast_arrays(
+        np.asarray(target_sla, dtype=float),
+        np.asarray(service_time, dtype=float),
+        np.asarray(calls_per_hour, dtype=float),
+        np.asarray(aht, dtype=float),
+    )
+    result = np.zeros(target_sla.shape)
+
+    pending = (calls_per_hour > 0) & (target_sla > 0)
+    if not pending.any():
+        return result
+
+    target = target_sla[pending]
+    t = service_time[pending]
+    h = aht[pending]
+    a = (calls_per_hour[pending] * h) / 3600.0
+    if upper_bound is None:
+        upper = agents_required_upper_bound(a)
+    else:
+        upper = np.broadcast_to(np.asarray(upper_bound, dtype=float), pending.shape)[pending]
+
+    if a.size == 1:
+        result[pending] = _agents_required_scalar(
+            float(target[0]), float(t[0]), float(h[0]), float(a[0]), float(upper[0])
+        )
+        return result
+
+    unique_cells, inverse = np.unique(np.stack([target, t, h, a, upper], axis=1), axis=0, return_inverse=True)
+    target, t, h, a, upper = (np.ascontiguousarray(column) for column in unique_cells.T)
+
+    n = np.floor(a) + 1
+    b = erlang_b_batch(n, a)
+    solution = upper.copy()
+    cells = np.arange(a.size)
+
+    while cells.size:
+        service_level = _sla_from_c(n, a, _erlang_c_from_b(n, a, b), t, h)
+        met = service_level >= target
+        solution[cells[met]] = n[met]
+
+        keep = ~met & (n < upper)
+        cells = cells[keep]
+        target, t, h, a, upper, n, b = (
+            target[keep], t[keep], h[keep], a[keep], upper[keep], n[keep], b[keep]
+        )
+        n = n + 1
+        weighted = a * b
+        b = weighted / (n + weighted)
+
+    result[pending] = solution[inverse.ravel()]
+    return result
+
+
+def traffic_capacity_batch(servers, target_sla, service_time, aht, iterations=60):
+    """
+    Calcula, por bisección vectorizada, el tráfico máximo que N agentes absorben cumpliendo el SLA.
+
+    El SLA es decreciente en el tráfico, así que para cada celda se acota el umbral A* tal que
+    SLA(N, A) >= objetivo si y solo si A <= A*. Se devuelve la horquilla final de la bisección:
+    todo tráfico <= lower cumple y todo tráfico > upper no cumple.
+
+    Args:
+        servers (array-like): Número de agentes
+        target_sla (array-like): SLA objetivo (valores entre 0 y 1)
+        service_time (array-like): Tiempo objetivo de servicio en segundos
+        aht (array-like): Tiempo promedio de manejo (AHT) en segundos
+        iterations (int): Iteraciones de bisección
+
+    Returns:
+        tuple: (lower, upper) como np.ndarray con la forma de la entrada
+    """
+    servers, target_sla, service_time, aht = np.broadcast_arrays(
+        np.asarray(servers, dtype=float),
+        np.asarray(target_sla, dtype=float),
+        np.asarray(service_time, dtype=float),
+        np.asarray(aht, dtype=float),
+    )
+    lower = np.zeros(servers.shape)
+    upper = np.maximum(servers, 0.0)
+
+    for _ in range(iterations):
+        mid = (lower + upper) / 2
+        met = np.zeros(servers.shape, dtype=bool)
+        valid = mid > 0
+        if valid.any():
+            n = servers[valid]
+            a = mid[valid]
+            met[valid] = _sla_from_c(
+                n, a, erlang_c_batch(n, a), service_time[valid], aht[valid]
+            ) >= target_sla[valid]
+        lower = np.where(met, mid, lower)
+        upper = np.where(met, upper, mid)
+
+    return lower, upper
+
+
+def sl_capacity_batch(num_agents, aht, sl_target, sl_time, interval_seconds=1800, iterations=12):
+    """
+    Calcula las llamadas máximas por intervalo que N agentes atienden cumpliendo el SLA.
+
+    Reproduce, para arrays completos, la bisección de 12 pasos sobre el tráfico del
+    calculador del scheduler: cada paso evalúa el SLA de todas las celdas en una sola
+    llamada a sla_batch, con el mismo volumen equivalente (tráfico · 3600 / AHT).
+    Las combinaciones de entrada repetidas se resuelven una sola vez.
+
+    Args:
+        num_agents (array-like): Número de agentes
+        aht (array-like): Tiempo promedio de manejo (AHT) en segundos
+        sl_target (array-like): SLA objetivo (valores entre 0 y 1)
+        sl_time (array-like): Tiempo objetivo de servicio en segundos
+        interval_seconds (array-like): Duración del intervalo en segundos
+        iterations (int): Iteraciones de bisección
+
+    Returns:
+        np.ndarray: Capacidad en llamadas (enteros en formato float) con la forma de la entrada
+    """
+    num_agents, aht, sl_target, sl_time, interval_seconds = np.broadcast_arrays(
+        np.asarray(num_agents, dtype=float),
+        np.asarray(aht, dtype=float),
+        np.asarray(sl_target, dtype=float),
+        np.asarray(sl_time, dtype=float),
+        np.asarray(interval_seconds, dtype=float),
+    )
+    result = np.zeros(num_agents.shape)
+
+    valid = (num_agents > 0) & (aht > 0)
+    if not valid.any():
+        return result
+
+    columns = np.stack([num_agents[valid], aht[valid], sl_target[valid], sl_time[valid], interval_seconds[valid]], axis=1)
+    unique_cells, inverse = np.unique(columns, axis=0, return_inverse=True)
+    n, h, target, t, interval = (np.ascontiguousarray(column) for column in unique_cells.T)
+
+    low = np.zeros(n.size)
+    high = n.copy()
+    best_traffic = np.zeros(n.size)
+    running = np.ones(n.size, dtype=bool)
+
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        running &= mid > 0
+        if not running.any():
+            break
+        calls_equivalent = (mid * 3600) / h
+        met = running & (sla_batch(n, t, calls_equivalent, h) >= target)
+        best_traffic = np.where(met, mid, best_traffic)
+        low = np.where(met, mid, low)
+        high = np.where(running & ~met, mid, high)
+
+    result[valid] = np.floor((best_traffic * interval) / h)[inverse.ravel()]
+    return result
+
+
+def _halfin_whitt_service_level(beta, traffic_rate, service_ratio):
+    """
+    Aproximación de Halfin-Whitt del SLA con N = A + beta·sqrt(A) agentes.
+
+    La probabilidad de espera se aproxima por [1 + beta·Phi(beta)/phi(beta)]^-1.
+    """
+    if beta <= 0:
+        return 0.0
+    cdf = 0.5 * (1 + math.erf(beta / math.sqrt(2)))
+    pdf = math.exp(-beta * beta / 2) / math.sqrt(2 * math.pi)
+    wait_probability = 1 / (1 + beta * cdf / pdf)
+    return 1 - wait_probability * math.exp(-beta * math.sqrt(traffic_rate) * service_ratio)
+
+
+def sqrt_staffing_estimate(traffic_rate, target_sla, service_time, aht, iterations=20):
+    """
+    Estimación analítica de agentes requeridos por square-root staffing (Halfin-Whitt).
+
+    Busca el factor de seguridad beta que hace que la aproximación de Halfin-Whitt alcance
+    el objetivo y devuelve N = ceil(A + beta·sqrt(A)). Sirve como punto de partida de la
+    búsqueda exacta, no como resultado.
+
+    Args:
+        traffic_rate (float): Tráfico en Erlangs
+        target_sla (float): SLA objetivo (valor entre 0 y 1)
+        service_time (float): Tiempo objetivo de servicio en segundos
+        aht (float): Tiempo promedio de manejo en segundos
+        iterations (int): Iteraciones de bisección sobre beta
+
+    Returns:
+        int: Número estimado de agentes
+    """
+    traffic_rate = float(traffic_rate)
+    if traffic_rate <= 0 or aht <= 0:
+        return 1
+    service_ratio = service_time / aht
+    low, high = 0.0, 8.0
+    for _ in range(iterations):
+        beta = (low + high) / 2
+        if _halfin_whitt_service_level(beta, traffic_rate, service_ratio) >= target_sla:
+            high = beta
+        else:
+            low = beta
+    return int(math.ceil(traffic_rate + high * math.sqrt(traffic_rate)))
+
+
+def search_min_agents(meets, estimate, low, high):
+    """
+    Encuentra el menor N en [low, high] con meets(N) verdadero partiendo de una estimación.
+
+    Sondea la estimación y galopa (pasos 1, 2, 4...) hacia abajo o hacia arriba hasta
+    acotar el umbral, y termina con bisección dentro de la horquilla. Con una estimación
+    buena bastan 2-3 sondeos. Supone meets monótona en N.
+
+    Args:
+        meets (callable): Función N -> bool que indica si N agentes cumplen el objetivo
+        estimate (int): Estimación inicial de N
+        low (int): Menor N admisible
+        high (int): Mayor N admisible
+
+    Returns:
+        int | None: Menor N que cumple, o None si ninguno en el rango cumple
+    """
+    if low > high:
+        return None
+    failing = low - 1
+    probe = min(max(int(estimate), low), high)
+    step = 1
+
+    if meets(probe):
+        passing = probe
+        while passing - step > failing:
+            candidate = passing - step
+            if not meets(candidate):
+                failing = candidate
+                break
+            passing = candidate
+            step *= 2
+    else:
+        failing = probe
+        while True:
+            if failing >= high:
+                return None
+            candidate = min(failing + step, high)
+            if meets(candidate):
+                passing = candidate
+                break
+            failing = candidate
+            step *= 2
+
+    while passing - failing > 1:
+        mid = (failing + passing) // 2
+        if meets(mid):
+            passing = mid
+        else:
+            failing = mid
+    return passing
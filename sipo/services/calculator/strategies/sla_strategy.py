@@ -3,9 +3,9 @@ Implementación de la estrategia de cálculo SLA para el patrón Strategy.
 Calcula el Nivel de Servicio (SLA) basado en Erlang C y parámetros operacionales.
 """
 
-import math
+import numpy as np
 from .base_strategy import CalculationStrategy
-from .erlang_c_strategy import ErlangCStrategy
+from .erlang_kernel import erlang_b, erlang_c, sla, sla_batch
 
 
 class SLAStrategy(CalculationStrategy):
@@ -33,30 +33,41 @@ class SLAStrategy(CalculationStrategy):
         if not is_valid:
             raise ValueError(error_msg)
         
-        if calls_per_hour == 0:
-            return 1.0
-        
-        if agents <= 0:
-            return 0.0
-        
-        # Modificado: Permitir AHT = 0 para cálculos especiales
-        # pero mantener la validación para otros casos
+        return sla(agents, service_time, calls_per_hour, aht)
+    
+    def calculate_batch(self, agents, service_time, calls_per_hour, aht, **kwargs):
+        """
+        Calcula el SLA para arrays de agentes, tiempos de servicio, volúmenes y AHT.
+        Los parámetros se difunden entre sí, por lo que pueden mezclarse escalares y arrays.
         
-        traffic_rate = (calls_per_hour * aht) / 3600.0
+        Args:
+            agents (array-like): Número de agentes disponibles por celda
+            service_time (array-like): Tiempo objetivo de servicio en segundos
+            calls_per_hour (array-like): Volumen de llamadas por hora por celda
+            aht (array-like): Tiempo promedio de manejo (AHT) en segundos por celda
+            **kwargs: Argumentos adicionales no utilizados en esta estrategia
+            
+        Returns:
+            np.ndarray: Porcentaje de llamadas atendidas dentro del tiempo objetivo (valores entre 0 y 1)
+        """
+        agents = np.asarray(agents, dtype=float)
+        service_time = np.asarray(service_time, dtype=float)
+        calls_per_hour = np.asarray(calls_per_hour, dtype=float)
+        aht = np.asarray(aht, dtype=float)
         
-        if traffic_rate >= agents:
-            return 0.0
+        if np.any(agents < 0):
+            raise ValueError("El número de agentes no puede ser negativo")
         
-        c = self._calculate_erlang_c(agents, traffic_rate)
+        if np.any(aht <= 0):
+            raise ValueError("El AHT debe ser mayor que cero")
         
-        exponent = (traffic_rate - agents) * (service_time / aht)
+        if np.any(calls_per_hour < 0):
+            raise ValueError("El volumen de llamadas por hora no puede ser negativo")
         
-        try:
-            sl_queued = 1 - c * math.exp(exponent)
-        except OverflowError:
-            sl_queued = 0
+        if np.any(service_time <= 0):
+            raise ValueError("El tiempo de servicio debe ser mayor que cero")
         
-        return max(0.0, min(sl_queued, 1.0))
+        return sla_batch(agents, service_time, calls_per_hour, aht)
     
     def get_name(self):
         """
@@ -110,17 +121,7 @@ class SLAStrategy(CalculationStrategy):
         Returns:
             float: Valor de Erlang C
         """
-        if agents <= intensity:
-            return 1.0
-        
-        b = ErlangCStrategy._calculate_erlang_b(agents, intensity)
-        denominator = (1 - (intensity / agents) * (1 - b))
-        
-        if denominator == 0:
-            return 1.0
-        
-        c = b / denominator
-        return max(0.0, min(c, 1.0))
+        return erlang_c(agents, intensity)
     
     @staticmethod
     def _calculate_erlang_b(servers, intensity):
@@ -134,15 +135,4 @@ class SLAStrategy(CalculationStrategy):
         Returns:
             float: Valor de Erlang B
         """
-        if servers < 0 or intensity < 0:
-            return 0.0
-        
-        max_iterate = int(servers)
-        last = 1.0
-        b = 1.0
-        
-        for count in range(1, max_iterate + 1):
-            b = (intensity * last) / (count + (intensity * last))
-            last = b
-        
-        return max(0.0, min(b, 1.0))
\ No newline at end of file
+        return erlang_b(servers, intensity)
\ No newline at end of file
@@ -0,0 +1,252 @@
+"""
+Tablas precalculadas de agentes requeridos por (objetivo, tiempo de servicio, tramo de AHT).
+Las tablas se generan offline con scripts/build_staffing_tables.py y se cargan con
+numpy.load(mmap_mode='r'), de modo que todos los workers comparten las páginas vía caché del SO.
+"""
+
+import os
+import json
+import bisect
+import threading
+import numpy as np
+from config import Config
+from .erlang_kernel import agents_required_upper_bound, traffic_capacity_batch
+
+MANIFEST_NAME = 'manifest.json'
+
+# Margen relativo alrededor de cada umbral dentro del cual se delega al cálculo exacto
+THRESHOLD_MARGIN = 1e-9
+
+
+def default_tables_dir():
+    """
+    Obtiene el directorio de tablas: STAFFING_TABLES_DIR o instance/staffing_tables en la raíz del proyecto.
+
+    Returns:
+        str: Ruta absoluta del directorio
+    """
+    if Config.STAFFING_TABLES_DIR:
+        return os.path.abspath(Config.STAFFING_TABLES_DIR)
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+    return os.path.join(project_root, 'instance', 'staffing_tables')
+
+
+def table_key(target_sla, service_time):
+    """
+    Normaliza el par (objetivo, tiempo de servicio) usado como clave de tabla.
+    """
+    return round(float(target_sla), 4), round(float(service_time), 4)
+
+
+def table_filename(target_sla, service_time):
+    """
+    Nombre del archivo .npy de una tabla, con la misma precisión que table_key (4 decimales),
+    de modo que dos claves distintas nunca comparten archivo: 0.8/20 -> 'capacity_sla8000_t20.npy'.
+    """
+    target_sla, service_time = table_key(target_sla, service_time)
+    return f"capacity_sla{int(round(target_sla * 10000)):04d}_t{service_time:g}.npy"
+
+
+def build_capacity_table(target_sla, service_time, aht_buckets, max_agents, iterations=60):
+    """
+    Calcula la tabla de capacidades para un par (objetivo, tiempo de servicio).
+
+    Para cada tramo de AHT y cada N en 0..max_agents guarda la horquilla [lower, upper] del
+    tráfico máximo que N agentes absorben cumpliendo el objetivo.
+
+    Args:
+        target_sla (float): SLA objetivo (0 < objetivo < 1)
+        service_time (float): Tiempo objetivo de servicio en segundos
+        aht_buckets (array-like): AHT representativo de cada tramo, en orden creciente
+        max_agents (int): Número máximo de agentes cubierto por la tabla
+        iterations (int): Iteraciones de bisección
+
+    Returns:
+        np.ndarray: Array (2, tramos, max_agents + 1) con las cotas inferior y superior
+    """
+    aht_buckets = np.asarray(aht_buckets, dtype=float)
+    servers = np.arange(max_agents + 1, dtype=float)[None, :]
+    lower, upper = traffic_capacity_batch(
+        servers, target_sla, service_time, aht_buckets[:, None], iterations=iterations
+    )
+    # N = 0 nunca cumple un objetivo positivo
+    lower[:, 0] = -1.0
+    upper[:, 0] = -1.0
+    return np.stack([lower, upper])
+
+
+class StaffingTableStore:
+    """
+    Acceso de solo lectura a las tablas precalculadas de un directorio.
+
+    La consulta usa los tramos de AHT inmediatamente inferior y superior al AHT real:
+    como los agentes requeridos crecen con el AHT, si ambos tramos coinciden ese es el
+    resultado exacto. Si discrepan, el tráfico cae cerca de un umbral o la entrada queda
+    fuera de tabla, se devuelve None y el llamador usa la estrategia de cálculo.
+    """
+
+    def __init__(self, directory):
+        """
+        Carga el manifiesto y mapea en memoria las tablas del directorio.
+
+        Args:
+            directory (str): Directorio que contiene manifest.json y los ficheros .npy
+        """
+        self.directory = directory
+        self._tables = {}
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        for entry in manifest.get('tables', []):
+            key = table_key(entry['target_sla'], entry['service_time'])
+            capacities = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+            self._tables[key] = ([float(a) for a in entry['aht_buckets']], capacities)
+
+    def available_tables(self):
+        """
+        Lista los pares (objetivo, tiempo de servicio) disponibles.
+
+        Returns:
+            list: Lista de tuplas (target_sla, service_time)
+        """
+        return sorted(self._tables.keys())
+
+    def lookup(self, target_sla, service_time, calls_per_hour, aht):
+        """
+        Consulta los agentes requeridos para una celda.
+
+        Args:
+            target_sla (float): SLA objetivo
+            service_time (float): Tiempo objetivo de servicio en segundos
+            calls_per_hour (float): Volumen de llamadas por hora
+            aht (float): Tiempo promedio de manejo en segundos
+
+        Returns:
+            int | None: Agentes requeridos, o None si la tabla no puede responder con exactitud
+        """
+        table = self._tables.get(table_key(target_sla, service_time))
+        if table is None:
+            return None
+        aht_buckets, capacities = table
+
+        aht = float(aht)
+        hi_index = bisect.bisect_left(aht_buckets, aht)
+        if hi_index >= len(aht_buckets) or aht < aht_buckets[0]:
+            return None
+        lo_index = hi_index if aht_buckets[hi_index] == aht else hi_index - 1
+
+        traffic = (calls_per_hour * aht) / 3600.0
+        agents_lo = self._agents_for_bucket(capacities, lo_index, traffic)
+        agents_hi = self._agents_for_bucket(capacities, hi_index, traffic)
+        if agents_lo is None or agents_lo != agents_hi:
+            return None
+        if agents_lo > float(agents_required_upper_bound(traffic)):
+            return None
+        return agents_lo
+
+    def lookup_batch(self, target_sla, service_time, calls_per_hour, aht):
+        """
+        Consulta vectorizada de agentes requeridos.
+
+        Args:
+            target_sla (array-like): SLA objetivo
+            service_time (array-like): Tiempo objetivo de servicio en segundos
+            calls_per_hour (array-like): Volumen de llamadas por hora
+            aht (array-like): Tiempo promedio de manejo en segundos
+
+        Returns:
+            np.ndarray: Agentes requeridos por celda, NaN donde la tabla no responde con exactitud
+        """
+        target_sla, service_time, calls_per_hour, aht = np.broadcast_arrays(
+            np.asarray(target_sla, dtype=float),
+            np.asarray(service_time, dtype=float),
+            np.asarray(calls_per_hour, dtype=float),
+            np.asarray(aht, dtype=float),
+        )
+        result = np.full(target_sla.shape, np.nan)
+        traffic = (calls_per_hour * aht) / 3600.0
+
+        pairs = np.unique(np.stack([target_sla.ravel(), service_time.ravel()], axis=1), axis=0)
+        for target_value, time_value in pairs:
+            table = self._tables.get(table_key(target_value, time_value))
+            if table is None:
+                continue
+            aht_buckets, capacities = table
+            buckets = np.asarray(aht_buckets)
+            in_group = (target_sla == target_value) & (service_time == time_value)
+            in_range = in_group & (aht >= buckets[0]) & (aht <= buckets[-1])
+
+            hi_index = np.searchsorted(buckets, aht, side='left')
+            exact = in_range & (buckets[np.minimum(hi_index, buckets.size - 1)] == aht)
+            lo_index = np.where(exact, hi_index, hi_index - 1)
+
+            agents_lo = np.full(result.shape, np.nan)
+            agents_hi = np.full(result.shape, np.nan)
+            for bucket_index in np.unique(np.concatenate([lo_index[in_range], hi_index[in_range]])):
+                for target_agents, indices in ((agents_lo, lo_index), (agents_hi, hi_index)):
+                    cells = in_range & (indices == bucket_index)
+                    if cells.any():
+                        target_agents[cells] = self._agents_for_bucket_batch(
+                            capacities, int(bucket_index), traffic[cells]
+                        )
+
+            agree = in_range & (agents_lo == agents_hi)
+            agree &= agents_lo <= agents_required_upper_bound(traffic)
+            result[agree] = agents_lo[agree]
+
+        return result
+
+    @staticmethod
+    def _agents_for_bucket_batch(capacities, bucket_index, traffic):
+        """
+        Versión vectorizada de _agents_for_bucket; NaN donde la respuesta es ambigua o fuera de tabla.
+        """
+        lower = np.asarray(capacities[0, bucket_index])
+        upper = np.asarray(capacities[1, bucket_index])
+        agents = np.searchsorted(lower, traffic, side='left')
+        inside = agents < lower.shape[0]
+        safe = np.minimum(agents, lower.shape[0] - 1)
+        margin = THRESHOLD_MARGIN * np.maximum(1.0, traffic)
+        clear = inside & (traffic <= lower[safe] - margin)
+        clear &= (agents == 0) | (traffic > upper[np.maximum(safe - 1, 0)] + margin)
+        return np.where(clear, agents.astype(float), np.nan)
+
+    @staticmethod
+    def _agents_for_bucket(capacities, bucket_index, traffic):
+        """
+        Menor N cuya capacidad cubre el tráfico en un tramo, o None si es ambiguo o fuera de tabla.
+        """
+        lower = capacities[0, bucket_index]
+        upper = capacities[1, bucket_index]
+        agents = int(np.searchsorted(lower, traffic, side='left'))
+        if agents >= lower.shape[0]:
+            return None
+        margin = THRESHOLD_MARGIN * max(1.0, traffic)
+        # El tráfico debe quedar claramente por debajo del umbral de N y por encima del de N-1
+        if traffic > float(lower[agents]) - margin:
+            return None
+        if agents > 0 and traffic <= float(upper[agents - 1]) + margin:
+            return None
+        return agents
+
+
+_store = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+
+def get_staffing_tables():
+    """
+    Obtiene el almacén de tablas del proceso, o None si no hay tablas construidas.
+
+    Returns:
+        StaffingTableStore | None: Almacén cargado perezosamente la primera vez
+    """
+    global _store, _store_loaded
+    if not _store_loaded:
+        with _store_lock:
+            if not _store_loaded:
+                directory = default_tables_dir()
+                if Config.STAFFING_TABLES_ENABLED and os.path.exists(os.path.join(directory, MANIFEST_NAME)):
+                    _store = StaffingTableStore(directory)
+                _store_loaded = True
+    return _store
@@ -63,6 +63,21 @@ class StrategyContext:
         strategy = self.get_strategy(strategy_type)
         return strategy.calculate(*args, **kwargs)
     
+    def calculate_batch(self, strategy_type: str, *args, **kwargs):
+        """
+        Ejecuta el cálculo vectorizado utilizando la estrategia especificada.
+        
+        Args:
+            strategy_type (str): Tipo de estrategia a utilizar
+            *args: Arrays (o escalares difundibles) con los parámetros del cálculo
+            **kwargs: Argumentos de palabra clave para el cálculo
+            
+        Returns:
+            np.ndarray: Resultados del cálculo con la forma de los parámetros de entrada
+        """
+        strategy = self.get_strategy(strategy_type)
+        return strategy.calculate_batch(*args, **kwargs)
+    
     def get_available_strategies(self):
         """
         Obtiene la lista de estrategias disponibles.
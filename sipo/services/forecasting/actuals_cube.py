@@ -0,0 +1,437 @@
+"""
+Cubo de datos reales (fecha × intervalo) por segmento.
+ActualsData guarda un JSON por (segmento, día); aquí se mantiene, a partir de esos mismos datos,
+una matriz de volumen y otra de AHT por segmento (una fila por día, una columna por intervalo)
+guardadas como arrays .npy bajo instance/actuals_cubes/<segment_id>. Cada carga de reales
+actualiza el cubo (las fechas nuevas se añaden y las existentes se sustituyen), y los análisis
+de forecasting leen cualquier ventana de fechas con numpy.load(mmap_mode='r') y un corte por
+búsqueda binaria, sin subir ni parsear ningún Excel.
+
+ActualsData sigue siendo la fuente de verdad: el cubo se puede reconstruir desde la tabla, y
+meta.json guarda la huella de ActualsData con la que está al día (source) para detectar escrituras
+que no pasan por el cubo.
+"""
+
+import os
+import re
+import json
+import shutil
+import logging
+import datetime
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from config import Config
+from utils import json_codec
+from utils.file_lock import file_lock
+from utils.lru_cache import BoundedLRUCache
+from .dataset_registry import DatasetNotFoundError, select_days
+
+logger = logging.getLogger(__name__)
+
+META_NAME = 'meta.json'
+ARRAY_NAMES = ('fecha', 'volumen', 'aht')
+
+# Claves del JSON de ActualsData con el volumen ofrecido y el AHT de cada intervalo
+VOLUME_KEYS = ('entrantes', 'llamadas', 'calls', 'volumen')
+AHT_KEYS = ('aht',)
+
+LABEL_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})')
+
+# Cubos abiertos (arrays mapeados) que se mantienen en memoria
+OPEN_CUBES = 16
+
+
+def default_cubes_dir():
+    """
+    Obtiene el directorio de los cubos: ACTUALS_CUBES_DIR o instance/actuals_cubes en la raíz del proyecto.
+
+    Returns:
+        str: Ruta absoluta del directorio
+    """
+    if Config.ACTUALS_CUBES_DIR:
+        return os.path.abspath(Config.ACTUALS_CUBES_DIR)
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    return os.path.join(project_root, 'instance', 'actuals_cubes')
+
+
+def _number(value):
+    """
+    Convierte un valor del JSON de reales a float (NaN si falta).
+    """
+    if value is None or value == '':
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Valor no numérico en los datos reales: {value!r}")
+
+
+def _label(key):
+    """
+    Normaliza la etiqueta de un intervalo a 'HH:MM' (las claves no horarias se conservan).
+    """
+    match = LABEL_PATTERN.match(str(key).strip())
+    if match is None:
+        return str(key).strip()
+    return f"{int(match.group(1)):02d}:{match.group(2)}"
+
+
+def parse_actuals_day(actuals):
+    """
+    Lee los datos reales de un día en el formato de ActualsData.
+
+    Args:
+        actuals (str | dict): JSON {intervalo: {'entrantes': .., 'aht': .., ...}} o {intervalo: volumen}
+
+    Returns:
+        dict: {etiqueta 'HH:MM': (volumen, aht)}, con NaN en los valores que faltan
+
+    Raises:
+        ValueError: Si el documento no es un objeto o contiene valores no numéricos
+    """
+    if isinstance(actuals, (str, bytes)):
+        actuals = json_codec.loads(actuals)
+    if not isinstance(actuals, dict):
+        raise ValueError("Los datos reales de un día deben ser un objeto {intervalo: valores}.")
+
+    values = {}
+    for key, cell in actuals.items():
+        if isinstance(cell, dict):
+            volume = next((cell[k] for k in VOLUME_KEYS if cell.get(k) is not None), None)
+            aht = next((cell[k] for k in AHT_KEYS if cell.get(k) is not None), None)
+        else:
+            volume, aht = cell, None
+        values[_label(key)] = (_number(volume), _number(aht))
+    return values
+
+
+def parse_actuals_days(days):
+    """
+    Lee y valida los datos reales de varios días.
+
+    Args:
+        days (dict): {fecha: datos del día en el formato de ActualsData (JSON o dict)}
+
+    Returns:
+        dict: {fecha datetime64[D]: {etiqueta 'HH:MM': (volumen, aht)}}
+
+    Raises:
+        ValueError: Si algún día no es un objeto o contiene valores no numéricos
+    """
+    return {
+        np.datetime64(pd.Timestamp(date).date(), 'D'): parse_actuals_day(actuals)
+        for date, actuals in days.items()
+    }
+
+
+class ActualsCube:
+    """
+    Cubo de reales de un segmento, con sus matrices mapeadas en memoria (solo lectura).
+    Cada escritura genera una nueva generación de archivos, de modo que un cubo abierto
+    sigue leyendo una versión coherente aunque otra petición lo actualice.
+    """
+
+    def __init__(self, directory, meta):
+        """
+        Args:
+            directory (str): Directorio del cubo
+            meta (dict): Metadatos leídos de meta.json
+        """
+        self.directory = directory
+        self.meta = meta
+        self.segment_id = meta['segment_id']
+        self.generation = meta['generation']
+        self.labels = np.asarray(meta['labels'], dtype=object)
+        self.fecha, self.volumen, self.aht = (
+            np.load(os.path.join(directory, f'{name}.{self.generation}.npy'), mmap_mode='r')
+            for name in ARRAY_NAMES
+        )
+
+    def __len__(self):
+        return len(self.fecha)
+
+    def window(self, start=None, end=None, last_days=None, month_day=None, dates=None):
+        """
+        Obtiene las matrices de los días seleccionados.
+
+        Args:
+            start, end: Primer y último día incluidos
+            last_days (int): Solo los últimos N días hasta la fecha máxima
+            month_day (tuple): (mes, día) de cualquier año
+            dates (iterable): Días concretos
+
+        Returns:
+            tuple: (fechas datetime64[D], volumen (días × intervalos), aht (días × intervalos)), con NaN donde no hay dato
+        """
+        rows = select_days(self.fecha, start, end, last_days, month_day, dates)
+        return (
+            np.array(self.fecha[rows]),
+            np.array(self.volumen[rows], dtype=np.float64),
+            np.array(self.aht[rows], dtype=np.float64),
+        )
+
+    def frame(self, start=None, end=None, last_days=None, month_day=None, dates=None):
+        """
+        Construye el DataFrame (Fecha, Intervalo, Llamadas Ofrecidas, AHT) de los días seleccionados,
+        con una fila por intervalo con volumen registrado, en el mismo formato que HistoricalDataset.frame.
+
+        Returns:
+            pd.DataFrame: Histórico ordenado por fecha e intervalo
+        """
+        fecha, volumen, aht = self.window(start, end, last_days, month_day, dates)
+        present = ~np.isnan(volumen)
+        day_idx, col_idx = np.nonzero(present)
+        return pd.DataFrame({
+            'Fecha': fecha[day_idx].astype('datetime64[ns]'),
+            'Intervalo': self.labels[col_idx],
+            'Llamadas Ofrecidas': volumen[present],
+            'AHT': aht[present],
+        })
+
+
+class ActualsCubeStore:
+    """
+    Cubos de reales en disco, uno por segmento.
+    Las escrituras de un segmento se serializan entre hilos y entre procesos (file_lock sobre
+    <segment_id>.lock); los lectores nunca ven un cubo a medias porque meta.json (que apunta
+    a la generación vigente) se sustituye de forma atómica.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Directorio raíz de los cubos
+        """
+        self.directory = directory
+        self._open = BoundedLRUCache(maxsize=OPEN_CUBES, policy='lru')
+        self._lock = threading.Lock()
+
+    def _path(self, segment_id):
+        """
+        Obtiene el directorio del cubo de un segmento.
+        """
+        return os.path.join(self.directory, str(int(segment_id)))
+
+    def _segment_lock(self, segment_id):
+        """
+        Bloqueo exclusivo entre procesos sobre el cubo de un segmento durante una lectura-fusión-escritura.
+        El archivo de bloqueo está junto al directorio del segmento (no dentro) para que siga siendo
+        el mismo aunque el directorio se borre y se vuelva a crear.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        return file_lock(self._path(segment_id) + '.lock')
+
+    def info(self, segment_id):
+        """
+        Obtiene los metadatos del cubo de un segmento, o None si todavía no existe.
+        """
+        return self._read_meta(self._path(segment_id))
+
+    def open(self, segment_id):
+        """
+        Abre el cubo de un segmento (o reutiliza el abierto si sigue siendo la generación vigente).
+
+        Returns:
+            ActualsCube: Cubo con las matrices mapeadas
+
+        Raises:
+            DatasetNotFoundError: Si el segmento no tiene datos reales en el cubo
+        """
+        path = self._path(segment_id)
+        key = int(segment_id)
+        with self._lock:
+            meta = self._read_meta(path)
+            if meta is None:
+                raise DatasetNotFoundError(f"No hay datos reales registrados para el segmento {segment_id}")
+            cube = self._open.get(key)
+            if cube is None or cube.generation != meta['generation']:
+                cube = ActualsCube(path, meta)
+                self._open.put(key, cube)
+            return cube
+
+    def append(self, segment_id, days, source=None):
+        """
+        Incorpora los datos reales de varios días al cubo del segmento. Los días nuevos se añaden
+        y los que ya existían se sustituyen por completo; los intervalos nuevos amplían las columnas.
+
+        Args:
+            segment_id (int): Segmento
+            days (dict): {fecha: datos del día en el formato de ActualsData (JSON o dict)}
+            source (dict): Huella de ActualsData que refleja el cubo tras la carga (None si no se conoce)
+
+        Returns:
+            dict: Metadatos del cubo actualizado (None si no había días ni cubo)
+
+        Raises:
+            ValueError: Si algún día contiene valores no válidos (el cubo no se modifica)
+        """
+        return self.append_parsed(segment_id, parse_actuals_days(days), source)
+
+    def append_parsed(self, segment_id, parsed, source=None):
+        """
+        Igual que append, con los días ya leídos por parse_actuals_days.
+
+        Returns:
+            dict: Metadatos del cubo actualizado (None si no había días ni cubo)
+        """
+        with self._lock, self._segment_lock(segment_id):
+            current = self._load_arrays(segment_id)
+            return self._write(segment_id, parsed, current, source)
+
+    def rebuild(self, segment_id, days, source=None):
+        """
+        Regenera el cubo del segmento solo con los días indicados (p. ej., todos los de ActualsData).
+
+        Args:
+            segment_id (int): Segmento
+            days (dict): {fecha: datos del día en el formato de ActualsData (JSON o dict)}
+            source (dict): Huella de ActualsData de la que se han leído los días
+
+        Returns:
+            dict: Metadatos del cubo (None si no había días)
+        """
+        parsed = parse_actuals_days(days)
+        with self._lock, self._segment_lock(segment_id):
+            if not parsed:
+                self._remove(segment_id)
+                return None
+            return self._write(segment_id, parsed, None, source)
+
+    def delete(self, segment_id):
+        """
+        Elimina el cubo de un segmento.
+
+        Raises:
+            DatasetNotFoundError: Si el segmento no tiene cubo
+        """
+        with self._lock, self._segment_lock(segment_id):
+            if not self._remove(segment_id):
+                raise DatasetNotFoundError(f"No hay datos reales registrados para el segmento {segment_id}")
+
+    def _remove(self, segment_id):
+        """
+        Borra el directorio del cubo y lo saca de los abiertos. Devuelve si existía.
+        """
+        path = self._path(segment_id)
+        self._open.pop(int(segment_id))
+        if not os.path.isdir(path):
+            return False
+        shutil.rmtree(path)
+        return True
+
+    def _load_arrays(self, segment_id):
+        """
+        Lee en memoria la generación vigente del cubo, o None si no existe.
+        """
+        path = self._path(segment_id)
+        meta = self._read_meta(path)
+        if meta is None:
+            return None
+        fecha, volumen, aht = (
+            np.load(os.path.join(path, f"{name}.{meta['generation']}.npy")) for name in ARRAY_NAMES
+        )
+        return meta, fecha, volumen, aht
+
+    def _write(self, segment_id, parsed, current, source=None):
+        """
+        Fusiona los días leídos con la generación actual y publica la siguiente generación.
+        """
+        if not parsed:
+            return current[0] if current is not None else None
+
+        path = self._path(segment_id)
+        previous = self._read_meta(path)
+        if current is None:
+            old_fecha = np.array([], dtype='datetime64[D]')
+            old_labels, old_volumen, old_aht = [], np.empty((0, 0)), np.empty((0, 0))
+        else:
+            _, old_fecha, old_volumen, old_aht = current
+            old_labels = previous['labels']
+
+        new_fecha = np.array(sorted(parsed), dtype='datetime64[D]')
+        labels = sorted(set(old_labels).union(*(day.keys() for day in parsed.values())))
+        col = {label: i for i, label in enumerate(labels)}
+
+        fecha = np.union1d(old_fecha, new_fecha)
+        volumen = np.full((len(fecha), len(labels)), np.nan)
+        aht = np.full((len(fecha), len(labels)), np.nan)
+
+        # Días anteriores (columnas reubicadas si aparecen intervalos nuevos)
+        if len(old_fecha):
+            rows = np.searchsorted(fecha, old_fecha)
+            cols = np.array([col[label] for label in old_labels], dtype=np.intp)
+            volumen[np.ix_(rows, cols)] = old_volumen
+            aht[np.ix_(rows, cols)] = old_aht
+
+        # Días cargados: sustituyen la fila completa
+        rows = np.searchsorted(fecha, new_fecha)
+        volumen[rows] = np.nan
+        aht[rows] = np.nan
+        for row, date in zip(rows, new_fecha):
+            for label, (volume, handle_time) in parsed[date].items():
+                volumen[row, col[label]] = volume
+                aht[row, col[label]] = handle_time
+
+        generation = (previous['generation'] if previous else 0) + 1
+        meta = {
+            'segment_id': int(segment_id),
+            'generation': generation,
+            'days': int(len(fecha)),
+            'start_date': str(fecha[0]),
+            'end_date': str(fecha[-1]),
+            'labels': labels,
+            'source': source,
+            'updated_at': datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+        os.makedirs(path, exist_ok=True)
+        for array_name, array in zip(ARRAY_NAMES, (fecha, volumen, aht)):
+            np.save(os.path.join(path, f'{array_name}.{generation}.npy'), array)
+        fd, tmp_meta = tempfile.mkstemp(dir=path, prefix='.meta-', suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta, os.path.join(path, META_NAME))
+
+        # Los cubos abiertos mantienen sus arrays mapeados aunque se borren los archivos
+        if previous is not None:
+            for array_name in ARRAY_NAMES:
+                try:
+                    os.remove(os.path.join(path, f"{array_name}.{previous['generation']}.npy"))
+                except OSError:
+                    pass
+
+        logger.info(f"Cubo de reales del segmento {segment_id} actualizado: {len(parsed)} días cargados, "
+                    f"{meta['days']} días ({meta['start_date']} - {meta['end_date']})")
+        return meta
+
+    @staticmethod
+    def _read_meta(path):
+        """
+        Lee meta.json de un cubo, o None si no existe.
+        """
+        try:
+            with open(os.path.join(path, META_NAME), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_actuals_cube_store():
+    """
+    Obtiene el almacén de cubos de reales del proceso, creándolo desde Config la primera vez.
+
+    Returns:
+        ActualsCubeStore: Almacén compartido
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ActualsCubeStore(default_cubes_dir())
+    return _instance
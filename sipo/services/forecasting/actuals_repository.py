@@ -0,0 +1,97 @@
+"""
+Módulo de repositorio de datos reales (actuals).
+Contiene la lógica de persistencia de ActualsData (un JSON por segmento y día).
+"""
+
+import logging
+from utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+class ActualsRepository:
+    """
+    Gestiona la persistencia de los datos reales por intervalo en la base de datos.
+    """
+
+    def save_days(self, segment_id, days):
+        """
+        Guarda (o sustituye) los datos reales de varios días de un segmento.
+
+        Args:
+            segment_id: ID del segmento
+            days (dict): {fecha (date): {intervalo: valores}}
+
+        Returns:
+            int: Número de días guardados
+        """
+        try:
+            from models import db, ActualsData
+
+            existing = {
+                row.result_date: row
+                for row in ActualsData.query.filter(
+                    ActualsData.segment_id == segment_id,
+                    ActualsData.result_date.in_(list(days))
+                ).all()
+            }
+            for date, actuals in days.items():
+                text = actuals if isinstance(actuals, str) else json_codec.dumps(actuals)
+                if date in existing:
+                    existing[date].actuals_data = text
+                else:
+                    db.session.add(ActualsData(result_date=date, segment_id=segment_id, actuals_data=text))
+
+            db.session.commit()
+            logger.info(f"Datos reales guardados: segmento {segment_id}, {len(days)} días")
+            return len(days)
+
+        except Exception as e:
+            logger.error(f"Error guardando datos reales: {e}")
+            from models import db
+            db.session.rollback()
+            raise
+
+    def get_days(self, segment_id):
+        """
+        Obtiene todos los datos reales de un segmento.
+
+        Args:
+            segment_id: ID del segmento
+
+        Returns:
+            dict: {fecha (date): JSON del día}
+        """
+        from models import ActualsData
+
+        rows = ActualsData.query.filter_by(segment_id=segment_id).with_entities(
+            ActualsData.result_date, ActualsData.actuals_data
+        ).all()
+        return {result_date: actuals_data for result_date, actuals_data in rows}
+
+    def get_fingerprint(self, segment_id):
+        """
+        Obtiene una huella de los datos reales de un segmento con una sola consulta agregada.
+        Cambia al añadir o borrar días y, salvo coincidencia de tamaño, al sustituir el JSON de un día,
+        también cuando la escritura no pasa por este repositorio (p. ej., la aplicación legacy).
+
+        Args:
+            segment_id: ID del segmento
+
+        Returns:
+            dict: {'rows', 'max_id', 'last_date', 'size'} (serializable a JSON)
+        """
+        from models import db, ActualsData
+
+        rows, max_id, last_date, size = db.session.query(
+            db.func.count(ActualsData.id),
+            db.func.max(ActualsData.id),
+            db.func.max(ActualsData.result_date),
+            db.func.sum(db.func.length(ActualsData.actuals_data)),
+        ).filter(ActualsData.segment_id == segment_id).one()
+        return {
+            'rows': int(rows or 0),
+            'max_id': int(max_id) if max_id is not None else None,
+            'last_date': str(last_date) if last_date is not None else None,
+            'size': int(size or 0),
+        }
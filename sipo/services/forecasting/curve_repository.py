@@ -4,8 +4,8 @@ Contiene la lógica de persistencia para curvas en la base de datos.
 """
 
 import datetime
-import json
 import logging
+from utils import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +58,7 @@ class CurveRepository:
                     forecast_curve.set_curve_for_day(day_index, curve_data)
             
             # Guardar metadatos
-            forecast_curve.time_labels = json.dumps(time_labels)
+            forecast_curve.time_labels = json_codec.dumps(time_labels)
             forecast_curve.weeks_analyzed = weeks_analyzed
             forecast_curve.analysis_date_range = date_range
             forecast_curve.created_at = datetime.datetime.utcnow()
@@ -208,13 +208,12 @@ class CurveRepository:
         """
         try:
             from models import db, DimensioningScenario
-            import json
             
-            forecast_json = json.dumps(timeframe_data)
+            forecast_json = json_codec.dumps(timeframe_data)
             
             scenario = DimensioningScenario(
                 segment_id=segment_id,
-                parameters=json.dumps({"name": name, "type": "forecast_import"}),
+                parameters=json_codec.dumps({"name": name, "type": "forecast_import"}),
                 agents_online=forecast_json, 
                 id_legal=user_info.get('id_legal') if user_info else None,
                 username=user_info.get('username') if user_info else None,
@@ -238,7 +237,6 @@ class CurveRepository:
         try:
             from models import db, ForecastedDistribution
             import datetime
-            import json
 
             # Convertir output_rows a un formato almacenables eficiente (JSON {date: {time: vol}})
             # output_rows es una lista de dicts con 'Fecha', 'Dia', etc. y luego columas de tiempo.
@@ -299,8 +297,8 @@ class CurveRepository:
                 segment_id=segment_id,
                 start_date=start_date,
                 end_date=end_date,
-                distribution_data=json.dumps(dist_map),
-                time_labels=json.dumps(time_labels),
+                distribution_data=json_codec.dumps(dist_map),
+                time_labels=json_codec.dumps(time_labels),
                 id_legal=user_info.get('idLegal') or user_info.get('id_legal') if user_info else None,
                 username=user_info.get('username') if user_info else None,
                 curve_id=curve_id,
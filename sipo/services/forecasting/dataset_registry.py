@@ -0,0 +1,385 @@
+"""
+Registro de históricos de forecasting ya normalizados.
+Un histórico se sube una vez por segmento: se parsea (pd.read_excel + prepare_historical_dataframe),
+se reduce a tres columnas (fecha, intervalo, volumen) ordenadas por fecha e intervalo y se guarda
+como arrays .npy bajo instance/historical_datasets/<dataset_id>. Los análisis reciben después el
+dataset_id y leen los arrays con numpy.load(mmap_mode='r'), filtrando por fechas antes de construir
+el DataFrame, en lugar de volver a parsear el Excel en cada petición.
+"""
+
+import io
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import datetime
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from config import Config
+from utils.lru_cache import BoundedLRUCache
+from utils.upload_cache import read_source_bytes
+from .excel_parser import ExcelParserUtils
+
+logger = logging.getLogger(__name__)
+
+META_NAME = 'meta.json'
+ARRAY_NAMES = ('fecha', 'intervalo', 'volumen')
+
+# <segment_id>-<16 hex del SHA-256 del archivo>
+DATASET_ID_PATTERN = re.compile(r'^\d+-[0-9a-f]{16}$')
+
+# Datasets abiertos (arrays mapeados) que se mantienen en memoria
+OPEN_DATASETS = 16
+
+
+class DatasetNotFoundError(LookupError):
+    """
+    El dataset_id no corresponde a ningún histórico registrado.
+    """
+
+
+def default_datasets_dir():
+    """
+    Obtiene el directorio del registro: HISTORICAL_DATASETS_DIR o instance/historical_datasets en la raíz del proyecto.
+
+    Returns:
+        str: Ruta absoluta del directorio
+    """
+    if Config.HISTORICAL_DATASETS_DIR:
+        return os.path.abspath(Config.HISTORICAL_DATASETS_DIR)
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    return os.path.join(project_root, 'instance', 'historical_datasets')
+
+
+def normalize_history(df_raw):
+    """
+    Normaliza un histórico leído del Excel a arrays columnares ordenados por fecha e intervalo.
+
+    Los históricos diarios (sin columna de intervalo) se guardan con un único intervalo '00:00'.
+
+    Args:
+        df_raw (pd.DataFrame): Hoja sin procesar
+
+    Returns:
+        tuple: (fecha datetime64[D], intervalo int16 (índice en labels), volumen float64, labels, has_intervals)
+
+    Raises:
+        ValueError: Si el archivo no tiene fecha y volumen reconocibles
+    """
+    try:
+        df = ExcelParserUtils.prepare_historical_dataframe(df_raw)
+        has_intervals = True
+    except ValueError:
+        df = ExcelParserUtils.prepare_historical_dataframe(df_raw, required_cols=['Fecha', 'Llamadas Ofrecidas'])
+        has_intervals = 'Intervalo' in df.columns
+
+    if not pd.api.types.is_datetime64_any_dtype(df['Fecha']):
+        # Fechas leídas como texto (prepare_historical_dataframe solo las convierte al pivotar)
+        df = df.assign(Fecha=pd.to_datetime(df['Fecha'], errors='coerce', dayfirst=True)).dropna(subset=['Fecha'])
+    if df.empty:
+        raise ValueError("No se encontraron fechas válidas en el archivo histórico.")
+
+    intervals = df['Intervalo'].astype(str) if has_intervals else pd.Series('00:00', index=df.index)
+    labels, codes = np.unique(intervals.to_numpy(), return_inverse=True)
+    fecha = df['Fecha'].to_numpy().astype('datetime64[D]')
+    volumen = pd.to_numeric(df['Llamadas Ofrecidas'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+    order = np.lexsort((codes, fecha))
+    return fecha[order], codes[order].astype(np.int16), volumen[order], [str(l) for l in labels], has_intervals
+
+
+def filter_history(df, start=None, end=None, last_days=None, month_day=None, dates=None):
+    """
+    Aplica sobre un DataFrame histórico los mismos filtros que HistoricalDataset.frame.
+
+    Args:
+        df (pd.DataFrame): Histórico preparado (columna Fecha datetime)
+        start, end: Primer y último día incluidos
+        last_days (int): Solo los últimos N días hasta la fecha máxima
+        month_day (tuple): (mes, día) de cualquier año
+        dates (iterable): Días concretos
+
+    Returns:
+        pd.DataFrame: Filas seleccionadas
+    """
+    if all(value is None for value in (start, end, last_days, month_day, dates)):
+        return df
+    fecha = df['Fecha']
+    mask = pd.Series(True, index=df.index)
+    if last_days:
+        max_date = fecha.max()
+        if pd.notna(max_date):
+            mask &= fecha >= max_date - pd.to_timedelta(last_days - 1, unit='d')
+    if start is not None:
+        mask &= fecha >= pd.Timestamp(start).normalize()
+    if end is not None:
+        mask &= fecha < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    if month_day is not None:
+        mask &= (fecha.dt.month == month_day[0]) & (fecha.dt.day == month_day[1])
+    if dates is not None:
+        mask &= fecha.dt.normalize().isin(pd.to_datetime(list(dates)))
+    return df[mask].copy()
+
+
+def _day(value):
+    """
+    Convierte una fecha (str, date, Timestamp) a datetime64[D].
+    """
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+def select_days(fecha, start=None, end=None, last_days=None, month_day=None, dates=None):
+    """
+    Selecciona las posiciones de un array de fechas ordenado que cumplen los filtros.
+    Los rangos se resuelven con búsqueda binaria; month_day y dates se aplican como máscara
+    solo sobre el tramo resultante.
+
+    Args:
+        fecha (np.ndarray): Fechas datetime64[D] en orden ascendente (admite repetidas)
+        start, end: Primer y último día incluidos
+        last_days (int): Solo los últimos N días hasta la fecha máxima
+        month_day (tuple): (mes, día) de cualquier año
+        dates (iterable): Días concretos
+
+    Returns:
+        slice | np.ndarray: Tramo contiguo o índices de las posiciones seleccionadas
+    """
+    lo, hi = 0, len(fecha)
+    if last_days and hi:
+        lo = max(lo, int(np.searchsorted(fecha, fecha[-1] - np.timedelta64(last_days - 1, 'D'), 'left')))
+    if start is not None:
+        lo = max(lo, int(np.searchsorted(fecha, _day(start), 'left')))
+    if end is not None:
+        hi = min(hi, int(np.searchsorted(fecha, _day(end), 'right')))
+    hi = max(lo, hi)
+
+    window = fecha[lo:hi]
+    mask = None
+    if month_day is not None:
+        months = window.astype('datetime64[M]')
+        mask = ((months.astype(np.int64) % 12 + 1) == month_day[0]) & \
+               ((window - months.astype('datetime64[D]')).astype(np.int64) + 1 == month_day[1])
+    if dates is not None:
+        wanted = np.array([_day(d) for d in dates], dtype='datetime64[D]')
+        in_dates = np.isin(window, wanted)
+        mask = in_dates if mask is None else mask & in_dates
+
+    return slice(lo, hi) if mask is None else np.flatnonzero(mask) + lo
+
+
+class HistoricalDataset:
+    """
+    Histórico registrado, con sus arrays mapeados en memoria (solo lectura).
+    """
+
+    def __init__(self, directory, meta):
+        """
+        Args:
+            directory (str): Directorio del dataset
+            meta (dict): Metadatos leídos de meta.json
+        """
+        self.directory = directory
+        self.meta = meta
+        self.dataset_id = meta['dataset_id']
+        self.labels = np.asarray(meta['labels'], dtype=object)
+        self.fecha, self.intervalo, self.volumen = (
+            np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in ARRAY_NAMES
+        )
+
+    def __len__(self):
+        return len(self.fecha)
+
+    def frame(self, start=None, end=None, last_days=None, month_day=None, dates=None):
+        """
+        Construye el DataFrame (Fecha, Intervalo, Llamadas Ofrecidas) de las filas seleccionadas.
+        Los rangos de fechas se resuelven con búsqueda binaria sobre los arrays ordenados, de modo
+        que solo se leen del disco las páginas del periodo pedido.
+
+        Args:
+            start, end: Primer y último día incluidos
+            last_days (int): Solo los últimos N días hasta la fecha máxima
+            month_day (tuple): (mes, día) de cualquier año
+            dates (iterable): Días concretos
+
+        Returns:
+            pd.DataFrame: Histórico con el mismo formato que prepare_historical_dataframe
+        """
+        rows = select_days(self.fecha, start, end, last_days, month_day, dates)
+        return pd.DataFrame({
+            'Fecha': np.asarray(self.fecha[rows], dtype='datetime64[ns]'),
+            'Intervalo': self.labels[self.intervalo[rows]],
+            'Llamadas Ofrecidas': np.array(self.volumen[rows], dtype=np.float64),
+        })
+
+
+class HistoricalDatasetRegistry:
+    """
+    Registro de históricos en disco, indexado por dataset_id.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Directorio raíz del registro
+        """
+        self.directory = directory
+        self._open = BoundedLRUCache(maxsize=OPEN_DATASETS, policy='lru')
+        self._lock = threading.Lock()
+
+    def _path(self, dataset_id):
+        """
+        Obtiene el directorio de un dataset validando el formato del id.
+        """
+        if not isinstance(dataset_id, str) or not DATASET_ID_PATTERN.match(dataset_id):
+            raise DatasetNotFoundError(f"Dataset histórico '{dataset_id}' no encontrado")
+        return os.path.join(self.directory, dataset_id)
+
+    def register(self, source, segment_id, user_info=None, name=None):
+        """
+        Registra un histórico subido. Subir el mismo archivo al mismo segmento devuelve el dataset existente.
+
+        Args:
+            source: Ruta o archivo subido (Excel)
+            segment_id (int): Segmento al que pertenece el histórico
+            user_info (dict): Información del usuario
+            name (str): Nombre descriptivo (por defecto el nombre del archivo)
+
+        Returns:
+            dict: Metadatos del dataset (incluye dataset_id)
+        """
+        content = read_source_bytes(source)
+        digest = hashlib.sha256(content).hexdigest()
+        dataset_id = f"{int(segment_id)}-{digest[:16]}"
+        path = self._path(dataset_id)
+
+        meta = self._read_meta(path)
+        if meta is not None:
+            return meta
+
+        fecha, intervalo, volumen, labels, has_intervals = normalize_history(pd.read_excel(io.BytesIO(content)))
+        user_info = user_info or {}
+        if name is None:
+            name = getattr(source, 'filename', None)
+        if name is None and isinstance(source, (str, os.PathLike)):
+            name = os.path.basename(source)
+        meta = {
+            'dataset_id': dataset_id,
+            'segment_id': int(segment_id),
+            'name': name,
+            'source_sha256': digest,
+            'rows': int(len(fecha)),
+            'start_date': str(fecha[0]),
+            'end_date': str(fecha[-1]),
+            'labels': labels,
+            'has_intervals': has_intervals,
+            'id_legal': user_info.get('idLegal') or user_info.get('id_legal'),
+            'username': user_info.get('username'),
+            'created_at': datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        try:
+            for array_name, array in zip(ARRAY_NAMES, (fecha, intervalo, volumen)):
+                np.save(os.path.join(tmp_path, f'{array_name}.npy'), array)
+            with open(os.path.join(tmp_path, META_NAME), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Otro proceso registró el mismo archivo a la vez
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            existing = self._read_meta(path)
+            if existing is None:
+                raise
+            return existing
+
+        logger.info(f"Histórico registrado {dataset_id}: {meta['rows']} filas ({meta['start_date']} - {meta['end_date']})")
+        return meta
+
+    def open(self, dataset_id):
+        """
+        Abre un dataset (o lo reutiliza si ya está abierto).
+
+        Returns:
+            HistoricalDataset: Dataset con los arrays mapeados
+
+        Raises:
+            DatasetNotFoundError: Si el dataset no existe
+        """
+        path = self._path(dataset_id)
+        with self._lock:
+            dataset = self._open.get(dataset_id)
+            if dataset is None:
+                meta = self._read_meta(path)
+                if meta is None:
+                    raise DatasetNotFoundError(f"Dataset histórico '{dataset_id}' no encontrado")
+                dataset = HistoricalDataset(path, meta)
+                self._open.put(dataset_id, dataset)
+            return dataset
+
+    def list(self, segment_id):
+        """
+        Lista los datasets de un segmento, del más reciente al más antiguo.
+
+        Returns:
+            list: Metadatos (sin las etiquetas de intervalo)
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        prefix = f"{int(segment_id)}-"
+        items = []
+        for entry in os.listdir(self.directory):
+            if entry.startswith(prefix) and DATASET_ID_PATTERN.match(entry):
+                meta = self._read_meta(os.path.join(self.directory, entry))
+                if meta is not None:
+                    items.append({k: v for k, v in meta.items() if k != 'labels'})
+        return sorted(items, key=lambda m: m['created_at'], reverse=True)
+
+    def delete(self, dataset_id):
+        """
+        Elimina un dataset del registro.
+
+        Raises:
+            DatasetNotFoundError: Si el dataset no existe
+        """
+        path = self._path(dataset_id)
+        if not os.path.isdir(path):
+            raise DatasetNotFoundError(f"Dataset histórico '{dataset_id}' no encontrado")
+        with self._lock:
+            # Soltar los arrays mapeados antes de borrar los archivos
+            self._open.pop(dataset_id)
+        shutil.rmtree(path)
+
+    @staticmethod
+    def _read_meta(path):
+        """
+        Lee meta.json de un dataset, o None si no existe.
+        """
+        try:
+            with open(os.path.join(path, META_NAME), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_dataset_registry():
+    """
+    Obtiene el registro de históricos del proceso, creándolo desde Config la primera vez.
+
+    Returns:
+        HistoricalDatasetRegistry: Registro compartido
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = HistoricalDatasetRegistry(default_datasets_dir())
+    return _instance
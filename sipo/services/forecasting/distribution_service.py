@@ -27,7 +27,7 @@ class VolumeDistributor:
         
         Args:
             monthly_volume_df (pd.DataFrame): DataFrame con año, mes y volumen
-            historical_file: Archivo Excel con datos históricos
+            historical_file: Archivo Excel con datos históricos o HistoricalDataset registrado
             holidays_file: Archivo Excel con festivos (opcional)
             
         Returns:
@@ -37,20 +37,7 @@ class VolumeDistributor:
             ValueError: Si no se pueden procesar los datos
         """
         try:
-            # Cargar histórico
-            df_hist = pd.read_excel(historical_file)
-            df_hist = self.parser.find_header_and_normalize(df_hist)
-            df_hist.columns = [str(col).strip() for col in df_hist.columns]
-            
-            fecha_col = self.parser.detect_date_column(df_hist)
-            vol_col = self.parser.detect_volume_column(df_hist, exclude_cols=[fecha_col])
-            if not vol_col:
-                vol_col = next((c for c in df_hist.columns if c != fecha_col), df_hist.columns[0])
-            
-            df_hist[fecha_col] = pd.to_datetime(df_hist[fecha_col], errors='coerce', dayfirst=True)
-            df_hist.dropna(subset=[fecha_col], inplace=True)
-            df_hist[vol_col] = pd.to_numeric(df_hist[vol_col], errors='coerce').fillna(0)
-            df_hist.rename(columns={fecha_col: 'Fecha'}, inplace=True)
+            df_hist, vol_col = self._load_historical_data(historical_file)
 
             holidays_set = self._load_holidays(holidays_file)
 
@@ -103,7 +90,7 @@ class VolumeDistributor:
             
             holidays_set = self._load_holidays(holidays_file)
 
-            df = pd.read_excel(forecast_file)
+            df = self.parser.read_excel(forecast_file)
             df = self.parser.find_header_and_normalize(df)
             df.columns = [str(c).strip() for c in df.columns]
             
@@ -126,12 +113,31 @@ class VolumeDistributor:
             logger.error(f"Error en distribute_intraday_volume: {e}")
             raise
 
+    def _load_historical_data(self, historical_file):
+        """Carga y normaliza el archivo histórico (o lee el dataset registrado)."""
+        if self.parser.is_historical_dataset(historical_file):
+            return historical_file.frame(), 'Llamadas Ofrecidas'
+        df_hist = self.parser.read_excel(historical_file)
+        df_hist = self.parser.find_header_and_normalize(df_hist)
+        df_hist.columns = [str(col).strip() for col in df_hist.columns]
+        
+        fecha_col = self.parser.detect_date_column(df_hist)
+        vol_col = self.parser.detect_volume_column(df_hist, exclude_cols=[fecha_col])
+        if not vol_col:
+            vol_col = next((c for c in df_hist.columns if c != fecha_col), df_hist.columns[0])
+        
+        df_hist[fecha_col] = pd.to_datetime(df_hist[fecha_col], errors='coerce', dayfirst=True)
+        df_hist.dropna(subset=[fecha_col], inplace=True)
+        df_hist[vol_col] = pd.to_numeric(df_hist[vol_col], errors='coerce').fillna(0)
+        df_hist.rename(columns={fecha_col: 'Fecha'}, inplace=True)
+        return df_hist, vol_col
+
     def _load_holidays(self, holidays_file):
         """Carga el conjunto de fechas festivas."""
         holidays_set = set()
         if holidays_file:
             try:
-                df_h = pd.read_excel(holidays_file)
+                df_h = self.parser.read_excel(holidays_file)
                 df_h = self.parser.find_header_and_normalize(df_h)
                 df_h.columns = [str(c).strip() for c in df_h.columns]
                 f_col = self.parser.detect_date_column(df_h)
@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 import datetime
 import logging
+from utils.upload_cache import get_upload_cache
 
 logger = logging.getLogger(__name__)
 
@@ -194,6 +195,72 @@ class ExcelParserUtils:
             value_name=value_name
         )
 
+    @staticmethod
+    def read_excel(source, **kwargs):
+        """
+        Lee un archivo Excel pasando por la caché de cargas (mismos bytes y argumentos = mismo resultado).
+        
+        Args:
+            source: Ruta o archivo subido
+            **kwargs: Argumentos de pd.read_excel
+            
+        Returns:
+            pd.DataFrame: Hoja leída
+        """
+        return get_upload_cache().get_or_parse(
+            source, 'excel', lambda buffer, params: pd.read_excel(buffer, **dict(params)), tuple(sorted(kwargs.items()))
+        )
+
+    @staticmethod
+    def load_historical_dataframe(source, required_cols=None):
+        """
+        Lee y prepara un archivo histórico (pd.read_excel + prepare_historical_dataframe),
+        guardando el resultado ya normalizado en la caché de cargas.
+        
+        Args:
+            source: Ruta o archivo subido
+            required_cols (list): Columnas requeridas
+            
+        Returns:
+            pd.DataFrame: DataFrame preparado para análisis
+        """
+        return get_upload_cache().get_or_parse(
+            source, 'historical',
+            lambda buffer, cols: ExcelParserUtils.prepare_historical_dataframe(pd.read_excel(buffer), list(cols) if cols else None),
+            tuple(required_cols) if required_cols else None
+        )
+
+    @staticmethod
+    def is_historical_dataset(source):
+        """
+        Indica si la fuente del histórico es un dataset registrado o un cubo de reales (y no un archivo subido).
+        """
+        from .dataset_registry import HistoricalDataset
+        from .actuals_cube import ActualsCube
+        return isinstance(source, (HistoricalDataset, ActualsCube))
+
+    @staticmethod
+    def load_history(source, start=None, end=None, last_days=None, month_day=None, dates=None):
+        """
+        Obtiene el histórico preparado de un archivo subido o de un dataset registrado,
+        aplicando los filtros de fechas (en el dataset, antes de construir el DataFrame).
+        
+        Args:
+            source: Archivo subido, ruta, HistoricalDataset o ActualsCube
+            start, end: Primer y último día incluidos
+            last_days (int): Solo los últimos N días hasta la fecha máxima
+            month_day (tuple): (mes, día) de cualquier año
+            dates (iterable): Días concretos
+            
+        Returns:
+            pd.DataFrame: Histórico con columnas Fecha, Intervalo y Llamadas Ofrecidas
+        """
+        from .dataset_registry import filter_history
+        filters = dict(start=start, end=end, last_days=last_days, month_day=month_day, dates=dates)
+        if ExcelParserUtils.is_historical_dataset(source):
+            return source.frame(**filters)
+        return filter_history(ExcelParserUtils.load_historical_dataframe(source), **filters)
+
     @staticmethod
     def prepare_historical_dataframe(df_raw, required_cols=None):
         """
@@ -14,6 +14,10 @@ from .distribution_service import VolumeDistributor
 from .curve_builder import CurveBuilder
 from .curve_repository import CurveRepository
 from .excel_exporter import ExcelExporter
+from .dataset_registry import get_dataset_registry
+from .dataset_registry import DatasetNotFoundError
+from .actuals_cube import get_actuals_cube_store, parse_actuals_days
+from .actuals_repository import ActualsRepository
 
 logger = logging.getLogger(__name__)
 
@@ -32,12 +36,65 @@ class ForecastingService:
         self.curve_builder = CurveBuilder()
         self.repository = CurveRepository()
         self.exporter = ExcelExporter()
+        self.actuals_repository = ActualsRepository()
+
+    # --- Históricos registrados ---
+
+    def register_historical_dataset(self, historical_file, segment_id, user_info=None, name=None):
+        """Normaliza y registra un histórico para reutilizarlo en los análisis."""
+        return get_dataset_registry().register(historical_file, segment_id, user_info, name)
+
+    def open_historical_dataset(self, dataset_id):
+        """Abre un histórico registrado (lanza DatasetNotFoundError si no existe)."""
+        return get_dataset_registry().open(dataset_id)
+
+    def get_historical_datasets_by_segment(self, segment_id):
+        """Lista los históricos registrados de un segmento."""
+        return get_dataset_registry().list(segment_id)
+
+    def delete_historical_dataset(self, dataset_id):
+        """Elimina un histórico registrado."""
+        return get_dataset_registry().delete(dataset_id)
+
+    # --- Cubo de datos reales ---
+
+    def record_actuals(self, segment_id, days):
+        """Guarda los reales de varios días en ActualsData y los incorpora al cubo del segmento."""
+        days = {pd.Timestamp(date).date(): actuals for date, actuals in days.items()}
+        # Se validan todos los días antes de guardar: un día no válido no llega a ActualsData
+        parsed = parse_actuals_days(days)
+        store = get_actuals_cube_store()
+        info = store.info(segment_id)
+        # El cubo solo queda al día si ya lo estaba antes de esta carga; si no, se reconstruirá al abrirlo
+        fresh = info is not None and info.get('source') == self.actuals_repository.get_fingerprint(segment_id)
+        self.actuals_repository.save_days(segment_id, days)
+        source = self.actuals_repository.get_fingerprint(segment_id) if fresh else None
+        return store.append_parsed(segment_id, parsed, source)
+
+    def open_actuals_cube(self, segment_id):
+        """Abre el cubo de reales de un segmento, (re)construyéndolo desde ActualsData si no existe o no está al día."""
+        store = get_actuals_cube_store()
+        info = store.info(segment_id)
+        if info is None or info.get('source') != self.actuals_repository.get_fingerprint(segment_id):
+            if self.rebuild_actuals_cube(segment_id) is None:
+                raise DatasetNotFoundError(f"No hay datos reales registrados para el segmento {segment_id}")
+        return store.open(segment_id)
+
+    def get_actuals_cube_info(self, segment_id):
+        """Obtiene los metadatos del cubo de reales de un segmento."""
+        return self.open_actuals_cube(segment_id).meta
+
+    def rebuild_actuals_cube(self, segment_id):
+        """Regenera el cubo de reales de un segmento a partir de ActualsData."""
+        # La huella se toma antes de leer: una escritura intermedia vuelve a marcar el cubo como desfasado
+        source = self.actuals_repository.get_fingerprint(segment_id)
+        return get_actuals_cube_store().rebuild(segment_id, self.actuals_repository.get_days(segment_id), source)
 
     # --- Métodos de Análisis ---
 
-    def analyze_intraday_distribution(self, historical_file, weeks_to_analyze):
+    def analyze_intraday_distribution(self, historical_file, weeks_to_analyze, layout='rows'):
         """Analiza patrones de comportamiento por día de la semana."""
-        return self.intraday_analyzer.analyze_distribution(historical_file, weeks_to_analyze)
+        return self.intraday_analyzer.analyze_distribution(historical_file, weeks_to_analyze, layout)
 
     def analyze_holiday_distribution(self, historical_file, holidays_file):
         """Analiza patrones en días festivos."""
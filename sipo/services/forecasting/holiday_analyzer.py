@@ -25,7 +25,7 @@ class HolidayAnalyzer:
         Agrupa los resultados por el nombre de la festividad.
         
         Args:
-            historical_file: Archivo Excel con datos históricos
+            historical_file: Archivo Excel con datos históricos o HistoricalDataset registrado
             holidays_file: Archivo Excel con fechas de festivos
             
         Returns:
@@ -36,7 +36,7 @@ class HolidayAnalyzer:
         """
         try:
             # 1. Cargar Festivos
-            df_holidays = pd.read_excel(holidays_file)
+            df_holidays = self.parser.read_excel(holidays_file)
             df_holidays = self.parser.find_header_and_normalize(
                 df_holidays, 
                 keywords=['fecha', 'date', 'festivo', 'nombre']
@@ -52,9 +52,8 @@ class HolidayAnalyzer:
             )
             df_holidays.dropna(subset=[fecha_col_h], inplace=True)
             
-            # 2. Cargar Histórico
-            df = pd.read_excel(historical_file)
-            df = self.parser.prepare_historical_dataframe(df)
+            # 2. Cargar Histórico (solo los días festivos)
+            df = self.parser.load_history(historical_file, dates=df_holidays[fecha_col_h].dt.date.unique())
             
             # 3. Cruzar datos
             df['Fecha_join'] = df['Fecha'].dt.date
@@ -17,16 +17,20 @@ class IntradayAnalyzer:
     Identifica tendencias, outliers y calcula pesos propuestos para cada semana.
     """
 
+    # Formatos de weekly_data: una entrada por semana o listas por campo (con matrices de curvas)
+    LAYOUTS = ('rows', 'columnar')
+
     def __init__(self):
         self.parser = ExcelParserUtils()
 
-    def analyze_distribution(self, historical_file, weeks_to_analyze):
+    def analyze_distribution(self, historical_file, weeks_to_analyze, layout='rows'):
         """
         Analiza un archivo histórico para detectar patrones de comportamiento por día de la semana.
         
         Args:
-            historical_file: Archivo Excel con datos históricos
+            historical_file: Archivo Excel con datos históricos o HistoricalDataset registrado
             weeks_to_analyze (int): Número de semanas a analizar
+            layout (str): Formato de weekly_data ('rows' o 'columnar')
             
         Returns:
             dict: Diccionario con weekly_data y labels
@@ -35,16 +39,10 @@ class IntradayAnalyzer:
             ValueError: Si no se pueden procesar los datos
         """
         try:
-            df = pd.read_excel(historical_file)
-            df = self.parser.prepare_historical_dataframe(df)
-            
-            # Filtrar por semanas recientes
-            max_date = df['Fecha'].max()
-            if pd.isna(max_date):
+            # Filtrar por semanas recientes (hasta la última fecha del histórico)
+            df_filtered = self.parser.load_history(historical_file, last_days=weeks_to_analyze * 7)
+            if pd.isna(df_filtered['Fecha'].max()):
                 raise ValueError("No se encontraron fechas válidas en los datos.")
-            
-            weeks_ago_date = max_date - pd.to_timedelta((weeks_to_analyze * 7) - 1, unit='d')
-            df_filtered = df[df['Fecha'] >= weeks_ago_date]
 
             if df_filtered.empty:
                 raise ValueError(f"No se encontraron datos en el rango de las últimas {weeks_to_analyze} semanas.")
@@ -63,7 +61,7 @@ class IntradayAnalyzer:
             df_pivot['day_of_week'] = df_pivot['Fecha'].dt.weekday
             df_pivot['week_number'] = df_pivot['Fecha'].dt.isocalendar().week
             
-            weekly_data = self._process_weekly_data(df_pivot, time_labels)
+            weekly_data = self._process_weekly_data(df_pivot, time_labels, layout)
                     
             return {"weekly_data": weekly_data, "labels": time_labels}
             
@@ -71,80 +69,95 @@ class IntradayAnalyzer:
             logger.error(f"Error en analyze_intraday_distribution: {e}")
             raise
 
-    def _process_weekly_data(self, df_pivot, time_labels):
+    def _process_weekly_data(self, df_pivot, time_labels, layout='rows'):
         """
         Procesa los datos semanales agrupados por día de la semana.
+        Las curvas, totales, outliers y pesos se calculan sobre la matriz (fechas × intervalos)
+        de cada día de la semana, y la respuesta se construye en una sola pasada.
         
         Args:
             df_pivot (pd.DataFrame): DataFrame pivoteado con datos
             time_labels (list): Lista de etiquetas de tiempo
+            layout (str): 'rows' (una entrada por semana) o 'columnar' (listas por campo y matrices)
             
         Returns:
             dict: Datos semanales organizados por día
         """
-        weekly_data = {i: [] for i in range(7)}
-        
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Formato de respuesta no válido. Formatos disponibles: {', '.join(self.LAYOUTS)}")
+
+        raw_all = df_pivot[time_labels].to_numpy(dtype=float)
+        totals_all = raw_all.sum(axis=1)
+        curves_all = np.divide(
+            raw_all, totals_all[:, None], out=np.zeros_like(raw_all), where=totals_all[:, None] > 0
+        )
+        fechas = df_pivot['Fecha'].to_numpy()
+        day_of_week = df_pivot['day_of_week'].to_numpy()
+        weeks_all = df_pivot['week_number'].to_numpy(dtype=np.int64)
+        dates_all = df_pivot['Fecha'].dt.strftime('%d/%m/%Y').to_numpy()
+
+        weekly_data = {}
         for day_num in range(7):
-            day_group_df = df_pivot[df_pivot['day_of_week'] == day_num].sort_values(
-                by='Fecha', ascending=False
-            )
-            if day_group_df.empty:
+            # Filas del día de la semana, de la fecha más reciente a la más antigua
+            rows = np.flatnonzero(day_of_week == day_num)
+            rows = rows[np.argsort(fechas[rows], kind='stable')[::-1]]
+
+            curves = curves_all[rows]
+            totals = totals_all[rows]
+            is_outlier = self._detect_outliers(curves, totals)
+            weights = np.round(self._calculate_weights(curves, is_outlier)).astype(np.int64)
+
+            columns = {
+                'week': weeks_all[rows].tolist(),
+                'date': dates_all[rows].tolist(),
+                'total_calls': totals.tolist(),
+                'is_outlier': is_outlier.tolist(),
+                'proposed_weight': weights.tolist(),
+                'intraday_dist': curves.tolist(),
+                'intraday_raw': raw_all[rows].tolist(),
+            }
+            if layout == 'columnar':
+                weekly_data[day_num] = columns
                 continue
-            
-            # Calcular curvas porcentuales
-            day_curves = day_group_df[time_labels].div(
-                day_group_df[time_labels].sum(axis=1), axis=0
-            ).fillna(0)
-            
-            # Detección de outliers y cálculo de pesos
-            is_outlier = self._detect_outliers(day_curves, day_group_df, time_labels)
-            weights = self._calculate_weights(day_curves, is_outlier)
-            
-            # Preparar datos para el frontend
-            for index, row in day_group_df.iterrows():
-                intraday_raw_calls = row[time_labels].to_dict()
-                total_calls = sum(intraday_raw_calls.values())
-                intraday_percentages = {
-                    k: (v / total_calls if total_calls > 0 else 0) 
-                    for k, v in intraday_raw_calls.items()
+
+            weekly_data[day_num] = [
+                {
+                    'week': week,
+                    'date': date,
+                    'total_calls': total,
+                    'is_outlier': outlier,
+                    'proposed_weight': weight,
+                    'intraday_dist': dict(zip(time_labels, dist)),
+                    'intraday_raw': dict(zip(time_labels, raw)),
                 }
-                
-                weekly_data[day_num].append({
-                    'week': int(row['week_number']),
-                    'date': row['Fecha'].strftime('%d/%m/%Y'),
-                    'total_calls': total_calls,
-                    'is_outlier': bool(is_outlier.get(index, False)),
-                    'proposed_weight': round(weights.get(index, 0)),
-                    'intraday_dist': intraday_percentages,
-                    'intraday_raw': intraday_raw_calls
-                })
-        
+                for week, date, total, outlier, weight, dist, raw in zip(*columns.values())
+            ]
+
         return weekly_data
 
-    def _detect_outliers(self, day_curves, day_group_df, time_labels):
+    def _detect_outliers(self, day_curves, day_totals):
         """
         Detecta outliers basándose en la desviación respecto a la mediana.
         
         Args:
-            day_curves (pd.DataFrame): Curvas porcentuales del día
-            day_group_df (pd.DataFrame): DataFrame del grupo del día
-            time_labels (list): Lista de etiquetas de tiempo
+            day_curves (np.ndarray): Curvas porcentuales del día (semanas × intervalos)
+            day_totals (np.ndarray): Volumen total de cada semana
             
         Returns:
-            pd.Series: Serie booleana indicando outliers
+            np.ndarray: Array booleano indicando outliers
         """
-        is_outlier = pd.Series([False] * len(day_curves), index=day_curves.index)
+        is_outlier = np.zeros(len(day_curves), dtype=bool)
         
         if len(day_curves) >= 2:
-            valid_day_curves = day_curves[day_group_df[time_labels].sum(axis=1) > 0]
-            if not valid_day_curves.empty:
-                reference_curve = valid_day_curves.median()
+            valid_day_curves = day_curves[day_totals > 0]
+            if len(valid_day_curves):
+                reference_curve = np.median(valid_day_curves, axis=0)
                 deviations = ((day_curves - reference_curve) ** 2).mean(axis=1)
                 
                 if len(deviations) >= 4:
-                    q1, q3 = deviations.quantile(0.25), deviations.quantile(0.75)
+                    q1, q3 = np.quantile(deviations, [0.25, 0.75])
                     iqr = q3 - q1
-                    is_outlier = (deviations > q3 + 1.5 * iqr)
+                    is_outlier = deviations > q3 + 1.5 * iqr
         
         return is_outlier
 
@@ -155,87 +168,59 @@ class IntradayAnalyzer:
         Lógica:
         1. Outliers reciben peso 0
         2. Semanas válidas reciben peso basado en:
-           - Recencia (más reciente = más peso)
+           - Recencia (posición en el orden de las semanas)
            - Similitud con la mediana (menor desviación = más peso)
         
         Args:
-            day_curves (pd.DataFrame): Curvas porcentuales del día
-            is_outlier (pd.Series): Serie indicando outliers
+            day_curves (np.ndarray): Curvas porcentuales del día (semanas × intervalos)
+            is_outlier (np.ndarray): Array booleano indicando outliers
             
         Returns:
-            pd.Series: Pesos calculados para cada semana
+            np.ndarray: Pesos calculados para cada semana (suman 100)
         """
-        weights = pd.Series([0.0] * len(day_curves), index=day_curves.index)
-        
-        # Filtrar solo las semanas válidas (no outliers)
-        valid_indices = [idx for idx, val in is_outlier.items() if not val]
+        weights = np.zeros(len(day_curves))
+        valid = ~is_outlier
+        valid_count = int(valid.sum())
         
-        if valid_indices:
-            valid_day_curves = day_curves.loc[valid_indices]
+        if valid_count:
+            valid_day_curves = day_curves[valid]
+            reference_curve = np.median(valid_day_curves, axis=0)
+            deviations = ((valid_day_curves - reference_curve) ** 2).mean(axis=1)
             
-            if len(valid_day_curves) > 0:
-                reference_curve = valid_day_curves.median()
-                deviations = ((valid_day_curves - reference_curve) ** 2).mean(axis=1)
-                
-                # Normalizar desviaciones (invertir: menor desviación = mayor score)
-                max_dev = deviations.max()
-                if max_dev > 0:
-                    similarity_scores = 1 - (deviations / max_dev)
-                else:
-                    similarity_scores = pd.Series([1.0] * len(valid_indices), index=valid_indices)
-                
-                # Factor de recencia (más reciente = mayor peso)
-                recency_scores = pd.Series(
-                    [i / (len(valid_indices) - 1) if len(valid_indices) > 1 else 1.0
-                     for i in range(len(valid_indices))],
-                    index=valid_indices
-                )
-                
-                # Combinar scores: 60% similitud + 40% recencia
-                combined_scores = (similarity_scores * 0.6) + (recency_scores * 0.4)
-                
-                # Normalizar a 100%
-                total_score = combined_scores.sum()
-                if total_score > 0:
-                    for idx in valid_indices:
-                        weights[idx] = (combined_scores[idx] / total_score) * 100.0
-                else:
-                    self._distribute_weights_equally(weights, valid_indices)
+            # Normalizar desviaciones (invertir: menor desviación = mayor score)
+            max_dev = deviations.max()
+            similarity_scores = 1 - (deviations / max_dev) if max_dev > 0 else np.ones(valid_count)
+            
+            # Factor de recencia según la posición entre las semanas válidas
+            recency_scores = np.arange(valid_count) / (valid_count - 1) if valid_count > 1 else np.ones(1)
+            
+            # Combinar scores: 60% similitud + 40% recencia
+            combined_scores = (similarity_scores * 0.6) + (recency_scores * 0.4)
+            
+            # Normalizar a 100%
+            total_score = combined_scores.sum()
+            if total_score > 0:
+                weights[valid] = (combined_scores / total_score) * 100.0
             else:
-                self._distribute_weights_equally(weights, valid_indices)
+                weights[valid] = 100.0 / valid_count
         elif len(day_curves) > 0:
             # Si todos son outliers (caso raro), distribución equitativa
-            weights = pd.Series([100.0 / len(day_curves)] * len(day_curves), index=day_curves.index)
+            weights[:] = 100.0 / len(day_curves)
         
         return weights
 
-    def _distribute_weights_equally(self, weights, indices):
-        """
-        Distribuye pesos equitativamente entre los índices dados.
-        
-        Args:
-            weights (pd.Series): Serie de pesos a modificar
-            indices (list): Índices a los que asignar pesos
-        """
-        weight_per_valid = 100.0 / len(indices) if indices else 0
-        for idx in indices:
-            weights[idx] = weight_per_valid
-
     def analyze_specific_date_historically(self, historical_file, target_date_str):
         """
         Busca en el histórico el comportamiento de una fecha específica (día y mes).
         
         Args:
-            historical_file: Archivo Excel con datos históricos
+            historical_file: Archivo Excel con datos históricos o HistoricalDataset registrado
             target_date_str (str): Fecha objetivo para buscar coincidencias (DD-MM-YYYY)
             
         Returns:
             dict: Datos históricos encontrados para ese día/mes en años previos
         """
         try:
-            df = pd.read_excel(historical_file)
-            df = self.parser.prepare_historical_dataframe(df)
-
             try:
                 target_dt = pd.to_datetime(target_date_str)
                 target_month = target_dt.month
@@ -243,10 +228,7 @@ class IntradayAnalyzer:
             except:
                 raise ValueError("Formato de fecha objetivo inválido.")
 
-            history_matches = df[
-                (df['Fecha'].dt.month == target_month) & 
-                (df['Fecha'].dt.day == target_day)
-            ].copy()
+            history_matches = self.parser.load_history(historical_file, month_day=(target_month, target_day))
 
             if history_matches.empty:
                 raise ValueError(f"No se encontraron datos históricos para el día {target_day}/{target_month} en el archivo.")
@@ -291,22 +273,19 @@ class IntradayAnalyzer:
         Obtiene la curva exacta de una fecha pasada específica.
         
         Args:
-            historical_file: Archivo Excel con datos históricos
+            historical_file: Archivo Excel con datos históricos o HistoricalDataset registrado
             specific_date_str (str): Fecha específica (YYYY-MM-DD)
             
         Returns:
             dict: Datos de la curva para esa fecha
         """
         try:
-            df = pd.read_excel(historical_file)
-            df = self.parser.prepare_historical_dataframe(df)
-
             try:
                 target_date = pd.to_datetime(specific_date_str).date()
             except:
                 raise ValueError("Fecha específica inválida.")
 
-            day_data = df[df['Fecha'].dt.date == target_date]
+            day_data = self.parser.load_history(historical_file, start=target_date, end=target_date)
 
             if day_data.empty:
                 raise ValueError(f"No se encontraron datos para la fecha {specific_date_str} en el archivo histórico.")
@@ -27,7 +27,7 @@ class MonthlyForecaster:
         Genera una proyección mensual basada en históricos.
         
         Args:
-            historical_file: Archivo Excel con datos históricos
+            historical_file: Archivo Excel con datos históricos o HistoricalDataset registrado
             holidays_file: Archivo Excel con festivos (opcional)
             recency_weight (float): Peso para datos recientes (0-1)
             manual_overrides (dict): Sobrescrituras manuales
@@ -94,7 +94,7 @@ class MonthlyForecaster:
         """Carga el conjunto de fechas festivas."""
         holidays_set = set()
         if holidays_file:
-            df_holidays = pd.read_excel(holidays_file)
+            df_holidays = self.parser.read_excel(holidays_file)
             df_holidays = self.parser.find_header_and_normalize(df_holidays)
             df_holidays.columns = [str(c).strip() for c in df_holidays.columns]
             fecha_col = self.parser.detect_date_column(df_holidays)
@@ -104,8 +104,10 @@ class MonthlyForecaster:
         return holidays_set
 
     def _load_historical_data(self, historical_file):
-        """Carga y normaliza el archivo histórico."""
-        df = pd.read_excel(historical_file)
+        """Carga y normaliza el archivo histórico (o lee el dataset registrado)."""
+        if self.parser.is_historical_dataset(historical_file):
+            return historical_file.frame(), 'Llamadas Ofrecidas'
+        df = self.parser.read_excel(historical_file)
         df = self.parser.find_header_and_normalize(df)
         df.columns = [str(col).strip() for col in df.columns]
         
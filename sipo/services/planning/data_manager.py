@@ -10,6 +10,8 @@ import pandas as pd
 from datetime import datetime
 from flask import current_app
 from services.scheduler.input_parser import InputParser # Updated import
+from utils.date_parsing import parse_dates_to_str
+from utils.matrix_blob import decode_frame, is_matrix_blob
 
 logger = logging.getLogger(__name__)
 
@@ -120,7 +122,9 @@ class PlanningDataManager:
             # Helper para parsear los blobs de datos
             def parse_blob(blob_str):
                 if not blob_str: return {}
-                try: data = json.loads(blob_str)
+                try:
+                    # Tablas en formato columnar (float32 comprimido) o en JSON
+                    data = decode_frame(blob_str).to_dict(orient='records') if is_matrix_blob(blob_str) else json.loads(blob_str)
                 except: return {}
                 
                 res = {}
@@ -140,20 +144,15 @@ class PlanningDataManager:
                     except: pass
                     return None
 
-                def smart_parse_date(val):
-                    if not val: return None
-                    s = str(val).strip()
-                    try:
-                        if '-' in s and s.index('-') == 4:
-                            return pd.to_datetime(s, dayfirst=False).strftime('%Y-%m-%d')
-                        return pd.to_datetime(s, dayfirst=True).strftime('%Y-%m-%d')
-                    except:
-                        try: return pd.to_datetime(s).strftime('%Y-%m-%d')
-                        except: return str(s).split(' ')[0]
+                def parse_date_keys(values):
+                    # Normalización vectorizada; lo no interpretable conserva su parte de fecha en texto
+                    values = [v if v else None for v in values]
+                    parsed = parse_dates_to_str(values, fallback=lambda v: str(v).strip().split(' ')[0])
+                    return [p if v else None for p, v in zip(parsed, values)]
 
                 if isinstance(data, list):
-                    for row in data:
-                        fecha_str = smart_parse_date(row.get('Fecha'))
+                    fechas = parse_date_keys([row.get('Fecha') for row in data])
+                    for row, fecha_str in zip(data, fechas):
                         if not fecha_str: continue
                         vals = [0.0] * 48
                         ignore = ['Fecha', 'Dia', 'Semana', 'Tipo', 'id', 'agent_id', 'total', 'Intervalo', 'Dia Semana', 'Nombre', 'Servicio']
@@ -165,9 +164,9 @@ class PlanningDataManager:
                                 except: pass
                         res[fecha_str] = vals
                 elif isinstance(data, dict):
-                    for d_key, col_data in data.items():
-                        if d_key.startswith('_') or d_key == 'Intervalo': continue
-                        fecha_str = smart_parse_date(d_key)
+                    items = [(k, v) for k, v in data.items() if not (k.startswith('_') or k == 'Intervalo')]
+                    fechas = parse_date_keys([k for k, _ in items])
+                    for (d_key, col_data), fecha_str in zip(items, fechas):
                         if not fecha_str: continue
                         vals = [0.0] * 48
                         if isinstance(col_data, dict):
@@ -12,6 +12,7 @@ from .kpi_service import PlanningKPIService
 from .scenario_service import PlanningScenarioService
 from services.scheduler.activity_allocator import ActivityAllocator
 from services.scheduler.metrics_calculator import DimensioningCalculator
+from utils.erlang_cache import get_erlang_cache
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +97,7 @@ class PlanningService:
         kpis = self.kpi_service.calculate_final_kpis(
             full_schedule, metrics, forecast_input, scenario_id, start_date_str, days_count
         )
+        logger.info(f"Erlang cache stats: {get_erlang_cache().stats()}")
         
         return {
             "schedule": full_schedule,
@@ -2,10 +2,10 @@
 Módulo para la gestión de persistencia de escenarios de planificación.
 """
 
-import json
 import logging
 from datetime import datetime, timedelta
 from models import PlanningScenario, db
+from utils import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +31,7 @@ class PlanningScenarioService:
                 metrics_data['dimensioning_scenario_id'] = dim_scn_id
             elif isinstance(metrics_data, str):
                 try:
-                    m = json.loads(metrics_data)
+                    m = json_codec.loads(metrics_data)
                     if isinstance(m, dict):
                         m['dimensioning_scenario_id'] = dim_scn_id
                         metrics_data = m
@@ -52,9 +52,9 @@ class PlanningScenarioService:
             id_legal=id_legal,
             start_date=start_date,
             days_count=days_count,
-            schedule_data=json.dumps(schedule_data) if isinstance(schedule_data, (dict, list)) else schedule_data,
-            metrics_data=json.dumps(metrics_data) if isinstance(metrics_data, (dict, list)) else metrics_data,
-            kpis_data=json.dumps(kpis_data) if isinstance(kpis_data, (dict, list)) else kpis_data,
+            schedule_data=json_codec.dumps(schedule_data) if isinstance(schedule_data, (dict, list)) else schedule_data,
+            metrics_data=json_codec.dumps(metrics_data) if isinstance(metrics_data, (dict, list)) else metrics_data,
+            kpis_data=json_codec.dumps(kpis_data) if isinstance(kpis_data, (dict, list)) else kpis_data,
             is_temporary=1 if is_temporary else 0,
             expires_at=expires_at
         )
@@ -83,7 +83,7 @@ class PlanningScenarioService:
         if not scenario:
             return None
             
-        metrics = json.loads(scenario.metrics_data) if scenario.metrics_data else {}
+        metrics = json_codec.loads(scenario.metrics_data) if scenario.metrics_data else {}
         dim_id = metrics.get('dimensioning_scenario_id') if isinstance(metrics, dict) else None
 
         return {
@@ -92,9 +92,9 @@ class PlanningScenarioService:
             "startDate": scenario.start_date.strftime('%Y-%m-%d'),
             "daysCount": scenario.days_count,
             "dimensioningScenarioId": dim_id,
-            "schedule": json.loads(scenario.schedule_data) if scenario.schedule_data else [],
+            "schedule": json_codec.loads(scenario.schedule_data) if scenario.schedule_data else [],
             "metrics": metrics,
-            "kpis": json.loads(scenario.kpis_data) if scenario.kpis_data else {}
+            "kpis": json_codec.loads(scenario.kpis_data) if scenario.kpis_data else {}
         }
 
     def delete_scenario(self, scenario_id):
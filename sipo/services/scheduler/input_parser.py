@@ -2,6 +2,7 @@
 import pandas as pd
 from datetime import datetime, time
 import re
+from utils.upload_cache import get_upload_cache
 
 def safe_date_str(val):
     if pd.isna(val): return None
@@ -18,13 +19,14 @@ class InputParser:
     ]
 
 
-    def parse_excel(self, file_path, country_override=None):
+    @staticmethod
+    def _read_agents_sheet(source):
         """
-        Parses the uploaded Excel file and extracts agent data and constraints.
+        Reads the agents sheet, locating the header row by its key column.
         """
         # Robustly find the header row
         # 1. Read first few rows without header
-        preview = pd.read_excel(file_path, header=None, nrows=20)
+        preview = pd.read_excel(source, header=None, nrows=20)
         header_idx = 0
         
         for idx, row in preview.iterrows():
@@ -35,7 +37,36 @@ class InputParser:
                 break
         
         # 2. Read actual dataframe with correct header
-        df = pd.read_excel(file_path, header=header_idx)
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.read_excel(source, header=header_idx)
+
+    @staticmethod
+    def _read_absences_sheet(source):
+        """
+        Reads the absences sheet, locating the header row by its key columns.
+        """
+        # Similar header logic
+        preview = pd.read_excel(source, header=None, nrows=20)
+        header_idx = 0
+        for idx, row in preview.iterrows():
+             # Look for a common column like 'dni' or 'fecha'
+             row_str = [str(x).lower() for x in row.values]
+             row_joined = ' '.join(row_str)
+             if "dni" in row_joined or "fecha inicio" in row_joined or "nombre incidencia" in row_joined:
+                 header_idx = idx
+                 break
+        
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.read_excel(source, header=header_idx)
+
+    def parse_excel(self, file_path, country_override=None):
+        """
+        Parses the uploaded Excel file and extracts agent data and constraints.
+        """
+        # Parsed sheets are cached by file content (same bytes = same DataFrame)
+        df = get_upload_cache().get_or_parse(file_path, 'scheduler_agents', self._read_agents_sheet)
         
         # Normalize column names (strip, lower)
         df.columns = [str(c).strip() for c in df.columns]
@@ -202,18 +233,7 @@ class InputParser:
         Returns a dictionary: { dni: [ {start_date, end_date, type, description}, ... ] }
         """
         try:
-            # Similar header logic
-            preview = pd.read_excel(file_path, header=None, nrows=20)
-            header_idx = 0
-            for idx, row in preview.iterrows():
-                 # Look for a common column like 'dni' or 'fecha'
-                 row_str = [str(x).lower() for x in row.values]
-                 row_joined = ' '.join(row_str)
-                 if "dni" in row_joined or "fecha inicio" in row_joined or "nombre incidencia" in row_joined:
-                     header_idx = idx
-                     break
-            
-            df = pd.read_excel(file_path, header=header_idx)
+            df = get_upload_cache().get_or_parse(file_path, 'scheduler_absences', self._read_absences_sheet)
             df.columns = [str(c).strip() for c in df.columns]
             
             # logger.debug(f"DEBUG Absences: Columns detected: {list(df.columns)}")
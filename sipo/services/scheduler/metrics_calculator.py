@@ -1,57 +1,46 @@
 import json
-import math
 import numpy as np
+from utils.erlang_cache import get_erlang_cache
+from services.calculator.strategies.erlang_kernel import (
+    erlang_b, erlang_c, sla, sl_capacity_batch, search_min_agents, sqrt_staffing_estimate
+)
 
 class DimensioningCalculator:
     def vba_erlang_b(self, servers, intensity):
-        if servers < 0 or intensity < 0: return 0
-        max_iterate = int(servers); last = 1.0; b = 1.0
-        for count in range(1, max_iterate + 1):
-            b = (intensity * last) / (count + (intensity * last)); last = b
-        return max(0, min(b, 1))
+        return erlang_b(servers, intensity)
 
     def vba_erlang_c(self, servers, intensity):
-        if servers <= intensity: return 1.0
-        b = self.vba_erlang_b(servers, intensity); denominator = (1 - (intensity / servers) * (1 - b))
-        if denominator == 0: return 1.0
-        return max(0, min(b / denominator, 1))
+        return erlang_c(servers, intensity)
 
     def vba_sla(self, agents, service_time, calls_per_hour, aht):
-        if agents <= 0 or aht <= 0 or calls_per_hour < 0: return 1.0 if calls_per_hour == 0 else 0.0
-        traffic_rate = (calls_per_hour * aht) / 3600.0
-        if traffic_rate >= agents: return 0.0
-        c = self.vba_erlang_c(agents, traffic_rate); exponent = (traffic_rate - agents) * (service_time / aht)
-        try: sl_queued = 1 - c * math.exp(exponent)
-        except OverflowError: sl_queued = 0
-        return max(0, min(sl_queued, 1))
+        # Memoizado en la caché compartida: los mismos (agentes, volumen, AHT) se repiten entre slots y días
+        return get_erlang_cache().memoize(
+            'scheduler_sla',
+            lambda calls, aht_value, n_agents, time: self._vba_sla(n_agents, time, calls, aht_value),
+            calls_per_hour, aht, agents, service_time
+        )
+
+    def _vba_sla(self, agents, service_time, calls_per_hour, aht):
+        return sla(agents, service_time, calls_per_hour, aht)
 
     def _calculate_sl_capacity(self, num_agents, aht, sl_target, sl_time, interval_seconds=1800):
         if num_agents <= 0 or aht <= 0: return 0
-        
-        # Optimization: Use Binary Search instead of Linear Search
-        # SLA is monotonic with traffic intensity.
-        low = 0.0
-        high = float(num_agents)
-        best_traffic = 0.0
-        
-        # 12 iterations gives accuracy of ~0.0002 agents
-        for _ in range(12):
-            mid = (low + high) / 2
-            if mid <= 0: break
-            
-            calls_equivalent = (mid * 3600) / aht
-            sl = self.vba_sla(num_agents, sl_time, calls_equivalent, aht)
-            
-            if sl >= sl_target:
-                best_traffic = mid
-                low = mid # Try higher traffic
-            else:
-                high = mid # Too much traffic
-                
-        return math.floor((best_traffic * interval_seconds) / aht)
+        return int(sl_capacity_batch(num_agents, aht, sl_target, sl_time, interval_seconds))
+
+    def calculate_sl_capacity_batch(self, num_agents, aht, sl_target, sl_time, interval_seconds=1800):
+        """
+        Capacidad en llamadas por slot para arrays de agentes y AHT (p. ej. días × intervalos).
+        Misma bisección que _calculate_sl_capacity, resuelta para todas las celdas a la vez.
+        """
+        return sl_capacity_batch(num_agents, aht, sl_target, sl_time, interval_seconds)
 
     def calculate_required_agents(self, calls, aht, sl_target, sl_time, is_nda=False):
         if calls <= 0 or aht <= 0: return 0.0
+        return get_erlang_cache().memoize(
+            'scheduler_required_agents', self._calculate_required_agents, calls, aht, sl_target, sl_time, bool(is_nda)
+        )
+
+    def _calculate_required_agents(self, calls, aht, sl_target, sl_time, is_nda=False):
         # calls are per 30 mins, convert to hourly rate
         calls_per_hour = calls * 2
         
@@ -72,26 +61,21 @@ class DimensioningCalculator:
             if target <= 0: return float(traffic)
             return float(traffic / target)
             
-        # Binary search for minimum agents meeting SLA (Erlang C)
+        # Search for minimum agents meeting SLA (Erlang C)
         # Lower bound: at least traffic intensity agents needed
         low = max(1, int(traffic))
         # Upper bound: Generous estimate (traffic * 3 or traffic + 50)
         high = max(int(traffic * 3), int(traffic) + 50)
-        
-        best_agents = high
-        
-        # Binary search: ~12 iterations instead of up to 2000
-        for _ in range(20):
-            if low > high:
-                break
-            mid = (low + high) // 2
-            sl = self.vba_sla(mid, sl_time, calls_per_hour, aht)
-            
-            if sl >= sl_target:
-                best_agents = mid
-                high = mid - 1  # Try fewer agents
-            else:
-                low = mid + 1  # Need more agents
+
+        # Start from the square-root staffing (Halfin-Whitt) estimate and widen only if needed:
+        # 2-3 SLA probes instead of a full binary search over [low, high]
+        estimate = sqrt_staffing_estimate(traffic, sl_target, sl_time, aht)
+        best_agents = search_min_agents(
+            lambda agents: self._vba_sla(agents, sl_time, calls_per_hour, aht) >= sl_target,
+            estimate, low, high
+        )
+        if best_agents is None:
+            best_agents = high
         
         return float(best_agents)
 
@@ -156,6 +140,7 @@ class DimensioningCalculator:
                                     pvds_map[date_str][i] += val
 
         # Final pass for KPI integration
+        capacity_inputs = []
         for date_str, agents_in_slot in coverage_map.items():
             day_forecast = forecast_data.get(date_str) or {}
             
@@ -164,6 +149,8 @@ class DimensioningCalculator:
             
             day_breaks = breaks_map[date_str]
             day_pvds = pvds_map[date_str]
+            slot_agents = np.zeros(num_slots)
+            slot_aht = np.zeros(num_slots)
 
             for i in range(num_slots):
                 # Map high-res slot back to 30-min forecast slot
@@ -182,6 +169,8 @@ class DimensioningCalculator:
                 if aht_val <= 0: aht_val = 300
                 
                 n_agents = max(0, agents_in_slot[i])
+                slot_agents[i] = n_agents
+                slot_aht[i] = aht_val
                 n_breaks = day_breaks[i]
                 n_pvds = day_pvds[i]
                 
@@ -207,12 +196,26 @@ class DimensioningCalculator:
                     "nda_pct": nda_pct,
                     "susceptible": susceptible
                 })
+
+            capacity_inputs.append((day_metrics, slot_agents, slot_aht))
                 
             metrics["daily_metrics"][date_str] = {
                 "slots": day_metrics,
                 "susceptible_slots": susceptible_slots
             }
             
+        # Capacidad por slot (llamadas máximas que los agentes planificados atienden cumpliendo el SLA
+        # objetivo), resuelta en una sola llamada por lotes para todos los días
+        if capacity_inputs:
+            sl_capacity = self.calculate_sl_capacity_batch(
+                np.stack([agents for _, agents, _ in capacity_inputs]),
+                np.stack([aht for _, _, aht in capacity_inputs]),
+                service_level_target, service_time_target, interval_minutes * 60
+            )
+            for (day_metrics, _, _), day_capacity in zip(capacity_inputs, sl_capacity):
+                for slot, capacity in zip(day_metrics, day_capacity):
+                    slot["sl_capacity"] = float(capacity)
+
         metrics["coverage"] = coverage_map
         return metrics
 
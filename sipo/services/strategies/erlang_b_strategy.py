@@ -3,8 +3,8 @@ Implementación de la estrategia de cálculo Erlang B para el patrón Strategy.
 Calcula la probabilidad de bloqueo en sistemas de telecomunicaciones.
 """
 
-import math
 from .base_strategy import CalculationStrategy
+from ..calculator.strategies.erlang_kernel import erlang_b
 
 
 class ErlangBStrategy(CalculationStrategy):
@@ -33,15 +33,7 @@ class ErlangBStrategy(CalculationStrategy):
         if servers == 0:
             return 1.0
         
-        max_iterate = int(servers)
-        last = 1.0
-        b = 1.0
-        
-        for count in range(1, max_iterate + 1):
-            b = (intensity * last) / (count + (intensity * last))
-            last = b
-        
-        return max(0.0, min(b, 1.0))
+        return erlang_b(servers, intensity)
     
     def get_name(self):
         """
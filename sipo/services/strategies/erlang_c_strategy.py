@@ -3,8 +3,8 @@ Implementación de la estrategia de cálculo Erlang C para el patrón Strategy.
 Calcula la probabilidad de espera en sistemas de colas de llamadas.
 """
 
-import math
 from .base_strategy import CalculationStrategy
+from ..calculator.strategies.erlang_kernel import erlang_b, erlang_c
 
 
 class ErlangCStrategy(CalculationStrategy):
@@ -30,17 +30,7 @@ class ErlangCStrategy(CalculationStrategy):
         if not is_valid:
             raise ValueError(error_msg)
         
-        if servers <= intensity:
-            return 1.0
-        
-        b = ErlangCStrategy._calculate_erlang_b(servers, intensity)
-        denominator = (1 - (intensity / servers) * (1 - b))
-        
-        if denominator == 0:
-            return 1.0
-        
-        c = b / denominator
-        return max(0.0, min(c, 1.0))
+        return erlang_c(servers, intensity)
     
     def get_name(self):
         """
@@ -86,15 +76,4 @@ class ErlangCStrategy(CalculationStrategy):
         Returns:
             float: Valor de Erlang B
         """
-        if servers < 0 or intensity < 0:
-            return 0.0
-        
-        max_iterate = int(servers)
-        last = 1.0
-        b = 1.0
-        
-        for count in range(1, max_iterate + 1):
-            b = (intensity * last) / (count + (intensity * last))
-            last = b
-        
-        return max(0.0, min(b, 1.0))
\ No newline at end of file
+        return erlang_b(servers, intensity)
\ No newline at end of file
@@ -3,9 +3,8 @@ Implementación de la estrategia de cálculo SLA para el patrón Strategy.
 Calcula el Nivel de Servicio (SLA) basado en Erlang C y parámetros operacionales.
 """
 
-import math
 from .base_strategy import CalculationStrategy
-from .erlang_c_strategy import ErlangCStrategy
+from ..calculator.strategies.erlang_kernel import erlang_b, erlang_c, sla
 
 
 class SLAStrategy(CalculationStrategy):
@@ -33,30 +32,7 @@ class SLAStrategy(CalculationStrategy):
         if not is_valid:
             raise ValueError(error_msg)
         
-        if calls_per_hour == 0:
-            return 1.0
-        
-        if agents <= 0:
-            return 0.0
-        
-        # Modificado: Permitir AHT = 0 para cálculos especiales
-        # pero mantener la validación para otros casos
-        
-        traffic_rate = (calls_per_hour * aht) / 3600.0
-        
-        if traffic_rate >= agents:
-            return 0.0
-        
-        c = self._calculate_erlang_c(agents, traffic_rate)
-        
-        exponent = (traffic_rate - agents) * (service_time / aht)
-        
-        try:
-            sl_queued = 1 - c * math.exp(exponent)
-        except OverflowError:
-            sl_queued = 0
-        
-        return max(0.0, min(sl_queued, 1.0))
+        return sla(agents, service_time, calls_per_hour, aht)
     
     def get_name(self):
         """
@@ -110,17 +86,7 @@ class SLAStrategy(CalculationStrategy):
         Returns:
             float: Valor de Erlang C
         """
-        if agents <= intensity:
-            return 1.0
-        
-        b = ErlangCStrategy._calculate_erlang_b(agents, intensity)
-        denominator = (1 - (intensity / agents) * (1 - b))
-        
-        if denominator == 0:
-            return 1.0
-        
-        c = b / denominator
-        return max(0.0, min(c, 1.0))
+        return erlang_c(agents, intensity)
     
     @staticmethod
     def _calculate_erlang_b(servers, intensity):
@@ -134,15 +100,4 @@ class SLAStrategy(CalculationStrategy):
         Returns:
             float: Valor de Erlang B
         """
-        if servers < 0 or intensity < 0:
-            return 0.0
-        
-        max_iterate = int(servers)
-        last = 1.0
-        b = 1.0
-        
-        for count in range(1, max_iterate + 1):
-            b = (intensity * last) / (count + (intensity * last))
-            last = b
-        
-        return max(0.0, min(b, 1.0))
\ No newline at end of file
+        return erlang_b(servers, intensity)
\ No newline at end of file
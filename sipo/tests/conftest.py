@@ -34,6 +34,38 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture(autouse=True)
+def clear_erlang_cache():
+    """
+    Fixture que vacía la caché compartida de cálculos Erlang y la de respuestas de escenarios
+    entre pruebas, para que los resultados de métodos simulados no se filtren a otras pruebas.
+    """
+    from utils.erlang_cache import get_erlang_cache
+    from utils.response_cache import get_scenario_response_cache
+    get_erlang_cache().clear()
+    get_scenario_response_cache().clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_instance_dirs(tmp_path, monkeypatch):
+    """
+    Fixture que dirige la caché de cargas, el registro de históricos y los cubos de reales
+    a un directorio temporal por prueba, para no escribir en instance/ ni reutilizar
+    entradas de ejecuciones anteriores.
+    """
+    from utils import upload_cache
+    from services.forecasting import dataset_registry, actuals_cube
+    monkeypatch.setattr(upload_cache, '_instance', upload_cache.UploadCache(
+        str(tmp_path / 'upload_cache'), max_bytes=TestingConfig.UPLOAD_CACHE_MAX_MB * 1024 * 1024
+    ))
+    monkeypatch.setattr(dataset_registry, '_instance', dataset_registry.HistoricalDatasetRegistry(
+        str(tmp_path / 'historical_datasets')
+    ))
+    monkeypatch.setattr(actuals_cube, '_instance', actuals_cube.ActualsCubeStore(str(tmp_path / 'actuals_cubes')))
+    yield
+
+
 @pytest.fixture(scope='session')
 def client(app):
     """
@@ -61,6 +93,21 @@ def session(app):
         connection.close()
 
 
+@pytest.fixture(scope='function')
+def db_session(app):
+    """
+    Fixture que proporciona la sesión de la aplicación (db.session), la misma que usan las rutas,
+    y vacía todas las tablas al terminar la prueba.
+    """
+    with app.app_context():
+        yield db.session
+
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+
+
 @pytest.fixture(scope='function')
 def sample_user():
     """
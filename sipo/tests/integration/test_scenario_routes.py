@@ -0,0 +1,204 @@
+"""
+Pruebas de integración de las rutas de escenarios de dimensionamiento guardados.
+"""
+
+import io
+import json
+import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from models import Campaign, DimensioningScenario, Segment
+
+
+@pytest.fixture
+def segment(db_session):
+    """
+    Crea una campaña y un segmento para asociar escenarios.
+    """
+    campaign = Campaign(code='HIST', name='Campaña historial', country='ES')
+    db_session.add(campaign)
+    db_session.flush()
+    segment = Segment(name='Segmento historial', campaign_id=campaign.id)
+    db_session.add(segment)
+    db_session.commit()
+    return segment
+
+
+def add_scenario(db_session, segment, created_at, scenario_id=None, id_legal='U1', kpis=None):
+    """
+    Guarda un escenario sin tablas de resultados.
+    """
+    scenario = DimensioningScenario(
+        id=scenario_id,
+        segment_id=segment.id,
+        created_at=created_at,
+        parameters=json.dumps({'start_date': '2025-01-01', 'end_date': '2025-01-31'}),
+        id_legal=id_legal,
+        kpis_data=json.dumps(kpis or {}),
+    )
+    db_session.add(scenario)
+    db_session.commit()
+    return scenario.id
+
+
+def template_workbook():
+    """
+    Construye en memoria una plantilla de dimensionamiento de dos días con todas las hojas requeridas.
+    """
+    labels = [datetime.time(i // 2, (i % 2) * 30) for i in range(48)]
+    values = {
+        'Volumen_a_gestionar': 20,
+        'AHT_esperado': 300,
+        'Absentismo_esperado': 0.05,
+        'Auxiliares_esperados': 0.1,
+        'Desconexiones_esperadas': 0.02,
+    }
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name, value in values.items():
+        sheet = workbook.create_sheet(name)
+        sheet.append(['Fecha', 'Dia'] + labels)
+        sheet.append([datetime.datetime(2025, 1, 1), 'Miércoles'] + [value] * 48)
+        sheet.append([datetime.datetime(2025, 1, 2), 'Jueves'] + [value] * 48)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+class TestCalculateRoute:
+    """
+    Pruebas de POST /calculate sobre el escenario guardado.
+    """
+
+    def test_executor_is_not_stored_in_parameters(self, client, db_session, segment):
+        """
+        Verifica que el ejecutor elegido en la petición no se guarda en los parámetros del escenario.
+        """
+        response = client.post('/api/calculator/calculate', data={
+            'segment_id': str(segment.id),
+            'sla_objetivo': '0.8',
+            'sla_tiempo': '20',
+            'nda_objetivo': '0.9',
+            'start_date': '2025-01-01',
+            'end_date': '2025-01-02',
+            'executor': 'serial',
+            'plantilla_excel': (template_workbook(), 'plantilla.xlsx'),
+        }, content_type='multipart/form-data')
+
+        assert response.status_code == 200
+        scenario = db_session.query(DimensioningScenario).one()
+        parameters = json.loads(scenario.parameters)
+        assert 'executor' not in parameters
+        assert parameters['sla_objetivo'] == 0.8
+
+
+class TestScenarioDetailsCache:
+    """
+    Pruebas de la caché de respuestas de GET /history/<id> con ETag.
+    """
+
+    def test_etag_and_not_modified(self, client, db_session, segment):
+        """
+        Verifica que la respuesta lleva ETag y que con If-None-Match coincidente se responde 304.
+        """
+        scenario_id = add_scenario(db_session, segment, datetime.datetime(2025, 1, 1, 8), kpis={'sla': 0.8})
+
+        first = client.get(f'/api/calculator/history/{scenario_id}')
+        second = client.get(f'/api/calculator/history/{scenario_id}', headers={'If-None-Match': first.headers['ETag']})
+
+        assert first.status_code == 200
+        assert first.get_json()['kpis'] == {'sla': 0.8}
+        assert second.status_code == 304
+
+    def test_reused_id_is_not_served_from_cache(self, client, db_session, segment):
+        """
+        Verifica que un escenario nuevo que reutiliza el id de uno borrado en otro proceso
+        (sin invalidar esta caché) no recibe la respuesta ni el ETag del anterior.
+        """
+        scenario_id = add_scenario(db_session, segment, datetime.datetime(2025, 1, 1, 8), kpis={'sla': 0.8})
+        old = client.get(f'/api/calculator/history/{scenario_id}')
+
+        db_session.delete(db_session.get(DimensioningScenario, scenario_id))
+        db_session.commit()
+        assert client.get(f'/api/calculator/history/{scenario_id}').status_code == 404
+
+        add_scenario(db_session, segment, datetime.datetime(2025, 2, 1, 9), scenario_id=scenario_id, kpis={'sla': 0.9})
+        new = client.get(f'/api/calculator/history/{scenario_id}', headers={'If-None-Match': old.headers['ETag']})
+
+        assert new.status_code == 200
+        assert new.get_json()['kpis'] == {'sla': 0.9}
+        assert new.headers['ETag'] != old.headers['ETag']
+
+    def test_reused_id_without_delete_request(self, client, db_session, segment):
+        """
+        Verifica que la versión (fecha de creación) invalida la entrada aunque la ruta no haya visto el borrado.
+        """
+        scenario_id = add_scenario(db_session, segment, datetime.datetime(2025, 1, 1, 8), kpis={'sla': 0.8})
+        client.get(f'/api/calculator/history/{scenario_id}')
+
+        db_session.delete(db_session.get(DimensioningScenario, scenario_id))
+        db_session.commit()
+        add_scenario(db_session, segment, datetime.datetime(2025, 2, 1, 9), scenario_id=scenario_id, kpis={'sla': 0.9})
+
+        assert client.get(f'/api/calculator/history/{scenario_id}').get_json()['kpis'] == {'sla': 0.9}
+
+
+class TestScenarioHistoryPage:
+    """
+    Pruebas de la paginación por clave de GET /history.
+    """
+
+    def test_cursor_walks_all_pages(self, client, db_session, segment):
+        """
+        Verifica que limit=2 devuelve un cursor y que al seguirlo llega la última fila sin cabecera.
+        """
+        ids = [add_scenario(db_session, segment, datetime.datetime(2025, 1, day, 8)) for day in (1, 2, 3)]
+        add_scenario(db_session, segment, datetime.datetime(2025, 1, 4, 8), id_legal='U2')
+
+        first = client.get('/api/calculator/history?id_legal=U1&limit=2')
+        cursor = first.headers['X-Next-Before-Id']
+        second = client.get(f'/api/calculator/history?id_legal=U1&limit=2&before_id={cursor}')
+
+        assert first.status_code == 200
+        assert [row['id'] for row in first.get_json()] == [ids[2], ids[1]]
+        assert first.get_json()[0]['created_at'] == '2025-01-03 08:00:00'
+        assert first.get_json()[0]['campaign_name'] == 'Campaña historial'
+        assert int(cursor) == ids[1]
+        assert [row['id'] for row in second.get_json()] == [ids[0]]
+        assert 'X-Next-Before-Id' not in second.headers
+
+    def test_before_id_filters_older_scenarios(self, client, db_session, segment):
+        """
+        Verifica que before_id devuelve solo los escenarios con id menor.
+        """
+        ids = [add_scenario(db_session, segment, datetime.datetime(2025, 1, day, 8)) for day in (1, 2, 3)]
+
+        response = client.get(f'/api/calculator/history?id_legal=U1&before_id={ids[2]}')
+
+        assert [row['id'] for row in response.get_json()] == [ids[1], ids[0]]
+        assert 'X-Next-Before-Id' not in response.headers
+
+    def test_limit_is_capped(self, client, db_session, segment, monkeypatch):
+        """
+        Verifica que limit se recorta a HISTORY_MAX_LIMIT.
+        """
+        monkeypatch.setattr('routes.calculator.HISTORY_MAX_LIMIT', 2)
+        ids = [add_scenario(db_session, segment, datetime.datetime(2025, 1, day, 8)) for day in (1, 2, 3)]
+
+        response = client.get('/api/calculator/history?id_legal=U1&limit=500')
+
+        assert [row['id'] for row in response.get_json()] == [ids[2], ids[1]]
+        assert response.headers['X-Next-Before-Id'] == str(ids[1])
+
+    @pytest.mark.parametrize('query', ['limit=abc', 'limit=0', 'limit=-1', 'before_id=x', 'before_id=0'])
+    def test_invalid_parameters(self, client, db_session, query):
+        """
+        Verifica que limit y before_id no enteros o no positivos devuelven 400.
+        """
+        response = client.get(f'/api/calculator/history?id_legal=U1&{query}')
+
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
@@ -0,0 +1,247 @@
+"""
+Pruebas unitarias para el cubo de datos reales por segmento.
+"""
+
+import os
+import json
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.forecasting.actuals_cube import ActualsCubeStore, get_actuals_cube_store, parse_actuals_day
+from services.forecasting.dataset_registry import DatasetNotFoundError, filter_history
+from services.forecasting.excel_parser import ExcelParserUtils
+from services.forecasting.forecasting_facade import ForecastingService
+from utils.file_lock import file_lock
+
+
+def actuals_json(day, labels):
+    """
+    Construye el JSON de ActualsData de un día (volumen y AHT dependientes del día y del intervalo).
+    """
+    return json.dumps({
+        label: {'entrantes': (day + 1) * (i % 5), 'atendidas': (day + 1) * (i % 5), 'nds': 0, 'aht': 200 + i}
+        for i, label in enumerate(labels)
+    })
+
+
+class TestActualsCubeStore:
+    """
+    Pruebas de carga incremental y lectura por ventanas del cubo de reales.
+    """
+
+    def setup_method(self):
+        """
+        Prepara 60 días de reales con 48 intervalos de media hora.
+        """
+        self.labels = [f"{i // 2:02d}:{(i % 2) * 30:02d}" for i in range(48)]
+        self.start = datetime.date(2024, 1, 1)
+        self.days = {
+            self.start + datetime.timedelta(days=d): actuals_json(d, self.labels) for d in range(60)
+        }
+
+    def expected_frame(self):
+        """
+        Construye el histórico esperado fila a fila a partir de los JSON.
+        """
+        rows = []
+        for date, text in sorted(self.days.items()):
+            for label, cell in json.loads(text).items():
+                rows.append({'Fecha': pd.Timestamp(date), 'Intervalo': label,
+                             'Llamadas Ofrecidas': float(cell['entrantes']), 'AHT': float(cell['aht'])})
+        return pd.DataFrame(rows)
+
+    def test_incremental_append_matches_full_rebuild(self, tmp_path):
+        """
+        Verifica que cargar los días por lotes y desordenados da el mismo cubo que reconstruirlo de una vez.
+        """
+        store = ActualsCubeStore(str(tmp_path))
+        dates = sorted(self.days)
+        for batch in (dates[30:], dates[:10], dates[10:30]):
+            store.append(7, {date: self.days[date] for date in batch})
+
+        incremental = store.open(7).frame()
+        meta = store.rebuild(8, self.days)
+
+        assert meta['days'] == 60
+        assert meta['start_date'] == '2024-01-01'
+        assert meta['end_date'] == '2024-02-29'
+        assert store.info(7)['generation'] == 3
+        pd.testing.assert_frame_equal(incremental, self.expected_frame(), check_dtype=False)
+        pd.testing.assert_frame_equal(store.open(8).frame(), incremental)
+
+    def test_upsert_replaces_day_and_widens_intervals(self, tmp_path):
+        """
+        Verifica que recargar un día lo sustituye y que un intervalo nuevo amplía el cubo sin alterar el resto.
+        """
+        store = ActualsCubeStore(str(tmp_path))
+        store.append(7, self.days)
+        first = store.open(7)
+
+        day = self.start + datetime.timedelta(days=5)
+        store.append(7, {day: {'08:00': {'entrantes': 999, 'aht': 180}, '23:45': {'entrantes': 3, 'aht': 90}}})
+        cube = store.open(7)
+
+        assert cube is not first
+        assert len(cube.labels) == 49
+        replaced = cube.frame(start=day, end=day)
+        assert replaced['Intervalo'].tolist() == ['08:00', '23:45']
+        assert replaced['Llamadas Ofrecidas'].tolist() == [999, 3]
+        assert replaced['AHT'].tolist() == [180, 90]
+
+        other = cube.frame(start=self.start, end=self.start)
+        assert other['Intervalo'].tolist() == self.labels
+        # El cubo abierto antes de la carga sigue leyendo su generación
+        assert len(first.frame(start=day, end=day)) == 48
+
+    def test_window_filters_match_filter_history(self, tmp_path):
+        """
+        Verifica que los filtros por ventana dan lo mismo que filtrar el histórico completo.
+        """
+        store = ActualsCubeStore(str(tmp_path))
+        store.append(7, self.days)
+        cube = store.open(7)
+        expected = self.expected_frame()
+
+        filters = [
+            {'last_days': 14},
+            {'start': datetime.date(2024, 2, 10), 'end': datetime.date(2024, 2, 12)},
+            {'month_day': (2, 29)},
+            {'dates': [datetime.date(2024, 1, 6), datetime.date(2024, 3, 6)]},
+        ]
+        for kwargs in filters:
+            pd.testing.assert_frame_equal(
+                cube.frame(**kwargs), filter_history(expected, **kwargs).reset_index(drop=True), check_dtype=False
+            )
+
+        fecha, volumen, aht = cube.window(last_days=7)
+        assert fecha[0] == np.datetime64('2024-02-23')
+        assert volumen.shape == aht.shape == (7, 48)
+        assert ExcelParserUtils.is_historical_dataset(cube)
+        assert len(ExcelParserUtils.load_history(cube, last_days=28)) == 28 * 48
+
+    def test_missing_cube_and_invalid_values(self, tmp_path):
+        """
+        Verifica que un segmento sin cubo lanza DatasetNotFoundError y que los valores no numéricos se rechazan.
+        """
+        store = ActualsCubeStore(str(tmp_path))
+
+        with pytest.raises(DatasetNotFoundError):
+            store.open(7)
+        with pytest.raises(ValueError):
+            store.append(7, {self.start: {'08:00': {'entrantes': 'n/a'}}})
+        assert store.info(7) is None
+
+        parsed = parse_actuals_day('{"interval1": 8, "8:30:00": {"entrantes": 14}}')
+        assert list(parsed) == ['interval1', '08:30']
+        assert [volume for volume, _ in parsed.values()] == [8.0, 14.0]
+        assert all(np.isnan(aht) for _, aht in parsed.values())
+
+    def test_append_waits_for_segment_lock(self, tmp_path):
+        """
+        Verifica que append espera al bloqueo del segmento tomado por otro descriptor (otro proceso).
+        """
+        store = ActualsCubeStore(str(tmp_path))
+        store.append(7, {self.start: self.days[self.start]})
+        day = self.start + datetime.timedelta(days=1)
+
+        worker = threading.Thread(target=store.append, args=(7, {day: self.days[day]}))
+        with file_lock(os.path.join(str(tmp_path), '7.lock')):
+            worker.start()
+            worker.join(0.2)
+            assert worker.is_alive()
+            assert store.info(7)['generation'] == 1
+        worker.join(5)
+
+        assert not worker.is_alive()
+        assert store.info(7)['days'] == 2
+
+
+class TestRecordActuals:
+    """
+    Pruebas de ForecastingService.record_actuals y de la frescura del cubo frente a ActualsData.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_segment(self, db_session):
+        """
+        Prepara el servicio y un segmento con el que guardar reales en ActualsData.
+        """
+        from models import Campaign, Segment
+
+        campaign = Campaign(code='ACT', name='Campaña reales', country='ES')
+        db_session.add(campaign)
+        db_session.flush()
+        segment = Segment(name='Segmento reales', campaign_id=campaign.id)
+        db_session.add(segment)
+        db_session.commit()
+        self.db_session = db_session
+        self.segment_id = segment.id
+        self.service = ForecastingService()
+
+    def legacy_upsert(self, date, actuals):
+        """
+        Escribe un día en ActualsData directamente, como la aplicación legacy (sin pasar por el cubo).
+        """
+        from models import ActualsData
+
+        row = ActualsData.query.filter_by(result_date=date, segment_id=self.segment_id).first()
+        if row is None:
+            self.db_session.add(ActualsData(result_date=date, segment_id=self.segment_id, actuals_data=json.dumps(actuals)))
+        else:
+            row.actuals_data = json.dumps(actuals)
+        self.db_session.commit()
+
+    def test_invalid_day_is_not_saved(self):
+        """
+        Verifica que si algún día no es válido no se guarda ninguno ni se toca el cubo.
+        """
+        from models import ActualsData
+
+        days = {
+            '2025-01-01': {'08:00': {'entrantes': 10, 'aht': 300}},
+            '2025-01-02': {'08:00': {'entrantes': 'n/a'}},
+        }
+
+        with pytest.raises(ValueError):
+            self.service.record_actuals(self.segment_id, days)
+
+        assert ActualsData.query.count() == 0
+        assert get_actuals_cube_store().info(self.segment_id) is None
+
+    def test_valid_days_are_saved_then_appended(self):
+        """
+        Verifica que los días válidos se guardan en ActualsData y el cubo queda al día sin reconstruirse.
+        """
+        meta = self.service.record_actuals(self.segment_id, {'2025-01-02': {'08:00': {'entrantes': 12, 'aht': 310}}})
+        cube = self.service.open_actuals_cube(self.segment_id)
+        meta = self.service.record_actuals(self.segment_id, {'2025-01-03': {'08:00': {'entrantes': 14, 'aht': 300}}})
+
+        assert self.service.actuals_repository.get_days(self.segment_id).keys() == {
+            datetime.date(2025, 1, 2), datetime.date(2025, 1, 3)
+        }
+        assert meta['source'] == self.service.actuals_repository.get_fingerprint(self.segment_id)
+        assert self.service.open_actuals_cube(self.segment_id).generation == cube.generation + 1
+        assert self.service.open_actuals_cube(self.segment_id).frame()['Llamadas Ofrecidas'].tolist() == [12, 14]
+
+    def test_writes_outside_the_cube_trigger_rebuild(self):
+        """
+        Verifica que un día añadido o sustituido directamente en ActualsData se refleja al abrir el cubo.
+        """
+        self.service.record_actuals(self.segment_id, {'2025-01-02': {'08:00': {'entrantes': 12, 'aht': 310}}})
+        assert self.service.open_actuals_cube(self.segment_id).frame()['Llamadas Ofrecidas'].tolist() == [12]
+
+        self.legacy_upsert(datetime.date(2025, 1, 3), {'08:00': {'entrantes': 20, 'aht': 300}})
+        assert self.service.open_actuals_cube(self.segment_id).frame()['Llamadas Ofrecidas'].tolist() == [12, 20]
+
+        self.legacy_upsert(datetime.date(2025, 1, 2), {'08:00': {'entrantes': 1200, 'aht': 310}})
+        assert self.service.open_actuals_cube(self.segment_id).frame()['Llamadas Ofrecidas'].tolist() == [1200, 20]
+
+        # Una carga sobre un cubo desfasado no lo marca como al día
+        self.legacy_upsert(datetime.date(2025, 1, 4), {'08:00': {'entrantes': 30, 'aht': 300}})
+        meta = self.service.record_actuals(self.segment_id, {'2025-01-05': {'08:00': {'entrantes': 40, 'aht': 300}}})
+        assert meta['source'] is None
+        assert self.service.open_actuals_cube(self.segment_id).frame()['Llamadas Ofrecidas'].tolist() == [1200, 20, 30, 40]
@@ -0,0 +1,155 @@
+"""
+Pruebas unitarias para DimensioningBatchExecutor.
+Verifican la separación de un libro en grupos de hojas por segmento.
+"""
+
+import io
+import zipfile
+import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from werkzeug.datastructures import FileStorage
+
+from services.calculator.batch_executor import DimensioningBatchExecutor
+from utils.upload_cache import get_upload_cache
+
+
+class TestSplitWorkbook:
+    """
+    Pruebas de split_workbook.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        self.volume = pd.DataFrame({
+            'Segmento': ['Ventas', 'Ventas', 'Soporte'],
+            'Fecha': ['2024-01-01', '2024-01-02', '2024-01-01'],
+            '00:00': [10, 20, 30],
+        })
+        self.aht = pd.DataFrame({'Fecha': ['2024-01-01'], '00:00': [300]})
+
+    def test_segment_column_splits_rows(self):
+        """
+        Verifica que las filas se reparten por la columna de segmento y las hojas sin ella se comparten.
+        """
+        groups = DimensioningBatchExecutor.split_workbook({'Volumen_a_gestionar': self.volume, 'AHT_esperado': self.aht})
+
+        assert set(groups) == {'Ventas', 'Soporte'}
+        assert list(groups['Ventas']['Volumen_a_gestionar']['00:00']) == [10, 20]
+        assert 'Segmento' not in groups['Soporte']['Volumen_a_gestionar'].columns
+        assert groups['Soporte']['AHT_esperado'] is self.aht
+
+    def test_blank_segment_cells_keep_integer_keys(self):
+        """
+        Verifica que con celdas vacías en la columna de segmento (leída como float) las claves siguen
+        siendo los IDs enteros y las filas sin segmento se descartan.
+        """
+        volume = pd.DataFrame({
+            'segment_id': [12, None, 7, 12],
+            'Fecha': ['2024-01-01', '2024-01-01', '2024-01-01', '2024-01-02'],
+            '00:00': [10, 99, 30, 20],
+        })
+        assert volume['segment_id'].dtype == float
+
+        groups = DimensioningBatchExecutor.split_workbook({'Volumen_a_gestionar': volume, 'AHT_esperado': self.aht})
+
+        assert set(groups) == {'12', '7'}
+        assert list(groups['12']['Volumen_a_gestionar']['00:00']) == [10, 20]
+        assert list(groups['7']['Volumen_a_gestionar']['00:00']) == [30]
+
+    def test_sheet_groups_by_prefix(self):
+        """
+        Verifica que las hojas '<segmento>__<hoja>' forman un grupo por segmento.
+        """
+        groups = DimensioningBatchExecutor.split_workbook({
+            '12__Volumen_a_gestionar': self.aht,
+            '12__AHT_esperado': self.aht,
+            '15__Volumen_a_gestionar': self.aht,
+            'Absentismo_esperado': self.aht,
+        })
+
+        assert set(groups) == {'12', '15'}
+        assert set(groups['12']) == {'Volumen_a_gestionar', 'AHT_esperado', 'Absentismo_esperado'}
+        assert set(groups['15']) == {'Volumen_a_gestionar', 'Absentismo_esperado'}
+
+    def test_workbook_without_segments(self):
+        """
+        Verifica que un libro sin segmentos usa la clave por defecto o lanza ValueError.
+        """
+        groups = DimensioningBatchExecutor.split_workbook({'AHT_esperado': self.aht}, default_key='Ventas')
+        assert list(groups) == ['Ventas']
+
+        with pytest.raises(ValueError, match="No se encontraron segmentos"):
+            DimensioningBatchExecutor.split_workbook({'AHT_esperado': self.aht})
+
+
+class TestReadUpload:
+    """
+    Pruebas de read_upload con el lector selectivo de plantillas.
+    """
+
+    def setup_method(self):
+        """
+        Construye en memoria un libro con grupos por prefijo, columna de segmento con una celda vacía y una hoja ajena.
+        """
+        workbook = Workbook()
+        volume = workbook.active
+        volume.title = 'Volumen_a_gestionar'
+        volume.append(['segment_id', 'Fecha', datetime.time(0, 0)])
+        volume.append([12, datetime.datetime(2024, 1, 1), 10])
+        volume.append([None, datetime.datetime(2024, 1, 1), 99])
+        volume.append([7, datetime.datetime(2024, 1, 1), 30])
+        grouped = workbook.create_sheet('12__AHT_esperado')
+        grouped.append(['Fecha', datetime.time(0, 0)])
+        grouped.append([datetime.datetime(2024, 1, 1), 280])
+        shared = workbook.create_sheet('AHT_esperado')
+        shared.append(['Fecha', datetime.time(0, 0)])
+        shared.append([datetime.datetime(2024, 1, 1), 300])
+        workbook.create_sheet('12__Notas').append(['no se usa'])
+        workbook.create_sheet('Notas').append(['no se usa'])
+
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        self.content = buffer.getvalue()
+
+    def upload(self, filename, content):
+        """
+        Simula el archivo subido en la petición.
+        """
+        return FileStorage(stream=io.BytesIO(content), filename=filename)
+
+    def test_reads_only_dimensioning_sheets_through_cache(self):
+        """
+        Verifica que solo se leen las hojas del dimensionamiento (con y sin prefijo) y que una segunda carga sale de la caché.
+        """
+        cache = get_upload_cache()
+        hits = cache.hits
+
+        jobs = DimensioningBatchExecutor.read_upload(self.upload('lote.xlsx', self.content))
+        again = DimensioningBatchExecutor.read_upload(self.upload('lote.xlsx', self.content))
+
+        assert set(jobs) == {'12', '7'}
+        assert set(jobs['12']) == {'Volumen_a_gestionar', 'AHT_esperado'}
+        assert list(jobs['12']['AHT_esperado'].iloc[:, 1]) == [280]
+        assert list(jobs['7']['AHT_esperado'].iloc[:, 1]) == [300]
+        assert list(jobs['7']['Volumen_a_gestionar'].iloc[:, 1]) == [30]
+        assert cache.hits == hits + 1
+        assert set(again) == set(jobs)
+
+    def test_zip_members_use_template_reader(self):
+        """
+        Verifica que cada libro de un zip se lee con el mismo lector selectivo.
+        """
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('lote.xlsx', self.content)
+            archive.writestr('notas.txt', 'no es un libro')
+
+        jobs = DimensioningBatchExecutor.read_upload(self.upload('lote.zip', buffer.getvalue()))
+
+        assert set(jobs) == {'12', '7'}
+        assert 'Notas' not in jobs['7']
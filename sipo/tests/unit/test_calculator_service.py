@@ -266,7 +266,8 @@ class TestCalculatorService:
             'Desconexiones_esperadas': df_shrink
         }
         
-        df_dimensionados, df_presentes, df_logados, df_efectivos, kpi_data = CalculatorService.procesar_plantilla_unica(config, all_sheets)
+        cube, kpi_data, df_calls, df_aht = CalculatorService.procesar_plantilla_unica(config, all_sheets)
+        df_dimensionados, df_presentes, df_logados, df_efectivos = cube.result_frames()
         
         assert df_dimensionados is not None
         assert df_presentes is not None
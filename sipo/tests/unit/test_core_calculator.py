@@ -0,0 +1,338 @@
+"""
+Pruebas unitarias para DimensioningCoreCalculator.
+Verifican que el cálculo sobre matrices coincide con el recorrido fila a fila.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.calculator.calculator_service import CalculatorService
+from services.calculator.core_calculator import DimensioningCoreCalculator
+from services.calculator.chunk_executor import DimensioningChunkExecutor, get_process_pool
+from services.calculator.dimensioning_cube import DimensioningCube
+
+
+class TestCalculateRequirements:
+    """
+    Pruebas de consistencia entre los modos vectorizado y fila a fila.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        rng = np.random.default_rng(21)
+        self.time_labels = [f"{i*30//60:02d}:{i*30%60:02d}" for i in range(48)]
+        days = 10
+        data = {
+            'Fecha': pd.date_range('2024-01-01', periods=days),
+            'Dia': ['Lunes'] * days,
+            'Semana': [1] * days,
+            'Tipo': ['Laboral'] * days,
+        }
+        calls = np.round(rng.uniform(0, 300, (days, 48)))
+        calls[:, :12] = 0
+        aht = rng.choice([180.0, 240.0, 300.0], (days, 48))
+        aht[0, 20] = 0
+        for j, label in enumerate(self.time_labels):
+            data[label] = calls[:, j]
+            data[f'{label}_aht'] = aht[:, j]
+            data[f'{label}_abs'] = rng.uniform(0, 0.2, days)
+            data[f'{label}_shr'] = rng.uniform(0, 0.3, days)
+            data[f'{label}_aux'] = rng.choice([0.05, 1.0, 1.5], days)
+        self.df_master = pd.DataFrame(data)
+        self.config = {'sla_objetivo': 0.8, 'sla_tiempo': 20}
+
+    def test_vectorized_matches_rows(self):
+        """
+        Verifica que ambos modos devuelven los mismos cuatro DataFrames a partir del mismo cubo float32.
+        """
+        service = CalculatorService()
+        vectorized = DimensioningCoreCalculator(service, vectorized=True)
+        rows = DimensioningCoreCalculator(service, vectorized=False)
+        cube = DimensioningCube.from_frame(self.df_master, self.time_labels)
+
+        expected = rows.calculate_requirements(cube, self.config, self.time_labels)
+        result = vectorized.calculate_requirements(cube, self.config, self.time_labels)
+
+        for frame, expected_frame in zip(result, expected):
+            assert list(frame.columns) == list(expected_frame.columns)
+            assert np.array_equal(
+                frame[self.time_labels].to_numpy(dtype=float),
+                expected_frame[self.time_labels].to_numpy(dtype=float)
+            )
+            assert frame['Fecha'].equals(expected_frame['Fecha'])
+
+    def test_dataframe_input_matches_rows(self):
+        """
+        Verifica que el DataFrame maestro en float64 da el mismo resultado salvo la precisión float32 del cubo,
+        y que los DataFrames de la API se entregan en float64.
+        """
+        service = CalculatorService()
+        expected = DimensioningCoreCalculator(service, vectorized=False).calculate_requirements(
+            self.df_master, self.config, self.time_labels
+        )
+        result = DimensioningCoreCalculator(service, vectorized=True).calculate_requirements(
+            self.df_master, self.config, self.time_labels
+        )
+
+        for frame, expected_frame in zip(result, expected):
+            assert frame[self.time_labels].dtypes.eq(np.float64).all()
+            np.testing.assert_allclose(
+                frame[self.time_labels].to_numpy(dtype=float),
+                expected_frame[self.time_labels].to_numpy(dtype=float),
+                rtol=1e-6
+            )
+
+    def test_formatted_cells_are_exactly_rounded(self):
+        """
+        Verifica que las celdas formateadas son exactamente round(x, 1), sin restos del float32 del cubo.
+        """
+        calculator = DimensioningCoreCalculator(CalculatorService(), vectorized=True)
+        cube = DimensioningCube.from_frame(self.df_master, self.time_labels)
+        values = np.full((len(cube), len(self.time_labels)), 12.3, dtype=np.float32)
+        values[:, 1] = 7.25
+        cube.set_results(values, values, values, values)
+
+        for df in (cube.layer_frame('dimensionados'),
+                   calculator.build_frames(cube.index, self.time_labels, values)[0]):
+            formatted = calculator.format_results(df).to_dict(orient='records')[0]
+            assert formatted['00:00'] == round(float(np.float32(12.3)), 1) == 12.3
+            assert formatted['00:30'] == round(7.25, 1)
+            assert formatted['Horas-Totales'] == round((12.3 * 47 + round(7.25, 1)) / 24, 1)
+
+    def test_missing_reducer_columns_default_to_zero(self):
+        """
+        Verifica que sin columnas de reductores los cuatro niveles coinciden.
+        """
+        df_master = self.df_master[['Fecha'] + self.time_labels + [f'{t}_aht' for t in self.time_labels]]
+        calculator = DimensioningCoreCalculator(CalculatorService(), vectorized=True)
+
+        df_dim, df_pre, df_log, df_efe = calculator.calculate_requirements(df_master, self.config, self.time_labels)
+
+        assert np.array_equal(df_dim[self.time_labels].to_numpy(), df_efe[self.time_labels].to_numpy())
+        assert (df_efe[self.time_labels[:12]] == 0).all().all()
+
+
+class TestCalculateRequirementsSweep:
+    """
+    Pruebas del cálculo de varios objetivos sobre el mismo DataFrame maestro.
+    """
+
+    def setup_method(self):
+        """
+        Reutiliza los datos de TestCalculateRequirements.
+        """
+        base = TestCalculateRequirements()
+        base.setup_method()
+        self.df_master = base.df_master
+        self.time_labels = base.time_labels
+        self.calculator = DimensioningCoreCalculator(CalculatorService(), vectorized=True)
+
+    def test_sweep_matches_single_target_calculations(self):
+        """
+        Verifica que cada objetivo del barrido coincide con su cálculo individual.
+        """
+        targets = [(0.7, 20), (0.8, 20), (0.9, 30)]
+
+        results = self.calculator.calculate_requirements_sweep(self.df_master, {}, self.time_labels, targets)
+
+        assert len(results) == len(targets)
+        for (target_level, service_time), matrices in zip(targets, results):
+            config = {'sla_objetivo': target_level, 'sla_tiempo': service_time}
+            expected = self.calculator.calculate_requirements(self.df_master, config, self.time_labels)
+            for matrix, expected_frame in zip(matrices, expected):
+                assert np.array_equal(matrix, expected_frame[self.time_labels].to_numpy(dtype=float))
+
+    def test_higher_target_needs_more_agents(self):
+        """
+        Verifica que un objetivo más exigente nunca requiere menos agentes.
+        """
+        low, high = self.calculator.calculate_requirements_sweep(
+            self.df_master, {}, self.time_labels, [(0.7, 20), (0.9, 20)]
+        )
+
+        assert (high[3] >= low[3]).all()
+
+    def test_parse_targets_accepts_percentages(self):
+        """
+        Verifica la normalización de objetivos y el rechazo de formatos no válidos.
+        """
+        from services.calculator.calculator_facade import CalculatorServiceFacade
+
+        assert CalculatorServiceFacade._parse_targets([[80, 20], ['0.9', '30']]) == [(0.8, 20), (0.9, 30)]
+        with pytest.raises(ValueError, match="Objetivo no válido"):
+            CalculatorServiceFacade._parse_targets(['80/20'])
+        with pytest.raises(ValueError, match="al menos un objetivo"):
+            CalculatorServiceFacade._parse_targets([])
+
+
+class TestCalculateSensitivityGrid:
+    """
+    Pruebas de la rejilla de sensibilidad de volumen y AHT.
+    """
+
+    def setup_method(self):
+        """
+        Reutiliza los datos de TestCalculateRequirements.
+        """
+        base = TestCalculateRequirements()
+        base.setup_method()
+        self.df_master = base.df_master
+        self.config = base.config
+        self.time_labels = base.time_labels
+        self.calculator = DimensioningCoreCalculator(CalculatorService(), vectorized=True)
+
+    def test_unshocked_cell_matches_calculation(self):
+        """
+        Verifica que la celda sin choques reproduce los agentes dimensionados.
+        """
+        df_dim, _, _, _ = self.calculator.calculate_requirements(self.df_master, self.config, self.time_labels)
+
+        grid = self.calculator.calculate_sensitivity_grid(
+            self.df_master, self.config, self.time_labels, [0.9, 1.0, 1.1], [1.0]
+        )
+
+        assert grid.shape == (3, 1, len(self.df_master), 48)
+        np.testing.assert_allclose(grid[1, 0], df_dim[self.time_labels].to_numpy(dtype=float), rtol=1e-6)
+
+    def test_shocks_match_scaled_inputs(self):
+        """
+        Verifica que un choque equivale a recalcular con el volumen y el AHT escalados.
+        """
+        df_shocked = self.df_master.copy()
+        for label in self.time_labels:
+            df_shocked[label] = df_shocked[label] * 1.1
+            df_shocked[f'{label}_aht'] = df_shocked[f'{label}_aht'] * 0.95
+        df_dim, _, _, _ = self.calculator.calculate_requirements(df_shocked, self.config, self.time_labels)
+
+        grid = self.calculator.calculate_sensitivity_grid(
+            self.df_master, self.config, self.time_labels, [1.1], [0.95]
+        )
+
+        np.testing.assert_allclose(grid[0, 0], df_dim[self.time_labels].to_numpy(dtype=float), rtol=1e-6)
+
+
+class TestRecalculateReducers:
+    """
+    Pruebas del recálculo incremental cambiando solo los reductores.
+    """
+
+    def setup_method(self):
+        """
+        Calcula un escenario base con los datos de TestCalculateRequirements.
+        """
+        base = TestCalculateRequirements()
+        base.setup_method()
+        self.df_master = base.df_master
+        self.config = base.config
+        self.time_labels = base.time_labels
+        self.service = CalculatorService()
+        self.calculator = DimensioningCoreCalculator(self.service, vectorized=True)
+        frames = self.calculator.calculate_requirements(self.df_master, self.config, self.time_labels)
+        self.stored_frames = dict(zip(('dimensionados', 'presentes', 'logados', 'efectivos'), frames))
+
+    def test_new_shrinkage_matches_full_calculation(self):
+        """
+        Verifica que cambiar las desconexiones equivale a recalcular el escenario completo.
+        """
+        shrinkage = np.full((len(self.df_master), 48), 0.25)
+        df_changed = self.df_master.copy()
+        for label in self.time_labels:
+            df_changed[f'{label}_shr'] = 0.25
+        expected = self.calculator.calculate_requirements(df_changed, self.config, self.time_labels)
+
+        result = self.service.recalculate_reducers(
+            self.stored_frames, {'absentismo_pct': 5.0}, reducer_arrays={'shrinkage': shrinkage}
+        )
+        df_dim, df_pre, df_log, df_efe, kpis, recalculated = result
+
+        for frame, expected_frame in zip((df_dim, df_pre, df_log, df_efe), expected):
+            np.testing.assert_allclose(
+                frame[self.time_labels].to_numpy(dtype=float),
+                expected_frame[self.time_labels].to_numpy(dtype=float),
+                rtol=1e-6
+            )
+        assert recalculated == ['shrinkage']
+        assert kpis['desconexiones_pct'] == 25.0
+        assert kpis['absentismo_pct'] == 5.0
+
+    def test_unchanged_stages_keep_stored_values(self):
+        """
+        Verifica que las etapas anteriores al reductor modificado no cambian.
+        """
+        df_dim, df_pre, df_log, _, _, _ = self.service.recalculate_reducers(
+            self.stored_frames, {}, reducer_arrays={'shrinkage': 0.1}
+        )
+
+        assert np.array_equal(
+            df_log[self.time_labels].to_numpy(dtype=float),
+            self.stored_frames['logados'][self.time_labels].to_numpy(dtype=float)
+        )
+        assert np.array_equal(
+            df_pre[self.time_labels].to_numpy(dtype=float),
+            self.stored_frames['presentes'][self.time_labels].to_numpy(dtype=float)
+        )
+
+    def test_invalid_reducer_raises(self):
+        """
+        Verifica que un reductor desconocido o sin datos lanza ValueError.
+        """
+        with pytest.raises(ValueError, match="Reductor no válido"):
+            self.service.recalculate_reducers(self.stored_frames, {}, reducer_arrays={'breaks': 0.1})
+        with pytest.raises(ValueError, match="No se recibieron reductores"):
+            self.service.recalculate_reducers(self.stored_frames, {})
+
+
+class TestDimensioningChunkExecutor:
+    """
+    Pruebas del cálculo por bloques de fechas en procesos.
+    """
+
+    def setup_method(self):
+        """
+        Reutiliza los datos de TestCalculateRequirements.
+        """
+        base = TestCalculateRequirements()
+        base.setup_method()
+        self.df_master = base.df_master
+        self.config = dict(base.config, segment=object())
+        self.time_labels = base.time_labels
+        self.calculator = DimensioningCoreCalculator(CalculatorService())
+
+    def test_process_executor_matches_serial(self):
+        """
+        Verifica que los bloques reensamblados son idénticos al cálculo en serie.
+        """
+        executor = DimensioningChunkExecutor(self.calculator, max_workers=2, chunk_days=3)
+
+        serial, serial_info = executor.run(self.df_master, self.config, self.time_labels, executor='serial')
+        parallel, parallel_info = executor.run(self.df_master, self.config, self.time_labels, executor='process')
+
+        assert np.array_equal(parallel.results, serial.results)
+        for frame, expected in zip(parallel.result_frames(), serial.result_frames()):
+            pd.testing.assert_frame_equal(frame, expected)
+        assert serial_info['executor'] == 'serial'
+        assert parallel_info['executor'] == 'process'
+        assert [chunk['rows'] for chunk in parallel_info['chunks']] == [3, 3, 3, 1]
+
+    def test_process_pool_is_reused(self):
+        """
+        Verifica que las ejecuciones en procesos reutilizan el mismo pool en lugar de crear uno por petición.
+        """
+        executor = DimensioningChunkExecutor(self.calculator, max_workers=2, chunk_days=3)
+
+        executor.run(self.df_master, self.config, self.time_labels, executor='process')
+        pool = get_process_pool(2)
+        executor.run(self.df_master, self.config, self.time_labels, executor='process')
+
+        assert get_process_pool(2) is pool
+        assert DimensioningChunkExecutor(self.calculator, max_workers=2).max_workers == 2
+
+    def test_invalid_executor_raises(self):
+        """
+        Verifica que un ejecutor desconocido lanza ValueError.
+        """
+        with pytest.raises(ValueError, match="Ejecutor no válido"):
+            DimensioningChunkExecutor(self.calculator, executor='threads')
@@ -0,0 +1,167 @@
+"""
+Pruebas unitarias para DimensioningDataProcessor.
+Verifican la lectura selectiva de la plantilla de dimensionamiento.
+"""
+
+import io
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from services.calculator.data_processor import DimensioningDataProcessor
+from services.calculator.kpi_service import DimensioningKPIService
+
+
+class TestReadTemplate:
+    """
+    Pruebas de read_template frente a pd.read_excel.
+    """
+
+    def setup_method(self):
+        """
+        Construye en memoria un libro con hojas requeridas y una hoja ajena.
+        """
+        workbook = Workbook()
+        volume = workbook.active
+        volume.title = 'Volumen_a_gestionar'
+        volume.append(['Fecha', 'Dia', datetime.time(0, 0), datetime.time(0, 30), None])
+        volume.append([datetime.datetime(2024, 1, 1), 'Lunes', 10, 12.5, None])
+        volume.append([datetime.datetime(2024, 1, 2), 'Martes', None, 7, None])
+        aht = workbook.create_sheet(' aht ')
+        aht.append(['Plantilla AHT', None, None])
+        aht.append(['Fecha', '00:00', '00:00'])
+        aht.append(['01/01/2024', 300, 310])
+        notes = workbook.create_sheet('Notas')
+        notes.append(['no se usa'])
+
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        self.content = buffer.getvalue()
+
+    def test_reads_only_required_sheets(self):
+        """
+        Verifica que solo se cargan las hojas resueltas por SHEET_NAME_RULES.
+        """
+        sheets = DimensioningDataProcessor.read_template(io.BytesIO(self.content))
+
+        assert set(sheets) == {'Volumen_a_gestionar', ' aht '}
+
+    def test_matches_read_excel(self):
+        """
+        Verifica que cada hoja coincide con la que devuelve pd.read_excel.
+        """
+        sheets = DimensioningDataProcessor.read_template(io.BytesIO(self.content))
+        expected = pd.read_excel(io.BytesIO(self.content), sheet_name=None)
+
+        for name, df in sheets.items():
+            pd.testing.assert_frame_equal(df, expected[name], check_dtype=False)
+
+    def test_reducer_keys_only(self):
+        """
+        Verifica que con keys solo se buscan las hojas pedidas.
+        """
+        sheets = DimensioningDataProcessor.read_template(
+            io.BytesIO(self.content), keys=DimensioningDataProcessor.REDUCER_KEYS
+        )
+
+        assert sheets == {}
+
+
+class TestBuildCube:
+    """
+    Pruebas del alineamiento de hojas en el cubo (métrica × día × intervalo).
+    """
+
+    def setup_method(self):
+        """
+        Construye hojas ya normalizadas con cabeceras de tiempo en distintos formatos.
+        """
+        self.time_labels = ['00:00', '00:30', '01:00']
+        self.sheets = {
+            'calls': pd.DataFrame({
+                'Fecha': ['2024-01-01', '2024-01-02', '2024-01-03'],
+                'Dia': ['Lunes', 'Martes', 'Miércoles'],
+                datetime.time(0, 0): [10, 20, 30],
+                '00:30:00': [1, 2, 3],
+            }),
+            'aht': pd.DataFrame({
+                'Fecha': ['03/01/2024', '01/01/2024', '01/01/2024'],
+                '00:00': [300, 100, 200],
+                '01:00': ['x', 250, 260],
+            }),
+            'absenteeism': pd.DataFrame({'Fecha': ['2024-01-02'], '00:30': [0.1]}),
+        }
+
+    def test_sheets_are_aligned_by_date(self):
+        """
+        Verifica que cada hoja se alinea con las fechas de volumen y los huecos valen 0.
+        """
+        cube = DimensioningDataProcessor().build_cube(self.sheets, {}, self.time_labels)
+
+        assert cube.values.shape == (5, 3, 3)
+        assert cube.metric('calls').tolist() == [[10, 1, 0], [20, 2, 0], [30, 3, 0]]
+        # Fecha duplicada: se toma la última; valores no numéricos valen 0
+        assert cube.metric('aht').tolist() == [[200, 0, 260], [0, 0, 0], [300, 0, 0]]
+        assert cube.metric('absenteeism')[1].tolist() == pytest.approx([0, 0.1, 0])
+        assert cube.values.dtype == np.float32
+        assert cube.metric('shrinkage').sum() == 0
+        assert list(cube.index.columns) == ['Fecha', 'Dia']
+
+    def test_base_defines_dates_without_loading_calls(self):
+        """
+        Verifica que base aporta solo el índice de fechas: su contenido no se carga como volumen.
+        """
+        base = pd.DataFrame({'Fecha': ['2024-01-01', '2024-01-02'], '00:00': [7, 8]})
+        sheets = {'absenteeism': self.sheets['absenteeism']}
+
+        cube = DimensioningDataProcessor().build_cube(sheets, {}, self.time_labels, base=base)
+
+        assert len(cube) == 2
+        assert cube.metric('calls').sum() == 0
+        assert cube.metric('absenteeism')[1].tolist() == pytest.approx([0, 0.1, 0])
+        assert base['Fecha'].tolist() == ['2024-01-01', '2024-01-02']
+
+    def test_reducer_kpis_use_float64_sheet_values(self):
+        """
+        Verifica que los KPI de reductores se calculan sobre los valores float64 de la hoja, sin el ruido del float32.
+        """
+        self.sheets['auxiliaries'] = pd.DataFrame({'Fecha': ['2024-01-01', '2024-01-02'], '00:00': [0.173776309, 0.07]})
+        cube = DimensioningDataProcessor().build_cube(self.sheets, {}, self.time_labels)
+
+        kpis = DimensioningKPIService().calculate_global_kpis(cube, self.time_labels, self.sheets)
+
+        assert kpis['auxiliares_pct'] == float(np.mean([0.173776309, 0.07]) * 100)
+        assert kpis['absentismo_pct'] == float(np.mean([0.1]) * 100)
+        assert kpis['desconexiones_pct'] == 0.0
+        assert kpis['auxiliares_pct'] != DimensioningKPIService.reducer_pct(cube.metric('auxiliaries'))
+
+    def test_merge_data_expands_cube(self):
+        """
+        Verifica que merge_data devuelve el DataFrame maestro ancho equivalente al cubo.
+        """
+        processor = DimensioningDataProcessor()
+        df_master = processor.merge_data(self.sheets, {}, self.time_labels)
+
+        assert df_master['00:00_aht'].tolist() == [200, 0, 300]
+        assert '01:00_shr' in df_master.columns
+        assert len(df_master) == 3
+
+    def test_result_layers_are_views(self):
+        """
+        Verifica que las capas de resultados y los bloques de días son vistas del mismo array float32.
+        """
+        cube = DimensioningDataProcessor().build_cube(self.sheets, {}, self.time_labels)
+        matrix = np.arange(9, dtype=float).reshape(3, 3)
+
+        cube.set_results(matrix, matrix * 2, matrix * 3, matrix * 4)
+        part = cube.slice(1, 3)
+
+        assert cube.results.dtype == np.float32
+        assert np.shares_memory(cube.layer('logados'), cube.results)
+        assert np.shares_memory(part.layer('efectivos'), cube.results)
+        assert part.layer('efectivos').tolist() == [[12, 16, 20], [24, 28, 32]]
+        assert cube.layer_frame('presentes')['01:00'].tolist() == [4, 10, 16]
+        assert not hasattr(cube, '__dict__')
@@ -0,0 +1,111 @@
+"""
+Pruebas unitarias para el registro de históricos de forecasting.
+"""
+
+import io
+import datetime
+
+import pandas as pd
+import pytest
+
+from services.forecasting.dataset_registry import (
+    DatasetNotFoundError, HistoricalDatasetRegistry, filter_history, normalize_history
+)
+from services.forecasting.excel_parser import ExcelParserUtils
+
+
+class TestHistoricalDatasetRegistry:
+    """
+    Pruebas de registro, lectura filtrada y borrado de históricos.
+    """
+
+    def setup_method(self):
+        """
+        Construye un histórico plano de 90 días × 48 intervalos como Excel en memoria.
+        """
+        labels = [f"{i // 2:02d}:{(i % 2) * 30:02d}" for i in range(48)]
+        rows = []
+        for d in range(90):
+            fecha = datetime.date(2024, 1, 1) + datetime.timedelta(days=d)
+            for i, label in enumerate(labels):
+                rows.append({'Fecha': datetime.datetime.combine(fecha, datetime.time()), 'Intervalo': label, 'Llamadas Ofrecidas': (d + 1) * (i % 7)})
+        buffer = io.BytesIO()
+        pd.DataFrame(rows).to_excel(buffer, index=False)
+        self.content = buffer.getvalue()
+        self.expected = ExcelParserUtils.prepare_historical_dataframe(pd.read_excel(io.BytesIO(self.content)))
+
+    def assert_same_history(self, result, expected):
+        """
+        Compara dos históricos ignorando el orden de las filas y el índice.
+        """
+        columns = ['Fecha', 'Intervalo', 'Llamadas Ofrecidas']
+        result = result[columns].sort_values(['Fecha', 'Intervalo']).reset_index(drop=True)
+        expected = expected[columns].sort_values(['Fecha', 'Intervalo']).reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_register_is_idempotent_per_segment(self, tmp_path):
+        """
+        Verifica que el mismo archivo en el mismo segmento devuelve el mismo dataset_id.
+        """
+        registry = HistoricalDatasetRegistry(str(tmp_path))
+
+        first = registry.register(io.BytesIO(self.content), segment_id=3, name='historico.xlsx')
+        second = registry.register(io.BytesIO(self.content), segment_id=3)
+        other = registry.register(io.BytesIO(self.content), segment_id=4)
+
+        assert first == second
+        assert other['dataset_id'] != first['dataset_id']
+        assert first['rows'] == 90 * 48
+        assert first['start_date'] == '2024-01-01'
+        assert first['end_date'] == '2024-03-30'
+        assert [item['dataset_id'] for item in registry.list(3)] == [first['dataset_id']]
+
+    def test_frame_matches_uploaded_file(self, tmp_path):
+        """
+        Verifica que el dataset y el archivo producen el mismo histórico con cada filtro.
+        """
+        registry = HistoricalDatasetRegistry(str(tmp_path))
+        dataset = registry.open(registry.register(io.BytesIO(self.content), segment_id=3)['dataset_id'])
+
+        filters = [
+            {},
+            {'last_days': 28},
+            {'start': datetime.date(2024, 2, 10), 'end': datetime.date(2024, 2, 10)},
+            {'month_day': (3, 1)},
+            {'dates': [datetime.date(2024, 1, 6), datetime.date(2024, 3, 6), datetime.date(2025, 1, 1)]},
+        ]
+        for kwargs in filters:
+            self.assert_same_history(dataset.frame(**kwargs), filter_history(self.expected, **kwargs))
+
+        assert len(dataset.frame(last_days=28)) == 28 * 48
+
+    def test_unknown_and_deleted_datasets(self, tmp_path):
+        """
+        Verifica que los ids desconocidos, mal formados o borrados lanzan DatasetNotFoundError.
+        """
+        registry = HistoricalDatasetRegistry(str(tmp_path))
+        dataset_id = registry.register(io.BytesIO(self.content), segment_id=3)['dataset_id']
+        registry.open(dataset_id)
+
+        registry.delete(dataset_id)
+
+        for bad_id in (dataset_id, '../3-0123456789abcdef', '3-0000000000000000'):
+            with pytest.raises(DatasetNotFoundError):
+                registry.open(bad_id)
+        assert registry.list(3) == []
+
+    def test_text_dates_are_parsed_day_first(self):
+        """
+        Verifica que las fechas leídas como texto se interpretan con el día primero.
+        """
+        df_raw = pd.DataFrame({
+            'Fecha': ['02/01/2024', '01/01/2024', 'sin fecha'],
+            'Intervalo': ['08:00', '08:00', '08:00'],
+            'Llamadas Ofrecidas': [5, 3, 1],
+        })
+
+        fecha, intervalo, volumen, labels, has_intervals = normalize_history(df_raw)
+
+        assert fecha.tolist() == [datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)]
+        assert volumen.tolist() == [3, 5]
+        assert labels == ['08:00'] and has_intervals
@@ -0,0 +1,102 @@
+"""
+Pruebas unitarias para la normalización vectorizada de fechas.
+Comparan el resultado con el parseo fila a fila que sustituye.
+"""
+
+import datetime
+
+import pandas as pd
+
+from utils.date_parsing import parse_dates, fix_day_month_swap, parse_dates_to_str
+
+
+def reference_parse(val):
+    """
+    Parseo fila a fila original de DimensioningDataProcessor._robust_date_parsing.
+    """
+    if pd.isna(val):
+        return pd.NaT
+    if isinstance(val, (datetime.datetime, pd.Timestamp)):
+        return pd.Timestamp(val).normalize()
+    s = str(val).strip()
+    try:
+        if '-' in s and s.index('-') == 4:
+            return pd.to_datetime(s, dayfirst=False).normalize()
+        return pd.to_datetime(s, dayfirst=True).normalize()
+    except Exception:
+        return pd.to_datetime(s, errors='coerce')
+
+
+class TestParseDates:
+    """
+    Pruebas de parse_dates.
+    """
+
+    def test_matches_row_by_row_parsing(self):
+        """
+        Verifica que la conversión vectorizada coincide con el parseo fila a fila.
+        """
+        values = [
+            '2024-01-05', '2024-01-06 00:00:00', '05/01/2024', '13/02/2024', ' 01/03/2024 ',
+            datetime.datetime(2024, 3, 4, 10, 30), pd.Timestamp('2024-03-05'), None, 'no es fecha',
+            '06-01-2024', '07.01.2024',
+        ]
+
+        result = parse_dates(pd.Series(values, dtype=object))
+
+        expected = [reference_parse(v) for v in values]
+        for got, want in zip(result.tolist(), expected):
+            assert (pd.isna(got) and pd.isna(want)) or got == want
+
+    def test_keeps_index(self):
+        """
+        Verifica que se conserva el índice original, aunque tenga duplicados.
+        """
+        series = pd.Series(['2024-01-05', '06/01/2024'], index=[3, 3], dtype=object)
+
+        result = parse_dates(series)
+
+        assert list(result.index) == [3, 3]
+        assert list(result) == [pd.Timestamp('2024-01-05'), pd.Timestamp('2024-01-06')]
+
+    def test_datetime_column_is_normalized(self):
+        """
+        Verifica la ruta rápida para columnas ya datetime.
+        """
+        series = pd.Series(pd.to_datetime(['2024-01-05 10:00', '2024-01-06 23:59']))
+
+        assert list(parse_dates(series)) == [pd.Timestamp('2024-01-05'), pd.Timestamp('2024-01-06')]
+
+    def test_parse_dates_to_str_fallback(self):
+        """
+        Verifica la conversión a texto y el valor de reserva para lo no interpretable.
+        """
+        result = parse_dates_to_str(['05/01/2024', 'xx yy'], fallback=lambda v: str(v).split(' ')[0])
+
+        assert result == ['2024-01-05', 'xx']
+
+
+class TestFixDayMonthSwap:
+    """
+    Pruebas de fix_day_month_swap.
+    """
+
+    def test_swaps_when_most_dates_out_of_range(self):
+        """
+        Verifica que se corrigen las fechas con día y mes intercambiados.
+        """
+        dates = pd.Series(pd.to_datetime(['2024-01-02', '2024-03-02', '2024-05-02', '2024-02-10']))
+
+        result = fix_day_month_swap(dates, '2024-02-01', '2024-02-29')
+
+        assert list(result) == list(pd.to_datetime(['2024-02-01', '2024-02-03', '2024-02-05', '2024-02-10']))
+
+    def test_no_swap_when_in_range(self):
+        """
+        Verifica que no se modifica nada si suficientes fechas están en rango.
+        """
+        dates = pd.Series(pd.to_datetime(['2024-02-03', '2024-02-04', '2024-01-02']))
+
+        result = fix_day_month_swap(dates, '2024-02-01', '2024-02-29')
+
+        assert result.equals(dates)
@@ -0,0 +1,126 @@
+"""
+Pruebas unitarias para la caché acotada y la caché compartida de cálculos Erlang.
+"""
+
+import pytest
+
+from utils.lru_cache import BoundedLRUCache
+from utils.erlang_cache import ErlangCache, get_erlang_cache
+from services.scheduler.metrics_calculator import DimensioningCalculator
+
+
+class TestBoundedLRUCache:
+    """
+    Pruebas unitarias para BoundedLRUCache.
+    """
+
+    def test_hits_and_misses_are_counted(self):
+        """
+        Verifica que los aciertos y fallos se contabilizan.
+        """
+        cache = BoundedLRUCache(maxsize=4)
+
+        assert cache.get('a') is None
+        cache.put('a', 1)
+        assert cache.get('a') == 1
+
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_ratio'] == 0.5
+
+    def test_lru_eviction_keeps_recently_used(self):
+        """
+        Verifica que la política LRU expulsa la entrada usada hace más tiempo.
+        """
+        cache = BoundedLRUCache(maxsize=2, policy='lru')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.stats()['evictions'] == 1
+
+    def test_fifo_eviction_ignores_hits(self):
+        """
+        Verifica que la política FIFO expulsa la entrada insertada primero.
+        """
+        cache = BoundedLRUCache(maxsize=2, policy='fifo')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert cache.get('a') is None
+        assert cache.get('b') == 2
+
+    def test_invalid_policy_raises(self):
+        """
+        Verifica que una política desconocida lanza ValueError.
+        """
+        with pytest.raises(ValueError, match="Política de expulsión no válida"):
+            BoundedLRUCache(policy='random')
+
+
+class TestErlangCache:
+    """
+    Pruebas unitarias para ErlangCache y su integración con el calculador del scheduler.
+    """
+
+    def test_memoize_computes_once(self):
+        """
+        Verifica que combinaciones repetidas se calculan una sola vez.
+        """
+        cache = ErlangCache(maxsize=16)
+        calls = []
+
+        def compute(volume, aht, target):
+            calls.append((volume, aht, target))
+            return volume * aht * target
+
+        assert cache.memoize('test', compute, 10, 180, 0.8) == cache.memoize('test', compute, 10.0, 180.0, 0.8)
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1
+
+    def test_quantization_shares_entries(self):
+        """
+        Verifica que la cuantización agrupa entradas cercanas y calcula con el valor redondeado.
+        """
+        cache = ErlangCache(maxsize=16, calls_decimals=1, aht_decimals=0)
+        seen = []
+
+        def compute(volume, aht):
+            seen.append((volume, aht))
+            return volume
+
+        cache.memoize('test', compute, 10.04, 180.2)
+        cache.memoize('test', compute, 10.01, 179.8)
+
+        assert seen == [(10.0, 180.0)]
+
+    def test_disabled_cache_always_computes(self):
+        """
+        Verifica que con la caché desactivada no se almacena nada.
+        """
+        cache = ErlangCache(maxsize=16, enabled=False)
+
+        cache.memoize('test', lambda volume, aht: volume, 1, 2)
+        cache.memoize('test', lambda volume, aht: volume, 1, 2)
+
+        assert cache.stats()['size'] == 0
+
+    def test_scheduler_results_unchanged(self):
+        """
+        Verifica que los métodos memoizados devuelven lo mismo que los originales.
+        """
+        calculator = DimensioningCalculator()
+        cache = get_erlang_cache()
+
+        first = calculator.calculate_required_agents(120, 240, 0.8, 20)
+        second = calculator.calculate_required_agents(120, 240, 0.8, 20)
+
+        assert first == second == calculator._calculate_required_agents(120, 240, 0.8, 20)
+        assert calculator.vba_sla(12, 20, 240, 240) == calculator._vba_sla(12, 20, 240, 240)
+        assert cache.stats()['hits'] >= 1
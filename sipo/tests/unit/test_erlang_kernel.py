@@ -0,0 +1,393 @@
+"""
+Pruebas unitarias para el núcleo vectorizado de Erlang y las APIs por lotes de las estrategias.
+Verifican que los resultados por lotes coinciden con los escalares.
+"""
+
+import math
+import pytest
+import numpy as np
+
+from services.calculator.calculator_service import CalculatorService
+from services.calculator.strategies.erlang_kernel import (
+    erlang_b, erlang_c, sla, erlang_b_batch, erlang_c_batch, sla_batch, agents_required_batch,
+    sl_capacity_batch,
+    search_min_agents, sqrt_staffing_estimate
+)
+from services.calculator.strategies.erlang_b_strategy import ErlangBStrategy
+from services.calculator.strategies.erlang_c_strategy import ErlangCStrategy
+from services.calculator.strategies.sla_strategy import SLAStrategy
+from services.calculator.strategies.agents_required_strategy import AgentsRequiredStrategy
+from services.strategies.erlang_c_strategy import ErlangCStrategy as LegacyErlangCStrategy
+from services.strategies.sla_strategy import SLAStrategy as LegacySLAStrategy
+from services.scheduler.metrics_calculator import DimensioningCalculator
+
+
+def _reference_erlang_b(servers, intensity):
+    """
+    Implementación original en Python puro usada como referencia.
+    """
+    last = 1.0
+    b = 1.0
+    for count in range(1, int(servers) + 1):
+        b = (intensity * last) / (count + (intensity * last))
+        last = b
+    return max(0.0, min(b, 1.0))
+
+
+class TestErlangKernel:
+    """
+    Pruebas unitarias para las funciones del núcleo vectorizado.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        rng = np.random.default_rng(42)
+        self.agents = rng.integers(1, 150, 300)
+        self.intensity = rng.uniform(0, 140, 300)
+        self.calls = rng.uniform(0, 2000, 300)
+        self.calls[::5] = 0
+        self.aht = rng.uniform(60, 600, 300)
+
+    def test_erlang_b_batch_matches_reference(self):
+        """
+        Verifica que Erlang B por lotes coincide exactamente con la recursión original.
+        """
+        expected = [_reference_erlang_b(n, a) for n, a in zip(self.agents, self.intensity)]
+
+        result = erlang_b_batch(self.agents, self.intensity)
+
+        assert np.array_equal(result, np.array(expected))
+
+    def test_erlang_b_batch_preserves_shape(self):
+        """
+        Verifica que el resultado mantiene la forma (días × intervalos) de la entrada.
+        """
+        servers = self.agents[:96].reshape(2, 48)
+        intensity = self.intensity[:96].reshape(2, 48)
+
+        result = erlang_b_batch(servers, intensity)
+
+        assert result.shape == (2, 48)
+
+    def test_erlang_b_batch_negative_values_return_zero(self):
+        """
+        Verifica que valores negativos producen probabilidad cero, como el helper escalar.
+        """
+        result = erlang_b_batch([-1, 5, 5], [2.0, -1.0, 2.0])
+
+        assert result[0] == 0.0
+        assert result[1] == 0.0
+        assert result[2] > 0.0
+
+    def test_erlang_c_batch_unstable_queue(self):
+        """
+        Verifica que con intensidad mayor o igual a los servidores la espera es segura.
+        """
+        result = erlang_c_batch([5, 5, 10], [5.0, 6.0, 2.0])
+
+        assert result[0] == 1.0
+        assert result[1] == 1.0
+        assert 0.0 < result[2] < 1.0
+
+    def test_sla_batch_special_cases(self):
+        """
+        Verifica los casos especiales: sin llamadas, sin agentes y tráfico saturado.
+        """
+        result = sla_batch([10, 0, 2], 20, [0.0, 100.0, 200.0], 180)
+
+        assert result[0] == 1.0
+        assert result[1] == 0.0
+        assert result[2] == 0.0
+
+    def test_empty_input(self):
+        """
+        Verifica que entradas vacías devuelven arrays vacíos.
+        """
+        assert erlang_b_batch([], []).size == 0
+        assert sla_batch([], 20, [], []).size == 0
+
+
+class TestSharedKernelConsistency:
+    """
+    Pruebas de consistencia entre el núcleo y todas las implementaciones que delegan en él.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        rng = np.random.default_rng(3)
+        self.agents = rng.integers(1, 120, 200)
+        self.intensity = rng.uniform(0, 110, 200)
+        self.calls = rng.uniform(0, 1500, 200)
+        self.calls[::4] = 0
+        self.aht = rng.uniform(60, 600, 200)
+
+    def test_scalar_functions_match_batch(self):
+        """
+        Verifica que las funciones escalares del núcleo coinciden con las de lotes.
+        """
+        b = [erlang_b(int(n), float(a)) for n, a in zip(self.agents, self.intensity)]
+        c = [erlang_c(int(n), float(a)) for n, a in zip(self.agents, self.intensity)]
+        levels = [sla(int(n), 20.0, float(v), float(h)) for n, v, h in zip(self.agents, self.calls, self.aht)]
+
+        assert np.array_equal(erlang_b_batch(self.agents, self.intensity), np.array(b))
+        assert np.array_equal(erlang_c_batch(self.agents, self.intensity), np.array(c))
+        assert np.array_equal(sla_batch(self.agents, 20.0, self.calls, self.aht), np.array(levels))
+
+    def test_scalar_erlang_b_matches_reference(self):
+        """
+        Verifica que Erlang B escalar coincide con la recursión original.
+        """
+        for n, a in zip(self.agents, self.intensity):
+            assert erlang_b(int(n), float(a)) == _reference_erlang_b(n, float(a))
+
+    def test_all_implementations_agree(self):
+        """
+        Verifica que estrategias, estrategias previas y scheduler devuelven el mismo SLA y Erlang C.
+        """
+        legacy_sla = LegacySLAStrategy()
+        legacy_c = LegacyErlangCStrategy()
+        calculator = DimensioningCalculator()
+        for n, a, v, h in zip(self.agents, self.intensity, self.calls, self.aht):
+            n, a, v, h = int(n), float(a), float(v), float(h)
+            expected_sla = sla(n, 20.0, v, h)
+            assert legacy_sla.calculate(n, 20.0, v, h) == expected_sla
+            assert SLAStrategy().calculate(n, 20.0, v, h) == expected_sla
+            assert calculator._vba_sla(n, 20.0, v, h) == expected_sla
+            assert legacy_c.calculate(n, a) == erlang_c(n, a)
+            assert calculator.vba_erlang_c(n, a) == erlang_c(n, a)
+
+
+class TestStrategyBatchApi:
+    """
+    Pruebas de consistencia entre los métodos calculate y calculate_batch.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        rng = np.random.default_rng(7)
+        self.agents = rng.integers(1, 120, 200)
+        self.intensity = rng.uniform(0, 110, 200)
+        self.calls = rng.uniform(0, 1500, 200)
+        self.calls[::4] = 0
+        self.aht = rng.uniform(60, 600, 200)
+        self.service_time = rng.choice([10.0, 20.0, 30.0], 200)
+
+    def test_erlang_b_batch_matches_scalar(self):
+        """
+        Verifica que ErlangBStrategy.calculate_batch coincide con calculate.
+        """
+        strategy = ErlangBStrategy()
+        scalar = [strategy.calculate(int(n), float(a)) for n, a in zip(self.agents, self.intensity)]
+
+        assert np.array_equal(strategy.calculate_batch(self.agents, self.intensity), np.array(scalar))
+
+    def test_erlang_c_batch_matches_scalar(self):
+        """
+        Verifica que ErlangCStrategy.calculate_batch coincide con calculate.
+        """
+        strategy = ErlangCStrategy()
+        scalar = [strategy.calculate(int(n), float(a)) for n, a in zip(self.agents, self.intensity)]
+
+        assert np.array_equal(strategy.calculate_batch(self.agents, self.intensity), np.array(scalar))
+
+    def test_sla_batch_matches_scalar(self):
+        """
+        Verifica que SLAStrategy.calculate_batch coincide con calculate.
+        """
+        strategy = SLAStrategy()
+        scalar = [
+            strategy.calculate(int(n), float(s), float(c), float(h))
+            for n, s, c, h in zip(self.agents, self.service_time, self.calls, self.aht)
+        ]
+
+        result = strategy.calculate_batch(self.agents, self.service_time, self.calls, self.aht)
+
+        assert np.array_equal(result, np.array(scalar))
+
+    def test_sla_batch_invalid_parameters_raise(self):
+        """
+        Verifica que los parámetros inválidos por lotes lanzan ValueError.
+        """
+        strategy = SLAStrategy()
+
+        with pytest.raises(ValueError, match="El AHT debe ser mayor que cero"):
+            strategy.calculate_batch([10, 10], 20, [100, 100], [180, 0])
+
+        with pytest.raises(ValueError, match="no puede ser negativo"):
+            strategy.calculate_batch([10, 10], 20, [100, -1], [180, 180])
+
+    def test_calculator_service_batch_delegation(self):
+        """
+        Verifica que CalculatorService expone la API por lotes a través del contexto.
+        """
+        service = CalculatorService()
+
+        result = service.vba_sla_batch(self.agents, 20, self.calls, self.aht)
+
+        assert result.shape == self.agents.shape
+        assert np.all((result >= 0) & (result <= 1))
+
+
+class TestAgentsRequiredSolvers:
+    """
+    Pruebas de consistencia entre el modo incremental y la búsqueda binaria.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        rng = np.random.default_rng(11)
+        self.target = rng.choice([0.5, 0.8, 0.9, 0.95, 1.0], 150)
+        self.service_time = rng.choice([10.0, 20.0, 60.0], 150)
+        self.calls = rng.uniform(0, 4000, 150)
+        self.calls[::6] = 0
+        self.aht = rng.uniform(1, 600, 150)
+
+    def test_incremental_matches_binary(self):
+        """
+        Verifica que ambos modos devuelven el mismo número de agentes.
+        """
+        strategy = AgentsRequiredStrategy()
+        for params in zip(self.target, self.service_time, self.calls, self.aht):
+            params = [float(value) for value in params]
+            assert strategy.calculate(*params) == strategy.calculate(*params, solver='binary')
+
+    def test_batch_matches_scalar(self):
+        """
+        Verifica que calculate_batch coincide con calculate celda a celda.
+        """
+        strategy = AgentsRequiredStrategy(solver='binary')
+        expected = [
+            strategy.calculate(float(t), float(s), float(c), float(h))
+            for t, s, c, h in zip(self.target, self.service_time, self.calls, self.aht)
+        ]
+
+        result = strategy.calculate_batch(self.target, self.service_time, self.calls, self.aht)
+
+        assert np.array_equal(result, np.array(expected, dtype=float))
+
+    def test_no_calls_or_zero_target_require_no_agents(self):
+        """
+        Verifica que sin llamadas o con objetivo cero no se requieren agentes.
+        """
+        result = agents_required_batch([0.8, 0.0, 0.8], 20, [0.0, 100.0, 100.0], 180)
+
+        assert result[0] == 0
+        assert result[1] == 0
+        assert result[2] > 100 * 180 / 3600
+
+    def test_invalid_solver_raises(self):
+        """
+        Verifica que un modo de resolución desconocido lanza ValueError.
+        """
+        with pytest.raises(ValueError, match="Modo de resolución no válido"):
+            AgentsRequiredStrategy(solver='newton')
+
+
+class TestSlCapacityBatch:
+    """
+    Pruebas de la inversa por lotes (capacidad en llamadas a un SLA dado).
+    """
+
+    @staticmethod
+    def _reference_capacity(num_agents, aht, sl_target, sl_time, interval_seconds=1800):
+        """
+        Bisección escalar original de DimensioningCalculator._calculate_sl_capacity.
+        """
+        if num_agents <= 0 or aht <= 0:
+            return 0
+        low, high, best_traffic = 0.0, float(num_agents), 0.0
+        for _ in range(12):
+            mid = (low + high) / 2
+            if mid <= 0:
+                break
+            if sla(num_agents, sl_time, (mid * 3600) / aht, aht) >= sl_target:
+                best_traffic = mid
+                low = mid
+            else:
+                high = mid
+        return math.floor((best_traffic * interval_seconds) / aht)
+
+    def test_matches_scalar_bisection(self):
+        """
+        Verifica que la capacidad por lotes coincide con la bisección escalar celda a celda.
+        """
+        rng = np.random.default_rng(5)
+        agents = rng.integers(0, 80, 120)
+        aht = rng.uniform(0, 600, 120)
+        aht[::7] = 0
+        expected = [self._reference_capacity(int(n), float(h), 0.8, 20) for n, h in zip(agents, aht)]
+
+        result = sl_capacity_batch(agents, aht, 0.8, 20)
+
+        assert np.array_equal(result, np.array(expected, dtype=float))
+
+    def test_scheduler_delegates_to_batch(self):
+        """
+        Verifica que el calculador del scheduler devuelve la misma capacidad en escalar y por lotes.
+        """
+        calculator = DimensioningCalculator()
+        agents = np.array([[0, 5, 12], [30, 30, 48]])
+        aht = np.array([[300.0, 300.0, 240.0], [180.0, 180.0, 420.0]])
+
+        result = calculator.calculate_sl_capacity_batch(agents, aht, 0.8, 20)
+
+        assert result.shape == (2, 3)
+        for (i, j), value in np.ndenumerate(result):
+            assert value == calculator._calculate_sl_capacity(int(agents[i, j]), float(aht[i, j]), 0.8, 20)
+
+
+    def test_metrics_include_capacity_per_slot(self):
+        """
+        Verifica que calculate_metrics devuelve la capacidad de cada slot calculada por lotes.
+        """
+        calculator = DimensioningCalculator()
+        schedule = [
+            {'shifts': {'2025-01-01': {'type': 'WORK', 'duration_minutes': 240, 'start_min': 480, 'end_min': 720}}}
+            for _ in range(12)
+        ]
+        forecast = {'2025-01-01': {'16': {'calls': 60, 'aht': 240, 'required': 10}}}
+
+        metrics = calculator.calculate_metrics(schedule, forecast, 0.8, 20, interval_minutes=30)
+        slots = metrics['daily_metrics']['2025-01-01']['slots']
+
+        assert slots[16]['sl_capacity'] == calculator._calculate_sl_capacity(12, 240.0, 0.8, 20, 1800)
+        assert slots[17]['sl_capacity'] == calculator._calculate_sl_capacity(12, 300.0, 0.8, 20, 1800)
+        assert slots[0]['sl_capacity'] == 0
+
+
+class TestSqrtStaffingSearch:
+    """
+    Pruebas para la estimación de square-root staffing y la búsqueda galopante.
+    """
+
+    def test_search_min_agents_finds_threshold_from_any_estimate(self):
+        """
+        Verifica que el resultado no depende de la estimación inicial.
+        """
+        for estimate in (1, 17, 42, 43, 80, 500):
+            assert search_min_agents(lambda n: n >= 42, estimate, 1, 100) == 42
+
+    def test_search_min_agents_returns_none_when_unreachable(self):
+        """
+        Verifica que devuelve None si ningún valor del rango cumple.
+        """
+        assert search_min_agents(lambda n: n >= 200, 50, 1, 100) is None
+
+    def test_estimate_is_close_to_exact_requirement(self):
+        """
+        Verifica que la estimación queda a pocos agentes del valor exacto.
+        """
+        exact = agents_required_batch(0.8, 20, 1000, 300)
+        traffic = 1000 * 300 / 3600
+
+        estimate = sqrt_staffing_estimate(traffic, 0.8, 20, 300)
+
+        assert abs(estimate - exact) <= 2
@@ -0,0 +1,60 @@
+"""
+Pruebas unitarias para el bloqueo de archivo entre procesos.
+"""
+
+import types
+
+import pytest
+
+from utils import file_lock as file_lock_module
+from utils.file_lock import file_lock
+
+
+class TestFileLock:
+    """
+    Pruebas de file_lock con fcntl y con la rama de msvcrt (Windows).
+    """
+
+    def test_creates_lock_file_and_is_reentrant_after_release(self, tmp_path):
+        """
+        Verifica que se crea el archivo de bloqueo y que se puede volver a tomar al liberarlo.
+        """
+        path = tmp_path / 'segment.lock'
+
+        with file_lock(str(path)):
+            assert path.exists()
+        with file_lock(str(path)):
+            pass
+
+    def test_windows_branch_retries_until_free(self, tmp_path, monkeypatch):
+        """
+        Verifica que sin fcntl se usa msvcrt.locking reintentando mientras el byte está bloqueado.
+        """
+        calls = []
+
+        def locking(fd, mode, nbytes):
+            calls.append(mode)
+            if mode == fake.LK_NBLCK and calls.count(fake.LK_NBLCK) < 3:
+                raise OSError('bloqueado')
+
+        fake = types.SimpleNamespace(LK_NBLCK=2, LK_UNLCK=0, locking=locking)
+        monkeypatch.setattr(file_lock_module, 'fcntl', None)
+        monkeypatch.setattr(file_lock_module, 'msvcrt', fake, raising=False)
+        monkeypatch.setattr(file_lock_module, 'RETRY_SECONDS', 0)
+
+        with file_lock(str(tmp_path / 'segment.lock')):
+            assert calls == [fake.LK_NBLCK] * 3
+
+        assert calls[-1] == fake.LK_UNLCK
+
+    def test_lock_is_released_on_error(self, tmp_path):
+        """
+        Verifica que una excepción dentro del bloque libera el bloqueo.
+        """
+        path = str(tmp_path / 'segment.lock')
+
+        with pytest.raises(RuntimeError):
+            with file_lock(path):
+                raise RuntimeError('fallo')
+        with file_lock(path):
+            pass
@@ -0,0 +1,79 @@
+"""
+Pruebas unitarias para el análisis semanal de IntradayAnalyzer.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.forecasting.intraday_analyzer import IntradayAnalyzer
+
+
+class TestProcessWeeklyData:
+    """
+    Pruebas de curvas, outliers y pesos calculados por día de la semana.
+    """
+
+    def setup_method(self):
+        """
+        Construye 8 semanas de datos con una semana anómala y un día sin llamadas.
+        """
+        self.analyzer = IntradayAnalyzer()
+        self.labels = [f"{h:02d}:00" for h in range(8, 20)]
+        rng = np.random.default_rng(3)
+        fechas = pd.date_range('2024-01-01', periods=56, freq='D')
+        base = np.sin(np.linspace(0.2, 3.0, len(self.labels))) * 100
+        # Mismo perfil con distinto volumen diario (potencias de 2: las curvas normalizadas coinciden
+        # exactamente), de modo que solo la semana anómala se desvía de la mediana
+        values = base[None, :] * rng.choice([0.5, 1.0, 2.0, 4.0], (len(fechas), 1))
+        # Lunes 2024-01-15: curva invertida
+        values[14] = base[::-1] * 1.5
+        # Domingo 2024-01-07: sin llamadas
+        values[6] = 0
+        self.df_pivot = pd.DataFrame(values, columns=self.labels)
+        self.df_pivot.insert(0, 'Fecha', fechas)
+        self.df_pivot['day_of_week'] = self.df_pivot['Fecha'].dt.weekday
+        self.df_pivot['week_number'] = self.df_pivot['Fecha'].dt.isocalendar().week
+
+    def test_rows_layout(self):
+        """
+        Verifica el orden, las curvas, el outlier y que los pesos sumen 100 en el formato por semanas.
+        """
+        weekly_data = self.analyzer._process_weekly_data(self.df_pivot, self.labels)
+
+        mondays = weekly_data[0]
+        assert [entry['date'] for entry in mondays][:2] == ['19/02/2024', '12/02/2024']
+        assert [entry['is_outlier'] for entry in mondays] == [False] * 5 + [True] + [False] * 2
+        assert mondays[5]['proposed_weight'] == 0
+        assert abs(sum(entry['proposed_weight'] for entry in mondays) - 100) <= len(mondays)
+
+        entry = mondays[0]
+        total = sum(entry['intraday_raw'].values())
+        assert entry['total_calls'] == pytest.approx(total)
+        for label in self.labels:
+            assert entry['intraday_dist'][label] == pytest.approx(entry['intraday_raw'][label] / total)
+
+        sunday = next(e for e in weekly_data[6] if e['date'] == '07/01/2024')
+        assert sunday['total_calls'] == 0
+        assert set(sunday['intraday_dist'].values()) == {0}
+
+    def test_columnar_layout_matches_rows(self):
+        """
+        Verifica que el formato columnar contiene los mismos valores que el formato por semanas.
+        """
+        rows = self.analyzer._process_weekly_data(self.df_pivot, self.labels)
+        columnar = self.analyzer._process_weekly_data(self.df_pivot, self.labels, layout='columnar')
+
+        for day_num in range(7):
+            day = columnar[day_num]
+            assert day['date'] == [entry['date'] for entry in rows[day_num]]
+            assert day['proposed_weight'] == [entry['proposed_weight'] for entry in rows[day_num]]
+            assert day['intraday_dist'] == [list(entry['intraday_dist'].values()) for entry in rows[day_num]]
+            assert np.asarray(day['intraday_raw']).shape == (8, len(self.labels))
+
+    def test_invalid_layout(self):
+        """
+        Verifica que un formato desconocido se rechaza.
+        """
+        with pytest.raises(ValueError):
+            self.analyzer._process_weekly_data(self.df_pivot, self.labels, layout='matrix')
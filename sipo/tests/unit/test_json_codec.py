@@ -0,0 +1,80 @@
+"""
+Pruebas unitarias para el codec JSON común (orjson o json estándar).
+"""
+
+import datetime
+
+import numpy as np
+import pytest
+
+from utils.json_codec import JSONCodec, orjson
+
+
+class TestJSONCodec:
+    """
+    Pruebas de serialización con los motores disponibles.
+    """
+
+    def setup_method(self):
+        """
+        Prepara un codec por cada motor instalado.
+        """
+        self.codecs = [JSONCodec('stdlib')]
+        if orjson is not None:
+            self.codecs.append(JSONCodec('orjson'))
+
+    def test_numpy_and_dates(self):
+        """
+        Verifica que los escalares y arrays de NumPy y las fechas se serializan sin conversión previa.
+        """
+        payload = {
+            'agents': np.int64(12),
+            'sla': np.float64(0.8),
+            'slots': np.arange(4, dtype=np.int32),
+            'matrix': np.array([[1.5, 2.0], [0.0, 3.25]]),
+            'fecha': datetime.date(2025, 1, 31),
+            'creado': datetime.datetime(2025, 1, 31, 8, 30),
+        }
+
+        for codec in self.codecs:
+            result = codec.loads(codec.dumps(payload))
+
+            assert result == {
+                'agents': 12,
+                'sla': 0.8,
+                'slots': [0, 1, 2, 3],
+                'matrix': [[1.5, 2.0], [0.0, 3.25]],
+                'fecha': '2025-01-31',
+                'creado': '2025-01-31T08:30:00',
+            }, codec.backend
+
+    def test_default_fallback_and_errors(self):
+        """
+        Verifica que default se usa para tipos desconocidos y que sin él se lanza TypeError.
+        """
+        class Opaque:
+            def __str__(self):
+                return 'opaco'
+
+        for codec in self.codecs:
+            assert codec.loads(codec.dumps({'x': Opaque()}, default=str)) == {'x': 'opaco'}
+            with pytest.raises(TypeError):
+                codec.dumps({'x': Opaque()})
+
+    def test_reads_legacy_documents(self):
+        """
+        Verifica que se leen los documentos guardados con json.dumps, incluidos NaN, y los bytes.
+        """
+        for codec in self.codecs:
+            result = codec.loads('{"sla": NaN, "nombre": "Campaña"}')
+
+            assert np.isnan(result['sla'])
+            assert result['nombre'] == 'Campaña'
+            assert codec.loads(codec.dumps_bytes([1, 2])) == [1, 2]
+
+    def test_invalid_backend(self):
+        """
+        Verifica que un motor desconocido se rechaza.
+        """
+        with pytest.raises(ValueError):
+            JSONCodec('simplejson')
@@ -0,0 +1,89 @@
+"""
+Pruebas unitarias para el formato columnar comprimido de las tablas de escenarios.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.matrix_blob import BLOB_PREFIX, decode_frame, decode_matrix, encode_frame, is_matrix_blob, read_table
+
+
+class TestMatrixBlob:
+    """
+    Pruebas de codificación, decodificación y compatibilidad con las tablas JSON.
+    """
+
+    def setup_method(self):
+        """
+        Construye una tabla de resultados (float64, como los DataFrames de la API) con columnas índice y 48 intervalos.
+        """
+        rng = np.random.default_rng(7)
+        self.time_labels = [f"{i*30//60:02d}:{i*30%60:02d}" for i in range(48)]
+        days = 60
+        data = {
+            'Fecha': [datetime.date(2024, 1, 1) + datetime.timedelta(days=i) for i in range(days)],
+            'Dia': ['Lunes'] * days,
+            'Semana': [i // 7 + 1 for i in range(days)],
+        }
+        for label in self.time_labels:
+            data[label] = np.round(rng.uniform(0, 80, days), 3)
+        self.df = pd.DataFrame(data)
+        self.formatters = {'Fecha': lambda d: d.strftime('%Y-%m-%d')}
+
+    def test_round_trip_matches_json_format(self):
+        """
+        Verifica que la tabla decodificada tiene las columnas de la del formato JSON y los valores exactos guardados.
+        """
+        blob = encode_frame(self.df, formatters=self.formatters)
+        df_json = self.df.assign(Fecha=self.df['Fecha'].map(self.formatters['Fecha']))
+        expected = read_table(df_json.to_json(orient='records'))
+
+        result = read_table(blob)
+
+        assert list(result.columns) == list(expected.columns)
+        assert result['Fecha'].tolist() == expected['Fecha'].tolist()
+        assert result['Semana'].tolist() == expected['Semana'].tolist()
+        # Valores exactos: los mismos float64 que se guardaron (read_json no garantiza la misma exactitud)
+        assert result[self.time_labels].dtypes.eq(np.float64).all()
+        assert np.array_equal(result[self.time_labels].to_numpy(), self.df[self.time_labels].to_numpy())
+        assert result[self.time_labels].to_dict(orient='records') == self.df[self.time_labels].to_dict(orient='records')
+
+    def test_blob_is_smaller_than_json(self):
+        """
+        Verifica que el formato columnar ocupa bastante menos que el JSON orient='records'.
+        """
+        blob = encode_frame(self.df, formatters=self.formatters)
+        text = self.df.assign(Fecha=self.df['Fecha'].astype(str)).to_json(orient='records')
+
+        assert len(blob) * 3 < len(text)
+
+    def test_decode_matrix_and_detection(self):
+        """
+        Verifica el acceso directo a la matriz, la detección del formato y la salida determinista.
+        """
+        blob = encode_frame(self.df, formatters=self.formatters)
+
+        header, matrix = decode_matrix(blob)
+
+        assert blob.startswith(BLOB_PREFIX)
+        assert is_matrix_blob(blob)
+        assert not is_matrix_blob('[{"Fecha": "2024-01-01"}]')
+        assert matrix.shape == (60, 48)
+        assert header['columns'][:3] == ['Fecha', 'Dia', 'Semana']
+        assert np.array_equal(matrix, self.df[self.time_labels].to_numpy(dtype=np.float32))
+        assert encode_frame(self.df, formatters=self.formatters) == blob
+
+    def test_empty_and_nan_values(self):
+        """
+        Verifica que las tablas vacías se leen como DataFrame vacío y los NaN se conservan.
+        """
+        df = pd.DataFrame({'Fecha': ['2024-01-01', '2024-01-02'], '00:00': [1.5, np.nan]})
+
+        result = decode_frame(encode_frame(df))
+
+        assert read_table("[]").empty
+        assert read_table(None).empty
+        assert result['00:00'].iloc[0] == 1.5
+        assert np.isnan(result['00:00'].iloc[1])
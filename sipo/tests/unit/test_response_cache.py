@@ -0,0 +1,76 @@
+"""
+Pruebas unitarias para la caché de respuestas con ETag.
+"""
+
+from utils.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """
+    Pruebas unitarias para ResponseCache.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        self.renders = 0
+
+    def render(self):
+        """
+        Genera un cuerpo de prueba y cuenta las llamadas.
+        """
+        self.renders += 1
+        return b'{"scenario_id": 1}'
+
+    def test_body_is_rendered_once(self):
+        """
+        Verifica que la segunda petición se sirve de la caché con el mismo ETag.
+        """
+        cache = ResponseCache(maxsize=4)
+
+        first = cache.get_or_render(1, self.render)
+        second = cache.get_or_render(1, self.render)
+
+        assert first == second
+        assert self.renders == 1
+        assert first[1] == ResponseCache.make_etag(b'{"scenario_id": 1}')
+
+    def test_invalidate_forces_render(self):
+        """
+        Verifica que invalidar una clave obliga a regenerar la respuesta.
+        """
+        cache = ResponseCache(maxsize=4)
+        cache.get_or_render(1, self.render)
+
+        cache.invalidate(1)
+        cache.invalidate(2)
+        cache.get_or_render(1, self.render)
+
+        assert self.renders == 2
+
+    def test_other_version_forces_render(self):
+        """
+        Verifica que una clave reutilizada por otro recurso (otra versión) no sirve la respuesta anterior.
+        """
+        cache = ResponseCache(maxsize=4)
+        first = cache.get_or_render(1, self.render, version='2025-01-01T08:00:00')
+
+        cache.get_or_render(1, lambda: b'{"scenario_id": 1, "nuevo": true}', version='2025-01-02T09:00:00')
+        second = cache.get_or_render(1, self.render, version='2025-01-02T09:00:00')
+
+        assert self.renders == 1
+        assert second != first
+        assert cache.get(1, version='2025-01-01T08:00:00') is None
+
+    def test_disabled_cache_always_renders(self):
+        """
+        Verifica que la caché desactivada no guarda respuestas.
+        """
+        cache = ResponseCache(maxsize=4, enabled=False)
+
+        cache.get_or_render(1, self.render)
+        cache.get_or_render(1, self.render)
+
+        assert self.renders == 2
+        assert cache.stats()['size'] == 0
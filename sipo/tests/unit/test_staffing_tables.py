@@ -0,0 +1,91 @@
+"""
+Pruebas unitarias para las tablas precalculadas de agentes requeridos.
+"""
+
+import json
+import numpy as np
+import pytest
+
+from services.calculator.strategies.staffing_tables import (
+    MANIFEST_NAME, StaffingTableStore, build_capacity_table, table_filename
+)
+from services.calculator.strategies.erlang_kernel import agents_required_batch
+
+
+@pytest.fixture(scope='module')
+def table_store(tmp_path_factory):
+    """
+    Fixture que construye una tabla pequeña (80/20) en un directorio temporal.
+    """
+    directory = tmp_path_factory.mktemp('staffing_tables')
+    aht_buckets = np.arange(60, 601, 30, dtype=float)
+    np.save(directory / 'capacity.npy', build_capacity_table(0.8, 20, aht_buckets, 150))
+    manifest = {'version': 1, 'tables': [{
+        'target_sla': 0.8, 'service_time': 20, 'aht_buckets': aht_buckets.tolist(),
+        'max_agents': 150, 'file': 'capacity.npy'
+    }]}
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest), encoding='utf-8')
+    return StaffingTableStore(str(directory))
+
+
+class TestStaffingTables:
+    """
+    Pruebas de consistencia entre las tablas y el cálculo exacto.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        rng = np.random.default_rng(5)
+        self.calls = rng.uniform(1, 1500, 400)
+        self.aht = rng.uniform(40, 650, 400)
+
+    def test_batch_lookup_matches_exact_solver(self, table_store):
+        """
+        Verifica que las celdas resueltas por tabla coinciden con el solver exacto.
+        """
+        expected = agents_required_batch(0.8, 20, self.calls, self.aht)
+
+        result = table_store.lookup_batch(0.8, 20, self.calls, self.aht)
+
+        resolved = ~np.isnan(result)
+        assert resolved.any()
+        assert np.array_equal(result[resolved], expected[resolved])
+
+    def test_scalar_lookup_matches_batch(self, table_store):
+        """
+        Verifica que la consulta escalar coincide con la vectorizada.
+        """
+        batch = table_store.lookup_batch(0.8, 20, self.calls[:50], self.aht[:50])
+
+        for index, (calls, aht) in enumerate(zip(self.calls[:50], self.aht[:50])):
+            value = table_store.lookup(0.8, 20, calls, aht)
+            if value is None:
+                assert np.isnan(batch[index])
+            else:
+                assert value == batch[index]
+
+    def test_out_of_table_inputs_return_none(self, table_store):
+        """
+        Verifica que objetivos, tiempos o AHT sin tabla delegan al cálculo exacto.
+        """
+        assert table_store.lookup(0.9, 20, 100, 180) is None
+        assert table_store.lookup(0.8, 30, 100, 180) is None
+        assert table_store.lookup(0.8, 20, 100, 30) is None
+        assert table_store.lookup(0.8, 20, 100, 900) is None
+
+
+class TestTableFilename:
+    """
+    Pruebas del nombre de archivo de cada tabla.
+    """
+
+    def test_filename_has_key_precision(self):
+        """
+        Verifica que objetivos o tiempos distintos a 4 decimales no comparten archivo y que los iguales sí.
+        """
+        assert table_filename(0.8, 20) == 'capacity_sla8000_t20.npy'
+        assert table_filename(0.8004, 20) == 'capacity_sla8004_t20.npy'
+        assert table_filename(0.8, 20.5) == 'capacity_sla8000_t20.5.npy'
+        assert table_filename(0.80000001, 20.00001) == table_filename(0.8, 20)
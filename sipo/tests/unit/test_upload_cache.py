@@ -0,0 +1,116 @@
+"""
+Pruebas unitarias para la caché de archivos subidos direccionada por contenido.
+"""
+
+import io
+import os
+import time
+
+import pandas as pd
+
+from utils import upload_cache
+from utils.upload_cache import UploadCache
+
+
+class TestUploadCache:
+    """
+    Pruebas unitarias para UploadCache.
+    """
+
+    def setup_method(self):
+        """
+        Configuración inicial para cada prueba.
+        """
+        self.calls = []
+
+    def parse(self, buffer, scale=1):
+        """
+        Parseo de prueba: registra la llamada y devuelve un DataFrame con los bytes leídos.
+        """
+        self.calls.append(scale)
+        content = buffer.read()
+        return pd.DataFrame({'byte': list(content)}) * scale
+
+    def test_same_content_is_parsed_once(self, tmp_path):
+        """
+        Verifica que dos cargas con los mismos bytes solo se parsean una vez.
+        """
+        cache = UploadCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+
+        first = cache.get_or_parse(io.BytesIO(b'abc'), 'test', self.parse)
+        second = cache.get_or_parse(io.BytesIO(b'abc'), 'test', self.parse)
+
+        pd.testing.assert_frame_equal(first, second)
+        assert self.calls == [1]
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_params_and_namespace_are_part_of_the_key(self, tmp_path):
+        """
+        Verifica que el mismo archivo con otro parseo u otros parámetros no comparte entrada.
+        """
+        cache = UploadCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+
+        cache.get_or_parse(io.BytesIO(b'abc'), 'test', self.parse, 1)
+        cache.get_or_parse(io.BytesIO(b'abc'), 'test', self.parse, 2)
+        cache.get_or_parse(io.BytesIO(b'abc'), 'other', self.parse, 1)
+
+        assert self.calls == [1, 2, 1]
+
+    def test_parser_version_is_part_of_the_key(self, tmp_path, monkeypatch):
+        """
+        Verifica que al cambiar PARSER_VERSION no se sirven entradas generadas por el código anterior.
+        """
+        cache = UploadCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+
+        cache.get_or_parse(io.BytesIO(b'abc'), 'test', self.parse)
+        monkeypatch.setattr(upload_cache, 'PARSER_VERSION', upload_cache.PARSER_VERSION + 1)
+        cache.get_or_parse(io.BytesIO(b'abc'), 'test', self.parse)
+
+        assert self.calls == [1, 1]
+        assert cache.stats()['hits'] == 0
+
+    def test_source_is_rewound(self, tmp_path):
+        """
+        Verifica que el archivo original queda listo para volver a leerse.
+        """
+        cache = UploadCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+        source = io.BytesIO(b'abc')
+
+        cache.get_or_parse(source, 'test', self.parse)
+
+        assert source.read() == b'abc'
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        """
+        Verifica que al superar el tamaño máximo se expulsa la entrada usada hace más tiempo.
+        """
+        cache = UploadCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+        cache.get_or_parse(io.BytesIO(b'a' * 1000), 'test', self.parse)
+        entry_size = cache.stats()['bytes']
+        cache.max_bytes = int(entry_size * 2.5)
+
+        cache.get_or_parse(io.BytesIO(b'b' * 1000), 'test', self.parse)
+        oldest = sorted(os.listdir(tmp_path))
+        past = time.time() - 60
+        for name in oldest:
+            os.utime(os.path.join(tmp_path, name), (past, past))
+        cache.get_or_parse(io.BytesIO(b'a' * 1000), 'test', self.parse)
+        cache.get_or_parse(io.BytesIO(b'c' * 1000), 'test', self.parse)
+
+        assert cache.stats()['evictions'] == 1
+        assert cache.stats()['entries'] == 2
+        cache.get_or_parse(io.BytesIO(b'a' * 1000), 'test', self.parse)
+        assert len(self.calls) == 3
+
+    def test_disabled_cache_always_parses(self, tmp_path):
+        """
+        Verifica que la caché desactivada no guarda nada.
+        """
+        cache = UploadCache(str(tmp_path), max_bytes=10 * 1024 * 1024, enabled=False)
+
+        cache.get_or_parse(io.BytesIO(b'abc'), 'test', self.parse)
+        cache.get_or_parse(io.BytesIO(b'abc'), 'test', self.parse)
+
+        assert self.calls == [1, 1]
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,132 @@
+"""
+Normalización vectorizada de columnas de fecha.
+Detecta el formato (ISO o día/mes) a partir de una muestra y convierte la columna completa
+con una sola llamada a pd.to_datetime(format=...), en lugar de parsear fila a fila.
+"""
+
+import datetime
+import numpy as np
+import pandas as pd
+
+# Formatos candidatos por familia, en orden de preferencia
+ISO_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f')
+DAYFIRST_FORMATS = ('%d/%m/%Y', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d-%m-%Y', '%d.%m.%Y', '%d/%m/%y')
+
+SAMPLE_SIZE = 50
+
+
+def _detect_format(text, candidates):
+    """
+    Devuelve el primer formato que interpreta toda la muestra, o None si ninguno lo hace.
+    """
+    sample = text.head(SAMPLE_SIZE)
+    for fmt in candidates:
+        if pd.to_datetime(sample, format=fmt, errors='coerce').notna().all():
+            return fmt
+    return None
+
+
+def _parse_text(text, candidates, dayfirst):
+    """
+    Convierte una serie de textos con el formato detectado; lo que no encaja se interpreta
+    elemento a elemento (format='mixed') con la misma convención de día/mes.
+    """
+    fmt = _detect_format(text, candidates)
+    parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+    if fmt:
+        parsed = pd.to_datetime(text, format=fmt, errors='coerce')
+    pending = parsed.isna()
+    if pending.any():
+        parsed[pending] = pd.to_datetime(text[pending], format='mixed', dayfirst=dayfirst, errors='coerce')
+    return parsed
+
+
+def parse_dates(values):
+    """
+    Convierte una columna de fechas (objetos fecha, textos ISO o textos día/mes) a datetime normalizado.
+
+    Conserva la regla de los parseos fila a fila que sustituye: un texto cuyo primer '-' está
+    en la posición 4 es ISO (año primero); cualquier otro texto se interpreta con el día primero.
+
+    Args:
+        values: Serie, lista o array de valores de fecha
+
+    Returns:
+        pd.Series: Fechas a medianoche (datetime64), NaT donde no se pudo interpretar
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.normalize()
+
+    # Se trabaja por posición para no depender de que el índice sea único
+    values = series.reset_index(drop=True)
+    result = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    present = values.notna()
+
+    is_date = present & values.map(lambda v: isinstance(v, (datetime.date, np.datetime64)))
+    if is_date.any():
+        result[is_date] = pd.to_datetime(values[is_date], errors='coerce')
+
+    text = values[present & ~is_date].astype(str).str.strip()
+    iso = text.str.find('-') == 4
+    if iso.any():
+        result[text.index[iso]] = _parse_text(text[iso], ISO_FORMATS, dayfirst=False)
+    if (~iso).any():
+        result[text.index[~iso]] = _parse_text(text[~iso], DAYFIRST_FORMATS, dayfirst=True)
+
+    result.index = series.index
+    return result.dt.normalize()
+
+
+def fix_day_month_swap(dates, start, end, min_in_range=0.3):
+    """
+    Corrige fechas con día y mes intercambiados cuando la mayoría cae fuera del rango pedido.
+
+    Si menos de min_in_range de las fechas está dentro de [start, end], cada fecha con día <= 12
+    cuyo intercambio día/mes cae dentro del rango se sustituye por la fecha intercambiada.
+
+    Args:
+        dates (pd.Series): Fechas datetime64
+        start, end: Límites del rango solicitado
+        min_in_range (float): Fracción mínima dentro del rango para no corregir
+
+    Returns:
+        pd.Series: Fechas corregidas
+    """
+    if dates.empty:
+        return dates
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if ((dates >= start) & (dates <= end)).sum() >= len(dates) * min_in_range:
+        return dates
+
+    candidates = dates.notna() & (dates.dt.day <= 12)
+    if not candidates.any():
+        return dates
+    # Los meses > 12 resultantes del intercambio quedan como NaT
+    swapped = pd.to_datetime(
+        pd.DataFrame({'year': dates.dt.year, 'month': dates.dt.day, 'day': dates.dt.month}, index=dates.index),
+        errors='coerce'
+    )
+    use = candidates & (swapped >= start) & (swapped <= end)
+    return dates.where(~use, swapped)
+
+
+def parse_dates_to_str(values, fallback=None):
+    """
+    Convierte valores de fecha a texto 'YYYY-MM-DD'.
+
+    Args:
+        values: Valores de fecha
+        fallback (callable): Función aplicada al valor original cuando no se puede interpretar
+            (por defecto None en esas posiciones)
+
+    Returns:
+        list: Textos 'YYYY-MM-DD' en el mismo orden
+    """
+    values = list(values)
+    parsed = parse_dates(pd.Series(values, dtype=object))
+    text = parsed.dt.strftime('%Y-%m-%d')
+    return [
+        t if isinstance(t, str) else (fallback(v) if fallback else None)
+        for t, v in zip(text.tolist(), values)
+    ]
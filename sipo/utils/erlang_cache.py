@@ -0,0 +1,170 @@
+"""
+Caché de memoización compartida por todo el proceso para los cálculos Erlang.
+Evita recalcular combinaciones repetidas de (volumen, AHT, objetivo, tiempo de servicio),
+muy frecuentes en intervalos nocturnos con volumen cero o idéntico.
+"""
+
+import threading
+import numpy as np
+from config import Config
+from utils.lru_cache import BoundedLRUCache
+
+
+def _parse_decimals(value):
+    """
+    Convierte el valor de configuración de decimales en int o None (sin cuantizar).
+    """
+    if value is None or str(value).strip() == '':
+        return None
+    return int(value)
+
+
+class ErlangCache:
+    """
+    Memoiza resultados de agentes requeridos y SLA sobre una BoundedLRUCache.
+
+    Cuando hay cuantización configurada, el volumen y el AHT se redondean antes de
+    formar la clave y el cálculo se hace con los valores redondeados, de modo que el
+    resultado almacenado no depende de qué entrada lo generó.
+    """
+
+    def __init__(self, maxsize=65536, policy='lru', calls_decimals=None, aht_decimals=None, enabled=True):
+        """
+        Inicializa la caché.
+
+        Args:
+            maxsize (int): Número máximo de entradas
+            policy (str): Política de expulsión ('lru' o 'fifo')
+            calls_decimals (int): Decimales de cuantización del volumen (None = exacto)
+            aht_decimals (int): Decimales de cuantización del AHT (None = exacto)
+            enabled (bool): Si es False se calcula siempre sin almacenar
+        """
+        self.enabled = enabled
+        self.calls_decimals = calls_decimals
+        self.aht_decimals = aht_decimals
+        self._cache = BoundedLRUCache(maxsize=maxsize, policy=policy)
+
+    def quantize(self, calls, aht):
+        """
+        Aplica la cuantización configurada al volumen y al AHT.
+
+        Returns:
+            tuple: (calls, aht) como float, redondeados si corresponde
+        """
+        calls = float(calls)
+        aht = float(aht)
+        if self.calls_decimals is not None:
+            calls = round(calls, self.calls_decimals)
+        if self.aht_decimals is not None:
+            aht = round(aht, self.aht_decimals)
+        return calls, aht
+
+    def memoize(self, namespace, compute, calls, aht, *params):
+        """
+        Devuelve el resultado de compute(calls, aht, *params) desde la caché o calculándolo.
+
+        Args:
+            namespace (str): Identificador del tipo de cálculo (separa claves de distintos métodos)
+            compute (callable): Función a memoizar; recibe (calls, aht, *params)
+            calls (float): Volumen (se cuantiza)
+            aht (float): AHT (se cuantiza)
+            *params: Resto de parámetros hashables (objetivo, tiempo de servicio, flags...)
+
+        Returns:
+            Any: Resultado del cálculo
+        """
+        calls, aht = self.quantize(calls, aht)
+        if not self.enabled:
+            return compute(calls, aht, *params)
+        key = (namespace, calls, aht) + params
+        return self._cache.get_or_compute(key, compute, calls, aht, *params)
+
+    def memoize_batch(self, namespace, compute_batch, calls, aht, *params):
+        """
+        Versión por lotes de memoize: consulta cada par (volumen, AHT) con la misma clave
+        que memoize y resuelve todos los pares ausentes en una sola llamada a compute_batch.
+
+        Args:
+            namespace (str): Identificador del tipo de cálculo (comparte claves con memoize)
+            compute_batch (callable): Función vectorizada; recibe (calls, aht, *params) como arrays
+            calls (array-like): Volúmenes (se cuantizan)
+            aht (array-like): AHT (se cuantizan)
+            *params: Resto de parámetros hashables, comunes a todo el lote
+
+        Returns:
+            np.ndarray: Resultados en el orden de la entrada
+        """
+        pairs = [self.quantize(c, a) for c, a in zip(np.ravel(calls), np.ravel(aht))]
+        result = np.empty(len(pairs))
+        if not pairs:
+            return result
+        if not self.enabled:
+            q_calls, q_aht = (np.array(column) for column in zip(*pairs))
+            result[:] = compute_batch(q_calls, q_aht, *params)
+            return result
+
+        keys = [(namespace, c, a) + params for c, a in pairs]
+        missing = []
+        for i, key in enumerate(keys):
+            value = self._cache.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(i)
+            else:
+                result[i] = value
+
+        if missing:
+            q_calls = np.array([pairs[i][0] for i in missing])
+            q_aht = np.array([pairs[i][1] for i in missing])
+            computed = np.asarray(compute_batch(q_calls, q_aht, *params), dtype=float)
+            for i, value in zip(missing, computed):
+                result[i] = value
+                self._cache.put(keys[i], float(value))
+        return result
+
+    def clear(self):
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        self._cache.clear()
+
+    def stats(self):
+        """
+        Obtiene los contadores de la caché junto con su configuración.
+
+        Returns:
+            dict: Estadísticas de uso
+        """
+        stats = self._cache.stats()
+        stats.update({
+            'enabled': self.enabled,
+            'calls_decimals': self.calls_decimals,
+            'aht_decimals': self.aht_decimals,
+        })
+        return stats
+
+
+_MISSING = object()
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_erlang_cache():
+    """
+    Obtiene la instancia de la caché compartida, creándola desde Config la primera vez.
+
+    Returns:
+        ErlangCache: Caché del proceso
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ErlangCache(
+                    maxsize=Config.ERLANG_CACHE_SIZE,
+                    policy=Config.ERLANG_CACHE_POLICY,
+                    calls_decimals=_parse_decimals(Config.ERLANG_CACHE_CALLS_DECIMALS),
+                    aht_decimals=_parse_decimals(Config.ERLANG_CACHE_AHT_DECIMALS),
+                    enabled=Config.ERLANG_CACHE_ENABLED,
+                )
+    return _instance
@@ -0,0 +1,65 @@
+"""
+Bloqueo exclusivo entre procesos sobre un archivo de bloqueo.
+Usa fcntl.flock en POSIX y msvcrt.locking en Windows (donde se ejecuta el backend con
+setup_and_run_backend.bat), de modo que el módulo se puede importar en ambas plataformas.
+"""
+
+import os
+import time
+import contextlib
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Espera entre reintentos de msvcrt.locking (no tiene un modo bloqueante sin límite)
+RETRY_SECONDS = 0.05
+
+
+def _acquire(fd):
+    """
+    Toma el bloqueo exclusivo sobre el descriptor, esperando lo necesario.
+    """
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(RETRY_SECONDS)
+
+
+def _release(fd):
+    """
+    Libera el bloqueo del descriptor.
+    """
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """
+    Mantiene un bloqueo exclusivo sobre el archivo indicado (que se crea si no existe) mientras dura el bloque.
+    El bloqueo excluye a otros procesos y a otros descriptores del mismo proceso.
+
+    Args:
+        path (str): Ruta del archivo de bloqueo
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _acquire(fd)
+        try:
+            yield
+        finally:
+            _release(fd)
+    finally:
+        os.close(fd)
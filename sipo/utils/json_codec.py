@@ -0,0 +1,162 @@
+"""
+Serialización JSON común para las respuestas de la API y los datos guardados en base de datos.
+Usa orjson cuando está instalado (serializa de forma nativa los arrays y escalares de NumPy,
+las fechas y los dataclasses) y, si no, el módulo json estándar con las mismas conversiones.
+En ambos casos las fechas se escriben en ISO 8601, los escalares de NumPy como números y
+los arrays como listas.
+"""
+
+import json
+import datetime
+import decimal
+import threading
+import numpy as np
+from config import Config
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el módulo json estándar
+    orjson = None
+
+BACKENDS = ('auto', 'orjson', 'stdlib')
+
+
+def _convert(obj):
+    """
+    Convierte los tipos que ninguno de los dos motores serializa por sí mismo.
+
+    Returns:
+        Valor serializable, o NotImplemented si el tipo no se reconoce
+    """
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # Timestamp/Timedelta de pandas y otros objetos con conversión propia
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    return NotImplemented
+
+
+class JSONCodec:
+    """
+    Serializador/deserializador JSON con motor orjson o json estándar.
+    """
+
+    def __init__(self, backend='auto'):
+        """
+        Args:
+            backend (str): 'auto' (orjson si está instalado), 'orjson' o 'stdlib'
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Motor JSON no válido. Motores disponibles: {', '.join(BACKENDS)}")
+        if backend == 'orjson' and orjson is None:
+            raise ValueError("El motor JSON 'orjson' no está instalado")
+        if backend == 'auto':
+            backend = 'orjson' if orjson is not None else 'stdlib'
+        self.backend = backend
+
+    @staticmethod
+    def _default(fallback=None):
+        """
+        Construye la función default con las conversiones comunes y, opcionalmente, otra de respaldo.
+        """
+        def default(obj):
+            value = _convert(obj)
+            if value is not NotImplemented:
+                return value
+            if fallback is not None:
+                return fallback(obj)
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return default
+
+    def dumps_bytes(self, obj, default=None):
+        """
+        Serializa un objeto a JSON en bytes UTF-8.
+
+        Args:
+            obj: Objeto a serializar
+            default (callable): Conversión para tipos no reconocidos (p. ej. str)
+
+        Returns:
+            bytes: Documento JSON compacto
+        """
+        if self.backend == 'orjson':
+            return orjson.dumps(
+                obj,
+                default=self._default(default),
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+        return self.dumps(obj, default=default).encode('utf-8')
+
+    def dumps(self, obj, default=None):
+        """
+        Serializa un objeto a JSON como texto.
+
+        Args:
+            obj: Objeto a serializar
+            default (callable): Conversión para tipos no reconocidos (p. ej. str)
+
+        Returns:
+            str: Documento JSON compacto
+        """
+        if self.backend == 'orjson':
+            return self.dumps_bytes(obj, default=default).decode('utf-8')
+        return json.dumps(obj, default=self._default(default), ensure_ascii=False, separators=(',', ':'))
+
+    def loads(self, text):
+        """
+        Deserializa un documento JSON (str o bytes).
+
+        Los documentos antiguos escritos con el módulo json estándar pueden contener NaN o
+        Infinity, que orjson rechaza; en ese caso se leen con el módulo estándar.
+        """
+        if self.backend == 'orjson':
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(text)
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_json_codec():
+    """
+    Obtiene el codec JSON del proceso, creándolo desde Config la primera vez.
+
+    Returns:
+        JSONCodec: Codec compartido
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = JSONCodec(backend=Config.JSON_BACKEND)
+    return _instance
+
+
+def dumps(obj, default=None):
+    """
+    Serializa un objeto a JSON (texto) con el codec del proceso.
+    """
+    return get_json_codec().dumps(obj, default=default)
+
+
+def loads(text):
+    """
+    Deserializa un documento JSON con el codec del proceso.
+    """
+    return get_json_codec().loads(text)
@@ -0,0 +1,39 @@
+"""
+Proveedor JSON de Flask basado en el codec común (utils.json_codec).
+Se instala en create_app para que jsonify, request.get_json y current_app.json usen
+el mismo serializador que los datos guardados en base de datos.
+"""
+
+from flask.json.provider import JSONProvider
+from utils.json_codec import get_json_codec
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    JSONProvider que delega en JSONCodec (orjson si está instalado).
+    """
+
+    mimetype = 'application/json'
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.codec = get_json_codec()
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serializa un objeto a texto JSON. Acepta el argumento default de json.dumps.
+        """
+        return self.codec.dumps(obj, default=kwargs.get('default'))
+
+    def loads(self, s, **kwargs):
+        """
+        Deserializa un documento JSON (str o bytes).
+        """
+        return self.codec.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Construye la respuesta de jsonify escribiendo directamente los bytes del codec.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.codec.dumps_bytes(obj), mimetype=self.mimetype)
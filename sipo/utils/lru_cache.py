@@ -0,0 +1,152 @@
+"""
+Caché acotada en memoria con política de expulsión configurable.
+Es segura entre hilos y expone contadores de aciertos y fallos.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class BoundedLRUCache:
+    """
+    Caché clave-valor con tamaño máximo.
+
+    Políticas de expulsión soportadas:
+        - 'lru': expulsa la entrada usada hace más tiempo (un acierto la renueva).
+        - 'fifo': expulsa la entrada insertada hace más tiempo (los aciertos no la renuevan).
+    """
+
+    POLICIES = ('lru', 'fifo')
+
+    def __init__(self, maxsize=65536, policy='lru'):
+        """
+        Inicializa la caché.
+
+        Args:
+            maxsize (int): Número máximo de entradas (0 desactiva el almacenamiento)
+            policy (str): Política de expulsión ('lru' o 'fifo')
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Política de expulsión no válida. Políticas disponibles: {', '.join(self.POLICIES)}")
+        if maxsize < 0:
+            raise ValueError("El tamaño máximo de la caché no puede ser negativo")
+
+        self.maxsize = int(maxsize)
+        self.policy = policy
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Obtiene un valor de la caché y actualiza los contadores.
+
+        Args:
+            key: Clave (hashable) a buscar
+            default: Valor devuelto si la clave no existe
+
+        Returns:
+            Any: Valor almacenado o default
+        """
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                if self.policy == 'lru':
+                    self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Almacena un valor, expulsando entradas si se supera el tamaño máximo.
+
+        Args:
+            key: Clave (hashable)
+            value: Valor a almacenar
+        """
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._data[key] = value
+                if self.policy == 'lru':
+                    self._data.move_to_end(key)
+                return
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """
+        Elimina una entrada (p. ej. al invalidarla) y devuelve su valor.
+
+        Args:
+            key: Clave (hashable)
+            default: Valor devuelto si la clave no existe
+
+        Returns:
+            Any: Valor eliminado o default
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def get_or_compute(self, key, compute, *args):
+        """
+        Devuelve el valor en caché o lo calcula y almacena.
+
+        El cálculo se realiza fuera del candado para no serializar a otros hilos;
+        dos hilos pueden calcular la misma clave a la vez, con idéntico resultado.
+
+        Args:
+            key: Clave (hashable)
+            compute (callable): Función que produce el valor
+            *args: Argumentos para compute
+
+        Returns:
+            Any: Valor en caché o recién calculado
+        """
+        missing = _MISSING
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute(*args)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Obtiene los contadores de uso de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, expulsiones, ratio de aciertos, tamaño actual y configuración
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'policy': self.policy,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+_MISSING = object()
@@ -0,0 +1,133 @@
+"""
+Formato columnar comprimido para las tablas día × intervalo de los escenarios.
+Las columnas numéricas se guardan como un único array float32 (filas × columnas) comprimido
+con gzip, precedido de una cabecera JSON con el orden de las columnas y los valores de las
+columnas no numéricas (Fecha, Dia, Semana, Tipo...). El resultado se codifica en base64 con
+un prefijo de versión, de modo que cabe en las columnas de texto (CLOB) existentes y se
+distingue de las tablas antiguas en JSON orient='records', que se siguen pudiendo leer.
+"""
+
+import io
+import json
+import gzip
+import base64
+import struct
+import numpy as np
+import pandas as pd
+
+# Prefijo (y versión) del formato; las tablas JSON empiezan por '[' o '{'
+BLOB_PREFIX = 'SIPOB1:'
+
+# Columnas que se guardan en la cabecera aunque sean numéricas
+HEADER_COLUMNS = ('Fecha', 'Dia', 'Semana', 'Tipo')
+
+COMPRESSION_LEVEL = 6
+
+# Tipo de los valores almacenados (little-endian, independiente de la plataforma)
+VALUE_DTYPE = np.dtype('<f4')
+
+
+def is_matrix_blob(text):
+    """
+    Indica si un texto almacenado está en el formato columnar (y no en JSON).
+    """
+    return isinstance(text, str) and text.startswith(BLOB_PREFIX)
+
+
+def encode_frame(df, formatters=None):
+    """
+    Codifica un DataFrame en el formato columnar comprimido.
+
+    Args:
+        df (pd.DataFrame): Tabla (una fila por día)
+        formatters (dict): Funciones por nombre de columna aplicadas a cada valor de la cabecera
+            (p. ej. la Fecha a 'YYYY-MM-DD')
+
+    Returns:
+        str: Texto con el prefijo BLOB_PREFIX
+    """
+    formatters = formatters or {}
+    columns = [str(col) for col in df.columns]
+    value_positions = [
+        position for position, name in enumerate(columns)
+        if name not in HEADER_COLUMNS and name not in formatters
+        and pd.api.types.is_numeric_dtype(df.iloc[:, position])
+    ]
+    value_set = set(value_positions)
+
+    header_values = {}
+    for position, name in enumerate(columns):
+        if position in value_set:
+            continue
+        series = df.iloc[:, position]
+        if name in formatters:
+            series = series.map(formatters[name])
+        # to_json conserva la conversión de tipos de las tablas JSON orient='records'
+        header_values[name] = json.loads(series.to_json(orient='values'))
+
+    matrix = df.iloc[:, value_positions].to_numpy(dtype=VALUE_DTYPE)
+    header = json.dumps({
+        'rows': len(df),
+        'columns': columns,
+        'values': value_positions,
+        'header': header_values,
+    }, separators=(',', ':')).encode('utf-8')
+
+    payload = struct.pack('<I', len(header)) + header + np.ascontiguousarray(matrix).tobytes()
+    # mtime=0 hace que el mismo contenido produzca siempre el mismo texto
+    compressed = gzip.compress(payload, compresslevel=COMPRESSION_LEVEL, mtime=0)
+    return BLOB_PREFIX + base64.b64encode(compressed).decode('ascii')
+
+
+def decode_matrix(text):
+    """
+    Decodifica la cabecera y la matriz float32 (filas × columnas de valores) sin construir el DataFrame.
+
+    Returns:
+        tuple: (cabecera dict, np.ndarray)
+    """
+    payload = gzip.decompress(base64.b64decode(text[len(BLOB_PREFIX):]))
+    header_size, = struct.unpack_from('<I', payload)
+    header = json.loads(payload[4:4 + header_size].decode('utf-8'))
+    matrix = np.frombuffer(payload, dtype=VALUE_DTYPE, offset=4 + header_size)
+    return header, matrix.reshape(header['rows'], len(header['values']))
+
+
+def to_float64(matrix):
+    """
+    Convierte la matriz float32 almacenada a float64 tomando, para cada valor, el decimal más corto
+    que lo representa en float32 (37.3 y no 37.29999923706055), como lo devolvía el formato JSON.
+    """
+    return matrix.astype(str).astype(np.float64)
+
+
+def decode_frame(text):
+    """
+    Decodifica una tabla del formato columnar a DataFrame con las columnas en su orden original.
+    Los valores se devuelven en float64: el float32 es solo la codificación en disco.
+    """
+    header, matrix = decode_matrix(text)
+    matrix = to_float64(matrix)
+    columns = header['columns']
+    value_index = {position: j for j, position in enumerate(header['values'])}
+    data = {}
+    for position, name in enumerate(columns):
+        if position in value_index:
+            data[name] = matrix[:, value_index[position]]
+        else:
+            data[name] = header['header'][name]
+    return pd.DataFrame(data, index=pd.RangeIndex(header['rows']))
+
+
+def read_table(text):
+    """
+    Lee una tabla almacenada en cualquiera de los dos formatos (columnar o JSON orient='records').
+
+    Returns:
+        pd.DataFrame: Tabla (vacía si no hay datos)
+    """
+    if not text or text == "[]":
+        return pd.DataFrame()
+    if is_matrix_blob(text):
+        return decode_frame(text)
+    return pd.read_json(io.StringIO(text), orient='records')
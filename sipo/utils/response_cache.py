@@ -0,0 +1,108 @@
+"""
+Caché en memoria de respuestas JSON ya generadas, con su ETag.
+Pensada para recursos que no cambian una vez guardados (p. ej. los escenarios de
+dimensionamiento): el cuerpo se genera una vez y las peticiones siguientes lo sirven
+directamente o responden 304 si el cliente ya tiene la misma versión.
+"""
+
+import hashlib
+import threading
+from config import Config
+from utils.lru_cache import BoundedLRUCache
+
+
+class ResponseCache:
+    """
+    Cuerpos de respuesta (bytes) y sus ETag indexados por clave, sobre una BoundedLRUCache.
+    """
+
+    def __init__(self, maxsize=128, enabled=True):
+        """
+        Args:
+            maxsize (int): Número máximo de respuestas guardadas
+            enabled (bool): Si es False no se guarda nada
+        """
+        self.enabled = enabled
+        self._cache = BoundedLRUCache(maxsize=maxsize, policy='lru')
+
+    @staticmethod
+    def make_etag(body):
+        """
+        Calcula el ETag (sin comillas) de un cuerpo de respuesta.
+        """
+        return hashlib.sha256(body).hexdigest()[:32]
+
+    def get(self, key, version=None):
+        """
+        Devuelve (cuerpo, etag) de una respuesta guardada para esa versión del recurso, o None.
+        """
+        if not self.enabled:
+            return None
+        entry = self._cache.get(key)
+        if entry is None or entry[2] != version:
+            return None
+        return entry[:2]
+
+    def get_or_render(self, key, render, version=None):
+        """
+        Devuelve la respuesta guardada o la genera con render() y la guarda.
+
+        Args:
+            key: Clave del recurso
+            render (callable): Función que devuelve el cuerpo en bytes
+            version: Versión del recurso (p. ej. su fecha de creación); una entrada guardada
+                con otra versión se regenera, aunque la clave se haya reutilizado
+
+        Returns:
+            tuple: (cuerpo, etag)
+        """
+        entry = self.get(key, version)
+        if entry is None:
+            body = render()
+            entry = (body, self.make_etag(body))
+            if self.enabled:
+                self._cache.put(key, entry + (version,))
+        return entry
+
+    def invalidate(self, key):
+        """
+        Elimina la respuesta guardada de un recurso (p. ej. al borrarlo).
+        """
+        self._cache.pop(key)
+
+    def clear(self):
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        self._cache.clear()
+
+    def stats(self):
+        """
+        Obtiene los contadores de uso de la caché.
+
+        Returns:
+            dict: Contadores de BoundedLRUCache y si la caché está activa
+        """
+        return dict(self._cache.stats(), enabled=self.enabled)
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_scenario_response_cache():
+    """
+    Obtiene la caché de respuestas de escenarios, creándola desde Config la primera vez.
+
+    Returns:
+        ResponseCache: Caché del proceso
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ResponseCache(
+                    maxsize=Config.SCENARIO_RESPONSE_CACHE_SIZE,
+                    enabled=Config.SCENARIO_RESPONSE_CACHE_ENABLED,
+                )
+    return _instance
@@ -0,0 +1,230 @@
+"""
+Caché en disco de archivos subidos ya parseados, direccionada por contenido.
+La clave es el SHA-256 de los bytes del archivo junto con la versión de los parseos, el
+tipo de parseo y sus parámetros, de modo que la misma plantilla subida varias veces solo
+se parsea una vez.
+Los resultados (DataFrames o diccionarios de DataFrames) se guardan serializados con
+pickle bajo instance/upload_cache y se expulsan por LRU cuando se supera el tamaño máximo.
+"""
+
+import io
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CACHE_EXTENSION = '.pkl'
+
+# Versión de los parseos cacheados: forma parte de la clave, de modo que al cambiar cualquier
+# función de parseo (plantilla de dimensionamiento, históricos, hojas del scheduler) basta con
+# incrementarla para que no se sirvan resultados generados por el código anterior
+PARSER_VERSION = 1
+
+
+def default_cache_dir():
+    """
+    Obtiene el directorio de la caché: UPLOAD_CACHE_DIR o instance/upload_cache en la raíz del proyecto.
+
+    Returns:
+        str: Ruta absoluta del directorio
+    """
+    if Config.UPLOAD_CACHE_DIR:
+        return os.path.abspath(Config.UPLOAD_CACHE_DIR)
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(project_root, 'instance', 'upload_cache')
+
+
+def read_source_bytes(source):
+    """
+    Lee los bytes de una ruta o de un archivo (p. ej. FileStorage de Flask) y rebobina el archivo.
+
+    Returns:
+        bytes: Contenido del archivo
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    stream = getattr(source, 'stream', source)
+    if hasattr(stream, 'seek'):
+        stream.seek(0)
+    content = stream.read()
+    if hasattr(stream, 'seek'):
+        stream.seek(0)
+    return content
+
+
+class UploadCache:
+    """
+    Caché de resultados de parseo indexada por el hash del contenido del archivo.
+    """
+
+    def __init__(self, directory, max_bytes, enabled=True):
+        """
+        Args:
+            directory (str): Directorio donde se guardan las entradas
+            max_bytes (int): Tamaño máximo total en bytes (se expulsan las entradas usadas hace más tiempo)
+            enabled (bool): Si es False, get_or_parse siempre parsea
+        """
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(content, namespace, *params):
+        """
+        Construye la clave a partir del contenido, la versión de los parseos, el tipo de parseo y sus parámetros.
+        """
+        digest = hashlib.sha256(content)
+        digest.update(repr((PARSER_VERSION, namespace) + params).encode('utf-8'))
+        return f"{namespace}-{digest.hexdigest()}"
+
+    def get_or_parse(self, source, namespace, parse, *params):
+        """
+        Devuelve el resultado cacheado del archivo o lo parsea y almacena.
+
+        Args:
+            source: Ruta o archivo subido
+            namespace (str): Tipo de parseo (distingue resultados distintos del mismo archivo)
+            parse (callable): Función parse(buffer, *params) que recibe un BytesIO con el contenido
+            *params: Parámetros del parseo que forman parte de la clave
+
+        Returns:
+            Any: Resultado del parseo
+        """
+        if not self.enabled:
+            return parse(source, *params)
+
+        content = read_source_bytes(source)
+        path = os.path.join(self.directory, self.make_key(content, namespace, *params) + CACHE_EXTENSION)
+
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+            with self._lock:
+                self.hits += 1
+            return value
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Entrada de caché de cargas ilegible, se vuelve a parsear: {e}")
+
+        with self._lock:
+            self.misses += 1
+        value = parse(io.BytesIO(content), *params)
+        self._store(path, value)
+        return value
+
+    def _store(self, path, value):
+        """
+        Escribe la entrada de forma atómica y aplica la expulsión por tamaño.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._evict()
+        except Exception as e:
+            logger.warning(f"No se pudo guardar la entrada en la caché de cargas: {e}")
+
+    def _entries(self):
+        """
+        Lista las entradas como (última utilización, tamaño, ruta), de la más antigua a la más reciente.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_EXTENSION):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def _evict(self):
+        """
+        Elimina las entradas usadas hace más tiempo hasta respetar max_bytes.
+        """
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Elimina todas las entradas y reinicia los contadores.
+        """
+        with self._lock:
+            if os.path.isdir(self.directory):
+                for _, _, path in self._entries():
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Obtiene los contadores de uso y la ocupación de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, expulsiones, entradas, bytes ocupados y configuración
+        """
+        with self._lock:
+            entries = self._entries() if os.path.isdir(self.directory) else []
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes,
+                'enabled': self.enabled,
+            }
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_upload_cache():
+    """
+    Obtiene la instancia de la caché de cargas, creándola desde Config la primera vez.
+
+    Returns:
+        UploadCache: Caché del proceso
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = UploadCache(
+                    directory=default_cache_dir(),
+                    max_bytes=Config.UPLOAD_CACHE_MAX_MB * 1024 * 1024,
+                    enabled=Config.UPLOAD_CACHE_ENABLED,
+                )
+    return _instance